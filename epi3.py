@@ -82,7 +82,8 @@ from kcomp import TOL
 #
 # In this design, the bas will be centered on X
 
-logging.basicConfig(level=logging.DEBUG,
+# level of the log, i.e. FCAD_LOG_LEVEL=DEBUG
+logging.basicConfig(level=os.environ.get('FCAD_LOG_LEVEL', 'INFO'),
                     format='%(asctime)s - %(levelname)s - %(message)s')
 
 doc = FreeCAD.newDocument()
@@ -450,7 +451,7 @@ cubefaceplate = h_cage_c.vec_face(VY)
 
 #plate3cubes_cenhole_d = h_tubelens_c.ring_d + TOL
 
-print h_tubelens_c.ring_d + TOL
+print(h_tubelens_c.ring_d + TOL)
 file_comps.write('hole tublens ' + str( h_tubelens_c.ring_d + TOL) +'\n')
 file_comps.write('vs 57\n')
 plate3cubes_cenhole_d = 57. # 56 given by ivan
@@ -1633,7 +1634,7 @@ n_movegr = len(movegroup_list)
 mvgroup_l = list(set(movegroup_list))
 n_cl_movegr = len(mvgroup_l)
 # to check if any element has been take twice
-print ("movegroup elements: " + str(n_movegr) + " - " + str(n_cl_movegr))
+print("movegroup elements: " + str(n_movegr) + " - " + str(n_cl_movegr))
 
 
 movegroup = doc.addObject("Part::Compound","movegroup")
@@ -75,7 +75,8 @@ from kcomp import TOL
 #
 # In this design, the bas will be centered on X
 
-logging.basicConfig(level=logging.DEBUG,
+# level of the log, i.e. FCAD_LOG_LEVEL=DEBUG
+logging.basicConfig(level=os.environ.get('FCAD_LOG_LEVEL', 'INFO'),
                     format='%(asctime)s - %(levelname)s - %(message)s')
 
 doc = FreeCAD.newDocument()
@@ -0,0 +1,315 @@
+# ----------------------------------------------------------------------------
+# -- Assemblies
+# -- comps library
+# -- Build subassemblies in their own documents and assemble them by links
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# The components of the library are created in FreeCAD.ActiveDocument,
+# so if everything is built in the same document, each doc.recompute()
+# walks all the objects, including the hidden intermediate features of
+# the booleans.
+# Here, each subassembly is built in its own document, and its final objects
+# are grouped in an App::Part. The master document only has an App::Link
+# to each subassembly, so the recomputes are local to each subassembly.
+#
+#    master document          subassembly documents
+#    ---------------          ---------------------
+#    link yslider_nx  ------> yslider_nx: App::Part -> top_slide, bot_slide
+#    link yslider_x   ------> yslider_x:  App::Part -> top_slide, bot_slide
+#    ...
+#
+# Since the subassemblies dont share a document, they can be built in
+# parallel processes, saved to FCStd files, and then opened and linked:
+# see build_subasm_files
+#
+# When the components are not going to be shown, but exported, iter_build
+# builds them one by one, and yields each finished component, so it can
+# be exported and freed before building the next one:
+#
+#    specs = [('bracket_x', parts.AluProfBracketPerp, {...}),
+#             ('bracket_nx', parts.AluProfBracketPerp, {...}) ]
+#    assembly.export_stl_stream(assembly.iter_build(specs), '/tmp/stl/')
+
+import os
+import logging
+import importlib
+import collections
+import multiprocessing
+
+import FreeCAD
+import MeshPart
+
+import kparts
+
+logger = logging.getLogger(__name__)
+
+
+def build_subasm (builder, name, *args, **kwargs):
+    """ Builds a subassembly in its own new document.
+    The builder is any class or function of the library that creates its
+    objects in FreeCAD.ActiveDocument. After building it, the previous active
+    document is active again. If the builder fails, the new document is
+    closed and the exception is raised again
+
+    Args:
+        builder: class or function that builds the subassembly
+        name: name of the new document
+        args, kwargs: arguments of the builder
+
+    Returns:
+        tuple (doc, result):
+            doc: the document of the subassembly
+            result: what the builder returns, i.e. the object of the class
+    """
+
+    prev_doc = FreeCAD.ActiveDocument
+    doc = FreeCAD.newDocument(name)
+    FreeCAD.setActiveDocument(doc.Name)
+    try:
+        result = builder(*args, **kwargs)
+        doc.recompute()
+    except Exception:
+        # dont leave a half built document open
+        FreeCAD.closeDocument(doc.Name)
+        raise
+    finally:
+        if prev_doc is not None:
+            FreeCAD.setActiveDocument(prev_doc.Name)
+    return doc, result
+
+
+def get_subasm_part (sub_doc, name = ''):
+    """ Gets the App::Part that contains the final objects of a subassembly
+    document. If it doesnt exist, it is created with the root objects of
+    the document (the objects that no other object uses), so the intermediate
+    features of the booleans are not included
+
+    Args:
+        sub_doc: document of the subassembly
+        name: name of the App::Part, if empty the name of the document
+              with the suffix _asm
+
+    Returns:
+        the App::Part object
+    """
+
+    if not name:
+        name = sub_doc.Name + '_asm'
+    part = sub_doc.getObject(name)
+    if part is not None and part.TypeId == 'App::Part':
+        return part
+    root_objs = [obj for obj in sub_doc.RootObjects
+                 if obj.TypeId != 'App::Part']
+    part = sub_doc.addObject('App::Part', name)
+    for obj in root_objs:
+        part.addObject(obj)
+    sub_doc.recompute()
+    return part
+
+
+def link_subasm (master_doc, sub_doc, name = '', placement = None):
+    """ Adds a subassembly to the master document by an App::Link
+    to the App::Part of the subassembly
+
+    Args:
+        master_doc: document where the assembly is
+        sub_doc: document of the subassembly
+        name: name of the link, if empty the name of the subassembly document
+        placement: FreeCAD.Placement of the link. If None, the subassembly
+                   stays where it was built
+
+    Returns:
+        the App::Link object
+    """
+
+    if not name:
+        name = sub_doc.Name
+    part = get_subasm_part(sub_doc)
+    link = master_doc.addObject('App::Link', name)
+    link.setLink(part)
+    link.Label = name
+    if placement is not None:
+        link.Placement = placement
+    return link
+
+
+def build_subasm_file (job):
+    """ Builds a subassembly in a new document and saves it in a FCStd
+    file. To be executed in another process (see build_subasm_files),
+    so the arguments are given as in the build daemon (builddaemon.py)
+
+    Args:
+        job: dictionary with:
+            'module': name of the module of the library, i.e. 'stageparts'
+            'cls': name of the class or function that builds it
+            'kwargs': arguments, FreeCAD.Vector encoded as {'__vec__':[x,y,z]}
+            'name': name of the document
+            'path': path of the FCStd file
+
+    Returns:
+        path of the saved file
+    """
+
+    import builddaemon
+
+    builder = getattr(importlib.import_module(job['module']), job['cls'])
+    kwargs = builddaemon.decode_arg(job.get('kwargs', {}))
+    doc, _ = build_subasm(builder, job['name'], **kwargs)
+    get_subasm_part(doc)
+    doc.saveAs(job['path'])
+    FreeCAD.closeDocument(doc.Name)
+    return job['path']
+
+
+def build_subasm_files (jobs, n_proc = 0):
+    """ Builds subassemblies in parallel processes, each one saved in its
+    FCStd file. Then they can be opened and linked in the master document:
+    see link_subasm_files
+
+    Args:
+        jobs: list of dictionaries, see build_subasm_file.
+              FreeCAD.Vector in kwargs can be given as they are,
+              they are encoded here
+        n_proc: number of processes. If 0: number of cpus
+
+    Returns:
+        list of the paths of the saved files, in the same order as jobs
+    """
+
+    import builddaemon
+
+    enc_jobs = []
+    for job in jobs:
+        enc_job = dict(job)
+        enc_job['kwargs'] = builddaemon.encode_arg(job.get('kwargs', {}))
+        enc_jobs.append(enc_job)
+    if n_proc == 0:
+        n_proc = multiprocessing.cpu_count()
+    pool = multiprocessing.Pool(min(n_proc, len(enc_jobs)))
+    try:
+        paths = pool.map(build_subasm_file, enc_jobs)
+    finally:
+        pool.close()
+        pool.join()
+    return paths
+
+
+def link_subasm_files (master_doc, paths, placements = None):
+    """ Opens the FCStd files of the subassemblies and links them into
+    the master document
+
+    Args:
+        master_doc: document where the assembly is
+        paths: list of paths of the FCStd files of the subassemblies
+        placements: list of FreeCAD.Placement (or None) for each subassembly
+
+    Returns:
+        list of the App::Link objects
+    """
+
+    if placements is None:
+        placements = [None] * len(paths)
+    links = []
+    for path, placement in zip(paths, placements):
+        sub_doc = FreeCAD.openDocument(path)
+        links.append(link_subasm(master_doc, sub_doc,
+                                 name = os.path.splitext(
+                                             os.path.basename(path))[0],
+                                 placement = placement))
+    FreeCAD.setActiveDocument(master_doc.Name)
+    master_doc.recompute()
+    return links
+
+
+
+# a finished component, yielded by iter_build
+# name: name of the component
+# shp: TopoShape of the component, it doesnt belong to any document
+# placement: FreeCAD.Placement of the shape
+# metadata: dictionary with the numeric and text attributes of the component
+#           such as its dimensions
+BuiltComp = collections.namedtuple('BuiltComp',
+                                   ['name', 'shp', 'placement', 'metadata'])
+
+
+def get_comp_metadata (comp):
+    """ Gets the simple attributes of a component: numbers, text and
+    FreeCAD.Vector (as tuples), that is, its dimensions and options,
+    without shapes nor FreeCAD objects
+
+    Args:
+        comp: component object
+
+    Returns:
+        dictionary with the attributes
+    """
+
+    metadata = {}
+    for key, val in vars(comp).items():
+        if isinstance(val, (bool, int, float, str)):
+            metadata[key] = val
+        elif isinstance(val, FreeCAD.Vector):
+            metadata[key] = (val.x, val.y, val.z)
+    return metadata
+
+
+def iter_build (specs):
+    """ Builds the components one by one, each one in a new document that
+    is closed after it is built. Each finished component is yielded, so
+    it can be exported and freed before the next component is built.
+    The peak memory is the memory of one component, not the whole assembly
+
+    Args:
+        specs: iterable (list or generator) of tuples (name, builder, kwargs)
+            name: name of the component (and of its temporary document)
+            builder: class or function of the library that builds it
+            kwargs: dictionary with the arguments of the builder
+
+    Yields:
+        BuiltComp (name, shp, placement, metadata) of each component
+    """
+
+    import builddaemon
+
+    for name, builder, kwargs in specs:
+        doc, comp = build_subasm(builder, name, **kwargs)
+        try:
+            shp = builddaemon.get_build_shp(comp).copy()
+            metadata = get_comp_metadata(comp)
+        finally:
+            # the shape is a copy, the document can be closed
+            FreeCAD.closeDocument(doc.Name)
+        del comp
+        yield BuiltComp(name, shp, shp.Placement, metadata)
+
+
+def export_stl_stream (built_comps, stl_dir, prefix = ''):
+    """ Exports to STL each component as soon as it is built, and frees it
+
+    Args:
+        built_comps: iterable of BuiltComp, usually iter_build(specs)
+        stl_dir: directory of the STL files
+        prefix: prefix of the file names, an underscore is added
+
+    Returns:
+        list of the paths of the STL files
+    """
+
+    if prefix:
+        prefix = prefix + '_'
+    paths = []
+    for built in built_comps:
+        path = os.path.join(stl_dir, prefix + built.name + '.stl')
+        mesh_shp = MeshPart.meshFromShape(built.shp,
+                                          LinearDeflection=kparts.LIN_DEFL,
+                                          AngularDeflection=kparts.ANG_DEFL)
+        mesh_shp.write(path)
+        del mesh_shp
+        paths.append(path)
+    return paths
@@ -33,6 +33,7 @@ sys.path.append(filepath)
 import kcomp  # import material constants and other constants
 import fcfun      # import my functions for freecad
 import kparts 
+import holerec
 
 
 
@@ -589,6 +590,7 @@ class BeltClamp (object):
     # minimum base 
     MIN_BASE_H = 2.
 
+    @holerec.log_holes
     def __init__(self,
                  fc_fro_ax,
                  fc_top_ax,
@@ -0,0 +1,305 @@
+# ----------------------------------------------------------------------------
+# -- Belt paths
+# -- comps library
+# -- Tangent points and lengths of belts around pulleys and idlers
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# The belt path is computed analytically with NumPy, without making any
+# geometry. The geometry (a wire) is only made if it is asked: shp_belt_path
+#
+# The belt goes through an ordered list of pulleys, each one defined by
+# the 2D coordinates of its center (on a plane defined by axis_1, axis_2,
+# as in patterns.py) and its signed pitch radius:
+#   radius > 0: the belt goes counterclockwise around the pulley
+#               (the pulley is on the left of the belt)
+#   radius < 0: the belt goes clockwise around the pulley
+#   radius = 0: a point, such as the end of an open belt in a belt clamp
+#
+#                  axis_2
+#                    :     tangent 1-2
+#           ___   ...:.........  ___
+#          /   \       :        /   \
+#         (  1  )      :       (  2  )..... axis_1
+#          \___/ ......:......  \___/
+#                  tangent 2-1
+#
+# The radius is the pitch radius, where the belt length is measured.
+# It can be obtained with gt2_pulley_pitch_r and idler_pitch_r
+#
+# Many layouts can be evaluated at once: the centers can have leading
+# dimensions: (n_layouts, n_pulleys, 2), and so the results
+
+import FreeCAD
+import Part
+import logging
+import math
+import numpy as np
+
+import kcomp
+import fcfun
+import patterns
+
+from fcfun import V0, VX, VY
+
+logger = logging.getLogger(__name__)
+
+# maximum wrap angle of the belt around a pulley. A larger angle usually
+# means that the belt bends to the other side of the pulley (an inflection),
+# the sign of its radius is wrong, and the wrap would be almost 2*pi
+MAX_WRAP = 1.5 * math.pi
+
+
+def gt2_pulley_pitch_r (n_teeth):
+    """ Pitch radius of a GT2 toothed pulley
+
+    Args:
+        n_teeth: number of teeth of the pulley
+
+    Returns:
+        pitch radius
+    """
+
+    return n_teeth * kcomp.GT2_PITCH / (2 * math.pi)
+
+
+def idler_pitch_r (r_idler, back = 1):
+    """ Pitch radius of a GT2 belt around a smooth idler (a bearing)
+
+    Args:
+        r_idler: radius of the idler, i.e. kcomp.BEARING[624]['do']/2.
+        back: 1: the back of the belt is on the idler
+              0: the teeth of the belt are on the idler
+
+    Returns:
+        pitch radius
+    """
+
+    if back == 1:
+        # from the back of the belt to the root of the teeth, and back
+        # to the pitch line
+        return r_idler + kcomp.GT2_T - kcomp.GT2_TOOTH_H - kcomp.GT2_PLD
+    else:
+        return r_idler + kcomp.GT2_TOOTH_H + kcomp.GT2_PLD
+
+
+def belt_tangents (centers, radii, closed = 1):
+    """ Computes the tangent segments of a belt path and the angles that the
+    belt wraps around each pulley
+
+    Args:
+        centers: NumPy array (..., n, 2) with the centers of the pulleys,
+                 in the order the belt goes through them
+        radii: NumPy array (..., n) (or (n)) with the signed pitch radii
+        closed: 1: closed belt, the last pulley goes to the first
+                0: open belt, the first and the last are the ends of the
+                   belt (usually with radius 0)
+
+    Returns:
+        tuple (tan_pts, tan_l, wrap):
+            tan_pts: array (..., m, 2, 2) with the start and end points of
+                     each tangent segment, m = n if closed, n-1 if not.
+                     Segment i goes from pulley i to pulley i+1
+            tan_l: array (..., m) with the length of each tangent segment
+            wrap: array (..., n) with the angle (radians) that the belt
+                  wraps around each pulley. 0 at the ends of an open belt
+        If the pulleys overlap, so there is no tangent, the values are nan.
+        If a wrap angle is larger than MAX_WRAP, there is a warning: the
+        belt bends against that pulley
+    """
+
+    centers = np.asarray(centers, dtype = float)
+    radii = np.broadcast_to(np.asarray(radii, dtype = float),
+                            centers.shape[:-1])
+    if closed == 1:
+        c_nxt = np.roll(centers, -1, axis = -2)
+        r_nxt = np.roll(radii, -1, axis = -1)
+        c_0 = centers
+        r_0 = radii
+    else:
+        c_nxt = centers[..., 1:, :]
+        r_nxt = radii[..., 1:]
+        c_0 = centers[..., :-1, :]
+        r_0 = radii[..., :-1]
+
+    dif = c_nxt - c_0
+    cen_l = np.hypot(dif[..., 0], dif[..., 1])
+    # u: unitary vector from center to center. w: u rotated 90 degrees
+    u_x = dif[..., 0] / cen_l
+    u_y = dif[..., 1] / cen_l
+    # direction of the tangent: t = a * u + b * w
+    # the tangent points are c + r * (t rotated -90 degrees)
+    b = (r_0 - r_nxt) / cen_l
+    with np.errstate(invalid = 'ignore'):
+        a = np.sqrt(1. - b * b)
+    if np.isnan(a).any():
+        logger.warning('pulleys too close, there is no tangent')
+    t_x = a * u_x - b * u_y
+    t_y = a * u_y + b * u_x
+    tan_l = a * cen_l
+
+    # tangent points: the normal to the right of the tangent is (t_y, -t_x)
+    p_start = np.stack((c_0[..., 0] + r_0 * t_y,
+                        c_0[..., 1] - r_0 * t_x), axis = -1)
+    p_end = np.stack((c_nxt[..., 0] + r_nxt * t_y,
+                      c_nxt[..., 1] - r_nxt * t_x), axis = -1)
+    tan_pts = np.stack((p_start, p_end), axis = -2)
+
+    # wrap angle on each pulley: from the incoming to the outgoing tangent
+    if closed == 1:
+        t_in_x = np.roll(t_x, 1, axis = -1)
+        t_in_y = np.roll(t_y, 1, axis = -1)
+        t_out_x = t_x
+        t_out_y = t_y
+        r_wrap = radii
+    else:
+        t_in_x = t_x[..., :-1]
+        t_in_y = t_y[..., :-1]
+        t_out_x = t_x[..., 1:]
+        t_out_y = t_y[..., 1:]
+        r_wrap = radii[..., 1:-1]
+    ang = np.arctan2(t_in_x * t_out_y - t_in_y * t_out_x,
+                     t_in_x * t_out_x + t_in_y * t_out_y)
+    wrap = np.where(r_wrap < 0, -ang, ang) % (2 * math.pi)
+    with np.errstate(invalid = 'ignore'):
+        # the points (radius 0) have no wrap
+        inflect = (wrap > MAX_WRAP) & (r_wrap != 0)
+    if inflect.any():
+        logger.warning('belt bends against %d pulleys (wrap %.1f deg), '
+                       'check the sign of their radii',
+                       np.count_nonzero(inflect),
+                       math.degrees(wrap[inflect].max()))
+    if closed == 0:
+        pad = [(0, 0)] * (wrap.ndim - 1) + [(1, 1)]
+        wrap = np.pad(wrap, pad, mode = 'constant')
+    return tan_pts, tan_l, wrap
+
+
+def belt_length (centers, radii, closed = 1):
+    """ Length of the belt on the pitch line: tangent segments and arcs
+
+    Args:
+        centers: NumPy array (..., n, 2) with the centers of the pulleys
+        radii: NumPy array (..., n) (or (n)) with the signed pitch radii
+        closed: 1: closed belt. 0: open belt, see belt_tangents
+
+    Returns:
+        length of the belt, float or array (...) if many layouts are given
+    """
+
+    _, tan_l, wrap = belt_tangents(centers, radii, closed)
+    radii = np.broadcast_to(np.asarray(radii, dtype = float), wrap.shape)
+    length = tan_l.sum(axis = -1) + (np.abs(radii) * wrap).sum(axis = -1)
+    if np.ndim(length) == 0:
+        return float(length)
+    return length
+
+
+def fit_stock_belt (length, stock = kcomp.GT2_LOOP_L,
+                    pitch = kcomp.GT2_PITCH):
+    """ Takes the shortest stock belt that is not shorter than the length
+    of the belt path.
+    The stock lengths are rounded to the pitch, a closed belt has a whole
+    number of teeth
+
+    Args:
+        length: length of the belt path, float or NumPy array
+        stock: list of the stock belt lengths
+        pitch: pitch of the belt
+
+    Returns:
+        tuple (stock_l, slack):
+            stock_l: length of the stock belt, nan if there is none long enough
+            slack: stock_l - length, that has to be taken by the tensioner
+    """
+
+    stock = np.sort(np.round(np.asarray(stock, dtype = float) / pitch) * pitch)
+    length = np.asarray(length, dtype = float)
+    ind = np.searchsorted(stock, length - 1e-6)
+    found = ind < len(stock)
+    stock_l = np.where(found, stock[np.minimum(ind, len(stock) - 1)], np.nan)
+    slack = stock_l - length
+    if stock_l.ndim == 0:
+        return float(stock_l), float(slack)
+    return stock_l, slack
+
+
+def best_layout (centers, radii, stock = kcomp.GT2_LOOP_L, closed = 1):
+    """ From many layouts of the pulleys (i.e. different idler positions),
+    takes the one that fits a stock belt with the least slack
+
+    Args:
+        centers: NumPy array (n_layouts, n, 2) with the centers of each layout
+        radii: NumPy array (n_layouts, n) or (n) with the signed pitch radii
+        stock: list of the stock belt lengths
+        closed: 1: closed belt. 0: open belt
+
+    Returns:
+        tuple (ind, length, stock_l):
+            ind: index of the best layout, -1 if none fits a stock belt
+            length: length of the belt path of the best layout
+            stock_l: length of the stock belt
+    """
+
+    length = belt_length(centers, radii, closed)
+    stock_l, slack = fit_stock_belt(length, stock)
+    if np.isnan(slack).all():
+        logger.warning('no stock belt for these layouts')
+        return -1, np.nan, np.nan
+    ind = int(np.nanargmin(slack))
+    return ind, float(length[ind]), float(stock_l[ind])
+
+
+def shp_belt_path (centers, radii, closed = 1,
+                   pos = V0, axis_1 = VX, axis_2 = VY):
+    """ Makes the wire of the belt path on the pitch line.
+    Only one layout
+
+    Args:
+        centers: NumPy array (n, 2) with the centers of the pulleys
+        radii: NumPy array (n) with the signed pitch radii
+        closed: 1: closed belt. 0: open belt
+        pos: FreeCAD.Vector of the origin of the 2D coordinates
+        axis_1: FreeCAD.Vector of the first axis of the 2D coordinates
+        axis_2: FreeCAD.Vector of the second axis of the 2D coordinates
+
+    Returns:
+        the shape of the wire
+    """
+
+    centers = np.asarray(centers, dtype = float)
+    radii = np.asarray(radii, dtype = float)
+    tan_pts, _, wrap = belt_tangents(centers, radii, closed)
+
+    def fcpt (pt_2d):
+        return patterns.fcvecs(patterns.pts_to_global([pt_2d],
+                                                       pos, axis_1, axis_2))[0]
+
+    edges = []
+    n_tan = len(tan_pts)
+    for ind in range(n_tan):
+        p_start, p_end = tan_pts[ind]
+        edges.append(Part.LineSegment(fcpt(p_start), fcpt(p_end)).toShape())
+        # arc on the next pulley
+        ind_nxt = (ind + 1) % len(centers)
+        r_nxt = radii[ind_nxt]
+        if (closed == 0 and ind == n_tan - 1) or r_nxt == 0:
+            continue
+        if wrap[ind_nxt] < 1e-9:
+            continue
+        p_arc_end = tan_pts[(ind + 1) % n_tan][0]
+        # middle point of the arc, rotating from the start point
+        cen = centers[ind_nxt]
+        ang_mid = np.sign(r_nxt) * wrap[ind_nxt] / 2.
+        rad_vec = p_end - cen
+        p_mid = cen + np.array(
+                    [rad_vec[0] * math.cos(ang_mid) - rad_vec[1] * math.sin(ang_mid),
+                     rad_vec[0] * math.sin(ang_mid) + rad_vec[1] * math.cos(ang_mid)])
+        edges.append(Part.Arc(fcpt(p_end), fcpt(p_mid),
+                              fcpt(p_arc_end)).toShape())
+    return Part.Wire(edges)
@@ -0,0 +1,445 @@
+# ----------------------------------------------------------------------------
+# -- Build daemon
+# -- comps library
+# -- Keeps FreeCAD worker processes warm, with the library already imported,
+# -- and builds components on request through a Unix socket
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# Starting freecadcmd and importing the library takes much longer than
+# building a small part, such as a bracket. The daemon pays this once:
+# each worker of the pool imports FreeCAD and the library when it starts,
+# and then waits for build requests.
+#
+# To start the daemon, from this directory:
+#   freecadcmd builddaemon.py
+# or from python, with FreeCAD in the path:
+#   python builddaemon.py --socket /tmp/fcad_build.sock --workers 4
+#
+# A request is one line of JSON, and the answer is one line of JSON:
+#   {"module": "parts", "cls": "IdlePulleyHolder",
+#    "kwargs": {"profile_size": 20., "pos": {"__vec__": [0, 0, 0]},
+#               "d_prof": {"__const__": "kcomp.ALU_PROF_20"} },
+#    "outputs": {"stl": "/tmp/holder.stl", "fcstd": "/tmp/holder.FCStd"} }
+#
+# Since JSON has no FreeCAD.Vector nor references to the dictionaries of
+# kcomp, they are encoded as:
+#   {"__vec__": [x, y, z]}            -> FreeCAD.Vector(x, y, z)
+#   {"__const__": "module.CONSTANT"}  -> module.CONSTANT, i.e. kcomp.ALU_PROF_20
+# The constants can only be taken from the modules of constants
+# (CONST_MODULES), and they cannot be functions, classes or modules
+#
+# If a worker dies (i.e. a segmentation fault of OpenCASCADE), its build
+# would never finish, so while a build runs the workers are checked every
+# POLL_TIME, and if one has died, the request fails at once. If a build
+# takes longer than BUILD_TIMEOUT, it also fails. In both cases the pool of
+# workers is replaced by a new one, so the daemon keeps serving
+#
+# From python, the function request() sends a request and waits the answer:
+#   import builddaemon
+#   builddaemon.request('parts', 'IdlePulleyHolder', kwargs,
+#                       outputs = {'stl': '/tmp/holder.stl'})
+
+import os
+import sys
+import json
+import time
+import socket
+import logging
+import inspect
+import importlib
+import threading
+import traceback
+import multiprocessing
+
+try:
+    import socketserver # python 3
+except ImportError:
+    import SocketServer as socketserver # python 2
+
+logger = logging.getLogger(__name__)
+
+# default path of the Unix socket
+SOCK_PATH = '/tmp/fcad_build.sock'
+
+# modules imported by the workers when they start
+WARM_MODULES = ('kcomp', 'kcomp_optic', 'kparts', 'fcfun', 'comps',
+                'parts', 'partgroup', 'beltcl', 'comp_optic')
+
+# modules from where the classes can be built. The workers only import
+# modules of the library, they dont execute any other code.
+# fc_clss is not included, it needs shp_clss, that is not in the library
+BUILD_MODULES = WARM_MODULES + ('linfiltersup', 'parts3d')
+
+# modules from where the constants (__const__) can be taken. Only the
+# modules of the library, the workers dont have the stage modules (kstage,
+# kcit) in their path
+CONST_MODULES = ('kcomp', 'kcomp_optic', 'kparts')
+
+# maximum time of a build, in seconds
+BUILD_TIMEOUT = 600
+
+# time between the checks of the workers while a build runs, in seconds
+POLL_TIME = 0.5
+
+
+class WorkerDiedError (RuntimeError):
+    """ A worker of the pool has died, the builds it had will not finish """
+
+
+def wait_result (pool, result, timeout = None):
+    """ Waits for the result of a job of a pool, checking that the workers
+    of the pool are alive. A worker that dies is replaced by the pool, but
+    its job is lost, so the result would never be ready
+
+    Args:
+        pool: multiprocessing.Pool
+        result: multiprocessing AsyncResult of the job
+        timeout: maximum time in seconds, if None: BUILD_TIMEOUT
+
+    Returns:
+        the value returned by the job
+
+    Raises:
+        WorkerDiedError: if a worker of the pool has died
+        multiprocessing.TimeoutError: if the job takes longer than timeout
+    """
+
+    if timeout is None:
+        timeout = BUILD_TIMEOUT
+    # the workers when the job was sent (Pool has no public list of them)
+    workers = list(pool._pool)
+    t_end = time.time() + timeout
+    while not result.ready():
+        result.wait(POLL_TIME)
+        if result.ready():
+            break
+        dead = [worker for worker in workers if worker.exitcode is not None]
+        if dead:
+            raise WorkerDiedError('worker died, exit code '
+                                  + str(dead[0].exitcode))
+        if time.time() > t_end:
+            raise multiprocessing.TimeoutError()
+    return result.get()
+
+
+def warm_worker (lib_path):
+    """ Initializer of each worker process: imports FreeCAD and the library,
+    so they are ready when the requests arrive
+
+    Args:
+        lib_path: path of the library, to be added to sys.path
+    """
+
+    if lib_path not in sys.path:
+        sys.path.append(lib_path)
+    import FreeCAD
+    for mod_name in WARM_MODULES:
+        try:
+            importlib.import_module(mod_name)
+        except Exception as exc:
+            # an exception here would make the pool restart the worker
+            # forever, it will fail when the request arrives
+            logger.warning('Module not preloaded: ' + mod_name + ' ' + str(exc))
+
+
+def decode_arg (arg):
+    """ Decodes a JSON argument into the python objects used by the library:
+    FreeCAD.Vector and constants of the library modules, recursively
+
+    Args:
+        arg: value decoded from JSON
+
+    Returns:
+        the argument with the vectors and constants decoded
+    """
+
+    import FreeCAD
+    if isinstance(arg, dict):
+        if '__vec__' in arg:
+            return FreeCAD.Vector(*arg['__vec__'])
+        if '__const__' in arg:
+            mod_name, const_name = arg['__const__'].rsplit('.', 1)
+            if mod_name not in CONST_MODULES:
+                raise ValueError('Module not allowed: ' + mod_name)
+            if const_name.startswith('_'):
+                raise ValueError('Constant not allowed: ' + const_name)
+            const = getattr(importlib.import_module(mod_name), const_name)
+            if callable(const) or inspect.ismodule(const):
+                raise ValueError('Constant not allowed: ' + const_name)
+            return const
+        return dict((key, decode_arg(val)) for key, val in arg.items())
+    if isinstance(arg, list):
+        return [decode_arg(val) for val in arg]
+    return arg
+
+
+def get_build_shp (obj, shape_attr = ''):
+    """ Gets the shape of a component built by the library.
+    Components keep their shape in different attributes
+
+    Args:
+        obj: the component object
+        shape_attr: name of the attribute with the shape or with the
+                    FreeCAD object. If empty: shp, and if not, fco
+
+    Returns:
+        TopoShape of the component
+    """
+
+    if shape_attr:
+        attr = getattr(obj, shape_attr)
+        # it could be a FreeCAD object or a shape
+        return getattr(attr, 'Shape', attr)
+    shp = getattr(obj, 'shp', None)
+    if shp is not None:
+        return shp
+    return obj.fco.Shape
+
+
+def build_job (req):
+    """ Builds a component in a new document and writes the outputs.
+    It is executed in a warm worker
+
+    Args:
+        req: dictionary of the request, see the header of this module
+
+    Returns:
+        dictionary with the result:
+            'ok': True or False
+            'outputs': dictionary of the written files
+            'time': build time in seconds (without the outputs)
+            'error': text of the error, if not ok
+    """
+
+    import FreeCAD
+
+    t0 = time.time()
+    doc = None
+    try:
+        import MeshPart
+        import kparts
+        mod_name = req['module']
+        if mod_name not in BUILD_MODULES:
+            raise ValueError('Module not allowed: ' + mod_name)
+        cls = getattr(importlib.import_module(mod_name), req['cls'])
+        kwargs = decode_arg(req.get('kwargs', {}))
+        doc = FreeCAD.newDocument(req.get('doc_name', 'build'))
+        FreeCAD.setActiveDocument(doc.Name)
+        obj = cls(**kwargs)
+        doc.recompute()
+        t_build = time.time() - t0
+
+        written = {}
+        outputs = req.get('outputs', {})
+        if 'stl' in outputs or 'brep' in outputs:
+            shp = get_build_shp(obj, req.get('shape_attr', ''))
+            if 'stl' in outputs:
+                mesh_shp = MeshPart.meshFromShape(shp,
+                                         LinearDeflection=kparts.LIN_DEFL,
+                                         AngularDeflection=kparts.ANG_DEFL)
+                mesh_shp.write(outputs['stl'])
+                del mesh_shp
+                written['stl'] = outputs['stl']
+            if 'brep' in outputs:
+                shp.exportBrep(outputs['brep'])
+                written['brep'] = outputs['brep']
+        if 'fcstd' in outputs:
+            doc.saveAs(outputs['fcstd'])
+            written['fcstd'] = outputs['fcstd']
+        return {'ok': True, 'outputs': written, 'time': t_build}
+    except Exception:
+        return {'ok': False, 'error': traceback.format_exc()}
+    finally:
+        if doc is not None:
+            FreeCAD.closeDocument(doc.Name)
+
+
+class _BuildHandler (socketserver.StreamRequestHandler):
+    """ Handles a connection: one request line, one answer line """
+
+    def handle (self):
+        line = self.rfile.readline()
+        try:
+            req = json.loads(line.decode('utf-8'))
+        except ValueError:
+            res = {'ok': False, 'error': 'request is not valid JSON'}
+        else:
+            res = self.server.run_job(req)
+        self.wfile.write((json.dumps(res) + '\n').encode('utf-8'))
+
+
+class BuildDaemon (socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+
+    """ Unix socket server that sends the build requests to a pool of warm
+    FreeCAD worker processes. Each connection is handled in a thread, so
+    there can be as many builds at the same time as workers
+
+    Args:
+        sock_path: path of the Unix socket
+        n_workers: number of worker processes. If 0: number of cpus
+        lib_path: path of the library. If empty, the path of this file
+
+    Attributes:
+        pool: multiprocessing.Pool of warm workers
+    """
+
+    daemon_threads = True
+
+    def __init__ (self, sock_path = SOCK_PATH, n_workers = 0, lib_path = ''):
+        if not lib_path:
+            lib_path = os.path.dirname(os.path.abspath(__file__))
+        if n_workers == 0:
+            n_workers = multiprocessing.cpu_count()
+        if os.path.exists(sock_path):
+            os.remove(sock_path)
+        self.sock_path = sock_path
+        self.n_workers = n_workers
+        self.lib_path = lib_path
+        self.pool_lock = threading.Lock()
+        self.pool = self.new_pool()
+        socketserver.UnixStreamServer.__init__(self, sock_path, _BuildHandler)
+        logger.info('build daemon on ' + sock_path + ' with '
+                    + str(n_workers) + ' workers')
+
+    def new_pool (self):
+        """ Creates a pool of warm workers """
+
+        return multiprocessing.Pool(self.n_workers, warm_worker,
+                                    (self.lib_path,))
+
+    def recycle_pool (self, pool):
+        """ Replaces the pool by a new one, if it is still the current pool.
+        The builds of the other threads on the old pool will fail
+
+        Args:
+            pool: the pool that failed
+        """
+
+        with self.pool_lock:
+            if pool is not self.pool:
+                # another thread already replaced it
+                return
+            logger.warning('recycling the pool of workers')
+            self.pool = self.new_pool()
+        pool.terminate()
+        pool.join()
+
+    def run_job (self, req, timeout = None):
+        """ Runs a build request in the pool of workers
+
+        Args:
+            req: dictionary of the request, see build_job
+            timeout: maximum time in seconds, if None: BUILD_TIMEOUT
+
+        Returns:
+            dictionary with the result, see build_job
+        """
+
+        if timeout is None:
+            timeout = BUILD_TIMEOUT
+        pool = self.pool
+        try:
+            return wait_result(pool, pool.apply_async(build_job, (req,)),
+                               timeout)
+        except WorkerDiedError as exc:
+            self.recycle_pool(pool)
+            return {'ok': False, 'error': str(exc)}
+        except multiprocessing.TimeoutError:
+            self.recycle_pool(pool)
+            return {'ok': False,
+                    'error': 'build timeout after ' + str(timeout) + ' s'}
+        except Exception:
+            return {'ok': False, 'error': traceback.format_exc()}
+
+    def server_close (self):
+        socketserver.UnixStreamServer.server_close(self)
+        self.pool.terminate()
+        self.pool.join()
+        if os.path.exists(self.sock_path):
+            os.remove(self.sock_path)
+
+
+def serve (sock_path = SOCK_PATH, n_workers = 0):
+    """ Starts the daemon and serves until it is interrupted
+
+    Args:
+        sock_path: path of the Unix socket
+        n_workers: number of worker processes. If 0: number of cpus
+    """
+
+    daemon = BuildDaemon(sock_path, n_workers)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.server_close()
+
+
+def request (module, cls, kwargs = None, outputs = None,
+             sock_path = SOCK_PATH, **req_opts):
+    """ Sends a build request to the daemon and waits for the answer
+
+    Args:
+        module: name of the module of the library, i.e. 'parts'
+        cls: name of the class (or function) to build, i.e. 'IdlePulleyHolder'
+        kwargs: dictionary of the arguments. FreeCAD.Vector are encoded,
+                constants have to be given as {'__const__': 'kcomp.NAME'}
+        outputs: dictionary of the files to write: 'stl', 'brep', 'fcstd'
+        sock_path: path of the Unix socket
+        req_opts: other options of the request: 'shape_attr', 'doc_name'
+
+    Returns:
+        dictionary with the answer, see build_job
+    """
+
+    req = dict(req_opts)
+    req['module'] = module
+    req['cls'] = cls
+    req['kwargs'] = encode_arg(kwargs or {})
+    req['outputs'] = outputs or {}
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(sock_path)
+        sock.sendall((json.dumps(req) + '\n').encode('utf-8'))
+        answer = sock.makefile('rb').readline()
+    finally:
+        sock.close()
+    return json.loads(answer.decode('utf-8'))
+
+
+def encode_arg (arg):
+    """ Encodes the FreeCAD.Vector of an argument, recursively, to be sent
+    in JSON. The rest of the values are left as they are
+
+    Args:
+        arg: argument to encode
+
+    Returns:
+        the argument ready to be encoded in JSON
+    """
+
+    if isinstance(arg, dict):
+        return dict((key, encode_arg(val)) for key, val in arg.items())
+    if isinstance(arg, (list, tuple)):
+        return [encode_arg(val) for val in arg]
+    if type(arg).__name__ == 'Vector':
+        return {'__vec__': [arg.x, arg.y, arg.z]}
+    return arg
+
+
+if __name__ == '__main__':
+    import argparse
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description='FreeCAD build daemon')
+    parser.add_argument('--socket', default=SOCK_PATH)
+    parser.add_argument('--workers', type=int, default=0)
+    args, _ = parser.parse_known_args()
+    serve(args.socket, args.workers)
+
@@ -20,6 +20,7 @@ import DraftGeomUtils
 import DraftVecUtils
 import math
 #import copy
+import numpy as np
 import Mesh
 import MeshPart
 
@@ -36,15 +37,14 @@ import kcomp
 import kcomp_optic
 import fcfun
 import kparts 
+import patterns
+import holerec
 
 from fcfun import V0, VX, VY, VZ, V0ROT, addBox, addCyl, addCyl_pos, fillet_len
 from fcfun import VXN, VYN, VZN
 from fcfun import addBolt, addBoltNut_hole, NutHole
 
 
-logging.basicConfig(level=logging.DEBUG,
-                    format='%(%(levelname)s - %(message)s')
-
 logger = logging.getLogger(__name__)
 
 # ---------------------- CageCube -------------------------------
@@ -78,6 +78,7 @@ class CageCube (object):
     THRU_RODS = kcomp_optic.THRU_RODS
     THRU_HOLE = kcomp_optic.THRU_HOLE  
 
+    @holerec.log_holes
     def __init__ (self, side_l,
                         thru_hole_d,
                         thru_thread_d,
@@ -181,6 +182,12 @@ class CageCube (object):
                                                   xtr_bot=0,
                                                   pos = fc_coord)
                 holes.append (shp_rodtap)
+                holerec.record(holerec.hole_recs(
+                               fc_coord + DraftVecUtils.scale(vnormal,
+                                                              rod_thread_l),
+                               vnormal.negative(),
+                               d = rod_thread_d, depth = rod_thread_l,
+                               kind = 'tap'))
 
 
 
@@ -208,6 +215,11 @@ class CageCube (object):
                                                   xtr_bot=0,
                                                   pos = fc_coord)
                     holes.append (shp_tap)
+                    holerec.record(holerec.hole_recs(
+                                   fc_coord + DraftVecUtils.scale(vnormal,
+                                                                  tap_l),
+                                   vnormal.negative(),
+                                   d = tap_d, depth = tap_l, kind = 'tap'))
   
        
 
@@ -319,8 +331,7 @@ def f_cagecube (d_cagecube,
         tol = 0
         tol_plus = 0
 
-    print ('tol: ' + str(tol))
-    print ('tol_plus: ' + str(tol_plus))
+    logger.debug('tol: %s, tol_plus: %s', tol, tol_plus)
 
     cage = CageCube(side_l = d_cagecube['L'],
                 thru_hole_d = d_cagecube['thru_hole_d'] + tol,
@@ -906,42 +917,37 @@ def plate_thruhole_hole8 (side_l,
                                       xtr_top=1., xtr_bot=1., 
                                       pos=pos_center)
 
-    # symetrical holes
+    # symetrical holes: the hole is made once at V0 and then translated
+    # to the 4 positions of the pattern
     holes = []
-    for add_l in (DraftVecUtils.scaleTo(axis_l,  sym_hole_sep/2),
-                  DraftVecUtils.scaleTo(axis_l, - sym_hole_sep/2)) :
-        for add_s in (DraftVecUtils.scaleTo(axis_s,  sym_hole_sep/2),
-                      DraftVecUtils.scaleTo(axis_s, - sym_hole_sep/2)) :
-            pos_hole = pos_center + add_l + add_s
-            shp_hole = fcfun.shp_cylcenxtr(r=sym_hole_d/2., h=thick,
-                                      normal=axis_h,
-                                      ch = 0,
-                                      xtr_top=1., xtr_bot=1., 
-                                      pos=pos_hole)
-            holes.append(shp_hole)
+    sym_pts = patterns.pts_to_global(patterns.pts_sym4(sym_hole_sep),
+                                     pos_center, axis_l, axis_s)
+    shp_hole = fcfun.shp_cylcenxtr(r=sym_hole_d/2., h=thick,
+                                   normal=axis_h,
+                                   ch = 0,
+                                   xtr_top=1., xtr_bot=1., 
+                                   pos=V0)
+    holes.append(patterns.shp_pattern(shp_hole, sym_pts))
 
     # asymetrical hole
-    for add_l in (DraftVecUtils.scaleTo(axis_l,  cbore_hole_sep_l/2),
-                  DraftVecUtils.scaleTo(axis_l, - cbore_hole_sep_l/2)) :
-        for add_s in (DraftVecUtils.scaleTo(axis_s,  cbore_hole_sep_s/2),
-                      DraftVecUtils.scaleTo(axis_s, - cbore_hole_sep_s/2)) :
-            pos_hole = pos_center + add_l + add_s
-            shp_hole = fcfun.shp_cylcenxtr(r=cbore_hole_d/2., h=thick,
-                                      normal=axis_h,
-                                      ch = 0,
-                                      xtr_top=1., xtr_bot=1., 
-                                      pos=pos_hole)
-            pos_head = (  pos_hole
-                      + DraftVecUtils.scaleTo(axis_h, thick-cbore_hole_head_l))
-            shp_hole_head = fcfun.shp_cylcenxtr(r=cbore_hole_head_d/2.,
-                                      h=cbore_hole_head_l,
-                                      normal=axis_h,
-                                      ch = 0,
-                                      xtr_top=1., xtr_bot=0, 
-                                      pos=pos_head)
-            shp_cbore_hole = shp_hole.fuse(shp_hole_head)
-
-            holes.append(shp_cbore_hole)
+    cbore_pts = patterns.pts_to_global(
+                             patterns.pts_sym4(cbore_hole_sep_l,
+                                               cbore_hole_sep_s),
+                             pos_center, axis_l, axis_s)
+    shp_hole = fcfun.shp_cylcenxtr(r=cbore_hole_d/2., h=thick,
+                                   normal=axis_h,
+                                   ch = 0,
+                                   xtr_top=1., xtr_bot=1., 
+                                   pos=V0)
+    pos_head = DraftVecUtils.scaleTo(axis_h, thick-cbore_hole_head_l)
+    shp_hole_head = fcfun.shp_cylcenxtr(r=cbore_hole_head_d/2.,
+                                        h=cbore_hole_head_l,
+                                        normal=axis_h,
+                                        ch = 0,
+                                        xtr_top=1., xtr_bot=0, 
+                                        pos=pos_head)
+    shp_cbore_hole = shp_hole.fuse(shp_hole_head)
+    holes.append(patterns.shp_pattern(shp_cbore_hole, cbore_pts))
 
 
     shp_holes = shp_cenhole.multiFuse(holes)
@@ -1169,6 +1175,7 @@ class PlateThruholeMhole (object):
     """
 
 
+    @holerec.log_holes
     def __init__(self,
                  side_l, 
                  thick,
@@ -1299,6 +1306,9 @@ class PlateThruholeMhole (object):
                                           xtr_top=1., xtr_bot=1., 
                                           pos=botcen_pos)
             holes.append(shp_cenhole)
+            holerec.record(holerec.hole_recs(botcen_pos, axis_h,
+                                             d = thruhole_d, depth = thick,
+                                             kind = 'thru'))
 
         # mounting hole
         if mhole_d > 0:
@@ -1308,45 +1318,50 @@ class PlateThruholeMhole (object):
                                           xtr_top=0, xtr_bot=1., 
                                           pos=mount_pos)
             holes.append(shp_mhole)
+            holerec.record(holerec.hole_recs(mount_pos, axis_m,
+                                             d = mhole_d, depth = mhole_l,
+                                             kind = 'tap'))
 
 
-        # symetrical holes
+        # symetrical holes: made once at V0 and translated to the pattern
         if sym_hole_d > 0:
-            for add_m in (DraftVecUtils.scaleTo(axis_m,  sym_hole_sep/2),
-                      DraftVecUtils.scaleTo(axis_m, - sym_hole_sep/2)) :
-                for add_p in (DraftVecUtils.scaleTo(axis_p,  sym_hole_sep/2),
-                          DraftVecUtils.scaleTo(axis_p, - sym_hole_sep/2)) :
-                    pos_hole = botcen_pos + add_m + add_p
-                    shp_hole = fcfun.shp_cylcenxtr(r=sym_hole_d/2., h=thick,
-                                          normal=axis_h,
-                                          ch = 0,
-                                          xtr_top=1., xtr_bot=1., 
-                                          pos=pos_hole)
-                    holes.append(shp_hole)
+            sym_pts = patterns.pts_to_global(patterns.pts_sym4(sym_hole_sep),
+                                             botcen_pos, axis_m, axis_p)
+            shp_hole = fcfun.shp_cylcenxtr(r=sym_hole_d/2., h=thick,
+                                           normal=axis_h,
+                                           ch = 0,
+                                           xtr_top=1., xtr_bot=1., 
+                                           pos=V0)
+            holes.append(patterns.shp_pattern(shp_hole, sym_pts))
+            holerec.record(holerec.hole_recs(sym_pts, axis_h,
+                                             d = sym_hole_d, depth = thick,
+                                             kind = 'thru'))
 
         # asymetrical holes
         if cbore_hole_d > 0:
-            for add_l in (DraftVecUtils.scaleTo(axis_l,  cbore_hole_sep_l/2),
-                          DraftVecUtils.scaleTo(axis_l, - cbore_hole_sep_l/2)) :
-                for add_s in (DraftVecUtils.scaleTo(axis_s, cbore_hole_sep_s/2),
-                          DraftVecUtils.scaleTo(axis_s, - cbore_hole_sep_s/2)) :
-                    pos_hole = botcen_pos + add_l + add_s
-                    shp_hole = fcfun.shp_cylcenxtr(r=cbore_hole_d/2., h=thick,
-                                              normal=axis_h,
-                                              ch = 0,
-                                              xtr_top=1., xtr_bot=1., 
-                                              pos=pos_hole)
-                    pos_head = (  pos_hole
-                       + DraftVecUtils.scaleTo(axis_h, thick-cbore_hole_head_l))
-                    shp_hole_head = fcfun.shp_cylcenxtr(r=cbore_hole_head_d/2.,
-                                              h=cbore_hole_head_l,
-                                              normal=axis_h,
-                                              ch = 0,
-                                              xtr_top=1., xtr_bot=0, 
-                                              pos=pos_head)
-                    shp_cbore_hole = shp_hole.fuse(shp_hole_head)
-
-                    holes.append(shp_cbore_hole)
+            cbore_pts = patterns.pts_to_global(
+                                     patterns.pts_sym4(cbore_hole_sep_l,
+                                                       cbore_hole_sep_s),
+                                     botcen_pos, axis_l, axis_s)
+            shp_hole = fcfun.shp_cylcenxtr(r=cbore_hole_d/2., h=thick,
+                                           normal=axis_h,
+                                           ch = 0,
+                                           xtr_top=1., xtr_bot=1., 
+                                           pos=V0)
+            pos_head = DraftVecUtils.scaleTo(axis_h, thick-cbore_hole_head_l)
+            shp_hole_head = fcfun.shp_cylcenxtr(r=cbore_hole_head_d/2.,
+                                                h=cbore_hole_head_l,
+                                                normal=axis_h,
+                                                ch = 0,
+                                                xtr_top=1., xtr_bot=0, 
+                                                pos=pos_head)
+            shp_cbore_hole = shp_hole.fuse(shp_hole_head)
+            holes.append(patterns.shp_pattern(shp_cbore_hole, cbore_pts))
+            holerec.record(holerec.hole_recs(
+                              cbore_pts + np.array(tuple(h_top - h_0)),
+                              axis_h.negative(),
+                              d = cbore_hole_d, depth = thick,
+                              kind = 'cbore'))
 
 
         shp_holes = fcfun.fuseshplist(holes)
@@ -1509,6 +1524,7 @@ class Lcpb1mBase (object):
 
     """
 
+    @holerec.log_holes
     def __init__(self,
                  w_tot, d_tot, h_tot, h_slot, slot_dist,
                  d_mount,
@@ -1632,19 +1648,20 @@ class Lcpb1mBase (object):
         shp_base = shp_base.removeSplitter()
 
         holes = []
-        # slot holes are in w=2
-        for pos_wi in [fc_1_2_w, fc_1_2_w.negative()]:
-            slot_pos = w1_d2_h1_pos + pos_wi
-            # longer length, it doesnt matter
-            shp_slot_hole = fcfun.shp_stadium_dir(length = d_tot,
-                                                radius = slot_d/2. + kcomp.TOL,
-                                                height = h_slot,
-                                                fc_axis_h = axis_h,
-                                                fc_axis_l = axis_d,
-                                                ref_l = 2, ref_h=2,
-                                                xtr_h = 1, xtr_nh = 1,
-                                                pos = slot_pos)
-            holes.append(shp_slot_hole)
+        # slot holes are in w=2, made once and translated to both sides
+        slot_pts = patterns.pts_to_global(
+                                     patterns.pts_grid(2, 1, slot_dist, cen=1),
+                                     w1_d2_h1_pos, axis_w, axis_d)
+        # longer length, it doesnt matter
+        shp_slot_hole = fcfun.shp_stadium_dir(length = d_tot,
+                                              radius = slot_d/2. + kcomp.TOL,
+                                              height = h_slot,
+                                              fc_axis_h = axis_h,
+                                              fc_axis_l = axis_d,
+                                              ref_l = 2, ref_h=2,
+                                              xtr_h = 1, xtr_nh = 1,
+                                              pos = V0)
+        holes.append(patterns.shp_pattern(shp_slot_hole, slot_pts))
 
         shp_lmbolt_hole = fcfun.shp_bolt_dir(r_shank = lmbolt_shank_r_tol,
                                   l_bolt = h_sup,
@@ -1659,18 +1676,17 @@ class Lcpb1mBase (object):
                                   pos = w1_d2_h1_pos)
         holes.append(shp_lmbolt_hole)
 
-        fc_1_to_smholes = DraftVecUtils.scale(axis_w, s_mholes_dist/2.)
-        for pos_wi in [fc_1_to_smholes.negative(), fc_1_to_smholes]:
-            mshole_pos = w1_d2_h1_pos + pos_wi
-            # longer length, it doesnt matter
-            shp_smhole = fcfun.shp_cylcenxtr(
-                                                r = s_mholes_d/2.,
-                                                h = h_sup,
-                                                normal = axis_h,
-                                                ch = 0,
-                                                xtr_top = 1, xtr_bot = 1,
-                                                pos = mshole_pos)
-            holes.append(shp_smhole)
+        smhole_pts = patterns.pts_to_global(
+                                 patterns.pts_grid(2, 1, s_mholes_dist, cen=1),
+                                 w1_d2_h1_pos, axis_w, axis_d)
+        # longer length, it doesnt matter
+        shp_smhole = fcfun.shp_cylcenxtr(r = s_mholes_d/2.,
+                                         h = h_sup,
+                                         normal = axis_h,
+                                         ch = 0,
+                                         xtr_top = 1, xtr_bot = 1,
+                                         pos = V0)
+        holes.append(patterns.shp_pattern(shp_smhole, smhole_pts))
 
         shp_holes = fcfun.fuseshplist(holes)
         shp_base = shp_base.cut(shp_holes)
@@ -1974,7 +1990,7 @@ class ThLed30 (object):
                         + DraftVecUtils.scaleTo(n_axis,
                                d_led['ext_l'] - heatsinks_totl + heatsink_w))
         pos_heatsink_add =  DraftVecUtils.scaleTo(n_axis, 2* heatsink_w)
-        for i in xrange(4): #0, 1, 2, 3
+        for i in range(4): #0, 1, 2, 3
             shp_heatsink = fcfun.shp_cyl(
                               r = d_led['ext_d']/2.,
                               h = heatsink_w,
@@ -2232,7 +2248,44 @@ class PrizLed (object):
 
 class BreadBoard (object):
 
+    """ Optical breadboard, with a grid of tapped holes and counterbored holes
+    at the corners (and at the center, if central_cbore == 1)
+
+    Each kind of hole is made once and copied to all its positions, then
+    all the holes are cut in one operation
+
+    Args:
+        length: length of the board, along axis_l (axis_w x axis_h)
+        width: width of the board, along fc_dir_w
+        thick: thickness of the board
+        hole_d: diameter of the tapped holes
+        hole_sep: separation between the tapped holes
+        hole_sep_edge: separation from the first tapped hole to the edge
+        cbored_hole_d: diameter of the shank of the counterbored holes
+        cbored_hole_sep: separation of the counterbored holes to the edges
+        cbored_head_d: diameter of the head of the counterbored holes
+        cbored_head_l: length of the head of the counterbored holes
+        central_cbore: 1: there is a counterbored hole at the center
+        cl, cw, ch: 1: centered along axis_l, fc_dir_w, fc_dir_h
+        fc_dir_h: FreeCAD.Vector of the direction of the thickness
+        fc_dir_w: FreeCAD.Vector of the direction of the width
+        pos: FreeCAD.Vector of the position
+        name: name of the FreeCAD object
+        tap_holes: 1: the tapped holes are cut
+                   0: the tapped holes are not cut, and only their positions
+                      are kept in tap_pts. For large boards
+
+    Attributes:
+        shp: shape of the breadboard
+        fco: FreeCAD object of the breadboard
+        cbore_pts: NumPy array (n,3) of the positions of the counterbored
+                   holes, at the bottom of the board
+        tap_pts: NumPy array (n,3) of the positions of the tapped holes,
+                 at the bottom of the board
+        n_tap: number of tapped holes
+    """
 
+    @holerec.log_holes
     def __init__ (self, length,
                         width,
                         thick,
@@ -2250,7 +2303,8 @@ class BreadBoard (object):
                         fc_dir_h = VZ,
                         fc_dir_w = VY,
                         pos = V0,
-                        name = 'breadboard'):
+                        name = 'breadboard',
+                        tap_holes = 1):
 
         doc = FreeCAD.ActiveDocument
 
@@ -2284,117 +2338,69 @@ class BreadBoard (object):
         pos_corner = pos + l_0 + w_0 + h_0
 
 
-        #Counterbored holes
-        pos_1cbored = (  pos_corner 
-                       + DraftVecUtils.scaleTo(axis_l, cbored_hole_sep)
-                       + DraftVecUtils.scaleTo(axis_w, cbored_hole_sep))
-        pos_2cbored = (  pos_corner
-                       + DraftVecUtils.scaleTo(axis_l, length - cbored_hole_sep)
-                       + DraftVecUtils.scaleTo(axis_w, cbored_hole_sep))
-        pos_3cbored = (  pos_corner
-                       + DraftVecUtils.scaleTo(axis_l, length - cbored_hole_sep)
-                       + DraftVecUtils.scaleTo(axis_w, width - cbored_hole_sep))
-        pos_4cbored = (  pos_corner
-                       + DraftVecUtils.scaleTo(axis_l, cbored_hole_sep)
-                       + DraftVecUtils.scaleTo(axis_w, width - cbored_hole_sep))
+        # Counterbored holes, on the corners at cbored_hole_sep from the edges
+        # local coordinates from the corner, along axis_l and axis_w
+        cbore_lpts = (  patterns.pts_grid(2, 2,
+                                          length - 2 * cbored_hole_sep,
+                                          width - 2 * cbored_hole_sep)
+                      + cbored_hole_sep)
+        if central_cbore == 1:
+            cbore_lpts = np.vstack((cbore_lpts, [[length/2., width/2.]]))
+        cbore_pts = patterns.pts_to_global(cbore_lpts, pos_corner,
+                                           axis_l, axis_w)
 
+        # the counterbored hole is made once at V0
         extra_headcbore = DraftVecUtils.scaleTo(axis_h, thick-cbored_head_l)
-
-        cbshank1 = fcfun.shp_cylcenxtr(r=cbored_hole_d/2., h=thick,
+        cbshank = fcfun.shp_cylcenxtr(r=cbored_hole_d/2., h=thick,
                                       normal=fc_dir_h,
                                       ch = 0,
                                       xtr_top=1., xtr_bot=1., 
-                                      pos=pos_1cbored)
-        cbholehead1 = fcfun.shp_cylcenxtr(r=cbored_head_d/2.,
+                                      pos=V0)
+        cbholehead = fcfun.shp_cylcenxtr(r=cbored_head_d/2.,
                                       h=cbored_head_l,
                                       normal=fc_dir_h,
                                       ch = 0,
                                       xtr_top=1., xtr_bot=0., 
-                                      pos=pos_1cbored +extra_headcbore)
-        cbore1 = cbshank1.fuse(cbholehead1)
-
-        cbshank2 = fcfun.shp_cylcenxtr(r=cbored_hole_d/2., h=thick,
+                                      pos=extra_headcbore)
+        cbore = cbshank.fuse(cbholehead)
+        cboresholes = patterns.shp_pattern(cbore, cbore_pts)
+
+        # tapped holes
+        # if 50/25 -> 2 holes, will make on 12,5 and 37,5
+        tap_lpts = (  patterns.pts_grid(int(length)//int(hole_sep),
+                                        int(width)//int(hole_sep),
+                                        hole_sep)
+                    + hole_sep_edge)
+        tap_pts = patterns.pts_to_global(tap_lpts, pos_corner, axis_l, axis_w)
+        taphole = fcfun.shp_cylcenxtr(r=hole_d/2., h=thick,
                                       normal=fc_dir_h,
                                       ch = 0,
                                       xtr_top=1., xtr_bot=1., 
-                                      pos=pos_2cbored)
-        cbholehead2 = fcfun.shp_cylcenxtr(r=cbored_head_d/2.,
-                                      h=cbored_head_l,
-                                      normal=fc_dir_h,
-                                      ch = 0,
-                                      xtr_top=1., xtr_bot=0., 
-                                      pos=pos_2cbored +extra_headcbore)
-        cbore2 = cbshank2.fuse(cbholehead2)
-
-        cbshank3 = fcfun.shp_cylcenxtr(r=cbored_hole_d/2., h=thick,
-                                      normal=fc_dir_h,
-                                      ch = 0,
-                                      xtr_top=1., xtr_bot=1., 
-                                      pos=pos_3cbored)
-        cbholehead3 = fcfun.shp_cylcenxtr(r=cbored_head_d/2.,
-                                      h=cbored_head_l,
-                                      normal=fc_dir_h,
-                                      ch = 0,
-                                      xtr_top=1., xtr_bot=0., 
-                                      pos=pos_3cbored +extra_headcbore)
-        cbore3 = cbshank3.fuse(cbholehead3)
-
-        cbshank4 = fcfun.shp_cylcenxtr(r=cbored_hole_d/2., h=thick,
-                                      normal=fc_dir_h,
-                                      ch = 0,
-                                      xtr_top=1., xtr_bot=1., 
-                                      pos=pos_4cbored)
-        cbholehead4 = fcfun.shp_cylcenxtr(r=cbored_head_d/2.,
-                                      h=cbored_head_l,
-                                      normal=fc_dir_h,
-                                      ch = 0,
-                                      xtr_top=1., xtr_bot=0., 
-                                      pos=pos_4cbored +extra_headcbore)
-        cbore4 = cbshank4.fuse(cbholehead4)
-
-        cboreholes_list = [cbore2, cbore3, cbore4]
-        if central_cbore == 1:
-            poscentral = (  pos_corner
-                          + DraftVecUtils.scaleTo(axis_l, length/2.)
-                          + DraftVecUtils.scaleTo(axis_w, width/2.))
-            cbshankcentral = fcfun.shp_cylcenxtr(r=cbored_hole_d/2., h=thick,
-                                      normal=fc_dir_h,
-                                      ch = 0,
-                                      xtr_top=1., xtr_bot=1., 
-                                      pos=poscentral)
-            cbholeheadcentral = fcfun.shp_cylcenxtr(r=cbored_head_d/2.,
-                                      h=cbored_head_l,
-                                      normal=fc_dir_h,
-                                      ch = 0,
-                                      xtr_top=1., xtr_bot=0., 
-                                      pos=poscentral +extra_headcbore)
-            cbholecentral = cbshankcentral.fuse(cbholeheadcentral)
-            cboreholes_list.append(cbholecentral)
-
-        cboresholes = cbore1.multiFuse(cboreholes_list)
-
-        pos_1st_tap = (   pos_corner
-                        + DraftVecUtils.scaleTo(axis_l, hole_sep_edge)
-                        + DraftVecUtils.scaleTo(axis_w, hole_sep_edge)
-                      )
-
-        tapholes = []
-        for li in range (int(length)//int(hole_sep)):
-            for wi in range (int(width)//int(hole_sep)):
-                # if 50/25 -> range 0,1, will make on 12,5 and 37,5
-                pos_tap = (   pos_1st_tap
-                           +  DraftVecUtils.scaleTo(axis_l, li * hole_sep)
-                           +  DraftVecUtils.scaleTo(axis_w, wi * hole_sep))
-                hole = fcfun.shp_cylcenxtr(r=hole_d/2., h=thick,
-                                           normal=fc_dir_h,
-                                           ch = 0,
-                                           xtr_top=1., xtr_bot=1., 
-                                           pos=pos_tap)
-                tapholes.append(hole)
-
-        allholes = cboresholes.multiFuse(tapholes)
+                                      pos=V0)
+
+        # the tapped holes are kept as metadata, even if they are not cut
+        self.cbore_pts = cbore_pts
+        self.tap_pts = tap_pts
+        self.n_tap = len(tap_pts)
+        # hole records, from the top of the board
+        top_add = np.array(tuple(DraftVecUtils.scaleTo(axis_h, thick)))
+        holerec.record(holerec.hole_recs(cbore_pts + top_add,
+                                         axis_h.negative(),
+                                         d = cbored_hole_d, depth = thick,
+                                         kind = 'cbore'))
+        holerec.record(holerec.hole_recs(tap_pts + top_add,
+                                         axis_h.negative(),
+                                         d = hole_d, depth = thick,
+                                         kind = 'tap'))
+
+        # all the holes are in one compound and cut once, no fusion needed
+        # since the holes dont intersect
+        holes_list = [cboresholes]
+        if tap_holes == 1:
+            holes_list.append(patterns.shp_pattern(taphole, tap_pts))
+        allholes = Part.makeCompound(holes_list)
         shp_breadboard = shp_box.cut(allholes)
-        doc.recompute()
+        self.shp = shp_breadboard
         fco_breadboard = doc.addObject("Part::Feature", name )
         fco_breadboard.Shape = shp_breadboard
         self.fco = fco_breadboard
@@ -2413,7 +2419,8 @@ def f_breadboard (d_breadboard,
                   fc_dir_h = VZ,
                   fc_dir_w = VY,
                   pos = V0,
-                  name = 'breadboard'
+                  name = 'breadboard',
+                  tap_holes = 1
                    ):
 
 
@@ -2435,6 +2442,7 @@ def f_breadboard (d_breadboard,
                         cbored_head_d  = d_breadboard['cbore_head_d'],
                         cbored_head_l  = d_breadboard['cbore_head_l'],
                         central_cbore = central_cbore,
+                        tap_holes = tap_holes,
                         cl= cl,
                         cw = cw,
                         ch = ch,
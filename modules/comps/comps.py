@@ -33,15 +33,15 @@ sys.path.append(filepath)
 
 import kcomp # before, it was called mat_cte
 import fcfun
+import patterns
+import holerec
+import fctrace
 
 from fcfun import V0, VX, VY, VZ, V0ROT, addBox, addCyl, addCyl_pos, fillet_len
 from fcfun import VXN, VYN, VZN
 from fcfun import addBolt, addBoltNut_hole, NutHole
 
 
-logging.basicConfig(level=logging.DEBUG,
-                    format='%(%(levelname)s - %(message)s')
-
 logger = logging.getLogger(__name__)
 #
 #        _______       _______________________________  TotH = H
@@ -353,6 +353,7 @@ class Sk_dir (object):
     # tolerances for holes 
     holtol = 1.1
 
+    @holerec.log_holes
     def __init__(self, size,
                  fc_axis_h = VZ,
                  fc_axis_d = VX,
@@ -616,8 +617,8 @@ class MisumiAlu30s6w8 (object):
         FreeCAD.ActiveDocument = doc
         self.Sk = doc.addObject("Sketcher::SketchObject", 'sk_' + name)
         self.Sk.Geometry = orig_alumsk.Geometry
-        print (orig_alumsk.Geometry)
-        print (orig_alumsk.Constraints)
+        logger.debug('%s: %d geometries, %d constraints', name,
+                     len(orig_alumsk.Geometry), len(orig_alumsk.Constraints))
         self.Sk.Constraints = orig_alumsk.Constraints
         self.Sk.ViewObject.Visibility = False
 
@@ -1008,9 +1009,8 @@ class AluProf (object):
                 linecol.append(0.)
             else:
                 linecol.append(col_i - 0.2)
-        print (str(linecol))       
         self.fco.ViewObject.LineColor = tuple(linecol)
-        print(str(color) + ' -  '  + str(self.fco.ViewObject.LineColor))
+        logger.debug('color: %s - line: %s', color, linecol)
 
 
     def linecolor (self, color = (1,1,1)):
@@ -1218,15 +1218,12 @@ class AluProf_dir (object):
         self.fco.ViewObject.ShapeColor = color
         linecol = []
         for col_i in color:
-            print (str(col_i))
             if col_i < 0.2:
                 linecol.append(0.)
             else:
                 linecol.append(col_i - 0.2)
-        print (str(linecol))       
         self.fco.ViewObject.LineColor = tuple(linecol)
-        print(str(color) + ' -  '  + str(self.fco.ViewObject.LineColor))
-        print(str(linecol))
+        logger.debug('color: %s - line: %s', color, linecol)
 
     def linecolor (self, color = (1,1,1)):
         self.fco.ViewObject.LineColor = color
@@ -1344,10 +1341,13 @@ def getaluprof_dir ( aludict, length,
 # normal: direction of the shaft
 # pos   : position of the base of the shaft. Not considering the circle that
 #         usually is on the base of the shaft
+# wfco  : 1: a FreeCAD object is created
+#         0: only the shape is created (shp), no FreeCAD object
 
 # ATTRIBUTES: all the arguments, and:
 # shaft_d: diameter of the motor shaft
-# fco: the FreeCad Object of the motor
+# shp: the shape of the motor
+# fco: the FreeCad Object of the motor, if wfco == 1
 # shp_cont: the container of the motor. To cut other pieces. It is a shape
 #           not a FreeCad Object (fco)
 # fco_cont: Having problems with shapes and fco. So I will do it with fco 
@@ -1373,10 +1373,12 @@ def getaluprof_dir ( aludict, length,
 
 class NemaMotor (object):
 
+    @fctrace.traced('NemaMotor', 'init')
+    @holerec.log_holes
     def __init__ (self, size, length, shaft_l, 
                   circle_r, circle_h, name = "nemamotor", chmf = 1, 
                   rshaft_l=0, bolt_depth = 3, bolt_out = 2, container=1,
-                  normal = VZ, pos = V0):
+                  normal = VZ, pos = V0, wfco = 1):
 
         doc = FreeCAD.ActiveDocument
         self.base_place = (0,0,0)
@@ -1414,7 +1416,6 @@ class NemaMotor (object):
         #rot = DraftGeomUtils.getRotation(VZ,nnormal)
         #print rot
         rot = FreeCAD.Rotation(VZ,nnormal)
-        print rot
         motorwire.Placement.Rotation = rot
         motorwire.Placement.Base = pos
         motorface = Part.Face(motorwire)
@@ -1481,60 +1482,26 @@ class NemaMotor (object):
         shp_contfuselist = []
 #        shp_contfuselist.append(shp_bolts)
 
-        b2hole00_pos = FreeCAD.Vector(-kcomp.NEMA_BOLT_SEP[size]/2,
-                                      -kcomp.NEMA_BOLT_SEP[size]/2,
-                                      -bolt_depth)
-        b2hole01_pos = FreeCAD.Vector(-kcomp.NEMA_BOLT_SEP[size]/2,
-                                       kcomp.NEMA_BOLT_SEP[size]/2,
-                                      -bolt_depth)
-        b2hole10_pos = FreeCAD.Vector( kcomp.NEMA_BOLT_SEP[size]/2,
-                                      -kcomp.NEMA_BOLT_SEP[size]/2,
-                                      -bolt_depth)
-        b2hole11_pos = FreeCAD.Vector( kcomp.NEMA_BOLT_SEP[size]/2,
-                                       kcomp.NEMA_BOLT_SEP[size]/2,
-                                      -bolt_depth)
-
-        b2hole00 = addBolt (
+        # the bolt hole is made once, referenced on the base of the shaft,
+        # and replicated in the 4 positions. Then the 4 holes are placed
+        # at once with the motor placement.
+        # Head up (-z): the head ends at bolt_out, the shank at -bolt_depth
+        shp_b2hole = fcfun.shp_bolt (
             r_shank = nemabolt_d/2. + mtol/2.,
             l_bolt = bolt_out + bolt_depth,
             r_head = kcomp.D912_HEAD_D[nemabolt_d]/2. + mtol/2.,
             l_head = kcomp.D912_HEAD_L[nemabolt_d] + mtol,
-            hex_head = 0, extra =1, support=1, headdown = 0, name ="b2hole00")
-
-        b2hole01 = Draft.clone(b2hole00)
-        b2hole01.Label = "b2hole01"
-        b2hole10 = Draft.clone(b2hole00)
-        b2hole10.Label = "b2hole10"
-        b2hole11 = Draft.clone(b2hole00)
-        b2hole11.Label = "b2hole11"
-
-        b2hole00.ViewObject.Visibility=False
-        b2hole01.ViewObject.Visibility=False
-        b2hole10.ViewObject.Visibility=False
-        b2hole11.ViewObject.Visibility=False
-
-        b2hole00.Placement.Base = b2hole00_pos
-        b2hole01.Placement.Base = b2hole01_pos
-        b2hole10.Placement.Base = b2hole10_pos
-        b2hole11.Placement.Base = b2hole11_pos
-
-        # it doesnt work if dont recompute here! probably the clones
-        doc.recompute()
-
-        b2holes_list = [b2hole00, b2hole01, b2hole10, b2hole11]
-        # not an efficient way, either use shapes or fco, but not both
-        shp_b2holes = b2hole00.Shape.multiFuse([b2hole01.Shape,
-                                                b2hole10.Shape,
-                                                b2hole11.Shape])
-        #Part.show(shp_b2holes)
-
-        b2holes = doc.addObject("Part::MultiFuse", "b2holes")
-        b2holes.Shapes = b2holes_list
-        b2holes.ViewObject.Visibility=False
-
-        shp_b2holes.Placement.Base = pos
-        shp_b2holes.Placement.Rotation = rot
+            hex_head = 0, xtr_head = 1, xtr_shank = 1, support = 1,
+            axis = '-z',
+            pos = FreeCAD.Vector(0, 0, bolt_out))
+        b2holes_pts = patterns.pts_to_global(
+                              patterns.pts_sym4(kcomp.NEMA_BOLT_SEP[size]))
+        shp_b2holes = patterns.shp_pattern(shp_b2hole, b2holes_pts)
+        shp_b2holes.Placement = FreeCAD.Placement(pos, rot)
         shp_contfuselist.append(shp_b2holes)
+        # the holes of the bolts are not recorded here, they are recorded by
+        # the part that cuts them (i.e. parts.NemaMotorHolder), so they are
+        # not twice in the logs of an assembly
 
 
         # Circle on the base of the shaft
@@ -1592,30 +1559,25 @@ class NemaMotor (object):
             shp_contmotor = shp_contmotor_box.multiFuse(shp_contfuselist)
         else:
             shp_contmotor = shp_motor # we put the same shape
-        
-
-        doc.recompute()
 
-        #fco_motor = doc.addObject("Part::Cut", name)
-        #fco_motor.Base = fmotor
-        #fco_motor.Tool = b2holes
-        fco_motor = doc.addObject("Part::Feature", name)
-        fco_motor.Shape = shp_motor
-
-        self.fco = fco_motor
+        self.shp = shp_motor
         self.shp_cont = shp_contmotor
-        #Part.show(shp_contmotor)
-
-
-        doc.recompute()
+        self.wfco = wfco
+        if wfco == 1:
+            # a single FreeCAD object, no recompute is needed
+            fco_motor = doc.addObject("Part::Feature", name)
+            fco_motor.Shape = shp_motor
+            self.fco = fco_motor
 
 
    # Move the motor and its container
     def BasePlace (self, position = (0,0,0)):
         self.base_place = position
-        self.fco.Placement.Base = FreeCAD.Vector(position)
-        #self.shp_cont.Placement.Base = FreeCAD.Vector(position)
-        self.fco_cont.Placement.Base = FreeCAD.Vector(position)
+        # only the FreeCAD objects that have been created (none if wfco == 0)
+        for fco in (getattr(self, 'fco', None),
+                    getattr(self, 'fco_cont', None)):
+            if fco is not None:
+                fco.Placement.Base = FreeCAD.Vector(position)
 
 #doc =FreeCAD.newDocument()
 
@@ -2755,7 +2717,7 @@ def f_linguide (rail_l, dlg, axis_l, axis_b, boltend_sep = 0,
                 bl_pos = 0.,
                 name ='linguide'):
 
-    print axis_l
+    logger.debug('%s', axis_l)
 
     d_rail = dlg['rail']
     if boltend_sep == 0:
@@ -0,0 +1,428 @@
+# ----------------------------------------------------------------------------
+# -- 2D drawings
+# -- comps library
+# -- Exports plates to DXF and SVG from a section and the hole records
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# The plates that are laser cut or milled (Plate3CageCubes, Lb2cPlate,
+# BreadBoard, ...) need a 2D drawing. Instead of projecting them in the GUI,
+# the drawing is made from:
+#   - the section of the plate by a plane perpendicular to its thickness,
+#     at half of the thickness: the outline and the cutouts. The circles of
+#     the section that are recorded holes are drawn from the records
+#   - the hole records of the component (see holerec.py), the holes that
+#     go along the thickness are drawn as circles, in a layer for each kind.
+#     The holes for the head or the nut of a bolt (cbore, hexhead, nut)
+#     have also the circle of the head or nut (see HOLE_OUT_D)
+#
+# The drawing is a list of Entity2d, and it is written to DXF (R12, ASCII)
+# or SVG without any other library:
+#
+#    ents = drawing2d.plate_entities(plate, fc_axis_h = VX)
+#    drawing2d.write_dxf(ents, 'plate.dxf')
+#    drawing2d.write_svg(ents, 'plate.svg')
+#
+# or for many plates at once:  export_plates
+
+import os
+import math
+import logging
+import collections
+
+import FreeCAD
+import Part
+import DraftVecUtils
+import numpy as np
+
+import fcfun
+import kcomp
+import holerec
+
+from fcfun import V0, VZ
+
+logger = logging.getLogger(__name__)
+
+# Entities of the drawing, in 2D coordinates of the plane (mm):
+# kind: 'line':   data = (x1, y1, x2, y2)
+#       'circle': data = (xc, yc, r)
+#       'arc':    data = (xc, yc, r, ang_start, ang_end), degrees,
+#                 counterclockwise from ang_start to ang_end
+#       'poly':   data = ((x1, y1), (x2, y2), ...), open polyline
+# layer: name of the layer: 'OUTLINE' or 'HOLE_' + kind of the hole
+Entity2d = collections.namedtuple('Entity2d', ['kind', 'layer', 'data'])
+
+LAYER_OUTLINE = 'OUTLINE'
+
+# deflection to discretize the edges that are not lines nor circles
+POLY_DEFL = 0.05
+
+# tolerance to take a circle of the section as a recorded hole: same
+# center and radius
+HOLE_TOL = 0.01
+
+# diameters of the heads and nuts of the holes of each kind, by metric.
+# They are drawn as other circles of the hole, with kcomp.TOL
+# (the hexagonal heads as the nuts: their circumdiameter)
+HOLE_OUT_D = {'cbore': (kcomp.D912_HEAD_D,),
+              'hexhead': (kcomp.NUT_D934_D,),
+              'nut': (kcomp.D912_HEAD_D, kcomp.NUT_D934_D)}
+
+# colors of the layers (DXF color index, SVG color)
+LAYER_COLORS = {LAYER_OUTLINE: (7, '#000000'),
+                'HOLE_thru': (1, '#ff0000'),
+                'HOLE_bolt': (4, '#00c0c0'),
+                'HOLE_cbore': (5, '#0000ff'),
+                'HOLE_hexhead': (5, '#0000ff'),
+                'HOLE_nut': (6, '#ff00ff'),
+                'HOLE_tap': (3, '#00a000')}
+
+
+class Plane2d (object):
+    """ Plane where the drawing is made, and its 2D coordinates
+
+    Args:
+        fc_axis_h: FreeCAD.Vector normal to the plane (the thickness)
+        fc_axis_1: FreeCAD.Vector of the X axis of the drawing, perpendicular
+                   to fc_axis_h. If None, any perpendicular
+        pos: FreeCAD.Vector of the origin of the drawing
+
+    Attributes:
+        axis_h, axis_1, axis_2: normalized axes. axis_2 = axis_h x axis_1
+        pos: origin
+    """
+
+    def __init__ (self, fc_axis_h = VZ, fc_axis_1 = None, pos = V0):
+        self.axis_h = DraftVecUtils.scaleTo(fc_axis_h, 1)
+        if fc_axis_1 is None or not fcfun.fc_isperp(self.axis_h, fc_axis_1):
+            fc_axis_1 = fcfun.get_fc_perpend1(self.axis_h)
+        self.axis_1 = DraftVecUtils.scaleTo(fc_axis_1, 1)
+        self.axis_2 = self.axis_h.cross(self.axis_1)
+        self.pos = pos
+
+    def to2d (self, pts):
+        """ 2D coordinates of points
+
+        Args:
+            pts: FreeCAD.Vector or NumPy array (n,3)
+
+        Returns:
+            tuple (x, y) if a vector, NumPy array (n,2) if an array
+        """
+
+        if isinstance(pts, FreeCAD.Vector):
+            rel = pts - self.pos
+            return (rel.dot(self.axis_1), rel.dot(self.axis_2))
+        axes = np.array([tuple(self.axis_1), tuple(self.axis_2)])
+        return np.dot(np.asarray(pts) - np.array(tuple(self.pos)), axes.T)
+
+
+def edge_entity (edge, plane, layer = LAYER_OUTLINE):
+    """ Converts an edge of the section into a 2D entity
+
+    Args:
+        edge: Part.Edge, on the plane
+        plane: Plane2d
+        layer: name of the layer
+
+    Returns:
+        Entity2d
+    """
+
+    curve = edge.Curve
+    first = edge.FirstParameter
+    last = edge.LastParameter
+    if isinstance(curve, (Part.Line, Part.LineSegment)):
+        x1, y1 = plane.to2d(edge.valueAt(first))
+        x2, y2 = plane.to2d(edge.valueAt(last))
+        return Entity2d('line', layer, (x1, y1, x2, y2))
+    if isinstance(curve, Part.Circle):
+        xc, yc = plane.to2d(curve.Center)
+        if edge.isClosed():
+            return Entity2d('circle', layer, (xc, yc, curve.Radius))
+        # the angles are taken in 2D, so the direction of the circle axis
+        # doesnt matter: from the middle point we know the way
+        angs = []
+        for param in (first, (first + last) / 2., last):
+            x_i, y_i = plane.to2d(edge.valueAt(param))
+            angs.append(math.degrees(math.atan2(y_i - yc, x_i - xc)) % 360.)
+        ang_s, ang_m, ang_e = angs
+        if (ang_m - ang_s) % 360. <= (ang_e - ang_s) % 360.:
+            return Entity2d('arc', layer, (xc, yc, curve.Radius, ang_s, ang_e))
+        return Entity2d('arc', layer, (xc, yc, curve.Radius, ang_e, ang_s))
+    pts = [plane.to2d(vec) for vec in edge.discretize(Deflection = POLY_DEFL)]
+    return Entity2d('poly', layer, tuple(pts))
+
+
+def section_wires (shp, plane, h_pos = None):
+    """ Section of a shape by a plane perpendicular to plane.axis_h
+
+    Args:
+        shp: shape of the plate
+        plane: Plane2d
+        h_pos: distance along axis_h (from the global origin) of the section
+               If None, at the middle of the shape
+
+    Returns:
+        list of wires of the section
+    """
+
+    if h_pos is None:
+        h_vals = [vtx.Point.dot(plane.axis_h) for vtx in shp.Vertexes]
+        h_pos = (min(h_vals) + max(h_vals)) / 2.
+    return shp.slice(plane.axis_h, h_pos)
+
+
+def hole_entities (holes, plane):
+    """ Circles of the holes that go along the thickness of the plate.
+    The holes of kinds in HOLE_OUT_D have also the circles of the head
+    or the nut, if their metric is in kcomp
+
+    Args:
+        holes: NumPy array of hole records (holerec.HOLE_DTYPE)
+        plane: Plane2d
+
+    Returns:
+        list of Entity2d
+    """
+
+    # both directions, the holes can be made from any of the faces
+    cos_tol = math.cos(math.radians(1.))
+    axis_h = np.array(tuple(plane.axis_h))
+    paral = np.abs(np.dot(holes['axis'], axis_h)) >= cos_tol
+    holes = holes[paral]
+    pts = plane.to2d(holes['pos'])
+    ents = []
+    for pt, hole in zip(pts, holes):
+        kind = str(hole['kind'])
+        layer = 'HOLE_' + kind
+        xc, yc = float(pt[0]), float(pt[1])
+        ents.append(Entity2d('circle', layer, (xc, yc, float(hole['d']) / 2.)))
+        for out_d in HOLE_OUT_D.get(kind, ()):
+            diam = out_d.get(float(hole['metric']))
+            if diam is None:
+                logger.debug('no head or nut diameter for M%s', hole['metric'])
+            else:
+                ents.append(Entity2d('circle', layer,
+                                     (xc, yc, (diam + kcomp.TOL) / 2.)))
+    return ents
+
+
+def plate_entities (comp, fc_axis_h = None, fc_axis_1 = None, pos = V0,
+                    h_pos = None):
+    """ Entities of the drawing of a plate
+
+    All the wires of the section are drawn, but the circles that are
+    recorded holes (same center and radius, see HOLE_TOL), that are drawn
+    from the records, in the layer of their kind
+
+    Args:
+        comp: component with the shape (shp or fco) and, optionally, the
+              hole records (holes)
+        fc_axis_h: FreeCAD.Vector of the thickness of the plate. If None,
+                   comp.axis_h, and if it doesnt have it: VZ
+        fc_axis_1: FreeCAD.Vector of the X axis of the drawing
+        pos: FreeCAD.Vector of the origin of the drawing
+        h_pos: position of the section along fc_axis_h, see section_wires
+
+    Returns:
+        list of Entity2d
+    """
+
+    import builddaemon
+
+    if fc_axis_h is None:
+        fc_axis_h = getattr(comp, 'axis_h', VZ)
+    plane = Plane2d(fc_axis_h, fc_axis_1, pos)
+    shp = builddaemon.get_build_shp(comp)
+    wires = section_wires(shp, plane, h_pos)
+    holes = holerec.get_holes(comp)
+    hole_ents = hole_entities(holes, plane) if len(holes) > 0 else []
+    hole_circ = np.array([ent.data for ent in hole_ents]).reshape(-1, 3)
+    ents = []
+    for wire in wires:
+        wire_ents = [edge_entity(edge, plane) for edge in wire.Edges]
+        if len(wire_ents) == 1 and wire_ents[0].kind == 'circle':
+            # a recorded hole: it is drawn from the record
+            if (np.abs(hole_circ - np.array(wire_ents[0].data))
+                    <= HOLE_TOL).all(axis = 1).any():
+                continue
+        ents.extend(wire_ents)
+    ents.extend(hole_ents)
+    return ents
+
+
+def entities_bbox (ents):
+    """ Bounding box of the entities
+
+    Returns:
+        tuple (x_min, y_min, x_max, y_max)
+    """
+
+    xs = []
+    ys = []
+    for ent in ents:
+        if ent.kind == 'line':
+            xs.extend((ent.data[0], ent.data[2]))
+            ys.extend((ent.data[1], ent.data[3]))
+        elif ent.kind in ('circle', 'arc'):
+            # for the arcs it is larger than the real box, it doesnt matter
+            xc, yc, rad = ent.data[:3]
+            xs.extend((xc - rad, xc + rad))
+            ys.extend((yc - rad, yc + rad))
+        else:
+            xs.extend(pt[0] for pt in ent.data)
+            ys.extend(pt[1] for pt in ent.data)
+    if not xs:
+        return (0., 0., 0., 0.)
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def write_dxf (ents, path):
+    """ Writes the entities to a DXF file (R12, ASCII)
+
+    Args:
+        ents: list of Entity2d
+        path: path of the file
+    """
+
+    def grp (code, val):
+        if isinstance(val, float):
+            val = '%.6f' % val
+        return '%3d\n%s\n' % (code, val)
+
+    layers = sorted(set(ent.layer for ent in ents))
+    x_min, y_min, x_max, y_max = [float(val) for val in entities_bbox(ents)]
+    out = [grp(0, 'SECTION'), grp(2, 'HEADER'),
+           grp(9, '$ACADVER'), grp(1, 'AC1009'),
+           grp(9, '$EXTMIN'), grp(10, x_min), grp(20, y_min),
+           grp(9, '$EXTMAX'), grp(10, x_max), grp(20, y_max),
+           grp(0, 'ENDSEC'),
+           grp(0, 'SECTION'), grp(2, 'TABLES'),
+           grp(0, 'TABLE'), grp(2, 'LAYER'), grp(70, len(layers))]
+    for layer in layers:
+        out += [grp(0, 'LAYER'), grp(2, layer), grp(70, 0),
+                grp(62, LAYER_COLORS.get(layer, (7, ''))[0]),
+                grp(6, 'CONTINUOUS')]
+    out += [grp(0, 'ENDTAB'), grp(0, 'ENDSEC'),
+            grp(0, 'SECTION'), grp(2, 'ENTITIES')]
+    for ent in ents:
+        data = [float(val) for val in ent.data] if ent.kind != 'poly' else []
+        if ent.kind == 'line':
+            out += [grp(0, 'LINE'), grp(8, ent.layer),
+                    grp(10, data[0]), grp(20, data[1]), grp(30, 0.),
+                    grp(11, data[2]), grp(21, data[3]), grp(31, 0.)]
+        elif ent.kind == 'circle':
+            out += [grp(0, 'CIRCLE'), grp(8, ent.layer),
+                    grp(10, data[0]), grp(20, data[1]), grp(30, 0.),
+                    grp(40, data[2])]
+        elif ent.kind == 'arc':
+            out += [grp(0, 'ARC'), grp(8, ent.layer),
+                    grp(10, data[0]), grp(20, data[1]), grp(30, 0.),
+                    grp(40, data[2]), grp(50, data[3]), grp(51, data[4])]
+        else:
+            out += [grp(0, 'POLYLINE'), grp(8, ent.layer), grp(66, 1),
+                    grp(10, 0.), grp(20, 0.), grp(30, 0.), grp(70, 0)]
+            for x_i, y_i in ent.data:
+                out += [grp(0, 'VERTEX'), grp(8, ent.layer),
+                        grp(10, float(x_i)), grp(20, float(y_i)),
+                        grp(30, 0.)]
+            out += [grp(0, 'SEQEND'), grp(8, ent.layer)]
+    out += [grp(0, 'ENDSEC'), grp(0, 'EOF')]
+    with open(path, 'w') as dxf_file:
+        dxf_file.write(''.join(out))
+
+
+def write_svg (ents, path, margin = 2., stroke_w = 0.2):
+    """ Writes the entities to a SVG file, in mm.
+    The Y axis of SVG goes down, so the drawing is flipped
+
+    Args:
+        ents: list of Entity2d
+        path: path of the file
+        margin: margin around the drawing, in mm
+        stroke_w: width of the lines, in mm
+    """
+
+    x_min, y_min, x_max, y_max = entities_bbox(ents)
+    width = x_max - x_min + 2 * margin
+    height = y_max - y_min + 2 * margin
+    out = ['<?xml version="1.0"?>\n',
+           '<svg width="%.3fmm" height="%.3fmm" viewBox="0 0 %.3f %.3f" '
+           'xmlns="http://www.w3.org/2000/svg" version="1.1">\n'
+           % (width, height, width, height),
+           '<g transform="translate(%.6f,%.6f) scale(1,-1)" fill="none" '
+           'stroke-width="%.3f">\n' % (margin - x_min, margin + y_max,
+                                       stroke_w)]
+    for ent in ents:
+        color = LAYER_COLORS.get(ent.layer, (7, '#000000'))[1]
+        if ent.kind == 'line':
+            out.append('<line x1="%.6f" y1="%.6f" x2="%.6f" y2="%.6f" '
+                       'stroke="%s"/>\n' % (tuple(ent.data) + (color,)))
+        elif ent.kind == 'circle':
+            out.append('<circle cx="%.6f" cy="%.6f" r="%.6f" stroke="%s"/>\n'
+                       % (tuple(ent.data) + (color,)))
+        elif ent.kind == 'arc':
+            xc, yc, rad, ang_s, ang_e = ent.data
+            sweep = (ang_e - ang_s) % 360.
+            x_s = xc + rad * math.cos(math.radians(ang_s))
+            y_s = yc + rad * math.sin(math.radians(ang_s))
+            x_e = xc + rad * math.cos(math.radians(ang_e))
+            y_e = yc + rad * math.sin(math.radians(ang_e))
+            # counterclockwise in the (flipped) drawing: sweep-flag 1
+            out.append('<path d="M %.6f %.6f A %.6f %.6f 0 %d 1 %.6f %.6f" '
+                       'stroke="%s"/>\n'
+                       % (x_s, y_s, rad, rad, int(sweep > 180.), x_e, y_e,
+                          color))
+        else:
+            pts = ' '.join('%.6f,%.6f' % (x_i, y_i) for x_i, y_i in ent.data)
+            out.append('<polyline points="%s" stroke="%s"/>\n' % (pts, color))
+    out.append('</g>\n</svg>\n')
+    with open(path, 'w') as svg_file:
+        svg_file.write(''.join(out))
+
+
+def export_plates (specs, out_dir, formats = ('dxf', 'svg')):
+    """ Builds the plates one by one and writes their drawings.
+    Each plate is built in its own document, that is closed after the
+    drawing is written
+
+    Args:
+        specs: iterable of tuples (name, builder, kwargs, draw_kwargs)
+            name: name of the files (without extension)
+            builder: class of the plate, i.e. parts.Plate3CageCubes
+            kwargs: dictionary with the arguments of the builder
+            draw_kwargs: dictionary with the arguments of plate_entities
+                         (fc_axis_h, fc_axis_1, pos, h_pos), can be empty
+        out_dir: directory of the files
+        formats: 'dxf' and/or 'svg'
+
+    Returns:
+        list of the paths of the written files
+    """
+
+    import assembly
+
+    paths = []
+    for name, builder, kwargs, draw_kwargs in specs:
+        doc, comp = assembly.build_subasm(builder, name, **kwargs)
+        try:
+            ents = plate_entities(comp, **draw_kwargs)
+        finally:
+            FreeCAD.closeDocument(doc.Name)
+        if 'dxf' in formats:
+            path = os.path.join(out_dir, name + '.dxf')
+            write_dxf(ents, path)
+            paths.append(path)
+        if 'svg' in formats:
+            path = os.path.join(out_dir, name + '.svg')
+            write_svg(ents, path)
+            paths.append(path)
+        logger.debug('drawing of ' + name + ': ' + str(len(ents))
+                     + ' entities')
+    return paths
@@ -33,14 +33,16 @@ sys.path.append(filepath + '/../../' + 'comps')
 
 import kcomp   # import material constants and other constants
 import fcfun   # import my functions for freecad. FreeCad Functions
+import fctrace
+import placenode
 import shp_clss
 import kparts
 
 from fcfun import V0, VX, VY, VZ, V0ROT
 from fcfun import VXN, VYN, VZN
+from placenode import batch_place, set_fco_base
 
 
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 
@@ -71,7 +73,7 @@ logger = logging.getLogger(__name__)
 # rough
 
 
-class SinglePart (object):
+class SinglePart (placenode.PlacePart):
     """
     This is a 3D model that only has one part.
     It can be either a part that forms a whole object with other parts, 
@@ -177,22 +179,12 @@ class SinglePart (object):
         """
         if not name:
             name = self.name
-        fco = fcfun.add_fcobj(self.shp, name, self.doc)
+        with fctrace.span(type(self).__name__, 'create_fco'):
+            fco = fcfun.add_fcobj(self.shp, name, self.doc)
         self.fco = fco
 
 
-    # ----- 
-    def place_fcos (self, displacement = V0):
-        """ Place the freecad objects
-        
-        """
-        #if type(place) is tuple:
-        #   place = FreeCAD.Vector(place) # change to FreeCAD.Vector
-        
-        tot_displ = (  self.pos_o_adjust + displacement
-                     + self.rel_place + self.extra_mov)
-        self.tot_displ = tot_displ
-        self.fco.Placement.Base = tot_displ
+    # ----- place_fcos: see placenode.PlacePart
     
     def set_place (self, place = V0):
         """ Sets a new placement for the piece
@@ -205,7 +197,7 @@ class SinglePart (object):
         if type(place) is tuple:
             place = FreeCAD.Vector(place) # change to FreeCAD.Vector
         if type(place) is FreeCAD.Vector:
-            self.fco.Placement.Base = place
+            set_fco_base(self.fco, place)
             self.place = place
 
     # ----- Export to STL method
@@ -277,13 +269,13 @@ class SinglePart (object):
             filename = prefix + '_' + filename
 
         fcad_filename = self.fcad_path + name + '.FCStd'
-        print fcad_filename
+        logger.debug('saving %s', fcad_filename)
         self.doc.saveAs (fcad_filename)
 
 
 # Possible names: Parts     , Pieces,         Elements,
 #                      Group        Ensemble,         Set, 
-class PartsSet (shp_clss.Obj3D):
+class PartsSet (shp_clss.Obj3D, placenode.PlaceSet):
     """
     This is a 3D model that has a set of parts (SinglePart or others)
     
@@ -313,17 +305,14 @@ class PartsSet (shp_clss.Obj3D):
 
         shp_clss.Obj3D.__init__(self, axis_d, axis_w, axis_h)
 
-        self.parts_lst = [] # list of all the parts (SinglePart, ...)
+        # list of all the parts (SinglePart, ...), and the ones that have
+        # changed since the last place_fcos
+        self.init_parts()
         self.abs_place = V0
         self.rel_place = V0
         self.extra_mov = V0
         self.displacement = V0
 
-    def append_part (self, part):
-        """ Appends a new part to the list of parts
-        """
-        self.parts_lst.append(part)
-
     def get_parts (self):
         """ get a list of the parts, 
         """
@@ -390,14 +379,16 @@ class PartsSet (shp_clss.Obj3D):
         
         displacement = (self.pos_o - self.pos) + vec_o_to_childpart + self.place
         child_part.place = child_part.place + displacement
-        try:
-            child_part.fco.Placement.Base = child_part.place
-        except AttributeError: # only SimpleParts objects have fco, not PartsSet
-            pass
-        # add this displacement to all the children
-        part_list = child_part.get_parts()
-        for grandchild_i in part_list:
-            child_part.add_part_place(grandchild_i)
+        # the placements of all the children are written together
+        with batch_place():
+            try:
+                set_fco_base(child_part.fco, child_part.place)
+            except AttributeError: # only SimpleParts objects have fco
+                pass
+            # add this displacement to all the children
+            part_list = child_part.get_parts()
+            for grandchild_i in part_list:
+                child_part.mov_place(grandchild_i)
         
     def set_color (self, color = (1.,1.,1.), part_i = 0):
         """ Sets a new color for the whole set of parts or for the selected
@@ -422,25 +413,7 @@ class PartsSet (shp_clss.Obj3D):
         else:
             self.parts_lst[part_i-1].set_color(color)
 
-    # ----- 
-    def place_fcos (self, displacement = V0):
-        """ Place the freecad objects
-        """
-        #if type(place) is tuple:
-        #   place = FreeCAD.Vector(place) # change to FreeCAD.Vector
-        
-        # having pos_o_adjust and rel_place made the sum twice
-        #tot_displ = (  self.pos_o_adjust + displacement 
-        tot_displ = (  displacement 
-                     + self.rel_place + self.extra_mov)
-        self.tot_displ = tot_displ
-        #if this set has been grouped, we dont have to go to its children
-        try:
-            self.fco.Placement.Base = tot_displ
-        except AttributeError:
-            # Not grouped: set the new position for every freecad object
-            for part in self.parts_lst:
-                part.place_fcos(tot_displ)
+    # ----- place_fcos and append_part: see placenode.PlaceSet
 
 
     # ----- Export to STL method
@@ -483,7 +456,7 @@ class PartsSet (shp_clss.Obj3D):
             filename = prefix + '_' + filename
 
         fcad_filename = self.fcad_path + name + '.FCStd'
-        print fcad_filename
+        logger.debug('saving %s', fcad_filename)
         self.doc.saveAs (fcad_filename)
 
     def set_name (self, name = '', default_name = '', change = 0):
@@ -786,14 +759,11 @@ class BearingOutl (SinglePart, shp_clss.ShpCylHole):
         self.set_name (name, default_name, change = 0)
         self.bearing_nb = bearing_nb
 
-        print bearing_nb
-        print default_name
-
         try:
             bear_d = kcomp.BEARING[bearing_nb]
             self.bear_d = bear_d
         except KeyError:
-            logger.error('Bearing key not found: ' + str(bearing_nb))
+            logger.error('Bearing key not found: %s', bearing_nb)
         else: # no exception:
             if tol == 0:
                 tol_r = 0
@@ -961,7 +931,7 @@ class BearWashSet (PartsSet):
             # bear is the dictionary with the dimensions of the bearing
             self.bear_dict = kcomp.BEARING[self.bear_type]
         except KeyError:
-            logger.error('Bearing/washer key not found: ' + str(metric))
+            logger.error('Bearing/washer key not found: %s', metric)
         else:
             # dimensions of each element
             # height, along axis_h
@@ -10,9 +10,13 @@
 # --- LGPL Licence
 # ----------------------------------------------------------------------------
 
+from __future__ import print_function
+
 import FreeCAD
 import Part
+import copy
 import math
+import hashlib
 import logging
 import DraftVecUtils
 
@@ -31,11 +35,12 @@ sys.path.append(filepath)
 
 
 import kcomp
+import holerec
+import fctrace
 
 from kcomp import LAYER3D_H
 
 
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 # vector constants
@@ -107,9 +112,9 @@ def RotateView(axisX=1.0,axisY=0.0,axisZ=0.0,angle=45.0):
         rot.setValue(coin.SbVec3f(axisX,axisY,axisZ),math.radians(angle))
         nrot = cam.orientation.getValue() * rot
         cam.orientation = nrot
-        print axisX," ",axisY," ",axisZ," ",angle
+        print(axisX," ",axisY," ",axisZ," ",angle)
     except Exception:
-        print "Not ActiveView " 
+        print("Not ActiveView ") 
 
 
 
@@ -259,7 +264,356 @@ def add_fcobj(shp, name, doc = None):
     fcobj = doc.addObject("Part::Feature", name)
     fcobj.Shape = shp
     return fcobj
-  
+
+
+# view properties that are kept when a FreeCAD object is flattened, in
+# the order they are set: DiffuseColor (the colors of each face) is the
+# last one, because setting ShapeColor changes it
+FLATTEN_VIEW_PROPS = ('ShapeColor', 'LineColor', 'PointColor',
+                      'Transparency', 'Visibility', 'DiffuseColor')
+
+def flatten_fco (fco):
+    """ Replaces a FreeCAD object that is the result of a tree of features
+    (Part::Box, Part::Cylinder, Part::Fuse, Part::Cut, ...) by a single
+    Part::Feature with its final shape. The intermediate features that are
+    not used by any other object are deleted.
+    The new object has the same name, label and colors, also the colors
+    of each face (DiffuseColor).
+    If the object is used by other objects (i.e. a Draft.clone), it is
+    not flattened, because they would lose their reference
+
+    Args:
+        fco: FreeCAD object to flatten
+
+    Returns:
+        the new FreeCAD object (Part::Feature), or fco if it is not
+        flattened
+    """
+
+    doc = fco.Document
+    if fco.InList or not fco.OutList:
+        # used by other objects, or it has no features to take away
+        return fco
+    doc.recompute()
+    shp = fco.Shape.copy()
+    name = fco.Name
+    label = fco.Label
+    view_props = []
+    if FreeCAD.GuiUp:
+        for prop in FLATTEN_VIEW_PROPS:
+            if hasattr(fco.ViewObject, prop):
+                view_props.append((prop, getattr(fco.ViewObject, prop)))
+
+    # the features to delete: the object and the features below it that
+    # are only used by objects that are going to be deleted
+    del_list = [fco]
+    del_names = set([name])
+    changed = True
+    while changed:
+        changed = False
+        for obj in list(del_list):
+            for child in obj.OutList:
+                if (child.Name not in del_names and
+                    all(user.Name in del_names for user in child.InList)):
+                    del_list.append(child)
+                    del_names.add(child.Name)
+                    changed = True
+    # the users are removed before the features they use
+    for obj in del_list:
+        doc.removeObject(obj.Name)
+
+    # the name is free again
+    new_fco = add_fcobj(shp, name, doc)
+    new_fco.Label = label
+    for prop, val in view_props:
+        setattr(new_fco.ViewObject, prop, val)
+    logger.debug('flattened %s: %d features deleted', name, len(del_list))
+    return new_fco
+
+
+def flatten_doc (doc = None):
+    """ Flattens all the root objects of a document (the objects not used
+    by other objects), see flatten_fco. It can be done once the model is
+    built, saved or not: the session will take less memory, and if it is
+    saved, it will be faster to load
+
+    Args:
+        doc: the document, if None, the active document
+
+    Returns:
+        list of the new root objects
+    """
+
+    if doc is None:
+        doc = FreeCAD.ActiveDocument
+    doc.recompute()
+    # the names, because the objects are deleted while flattening
+    root_names = [obj.Name for obj in doc.RootObjects]
+    new_roots = []
+    for name in root_names:
+        fco = doc.getObject(name)
+        if fco is not None and fco.isDerivedFrom('Part::Feature'):
+            new_roots.append(flatten_fco(fco))
+    doc.recompute()
+    return new_roots
+
+
+# relative tolerance of the volume, area and moments of inertia of the
+# fingerprints, and absolute tolerance of the bounding box (mm)
+FP_REL_TOL = 1e-6
+FP_LEN_TOL = 1e-4
+
+
+def _fp_round_rel (val, rel_tol = FP_REL_TOL):
+    """ Rounds a value to the significant digits of a relative tolerance """
+
+    if val == 0:
+        return 0.
+    n_dig = int(round(-math.log10(rel_tol)))
+    return float('%.*e' % (n_dig - 1, val))
+
+
+def shp_fingerprint_vals (shp, rel_tol = FP_REL_TOL, len_tol = FP_LEN_TOL):
+    """ Values of the fingerprint of a shape, rounded to the tolerances:
+    number of solids, faces, edges and vertexes, volume, area, bounding box
+    and the principal moments of inertia of its solids (sorted).
+    They depend on the placement of the shape
+
+    Args:
+        shp: TopoShape
+        rel_tol: relative tolerance of the volume, area and moments
+        len_tol: tolerance of the bounding box
+
+    Returns:
+        tuple of the values
+    """
+
+    topo = (len(shp.Solids), len(shp.Faces), len(shp.Edges),
+            len(shp.Vertexes))
+    moments = []
+    for sol in shp.Solids:
+        moments.extend(sol.PrincipalProperties['Moments'])
+    bb = shp.BoundBox
+    bbox = tuple(round(val / len_tol) * len_tol
+                 for val in (bb.XMin, bb.YMin, bb.ZMin,
+                             bb.XMax, bb.YMax, bb.ZMax))
+    return (topo
+            + (_fp_round_rel(shp.Volume, rel_tol),
+               _fp_round_rel(shp.Area, rel_tol))
+            + tuple(round(val, 6) + 0. for val in bbox)
+            + tuple(_fp_round_rel(val, rel_tol) for val in sorted(moments)))
+
+
+def shp_fingerprint (shp, rel_tol = FP_REL_TOL, len_tol = FP_LEN_TOL):
+    """ Fingerprint of a shape: hash of its rounded geometric properties
+    (see shp_fingerprint_vals). Two shapes with the same geometry and
+    placement have the same fingerprint, even if they were built in a
+    different way. To compare shapes, use it instead of exporting them
+
+    Args:
+        shp: TopoShape
+        rel_tol: relative tolerance of the volume, area and moments
+        len_tol: tolerance of the bounding box
+
+    Returns:
+        string with the hexadecimal hash
+    """
+
+    vals = shp_fingerprint_vals(shp, rel_tol, len_tol)
+    return hashlib.sha1(repr(vals).encode('utf-8')).hexdigest()
+
+
+def comp_fingerprint (comp):
+    """ Fingerprint of the shape of a component. It is computed once and
+    kept in the attribute fingerprint of the component, and the shape it
+    was computed from in fingerprint_shp, with a copy of its placement in
+    fingerprint_plm, so it is computed again only if the shape changes or
+    it is moved (the placement of the shape can be changed in place, and
+    then the shape kept is also moved)
+
+    Args:
+        comp: component object (with shp or fco)
+
+    Returns:
+        string with the hexadecimal hash
+    """
+
+    shp = getattr(comp, 'shp', None)
+    if shp is None:
+        shp = comp.fco.Shape
+    fp_shp = getattr(comp, 'fingerprint_shp', None)
+    fp_plm = getattr(comp, 'fingerprint_plm', None)
+    if (fp_shp is not None and fp_shp.isSame(shp)
+            and fp_plm is not None
+            and fp_plm.Base == shp.Placement.Base
+            and fp_plm.Rotation.Q == shp.Placement.Rotation.Q):
+        return comp.fingerprint
+    comp.fingerprint = shp_fingerprint(shp)
+    comp.fingerprint_shp = shp
+    comp.fingerprint_plm = FreeCAD.Placement(shp.Placement)
+    return comp.fingerprint
+
+
+def mirror_vec (fc_vec, fc_normal, base = V0, is_dir = 0):
+    """ Mirrors a vector by a plane
+
+    Args:
+        fc_vec: FreeCAD.Vector to mirror
+        fc_normal: FreeCAD.Vector normal to the plane
+        base: FreeCAD.Vector of a point of the plane
+        is_dir: 1: the vector is a direction, the base is not used
+                0: the vector is a position
+
+    Returns:
+        FreeCAD.Vector mirrored
+    """
+
+    nnormal = DraftVecUtils.scaleTo(fc_normal, 1)
+    if is_dir == 1:
+        vec = fc_vec
+    else:
+        vec = fc_vec - base
+    vec_mirr = vec - DraftVecUtils.scale(nnormal, 2. * vec.dot(nnormal))
+    if is_dir == 1:
+        return vec_mirr
+    return vec_mirr + base
+
+
+def mirror_plm (plm, fc_normal, base = V0):
+    """ Mirrors a placement by a plane. A mirror cannot be a placement,
+    so it is the placement that places the mirrored local shape where the
+    mirror of the placed shape is: mirror * placement * mirror
+
+    Args:
+        plm: FreeCAD.Placement to mirror
+        fc_normal: FreeCAD.Vector normal to the mirror plane
+        base: FreeCAD.Vector of a point of the mirror plane
+
+    Returns:
+        FreeCAD.Placement mirrored
+    """
+
+    nx, ny, nz = tuple(DraftVecUtils.scaleTo(fc_normal, 1))
+    # mirror: I - 2 n n^T, and the translation 2 (n . base) n
+    dist2 = 2. * (nx * base.x + ny * base.y + nz * base.z)
+    mtx_mirr = FreeCAD.Matrix(1 - 2*nx*nx,    -2*nx*ny,    -2*nx*nz, dist2*nx,
+                                 -2*ny*nx, 1 - 2*ny*ny,    -2*ny*nz, dist2*ny,
+                                 -2*nz*nx,    -2*nz*ny, 1 - 2*nz*nz, dist2*nz,
+                                        0,           0,           0,        1)
+    mtx = mtx_mirr.multiply(plm.toMatrix()).multiply(mtx_mirr)
+    return FreeCAD.Placement(mtx)
+
+
+def _mirror_attr (val, fc_normal, base, is_dir):
+    """ Mirrored copy of the value of an attribute of a component: vectors
+    and placements are mirrored, and the lists, tuples, dictionaries and
+    arrays are copied with their values mirrored, so they are not shared
+    with the original component. See mirror_comp """
+
+    if isinstance(val, FreeCAD.Vector):
+        return mirror_vec(val, fc_normal, base, is_dir = is_dir)
+    if isinstance(val, FreeCAD.Placement):
+        return mirror_plm(val, fc_normal, base)
+    if isinstance(val, (list, tuple)):
+        return type(val)(_mirror_attr(elem, fc_normal, base, is_dir)
+                         for elem in val)
+    if isinstance(val, dict):
+        return dict((key, _mirror_attr(elem, fc_normal, base, is_dir))
+                    for key, elem in val.items())
+    if hasattr(val, 'copy') and type(val).__module__ == 'numpy':
+        return val.copy()
+    return val
+
+
+# attributes that mirror_comp makes again, they are not copied
+MIRROR_SKIP = ('shp', 'fco', 'holes', 'name',
+               'fingerprint', 'fingerprint_shp', 'fingerprint_plm')
+
+
+def mirror_comp (comp, fc_normal, base = V0, name = '', pos_attrs = ()):
+    """ Makes the mirrored variant of a component that has already been
+    built, mirroring its shape, instead of building it again.
+    The attributes that are FreeCAD.Vector are mirrored: the ones in
+    pos_attrs as positions, and the rest as directions (axis). The
+    placements are mirrored (see mirror_plm), and the lists, tuples and
+    dictionaries are copied with their vectors and placements mirrored.
+    The hole records are mirrored too (see holerec.holes_mirrored), and
+    recorded in the open logs, as the holes of a component that is built.
+    Other attributes, such as dimensions, are the same
+
+    Args:
+        comp: component object with the shape in the attribute shp, and
+              if wfco == 1, the FreeCAD object in fco
+        fc_normal: FreeCAD.Vector normal to the mirror plane
+        base: FreeCAD.Vector of a point of the mirror plane
+        name: name of the mirrored component (and its FreeCAD object).
+              If empty, the name of the component with the suffix _mirr
+        pos_attrs: names of the attributes that are positions (points).
+              Their vectors (also inside lists and dictionaries) are
+              mirrored as points, the vectors of the other attributes as
+              directions
+
+    Returns:
+        the mirrored component, of the same class
+    """
+
+    comp_mirr = copy.copy(comp)
+    for attr, val in vars(comp).items():
+        if attr not in MIRROR_SKIP:
+            setattr(comp_mirr, attr,
+                    _mirror_attr(val, fc_normal, base,
+                                 is_dir = 0 if attr in pos_attrs else 1))
+    comp_mirr.shp = comp.shp.mirror(base, fc_normal)
+    if getattr(comp, 'holes', None) is not None:
+        comp_mirr.holes = holerec.holes_mirrored(comp.holes, fc_normal, base)
+        holerec.record(comp_mirr.holes)
+    # the fingerprint is of the other shape
+    comp_mirr.__dict__.pop('fingerprint', None)
+    comp_mirr.__dict__.pop('fingerprint_shp', None)
+    comp_mirr.__dict__.pop('fingerprint_plm', None)
+    if not name:
+        name = getattr(comp, 'name', 'comp') + '_mirr'
+    comp_mirr.name = name
+    if getattr(comp, 'wfco', 0) == 1:
+        # in the document of the component, that may not be the active one
+        fco = getattr(comp, 'fco', None)
+        if fco is not None:
+            doc = fco.Document
+        else:
+            doc = FreeCAD.ActiveDocument
+        fco_mirr = doc.addObject("Part::Feature", name)
+        fco_mirr.Shape = comp_mirr.shp
+        comp_mirr.fco = fco_mirr
+    else:
+        comp_mirr.__dict__.pop('fco', None)
+    return comp_mirr
+
+
+class MirrorComp (object):
+    """ Mixin for the components that can be mirrored once built, with
+    the method mirrored (see mirror_comp).
+    The attributes of the class that are positions have to be listed in
+    MIRROR_POS_ATTRS, the other vectors are mirrored as directions
+    """
+
+    MIRROR_POS_ATTRS = ()
+
+    def mirrored (self, fc_normal, base = V0, name = ''):
+        """ Mirrored component, made mirroring the shape of this one,
+        see mirror_comp
+
+        Args:
+            fc_normal: FreeCAD.Vector normal to the mirror plane
+            base: FreeCAD.Vector of a point of the mirror plane
+            name: name of the mirrored component
+
+        Returns:
+            the mirrored component, of the same class
+        """
+
+        return mirror_comp(self, fc_normal, base, name,
+                           pos_attrs = self.MIRROR_POS_ATTRS)
+
 
 def addBox(x, y, z, name, cx= False, cy=False):
     # we have to bring the active document
@@ -2578,8 +2932,8 @@ def shp_belt_wire_dir (center_sep, rad1, rad2, fc_axis_l = VX,
     # the angle beta of the tanget is calculate from pythagoras:
     # the length (separation between centers) and dif_rad
     beta = math.atan (dif_rad/center_sep)
-    print ('beta %f', 180*beta/math.pi)
-    print ('beta %f', beta*math.pi/2)
+    print('beta %f' % (180*beta/math.pi))
+    print('beta %f' % (beta*math.pi/2))
     # depending on who is larger rad1 or rad2, the negative angle will be either
     # on top or down of axis_s
 
@@ -2812,7 +3166,7 @@ def shpRndRectWire (x=1, y=1, r= 0.5, zpos = 0):
     #doc = FreeCAD.ActiveDocument
 
     if 2*r >= x or 2*r >= y:
-        print "Radius too large: addRoundRectan"
+        print("Radius too large: addRoundRectan")
         if x > y:
             r = y/2.0 - 0.1 # otherwise there will be a problem
         else:
@@ -3481,6 +3835,78 @@ def shp_cableturn (d, w, thick_d, corner_r,
 
 
 
+# The regular polygons and prisms (mostly the hexagons of the nuts) are
+# made many times with the same dimensions. So the vertexes of the polygons
+# of circumradius 1, and the prisms at the origin are kept in caches, and
+# then they are scaled or placed where they are needed.
+#
+#           Y                            fc_normal (Z)
+#           :                               :
+#       ____:____                       ____:____
+#      /    :    \                     |    :    |
+#     /     :     \                    |    :    |  placed by a matrix
+#    /      :......\..... X           |    :    |  on its axes and pos
+#    \            / 1                  |____:____|
+#     \          /                          :.......... fc_verx1 (X)
+#      \________/
+#
+# decimals of the dimensions in the keys of the caches
+SHP_CACHE_DEC = 6
+
+# vertexes of the polygons of circumradius 1:
+# {(n_sides, x_angle): ((cos, sin), ...)}
+_regpolygon_unit_cache = {}
+# regular prisms at the origin: {(n_sides, radius, length): shape}
+_regprism_cache = {}
+# nut holes of shp_nuthole, on axes VZ (nut) and VX (hole), and nut holes
+# of NutHole: {(arguments): shape}
+_nuthole_cache = {}
+
+
+def clear_shp_cache ():
+    """ Empties the caches of the regular polygons, prisms, nut holes and
+    bolt hole stamps """
+
+    _regpolygon_unit_cache.clear()
+    _regprism_cache.clear()
+    _nuthole_cache.clear()
+    _bolt_stamp_cache.clear()
+
+
+def regpolygon_unit (n_sides, x_angle=0):
+    """
+    calculates the vertexes of a regular polygon of circumradius 1 on
+    plane XY. They are calculated once for each number of sides and angle
+
+    Args:
+        n_sides: number of sides of the polygon
+        x_angle: if zero, the first vertex will be on axis x (y=0)
+                 if x_angle != 0, it will rotated some angle (clockwise)
+
+    Returns:
+        a tuple of tuples (cos, sin) of the vertexes, the first vertex is
+        repeated at the end
+
+    """
+
+    key = (n_sides, x_angle)
+    unit_vertexes = _regpolygon_unit_cache.get(key)
+    if unit_vertexes is None:
+        # It seems that the angle was wrong, changing the sign
+        angle_0 = - math.radians(x_angle)
+        # divide the 360 degrees by the number of sides
+        polygon_angle = 2*math.pi / n_sides
+        unit_vertexes = []
+        for i in range(n_sides):
+            angle = angle_0 + i * polygon_angle
+            unit_vertexes.append((math.cos(angle), math.sin(angle)))
+        # the first vertex will be also the last one
+        unit_vertexes.append(unit_vertexes[0])
+        unit_vertexes = tuple(unit_vertexes)
+        _regpolygon_unit_cache[key] = unit_vertexes
+    return unit_vertexes
+
+
 def regpolygon_vecl (n_sides, radius, x_angle=0):
 
     """
@@ -3500,21 +3926,8 @@ def regpolygon_vecl (n_sides, radius, x_angle=0):
 
     """
 
-    v = FreeCAD.Vector(radius, 0, 0)
-    if x_angle != 0:
-        # rotate the polygon
-        x_angle_rad = math.radians(x_angle)
-        # uses radians, rotates around Z axis
-        # It seems that the angle of the function is wrong, changing the sign
-        v = DraftVecUtils.rotate2D(v,-x_angle_rad)
-    vec_vertex_list = [v]
-    # divide the 360 degrees by the number of sides
-    polygon_angle = 2*math.pi / n_sides
-    for i in xrange(n_sides):
-        v = DraftVecUtils.rotate2D(v,polygon_angle)
-        # the first vertex will be also the last one
-        vec_vertex_list.append(v)
-    return (vec_vertex_list)
+    return [FreeCAD.Vector(radius * cos_i, radius * sin_i, 0)
+            for cos_i, sin_i in regpolygon_unit(n_sides, x_angle)]
 
 
 def regpolygon_dir_vecl (n_sides, radius, fc_normal, fc_verx1, pos):
@@ -3547,21 +3960,91 @@ def regpolygon_dir_vecl (n_sides, radius, fc_normal, fc_verx1, pos):
         logger.error('Vectors are Not perpendicular')
     #direction of the first vertex scaled to the radius
     n1dir_rad = DraftVecUtils.scaleTo(fc_verx1,radius)
+    # the vertexes are n1dir_rad rotated around the normal. Its component
+    # on the normal doesnt rotate (it is zero if they are perpendicular)
+    n1dir_nrm = DraftVecUtils.scale(nnormal, n1dir_rad.dot(nnormal))
+    n1dir_perp = n1dir_rad - n1dir_nrm
+    n2dir_perp = nnormal.cross(n1dir_perp)
+    center = pos + n1dir_nrm
 
-    vertex_list = []
-    # divide the 360 degrees by the number of sides
-    polygon_angle = 2*math.pi / n_sides
-    for i in range(n_sides):
-        rot_angle = i*polygon_angle
-        # Rotate n1dir, and then add to pos
-        vertex = pos + DraftVecUtils.rotate(n1dir_rad,rot_angle,nnormal)
-        vertex_list.append(vertex)
-    # the first vertex will be also the last one
-    vertex_list.append(vertex_list[0])
-        
-    return (vertex_list)
+    return [center + DraftVecUtils.scale(n1dir_perp, cos_i)
+                   + DraftVecUtils.scale(n2dir_perp, sin_i)
+            for cos_i, sin_i in regpolygon_unit(n_sides)]
+
+
+def calc_place_matrix (fc_axis_x = VX, fc_axis_z = VZ, pos = V0):
+    """
+    calculates the matrix that places a shape made at the origin: its
+    axis X on fc_axis_x, its axis Z on fc_axis_z and the origin on pos
+
+    Args:
+        fc_axis_x: FreeCAD.Vector, perpendicular to fc_axis_z
+        fc_axis_z: FreeCAD.Vector
+        pos: FreeCAD.Vector
+
+    Returns:
+        a FreeCAD.Matrix
+
+    """
+
+    axis_x = DraftVecUtils.scaleTo(fc_axis_x, 1)
+    axis_z = DraftVecUtils.scaleTo(fc_axis_z, 1)
+    axis_y = axis_z.cross(axis_x)
+    return FreeCAD.Matrix(axis_x.x, axis_y.x, axis_z.x, pos.x,
+                          axis_x.y, axis_y.y, axis_z.y, pos.y,
+                          axis_x.z, axis_y.z, axis_z.z, pos.z,
+                          0, 0, 0, 1)
+
+
+def shp_transform_copy (shp, fc_mtx):
+    """
+    copy of a shape transformed by a matrix (a placement without scale).
+    The transformation is applied to the geometry of the copy, so its
+    Placement is zero, as if it had been made on its place. So a cached
+    shape can be used where it is needed without changing it
+
+    Args:
+        shp: shape
+        fc_mtx: FreeCAD.Matrix, see calc_place_matrix or Placement.toMatrix
+
+    Returns:
+        a shape (TopoShape)
+
+    """
+
+    shp_copy = shp.copy()
+    shp_copy.transformShape(fc_mtx, True)
+    return shp_copy
+
+
+def shp_regprism_orig (n_sides, radius, length):
+    """
+    makes the shape of a regular prism at the origin, the base on plane XY,
+    extruded on VZ and the first vertex on VX. It is made once for each
+    dimensions and kept in a cache, so it should not be changed. To place
+    it use shp_transform_copy
 
+    Args:
+        n_sides: number of sides of the polygon
+        radius: Circumradius of the polygon
+        length: length of the prism
+
+    Returns:
+        a shape (TopoShape) of the regular prism
+
+    """
 
+    key = (n_sides, round(radius, SHP_CACHE_DEC), round(length, SHP_CACHE_DEC))
+    shp_rprism = _regprism_cache.get(key)
+    if fctrace.enabled:
+        fctrace.count('fcfun', 'regprism_' + ('new' if shp_rprism is None
+                                              else 'hit'))
+    if shp_rprism is None:
+        rpolygon_wire = Part.makePolygon(regpolygon_vecl(n_sides, radius))
+        shp_rprism = Part.Face(rpolygon_wire).extrude(
+                                              FreeCAD.Vector(0, 0, length))
+        _regprism_cache[key] = shp_rprism
+    return shp_rprism
 
 
 def shp_regpolygon_face (n_sides, radius,
@@ -3751,11 +4234,22 @@ def shp_regprism_dirxtr (n_sides, radius, length,
         movcenter = (xtr_top - xtr_bot)/2.
         pos = pos + DraftVecUtils.scaleTo(nnorm,movcenter) 
 
-    shp_rpolygon_face = shp_regpolygon_dir_face (n_sides, radius,
-                                                  nnorm, fc_verx1,
-                                                  pos)
-    shp_rprism = shp_extrud_face(shp_rpolygon_face,
-                                 totlen, nnorm,centered)
+    if not fc_isperp(nnorm, fc_verx1):
+        # cannot be placed by a rotation, made on its place
+        shp_rpolygon_face = shp_regpolygon_dir_face (n_sides, radius,
+                                                      nnorm, fc_verx1,
+                                                      pos)
+        shp_rprism = shp_extrud_face(shp_rpolygon_face,
+                                     totlen, nnorm,centered)
+        return shp_rprism
+
+    if centered == 1:
+        # the base of the prism
+        pos = pos - DraftVecUtils.scale(nnorm, totlen/2.)
+    # the cached prism at the origin is placed
+    shp_rprism = shp_transform_copy(
+                           shp_regprism_orig(n_sides, radius, totlen),
+                           calc_place_matrix(fc_verx1, nnorm, pos))
     return shp_rprism
 
 
@@ -3850,136 +4344,171 @@ def shp_extrud_face_rot (face, vec_facenormal, vec_edgx, length, centered=0,
 
 
 
-def addBolt (r_shank, l_bolt, r_head, l_head,
-             hex_head = 0, extra=1, support=1, headdown = 1, name="bolt"):
-    """ 
-    Creates the hole for the bolt shank and the head or the nut
-    Tolerances have to be included
+# ------------------- bolt hole stamps
+# The holes of the bolts (shank, head or nut and the supports to print
+# them) are made for a few metrics and lengths, but a part may have many of
+# them. Each hole is made once at the origin (a stamp), and then it is
+# copied and placed where it is needed by a matrix (see shp_transform_copy)
+#
+#                VZ                    fc_normal
+#                :                        :
+#               _:_                      _:_
+#              | : |                    |   |
+#              | : |    placed on       |   |
+#            __| : |__  fc_normal,    __|   |__
+#           |    :    | fc_verx1,    |         |
+#           |____:....|.. VX  pos    |_________|.... fc_verx1
+#                                      pos
+#
+# The stamps are kept for the process. If BOLT_STAMP_DIR is set, they are
+# also saved there as BREP files, and read by the following processes
+# instead of making them again. It can be set by the environment variable
+# FCAD_BOLT_STAMP_DIR
+BOLT_STAMP_DIR = os.environ.get('FCAD_BOLT_STAMP_DIR', '')
+# version of the stamps, to be changed if the way they are made changes,
+# so the saved stamps are not read
+BOLT_STAMP_VER = 1
+
+# stamps of the bolt holes: {(function, LAYER3D_H, arguments): shape}
+_bolt_stamp_cache = {}
+
+
+def get_bolt_stamp (make_stamp, *args):
+    """
+    gets the stamp of a bolt hole. It is made once by make_stamp(*args)
+    and kept in a cache. If BOLT_STAMP_DIR is set it is read from there,
+    or saved there once it is made.
+    The stamp should not be changed, to place it use shp_transform_copy
 
     Args:
-        r_shank: Radius of the shank (tolerance included)
-        l_bolt: total length of the bolt: head & shank
-        r_head: radius of the head (tolerance included)
-        l_head: length of the head
-        hex_head: inidicates if the head is hexagonal or rounded
-              1: hexagonal
-              0: rounded
-        h_layer3d: height of the layer for printing, if 0, means that the
-                   support is not needed
-        extra: 1 if you want 1 mm on top and botton to avoid cutting on the same
-               plane pieces after making cuts (boolean difference) 
-        support: 1 if you want to include a triangle between the shank and the
-                 head to support the shank and not building the head on the
-                 air using kcomp.LAYER3D_H
-        headdown: 1 if the head is down. 0 if it is up
+        make_stamp: function that makes the stamp at the origin
+        args: arguments of make_stamp
+
+    Returns:
+        a shape (TopoShape)
+
     """
 
-    # we have to bring the active document
-    doc = FreeCAD.ActiveDocument
+    key = (make_stamp.__name__, kcomp.LAYER3D_H) + tuple(
+                  round(arg, SHP_CACHE_DEC) if isinstance(arg, float) else arg
+                  for arg in args)
+    shp_stamp = _bolt_stamp_cache.get(key)
+    if shp_stamp is not None:
+        if fctrace.enabled:
+            fctrace.count('fcfun', 'bolt_stamp_hit')
+        return shp_stamp
+
+    stamp_path = ''
+    if BOLT_STAMP_DIR:
+        key_hash = hashlib.sha1(repr((BOLT_STAMP_VER,) + key).encode('utf-8'))
+        stamp_path = os.path.join(BOLT_STAMP_DIR,
+                                  'bolt_' + key_hash.hexdigest() + '.brep')
+        if os.path.isfile(stamp_path):
+            try:
+                shp_stamp = Part.read(stamp_path)
+            except Exception as err:
+                logger.warning('bolt stamp not read: %s %s', stamp_path, err)
+            else:
+                if fctrace.enabled:
+                    fctrace.count('fcfun', 'bolt_stamp_read')
+    if shp_stamp is None:
+        with fctrace.span('fcfun', 'bolt_stamp',
+                          stamp = make_stamp.__name__):
+            shp_stamp = make_stamp(*args)
+        if stamp_path:
+            save_bolt_stamp(shp_stamp, stamp_path)
+    _bolt_stamp_cache[key] = shp_stamp
+    return shp_stamp
+
+
+def save_bolt_stamp (shp_stamp, stamp_path):
+    """
+    saves a stamp as a BREP file. It is written on a temporary file that is
+    renamed, so other processes dont read it half written
+
+    Args:
+        shp_stamp: shape of the stamp
+        stamp_path: path of the BREP file
+
+    """
+
+    try:
+        stamp_dir = os.path.dirname(stamp_path)
+        if not os.path.isdir(stamp_dir):
+            os.makedirs(stamp_dir)
+        tmp_path = stamp_path + '.' + str(os.getpid())
+        shp_stamp.exportBrep(tmp_path)
+        os.rename(tmp_path, stamp_path)
+    except (IOError, OSError) as err:
+        logger.warning('bolt stamp not saved: %s %s', stamp_path, err)
+
+
+def _stamp_prism (n_sides, radius, length, zpos, rot_z = 0):
+    """ Regular prism on VZ from z = zpos, rotated rot_z degrees around VZ,
+    as a Part::Prism """
+
+    place = FreeCAD.Placement(FreeCAD.Vector(0, 0, zpos),
+                              FreeCAD.Rotation(VZ, rot_z))
+    return shp_transform_copy(shp_regprism_orig(n_sides, radius, length),
+                              place.toMatrix())
+
+
+def _stamp_head (hex_head, r_head, length, zpos):
+    """ Rounded or hexagonal head on VZ from z = zpos """
+
+    if hex_head == 0:
+        return Part.makeCylinder(r_head, length, FreeCAD.Vector(0, 0, zpos))
+    return _stamp_prism(6, r_head, length, zpos)
+
+
+def _stamp_addbolt (r_shank, l_bolt, r_head, l_head,
+                    hex_head, extra, support, headdown):
+    """ Stamp of addBolt, the same shape as its Part::MultiFuse """
+
     elements = []
     # shank
-    shank =  doc.addObject("Part::Cylinder", name + "_shank")
-    shank.Radius = r_shank
-    shank.Height = l_bolt + 2*extra
-    pos = FreeCAD.Vector(0,0,-extra)
-    shank.Placement = FreeCAD.Placement(pos, V0ROT, V0)
-    elements.append (shank)
+    elements.append(Part.makeCylinder(r_shank, l_bolt + 2*extra,
+                                      FreeCAD.Vector(0, 0, -extra)))
     # head:
-    if hex_head == 0:
-        head =  doc.addObject("Part::Cylinder", name + "_head")
-        head.Radius = r_head
-    else:
-        head =  doc.addObject("Part::Prism", name + "_head")
-        head.Polygon = 6
-        head.Circumradius = r_head
-
-    head.Height = l_head + extra
     if headdown == 1:
         zposhead = -extra
     else:
         zposhead = l_bolt - l_head
-    poshead =  FreeCAD.Vector(0,0,zposhead)
-    head.Placement.Base = poshead
-    elements.append (head)
+    elements.append(_stamp_head(hex_head, r_head, l_head + extra, zposhead))
     # support for the shank:
     if support==1 and kcomp.LAYER3D_H > 0:
-        sup1 = doc.addObject("Part::Prism", name + "_sup1")
-        sup1.Polygon = 3
-        sup1.Circumradius = r_shank * 2
         # we could put it just on top of the head, but since we are going to 
         # make an union, we put it from the bottom (no need to include extra)
-        # sup1.Height = kcomp.LAYER3D_H
-        # pos1 = FreeCAD.Vector(0,0,l_head)
-        # rot30z = FreeCAD.Rotation(VZ,30)
-        # sup1.Placement = FreeCAD.Placement(pos1, rot30z, V0)
-        sup1.Height = l_head + kcomp.LAYER3D_H
-        # rotation make only make sense for hexagonal head, but it doesn't
-        # matter for rounded head
-        rot30z = FreeCAD.Rotation(VZ,30)
+        sup1_l = l_head + kcomp.LAYER3D_H
         if headdown == 1:
             zposheadsup1 = 0
         else:
             zposheadsup1 = l_bolt - l_head - kcomp.LAYER3D_H
-        sup1.Placement.Base = FreeCAD.Vector(0,0,zposheadsup1)
-        sup1.Placement.Rotation = rot30z
+        # rotation make only make sense for hexagonal head, but it doesn't
+        # matter for rounded head
+        shp_sup1 = _stamp_prism(3, r_shank * 2, sup1_l, zposheadsup1, 30)
         # take vertex away:
-        if hex_head == 0:
-            sup1away = doc.addObject("Part::Cylinder", name + "_sup1away")
-            sup1away.Radius = r_head
-        else:
-            sup1away = doc.addObject("Part::Prism", name + "_sup1away")
-            sup1away.Polygon = 6
-            sup1away.Circumradius = r_head
-        # again, we take all the height
-        sup1away.Height =  l_head + kcomp.LAYER3D_H
-        sup1away.Placement.Base = sup1.Placement.Base
-        sup1cut = doc.addObject("Part::Common", "sup1cut")
-        sup1cut.Base = sup1
-        sup1cut.Tool = sup1away
-        elements.append (sup1cut)
+        shp_sup1away = _stamp_head(hex_head, r_head, sup1_l, zposheadsup1)
+        elements.append(shp_sup1.common(shp_sup1away))
         # another support
         # 1.15 is the relationship between the Radius and the Apothem
         # of the hexagon: sqrt(3)/2 . I make it slightly smaller
-        sup2 = doc.addObject("Part::Prism", name + "_sup2")
-        sup2.Polygon = 6
-        sup2.Circumradius = r_shank * 1.15
-        sup2.Height = l_head + 2* kcomp.LAYER3D_H
         if headdown == 1:
             zposheadsup2 = 0
         else:
             zposheadsup2 = l_bolt - l_head - 2* kcomp.LAYER3D_H
-        sup2.Placement.Base = FreeCAD.Vector(0,0,zposheadsup2)
-        elements.append (sup2)
-  
+        elements.append(_stamp_prism(6, r_shank * 1.15,
+                                     l_head + 2* kcomp.LAYER3D_H,
+                                     zposheadsup2))
     # union of elements
-    bolt =  doc.addObject("Part::MultiFuse", name)
-    bolt.Shapes = elements
-    return bolt
-"""
-    bolt =  doc.addObject("Part::Fuse", name)
-    bolt.Base = shank
-    bolt.Tool = head
-"""
-
-
+    return elements[0].multiFuse(elements[1:])
 
 
-
-def shp_bolt (r_shank, l_bolt, r_head, l_head,
-              hex_head = 0,
-              xtr_head=1,
-              xtr_shank=1,
-              support=1,
-              axis = 'z',
-              hex_ref = 'x',
-              hex_rot_angle = 0,
-              pos = V0):
+def addBolt (r_shank, l_bolt, r_head, l_head,
+             hex_head = 0, extra=1, support=1, headdown = 1, name="bolt"):
     """ 
-    Similar to addBolt, but creates a shape instead of a FreeCAD Object
-    Creates a shape of the bolt shank and head or the nut
-    Tolerances have to be included if you want it for making a hole
-
-    It is referenced at the end of the head
+    Creates the hole for the bolt shank and the head or the nut
+    Tolerances have to be included
 
     Args:
         r_shank: Radius of the shank (tolerance included)
@@ -3991,53 +4520,47 @@ def shp_bolt (r_shank, l_bolt, r_head, l_head,
               0: rounded
         h_layer3d: height of the layer for printing, if 0, means that the
                    support is not needed
-        xtr_head: 1 if you want 1 mm on the head to avoid cutting on the same
+        extra: 1 if you want 1 mm on top and botton to avoid cutting on the same
                plane pieces after making cuts (boolean difference) 
-        xtr_shank: 1 if you want 1 mm at the opposite side of the head to
-               avoid cutting on the same plane pieces after making cuts
-               (boolean difference) 
         support: 1 if you want to include a triangle between the shank and the
                  head to support the shank and not building the head on the
                  air using kcomp.LAYER3D_H
-        axis: 'x', '-x', 'y', '-y', 'z', '-z': defines the orientation
-           for example:
-           axis = '-z':              Z
-                                     :
-                         ....... ____:____
-             xtr_head=1  .......|    :....|...... X
-                                |         |
-                                |__     __|
-                                   |   |
-                                   |   |
-                                   |   |
-                                   |___|
+        headdown: 1 if the head is down. 0 if it is up
+    """
 
-           axis = 'z':               Z
-                                     :
-                                     :
-                                    _:_
-                                   | : |
-                                   | : |
-                                   | : |
-                                 __| : |__
-                                |    :    |
-             xtr_head=1  .......|    :....|...... X
-                         .......|____:____|
+    # we have to bring the active document
+    doc = FreeCAD.ActiveDocument
+    shp_bolt = get_bolt_stamp(_stamp_addbolt, r_shank, l_bolt, r_head, l_head,
+                              hex_head, extra, support, headdown)
+    bolt = doc.addObject("Part::Feature", name)
+    bolt.Shape = shp_bolt.copy()
+    return bolt
 
-        hex_ref: In case of a hexagonal head, this will indicate the
-                 axis that the first vertex of the nut will point
-                 hex_ref has to be perpendicular to axis, if not, it will be
-                 changed
-        hex_rot_angle: Angle in degrees. In case of a hexagonal head, it will
-           indicate the angle of rotation of the hexagon referenced to hex_ref.
-
-        pos: FreeCAD.Vector of the position of the center of the head of the
-              bolt
 
+def shp_addbolt (r_shank, l_bolt, r_head, l_head,
+                 hex_head = 0, extra=1, support=1, headdown = 1):
+    """
+    Similar to addBolt, but creates a shape instead of a FreeCAD Object.
+    It is a copy of the stamp of addBolt. See addBolt for the arguments
 
+    Returns:
+        a shape (TopoShape)
 
     """
 
+    return get_bolt_stamp(_stamp_addbolt, r_shank, l_bolt, r_head, l_head,
+                          hex_head, extra, support, headdown).copy()
+
+
+def _stamp_bolt (r_shank, l_bolt, r_head, l_head,
+                 hex_head, xtr_head, xtr_shank, support, hex_rot_angle):
+    """ Stamp of shp_bolt, see get_bolt_stamp """
+
+    # the stamp is made on axis 'z', the first vertex on 'x', at the origin
+    axis = 'z'
+    hex_ref = 'x'
+    pos = V0
+
     elements = []
     v_axis = getfcvecofname(axis)
     # It is built as its orientation is 'z', it will be rotated at the end
@@ -4062,9 +4585,6 @@ def shp_bolt (r_shank, l_bolt, r_head, l_head,
                                    xtr_bot = xtr_head,
                                    pos = pos)
     else:
-        # check if axis and hex_ref are the same vector (wrong)
-        if vecname_paral (axis, hex_ref):
-            hex_ref = get_vecname_perpend(axis)
         shp_head = shp_regprism_xtr (n_sides=6,
                                      radius = r_head,
                                      length = l_head,
@@ -4125,22 +4645,17 @@ def shp_bolt (r_shank, l_bolt, r_head, l_head,
     return shp_bolt
 
 
-
-
-def shp_bolt_dir (r_shank, l_bolt, r_head, l_head,
+def shp_bolt (r_shank, l_bolt, r_head, l_head,
               hex_head = 0,
               xtr_head=1,
               xtr_shank=1,
               support=1,
-              fc_normal = VZ,
-              fc_verx1 = VX,
-              #default value has to be 0 for backward compatibility
-              #because it didnt exist before
-              pos_n = 0,
+              axis = 'z',
+              hex_ref = 'x',
+              hex_rot_angle = 0,
               pos = V0):
     """ 
-    Similar to shp_bolt, but it can be done in any direction
-    Creates a shape, not a of a FreeCAD Object
+    Similar to addBolt, but creates a shape instead of a FreeCAD Object
     Creates a shape of the bolt shank and head or the nut
     Tolerances have to be included if you want it for making a hole
 
@@ -4164,25 +4679,20 @@ def shp_bolt_dir (r_shank, l_bolt, r_head, l_head,
         support: 1 if you want to include a triangle between the shank and the
                  head to support the shank and not building the head on the
                  air using kcomp.LAYER3D_H
-        fc_normal: FreeCAD.Vector: defines the orientation
+        axis: 'x', '-x', 'y', '-y', 'z', '-z': defines the orientation
            for example:
-           fc_normal = (0,0,-1):     Z
+           axis = '-z':              Z
                                      :
                          ....... ____:____
-           ..xtr_head=1  .......|    :....|...... X  pos_n = 0
-           :      l_head+:      |         |
-           :             :......|__     __|          pos_n = 1
-           :+ l_bolt               |   |
-           :                       |   |
-           :.......................|   |.............pos_n = 2
-                                   |___|....xtr_shank
-                                     :
-                                     :
-                                   fc_normal
-
-
+             xtr_head=1  .......|    :....|...... X
+                                |         |
+                                |__     __|
+                                   |   |
+                                   |   |
+                                   |   |
+                                   |___|
 
-           fc_normal = (0,0,1):      Z
+           axis = 'z':               Z
                                      :
                                      :
                                     _:_
@@ -4194,14 +4704,12 @@ def shp_bolt_dir (r_shank, l_bolt, r_head, l_head,
              xtr_head=1  .......|    :....|...... X
                          .......|____:____|
 
-        fc_verx1: In case of a hexagonal head, this will indicate the
+        hex_ref: In case of a hexagonal head, this will indicate the
                  axis that the first vertex of the nut will point
-                 it has to be perpendicular to fc_normal, 
-
-        pos_n: location of pos along the normal, at the cylinder center
-            0: at the top of the head (excluding xtr_head)
-            1: at the union of the head and the shank
-            2: at the end of the shank (excluding xtr_shank)
+                 hex_ref has to be perpendicular to axis, if not, it will be
+                 changed
+        hex_rot_angle: Angle in degrees. In case of a hexagonal head, it will
+           indicate the angle of rotation of the hexagon referenced to hex_ref.
 
         pos: FreeCAD.Vector of the position of the center of the head of the
               bolt
@@ -4210,15 +4718,32 @@ def shp_bolt_dir (r_shank, l_bolt, r_head, l_head,
 
     """
 
-    elements = []
-    nnormal = DraftVecUtils.scaleTo(fc_normal,1)
+    # check if axis and hex_ref are the same vector (wrong)
+    if vecname_paral (axis, hex_ref):
+        hex_ref = get_vecname_perpend(axis)
+    shp_stamp = get_bolt_stamp(_stamp_bolt, r_shank, l_bolt, r_head, l_head,
+                               hex_head, xtr_head, xtr_shank, support,
+                               hex_rot_angle)
+    # rotation from the stamp ('z', 'x') to axis and hex_ref
+    vrot = calc_rot_z(getvecofname(axis), getvecofname(hex_ref)).multiply(
+                 calc_rot_z(getvecofname('z'), getvecofname('x')).inverted())
+    shp_bolt = shp_transform_copy(shp_stamp,
+                                  FreeCAD.Placement(pos, vrot).toMatrix())
+    return shp_bolt
 
-    # vectors to pos_n = 0 (to the end of the head)
-    n0to = {}
-    n0to[0] = V0
-    n0to[1] = DraftVecUtils.scale(nnormal, l_head) # xtr_head not included
-    n0to[2] = DraftVecUtils.scale(nnormal, l_bolt) # xtr_head/shank not included
-    pos0 = pos + (n0to[pos_n]).negative()
+
+
+
+def _stamp_bolt_dir (r_shank, l_bolt, r_head, l_head,
+                     hex_head, xtr_head, xtr_shank, support):
+    """ Stamp of shp_bolt_dir, see get_bolt_stamp """
+
+    # the stamp is made on VZ, the first vertex on VX, the end of the head
+    # at the origin
+    elements = []
+    nnormal = VZ
+    fc_verx1 = VX
+    pos0 = V0
 
     shp_shank = shp_cylcenxtr (r_shank, l_bolt, nnormal,
                                 ch=0,
@@ -4237,16 +4762,7 @@ def shp_bolt_dir (r_shank, l_bolt, r_head, l_head,
                                   xtr_top = 0,
                                   xtr_bot = xtr_head,
                                   pos = pos0)
-        if not fc_isperp(nnormal, fc_verx1):
-            # get any perpendicular vector:
-            fc_verx1 = get_fc_perpend1(nnormal)     
     else:
-        # check if fc_normal and fc_verx1 are perpendicular
-        if not fc_isperp(nnormal, fc_verx1):
-            logger.debug('Vectors are not perpendicular')
-            # get any perpendicular vector:
-            fc_verx1 = get_fc_perpend1(nnormal)
-
         shp_head = shp_regprism_dirxtr (
                                      n_sides=6,
                                      radius = r_head,
@@ -4307,6 +4823,119 @@ def shp_bolt_dir (r_shank, l_bolt, r_head, l_head,
     shp_bolt = shp_bolt.removeSplitter()
     return shp_bolt
 
+
+
+def shp_bolt_dir (r_shank, l_bolt, r_head, l_head,
+              hex_head = 0,
+              xtr_head=1,
+              xtr_shank=1,
+              support=1,
+              fc_normal = VZ,
+              fc_verx1 = VX,
+              #default value has to be 0 for backward compatibility
+              #because it didnt exist before
+              pos_n = 0,
+              pos = V0):
+    """ 
+    Similar to shp_bolt, but it can be done in any direction
+    Creates a shape, not a of a FreeCAD Object
+    Creates a shape of the bolt shank and head or the nut
+    Tolerances have to be included if you want it for making a hole
+
+    It is referenced at the end of the head
+
+    Args:
+        r_shank: Radius of the shank (tolerance included)
+        l_bolt: total length of the bolt: head & shank
+        r_head: radius of the head (tolerance included)
+        l_head: length of the head
+        hex_head: inidicates if the head is hexagonal or rounded
+              1: hexagonal
+              0: rounded
+        h_layer3d: height of the layer for printing, if 0, means that the
+                   support is not needed
+        xtr_head: 1 if you want 1 mm on the head to avoid cutting on the same
+               plane pieces after making cuts (boolean difference) 
+        xtr_shank: 1 if you want 1 mm at the opposite side of the head to
+               avoid cutting on the same plane pieces after making cuts
+               (boolean difference) 
+        support: 1 if you want to include a triangle between the shank and the
+                 head to support the shank and not building the head on the
+                 air using kcomp.LAYER3D_H
+        fc_normal: FreeCAD.Vector: defines the orientation
+           for example:
+           fc_normal = (0,0,-1):     Z
+                                     :
+                         ....... ____:____
+           ..xtr_head=1  .......|    :....|...... X  pos_n = 0
+           :      l_head+:      |         |
+           :             :......|__     __|          pos_n = 1
+           :+ l_bolt               |   |
+           :                       |   |
+           :.......................|   |.............pos_n = 2
+                                   |___|....xtr_shank
+                                     :
+                                     :
+                                   fc_normal
+
+
+
+           fc_normal = (0,0,1):      Z
+                                     :
+                                     :
+                                    _:_
+                                   | : |
+                                   | : |
+                                   | : |
+                                 __| : |__
+                                |    :    |
+             xtr_head=1  .......|    :....|...... X
+                         .......|____:____|
+
+        fc_verx1: In case of a hexagonal head, this will indicate the
+                 axis that the first vertex of the nut will point
+                 it has to be perpendicular to fc_normal, 
+
+        pos_n: location of pos along the normal, at the cylinder center
+            0: at the top of the head (excluding xtr_head)
+            1: at the union of the head and the shank
+            2: at the end of the shank (excluding xtr_shank)
+
+        pos: FreeCAD.Vector of the position of the center of the head of the
+              bolt
+
+
+
+    """
+
+    nnormal = DraftVecUtils.scaleTo(fc_normal,1)
+
+    # vectors to pos_n = 0 (to the end of the head)
+    n0to = {}
+    n0to[0] = V0
+    n0to[1] = DraftVecUtils.scale(nnormal, l_head) # xtr_head not included
+    n0to[2] = DraftVecUtils.scale(nnormal, l_bolt) # xtr_head/shank not included
+    pos0 = pos + (n0to[pos_n]).negative()
+
+    # check if fc_normal and fc_verx1 are perpendicular
+    if not fc_isperp(nnormal, fc_verx1):
+        if hex_head == 1:
+            logger.debug('Vectors are not perpendicular')
+        # get any perpendicular vector:
+        fc_verx1 = get_fc_perpend1(nnormal)
+
+    shp_stamp = get_bolt_stamp(_stamp_bolt_dir, r_shank, l_bolt, r_head,
+                               l_head, hex_head, xtr_head, xtr_shank, support)
+    shp_bolt = shp_transform_copy(shp_stamp,
+                                  calc_place_matrix(fc_verx1, nnormal, pos0))
+    if hex_head == 0:
+        hole_kind = 'cbore'
+    else:
+        hole_kind = 'hexhead'
+    holerec.record(holerec.hole_recs(pos0, nnormal, 2 * r_shank, l_bolt,
+                                     kind = hole_kind))
+    return shp_bolt
+
 #doc = FreeCAD.newDocument()
 #shp = shp_bolt_dir (r_shank = 5, l_bolt=50, r_head=10, l_head=12,
 #                   hex_head = 1,
@@ -4320,6 +4949,41 @@ def shp_bolt_dir (r_shank, l_bolt, r_head, l_head,
 #Part.show(shp)
 
 
+def _stamp_addboltnut (r_shank, l_bolt, r_head, l_head, r_nut, l_nut,
+                       hex_head, extra, supp_head, supp_nut, headdown):
+    """ Stamp of addBoltNut_hole, the same shape as its Part::MultiFuse """
+
+    elements = [get_bolt_stamp(_stamp_addbolt, r_shank, l_bolt, r_head,
+                               l_head, hex_head, extra, supp_head, headdown)]
+    if headdown == 1:
+        zpos_nut = l_bolt - l_nut
+    else:
+        zpos_nut = -extra
+    elements.append(_stamp_prism(6, r_nut, l_nut + extra, zpos_nut))
+    # support for the nut
+    if supp_nut == 1 and kcomp.LAYER3D_H > 0:
+        supnut1_l = l_nut + kcomp.LAYER3D_H
+        if headdown == 1:
+            zpos_supnut1 = l_bolt - l_nut - kcomp.LAYER3D_H
+        else:
+            zpos_supnut1 = 0
+        shp_supnut1 = _stamp_prism(3, r_shank * 2, supnut1_l, zpos_supnut1, 30)
+        # take vertex away:
+        shp_supnut1away = _stamp_prism(6, r_nut, supnut1_l, zpos_supnut1)
+        elements.append(shp_supnut1.common(shp_supnut1away))
+        # the other support
+        # 1.15 is the relationship between the Radius and the Apothem
+        # of the hexagon: sqrt(3)/2 . I make it slightly smaller
+        if headdown == 1:
+            zpos_supnut2 = l_bolt - l_nut - 2*kcomp.LAYER3D_H
+        else:
+            zpos_supnut2 = 0
+        elements.append(_stamp_prism(6, r_shank * 1.15,
+                                     l_nut + 2* kcomp.LAYER3D_H,
+                                     zpos_supnut2))
+    return elements[0].multiFuse(elements[1:])
+
+
 def addBoltNut_hole (r_shank,        l_bolt, 
                      r_head,         l_head,
                      r_nut,          l_nut,
@@ -4354,71 +5018,122 @@ def addBoltNut_hole (r_shank,        l_bolt,
     """
     # we have to bring the active document
     doc = FreeCAD.ActiveDocument
-    elements = []
-    bolt = addBolt  (r_shank  = r_shank,
-                     l_bolt   = l_bolt,
-                     r_head   = r_head,
-                     l_head   = l_head,
-                     hex_head = hex_head,
-                     extra    = extra,
-                     support  = supp_head,
-                     headdown = headdown,
-                     name     = name + "_bolt")
-
-    nut = doc.addObject("Part::Prism", name + "_nut")
-    nut.Polygon = 6
-    nut.Circumradius = r_nut
-    nut.Height = l_nut + extra
-    if headdown == 1:
-        pos = FreeCAD.Vector (0, 0, l_bolt - l_nut)
-    else:
-        pos = FreeCAD.Vector (0, 0, -extra)
-    nut.Placement = FreeCAD.Placement(pos, V0ROT, V0)
-    elements.append (bolt)
-    elements.append (nut)
+    shp_boltnut = get_bolt_stamp(_stamp_addboltnut, r_shank, l_bolt,
+                                 r_head, l_head, r_nut, l_nut, hex_head,
+                                 extra, supp_head, supp_nut, headdown)
+    boltnut = doc.addObject("Part::Feature", "boltnut")
+    boltnut.Shape = shp_boltnut.copy()
+    return boltnut
+      
+
+
+
+def shp_addboltnut_hole (r_shank,        l_bolt, 
+                         r_head,         l_head,
+                         r_nut,          l_nut,
+                         hex_head = 0,   extra=1,
+                         supp_head=1,    supp_nut=1,
+                         headdown=1):
+    """
+    Similar to addBoltNut_hole, but creates a shape instead of a FreeCAD
+    Object. It is a copy of the stamp of addBoltNut_hole. See
+    addBoltNut_hole for the arguments
+
+    Returns:
+        a shape (TopoShape)
+
+    """
+
+    return get_bolt_stamp(_stamp_addboltnut, r_shank, l_bolt, r_head, l_head,
+                          r_nut, l_nut, hex_head, extra, supp_head, supp_nut,
+                          headdown).copy()
+
+
+def _stamp_boltnut_dir (r_shank, l_bolt, r_head, l_head, r_nut, l_nut,
+                        hex_head, xtr_head, xtr_nut, supp_head, supp_nut):
+    """ Stamp of shp_boltnut_dir_hole, see get_bolt_stamp """
+
+    # the stamp is made on VZ, the first vertex on VX, the head at the
+    # origin and the nut at the other end
+    nverx1 = VX
+    pos_head = V0
+    pos_nut = FreeCAD.Vector(0, 0, l_bolt)
+    nnormal_head = VZ
+    nnormal_nut = VZN
+
+    # bolt with the head, the hole is recorded as a whole by
+    # shp_boltnut_dir_hole
+    with holerec.no_log():
+        shp_bolt = shp_bolt_dir  (r_shank  = r_shank,
+                              l_bolt   = l_bolt,
+                              r_head   = r_head,
+                              l_head   = l_head,
+                              hex_head = hex_head,
+                              xtr_head = xtr_head,
+                              xtr_shank = 0, # no need, the nut will go extra
+                              support   = supp_head,
+                              fc_normal = nnormal_head,
+                              fc_verx1  = nverx1,
+                              pos_n     = 0,
+                              pos       = pos_head)
+
+    # Nut:
+    shp_nut = shp_regprism_dirxtr ( 
+                                     n_sides = 6,
+                                     radius  = r_nut,
+                                     length  = l_nut,
+                                     fc_normal = nnormal_nut,
+                                     fc_verx1  = nverx1,
+                                     centered  = 0,
+                                     # no extra on top, the shank will be there
+                                     xtr_top   = 0,
+                                     xtr_bot   = xtr_nut,
+                                     pos       = pos_nut)
+
+    nut_elements = [shp_nut]
     # support for the nut
     if supp_nut == 1 and kcomp.LAYER3D_H > 0:
-        supnut1 = doc.addObject("Part::Prism", name + "_nutsup1")
-        supnut1.Polygon = 3
-        supnut1.Circumradius = r_shank * 2
-        supnut1.Height = l_nut + kcomp.LAYER3D_H
-        if headdown == 1:
-            pos_supnut1 = FreeCAD.Vector (0, 0,
-                                          l_bolt - l_nut - kcomp.LAYER3D_H)
-        else:
-            pos_supnut1 = V0
-        rot30z = FreeCAD.Rotation(VZ,30)
-        supnut1.Placement = FreeCAD.Placement(pos_supnut1, rot30z, V0)
-        # take vertex away:
-        supnut1away = doc.addObject("Part::Prism", name + "_supnut1away")
-        supnut1away.Polygon = 6
-        supnut1away.Circumradius = r_nut
-        supnut1away.Height =  supnut1.Height
-        supnut1away.Placement = FreeCAD.Placement(pos_supnut1, V0ROT, V0)
-        supnut1cut = doc.addObject("Part::Common", "supnut1_cut")
-        supnut1cut.Base = supnut1
-        supnut1cut.Tool = supnut1away
-        elements.append (supnut1cut)
-        # the other support
+        # rotate 30 degrees
+        nverx1_triangle =  DraftVecUtils.rotate(nverx1,
+                                                -math.pi/6., nnormal_nut)
+        shp_sup1 = shp_regprism_dirxtr (n_sides=3,
+                                 radius = 2*r_shank,
+                                 length = l_nut + kcomp.LAYER3D_H,
+                                 fc_normal=nnormal_nut,
+                                 fc_verx1=nverx1_triangle,
+                                 centered = 0,
+                                 pos=pos_nut)
+        # take vertexes away:
+        sup1away_l = l_nut + kcomp.LAYER3D_H
+        shp_sup1away = shp_regprism_dirxtr (
+                                        n_sides=6,
+                                        radius= r_nut,
+                                        length= sup1away_l,
+                                        fc_normal=nnormal_nut,
+                                        fc_verx1=nverx1,
+                                        centered = 0,
+                                        pos = pos_nut)
+        shp_sup1cut = shp_sup1.common(shp_sup1away)
+        nut_elements.append (shp_sup1cut)
+
+        # another support
         # 1.15 is the relationship between the Radius and the Apothem
         # of the hexagon: sqrt(3)/2 . I make it slightly smaller
-        supnut2 = doc.addObject("Part::Prism", name + "_supnut2")
-        supnut2.Polygon = 6
-        supnut2.Circumradius = r_shank * 1.15
-        supnut2.Height = l_nut + 2* kcomp.LAYER3D_H
-        if headdown == 1:
-            pos_supnut2 = FreeCAD.Vector(0,0,
-                                         l_bolt - l_nut - 2*kcomp.LAYER3D_H)
-        else:
-            pos_supnut2 = V0
-        supnut2.Placement = FreeCAD.Placement(pos_supnut2, V0ROT, V0)
-        elements.append (supnut2)
-
-    boltnut = doc.addObject("Part::MultiFuse", "boltnut")
-    boltnut.Shapes = elements
-    return boltnut
-      
+        shp_sup2 = shp_regprism_dirxtr (
+                                 n_sides=6,
+                                 radius = 1.15*r_shank,
+                                 length = l_nut + 2* kcomp.LAYER3D_H,
+                                 fc_normal=nnormal_nut,
+                                 fc_verx1=nverx1,
+                                 centered = 0,
+                                 pos=pos_nut)
+        nut_elements.append (shp_sup2)
+        
 
+    # union of elements
+    shp_boltnut = shp_bolt.multiFuse(nut_elements)
+    shp_boltnut = shp_boltnut.removeSplitter()
+    return shp_boltnut
 
 
 def shp_boltnut_dir_hole (r_shank,        l_bolt, 
@@ -4470,8 +5185,6 @@ def shp_boltnut_dir_hole (r_shank,        l_bolt,
                  will obtain one perpendicular direction
         pos: position of the head (if headstart) or of the nut 
     """
-    # we have to bring the active document
-    doc = FreeCAD.ActiveDocument
 
     # normalize
     nnormal = DraftVecUtils.scaleTo(fc_normal,1)
@@ -4482,94 +5195,24 @@ def shp_boltnut_dir_hole (r_shank,        l_bolt,
     else:
         nverx1 = DraftVecUtils.scaleTo(fc_verx1,1)
 
-    # vector from the origin position (pos) to the end
-    pos2end = DraftVecUtils.scaleTo(nnormal, l_bolt)
-    # nnormal negated
-    nnormal_neg = DraftVecUtils.scaleTo(nnormal,-1)
     if headstart == 1:
         #the head will be on pos and the nut on pos + l_bolt
         pos_head = pos
-        pos_nut = pos + pos2end
         nnormal_head = nnormal
-        nnormal_nut = nnormal_neg
     else:
         #the nut will be on pos and the head on pos + l_bolt
-        pos_head = pos + pos2end
-        pos_nut = pos
-        nnormal_head = nnormal_neg
-        nnormal_nut = nnormal
-
-
-    # bolt with the head:
-    shp_bolt = shp_bolt_dir  (r_shank  = r_shank,
-                          l_bolt   = l_bolt,
-                          r_head   = r_head,
-                          l_head   = l_head,
-                          hex_head = hex_head,
-                          xtr_head = xtr_head,
-                          xtr_shank = 0, # no need, the nut will go extra
-                          support   = supp_head,
-                          fc_normal = nnormal_head,
-                          fc_verx1  = nverx1,
-                          pos_n     = 0,
-                          pos       = pos_head)
-
-    # Nut:
-    shp_nut = shp_regprism_dirxtr ( 
-                                     n_sides = 6,
-                                     radius  = r_nut,
-                                     length  = l_nut,
-                                     fc_normal = nnormal_nut,
-                                     fc_verx1  = nverx1,
-                                     centered  = 0,
-                                     # no extra on top, the shank will be there
-                                     xtr_top   = 0,
-                                     xtr_bot   = xtr_nut,
-                                     pos       = pos_nut)
-
-    nut_elements = [shp_nut]
-    # support for the nut
-    if supp_nut == 1 and kcomp.LAYER3D_H > 0:
-        # rotate 30 degrees
-        nverx1_triangle =  DraftVecUtils.rotate(nverx1,
-                                                -math.pi/6., nnormal_nut)
-        shp_sup1 = shp_regprism_dirxtr (n_sides=3,
-                                 radius = 2*r_shank,
-                                 length = l_nut + kcomp.LAYER3D_H,
-                                 fc_normal=nnormal_nut,
-                                 fc_verx1=nverx1_triangle,
-                                 centered = 0,
-                                 pos=pos_nut)
-        # take vertexes away:
-        sup1away_l = l_nut + kcomp.LAYER3D_H
-        shp_sup1away = shp_regprism_dirxtr (
-                                        n_sides=6,
-                                        radius= r_nut,
-                                        length= sup1away_l,
-                                        fc_normal=nnormal_nut,
-                                        fc_verx1=nverx1,
-                                        centered = 0,
-                                        pos = pos_nut)
-        shp_sup1cut = shp_sup1.common(shp_sup1away)
-        nut_elements.append (shp_sup1cut)
-
-        # another support
-        # 1.15 is the relationship between the Radius and the Apothem
-        # of the hexagon: sqrt(3)/2 . I make it slightly smaller
-        shp_sup2 = shp_regprism_dirxtr (
-                                 n_sides=6,
-                                 radius = 1.15*r_shank,
-                                 length = l_nut + 2* kcomp.LAYER3D_H,
-                                 fc_normal=nnormal_nut,
-                                 fc_verx1=nverx1,
-                                 centered = 0,
-                                 pos=pos_nut)
-        nut_elements.append (shp_sup2)
-        
-
-    # union of elements
-    shp_boltnut = shp_bolt.multiFuse(nut_elements)
-    shp_boltnut = shp_boltnut.removeSplitter()
+        pos_head = pos + DraftVecUtils.scaleTo(nnormal, l_bolt)
+        nnormal_head = DraftVecUtils.scaleTo(nnormal,-1)
+
+    # the stamp has the head at the origin, on VZ
+    shp_stamp = get_bolt_stamp(_stamp_boltnut_dir, r_shank, l_bolt,
+                               r_head, l_head, r_nut, l_nut, hex_head,
+                               xtr_head, xtr_nut, supp_head, supp_nut)
+    shp_boltnut = shp_transform_copy(shp_stamp,
+                                     calc_place_matrix(nverx1, nnormal_head,
+                                                       pos_head))
+    holerec.record(holerec.hole_recs(pos_head, nnormal_head, 2 * r_shank,
+                                     l_bolt, kind = 'nut'))
     return shp_boltnut
 
 
@@ -4848,14 +5491,35 @@ class NutHole (object):
         doc = FreeCAD.ActiveDocument
         self.doc     = doc
 
-        # the nut
-        nut = doc.addObject("Part::Prism", name + "_nut")
-        nut.Polygon = 6
-        nut.Circumradius = nut_r
-        nut.Height = nut_h
-        self.nutObj  = nut
+        # the nut holes with the same arguments are the same shape, it is
+        # made once and kept in a cache
+        cache_key = ('NutHole',
+                     round(nut_r, SHP_CACHE_DEC), round(nut_h, SHP_CACHE_DEC),
+                     round(hole_h, SHP_CACHE_DEC), extra, nuthole_x,
+                     cx, cy, holedown)
+        shp_nuthole = _nuthole_cache.get(cache_key)
+        if fctrace.enabled:
+            fctrace.count('NutHole', 'shp_' + ('new' if shp_nuthole is None
+                                               else 'hit'))
+        if shp_nuthole is None:
+            shp_nuthole = self.make_shp()
+            _nuthole_cache[cache_key] = shp_nuthole
+
+        nuthole = doc.addObject("Part::Feature", name)
+        nuthole.Shape = shp_nuthole.copy()
+        self.fco = nuthole   # the FreeCad Object
+
+    def make_shp (self):
+        """ Makes the shape of the nut hole, at the origin """
+
+        nut_r = self.nut_r
+        nut_h = self.nut_h
+        hole_h = self.hole_h
+        extra = self.extra
+        cx = self.cx
+        cy = self.cy
 
-        if nuthole_x == 1:
+        if self.nuthole_x == 1:
             x_hole = nut_h
             y_hole = self.nut_2ap
             nutrot = FreeCAD.Rotation(VY,90)
@@ -4886,26 +5550,25 @@ class NutHole (object):
                 # already starting on y=0
                 ypos_nut = 0
 
-        hole = addBox (x_hole, y_hole, hole_h + extra, name + "_hole",
-                     cx = cx, cy = cy)
-        self.holeObj = hole
-
-        if holedown== 1:
+        hole_pos = V0
+        if self.holedown == 1:
             # the nut will be top
             zpos_nut = hole_h
             if extra > 0: # then we will have to bring down the z of the hole
-              hole.Placement.Base =   hole.Placement.Base \
-                                    + FreeCAD.Vector(0,0,-extra)
+                hole_pos = FreeCAD.Vector(0,0,-extra)
         else:
             zpos_nut = 0
+        shp_hole = shp_boxcen(x_hole, y_hole, hole_h + extra,
+                              cx = cx, cy = cy, pos = hole_pos)
 
-        nut.Placement.Base = FreeCAD.Vector (xpos_nut, ypos_nut, zpos_nut)
-        nut.Placement.Rotation = nutrot
+        # the nut: the cached hexagonal prism, placed
+        nut_place = FreeCAD.Placement(
+                              FreeCAD.Vector(xpos_nut, ypos_nut, zpos_nut),
+                              nutrot)
+        shp_nut = shp_transform_copy(shp_regprism_orig(6, nut_r, nut_h),
+                                     nut_place.toMatrix())
 
-        nuthole =  doc.addObject("Part::Fuse", name)
-        nuthole.Base = nut
-        nuthole.Tool = hole
-        self.fco = nuthole   # the FreeCad Object
+        return shp_nut.fuse(shp_hole)
 
 
  
@@ -4989,6 +5652,23 @@ def shp_nuthole (nut_r, nut_h, hole_h,
     axis_hole = DraftVecUtils.scaleTo(fc_axis_hole,1)
     nut_2ap = 2 * nut_r * COS30    #Apotheme = R * cos (30)
 
+    # the nut hole is made at the origin, the nut on VZ and the hole on VX,
+    # and kept in a cache. Then it is placed on its axes and pos
+    cache_key = None
+    if fc_isperp(axis_nut, axis_hole):
+        cache_key = ('shp_nuthole',
+                     round(nut_r, SHP_CACHE_DEC), round(nut_h, SHP_CACHE_DEC),
+                     round(hole_h, SHP_CACHE_DEC), xtr_nut, xtr_hole,
+                     ref_nut_ax, ref_hole_ax)
+        place_mtx = calc_place_matrix(axis_hole, axis_nut, pos)
+        if cache_key in _nuthole_cache:
+            if fctrace.enabled:
+                fctrace.count('fcfun', 'nuthole_hit')
+            return shp_transform_copy(_nuthole_cache[cache_key], place_mtx)
+        axis_nut = VZ
+        axis_hole = VX
+        pos = V0
+
     # --- Reference to point *: hole=1 , nut=2
     #    fc_axis_hole               fc_axis_hole
     #       :                        :   
@@ -5066,6 +5746,9 @@ def shp_nuthole (nut_r, nut_h, hole_h,
     shp_nuthole = shp_nut.fuse(shp_hole)
     shp_nuthole = shp_nuthole.removeSplitter()
     doc.recompute() 
+    if cache_key is not None:
+        _nuthole_cache[cache_key] = shp_nuthole
+        shp_nuthole = shp_transform_copy(shp_nuthole, place_mtx)
     return shp_nuthole
 
 #doc = FreeCAD.newDocument()
@@ -5272,7 +5955,9 @@ def edgeonaxis (edge, axis):
     if (equ(vex0.X, vex1.X) and 
         equ(vex0.Y, vex1.Y) and
         equ(vex0.Z, vex1.Z)):
-        logger.debug('edgeonaxis:  error, same point')
+        # called for every edge: counted, not logged
+        if fctrace.enabled:
+            fctrace.count('fcfun', 'edgeonaxis_same_point')
         return False
     elif equ(vex0.X, vex1.X) and equ(vex0.Y, vex1.Y):
         if axis == 'z' or axis == '-z':
@@ -5292,6 +5977,7 @@ def edgeonaxis (edge, axis):
     else:
         return False
 
+@fctrace.traced('fcfun')
 def shp_filletchamfer_dir (shp, fc_axis = VZ,  fillet = 1, radius=1):
     """
         Fillet or chamfer edges on a certain axis
@@ -5329,6 +6015,8 @@ def shp_filletchamfer_dir (shp, fc_axis = VZ,  fillet = 1, radius=1):
                 #logger.debug('append edge Length: %s', edge.Length)
                 #logger.debug(str(p0) + ' - ' + str(p1))
 
+    if fctrace.enabled:
+        fctrace.count('fcfun', 'filletchamfer_edges', len(edgelist))
     if len(edgelist) != 0:
         if fillet == 1:
             #logger.debug('%s', str(edgelist))
@@ -5343,6 +6031,7 @@ def shp_filletchamfer_dir (shp, fc_axis = VZ,  fillet = 1, radius=1):
 
 
 
+@fctrace.traced('fcfun')
 def shp_filletchamfer_dirs (shp, fc_axis_l, fillet = 1, radius=1):
     """
         Same as shp_filletchamfer_dir, but with a list of directions
@@ -5385,6 +6074,8 @@ def shp_filletchamfer_dirs (shp, fc_axis_l, fillet = 1, radius=1):
                     edgelist.append(edge)
                     break # breaks inside this for, but not the outer
 
+    if fctrace.enabled:
+        fctrace.count('fcfun', 'filletchamfer_edges', len(edgelist))
     if len(edgelist) != 0:
         if fillet == 1:
             #logger.debug('%', str(edgelist))
@@ -5679,7 +6370,7 @@ def shp_filletchamfer (shp, e_len, fillet = 1, radius=1, axis='x',
 
     if len(edgelist) != 0:
         if fillet == 1:
-            logger.debug('%', str(edgelist))
+            #logger.debug('%s', edgelist)
             shp_fillcham = shp.makeFillet(radius, edgelist)
         else:
             shp_fillcham = shp.makeChamfer(radius, edgelist)
@@ -5834,7 +6525,7 @@ def calc_rot (vec1, vec2):
         elif vec2 == (0,0,-1):
             roll  = 0
         else:
-            print "error 1 in yaw-pitch-roll"
+            print("error 1 in yaw-pitch-roll")
     elif vec1 == (-1,0,0):
         yaw = 180
         pitch = 0
@@ -5847,7 +6538,7 @@ def calc_rot (vec1, vec2):
         elif vec2 == (0,0,-1):
             roll  = 0
         else:
-            print "error 2 in yaw-pitch-roll"
+            print("error 2 in yaw-pitch-roll")
     elif vec1 == (0,1,0):
         yaw = 90
         pitch = 0
@@ -5860,7 +6551,7 @@ def calc_rot (vec1, vec2):
         elif vec2 == (0,0,-1):
             roll  = 0
         else:
-            print "error 3 in yaw-pitch-roll"
+            print("error 3 in yaw-pitch-roll")
     elif vec1 == (0,-1,0):
         yaw = -90
         pitch = 0
@@ -5873,7 +6564,7 @@ def calc_rot (vec1, vec2):
         elif vec2 == (0,0,-1):
             roll  = 0
         else:
-            print "error 4 in yaw-pitch-roll"
+            print("error 4 in yaw-pitch-roll")
     elif vec1 == (0,0,1):
         pitch = -90
         yaw = 0
@@ -5886,7 +6577,7 @@ def calc_rot (vec1, vec2):
         elif vec2 == (0,-1,0):
             roll  = -90
         else:
-            print "error 5 in yaw-pitch-roll"
+            print("error 5 in yaw-pitch-roll")
     elif vec1 == (0,0,-1):
         pitch = 90
         yaw = 0
@@ -5899,7 +6590,7 @@ def calc_rot (vec1, vec2):
         elif vec2 == (0,-1,0):
             roll  = -90
         else:
-            print "error 6 in yaw-pitch-roll"
+            print("error 6 in yaw-pitch-roll")
     elif vec1 == (0,0,0): # it doesn't matter the direction of vec1
         yaw = 0
         if vec2 == (1,0,0):
@@ -5921,7 +6612,7 @@ def calc_rot (vec1, vec2):
             pitch = 0
             roll  = 0 # the same position
         else:
-            print "error 7 in yaw-pitch-roll"
+            print("error 7 in yaw-pitch-roll")
 
 
 
@@ -6080,7 +6771,7 @@ def calc_desp_ncen (Length, Width, Height,
             if cz == False:
                 z = Height / 2.0
         else:
-            print "error 1 in calc_desp_ncen"
+            print("error 1 in calc_desp_ncen")
     elif abs(vec1[1]) == 1: # Y axis
         if abs(vec2[0]) == 1:   # X
             if cx == False:
@@ -6097,7 +6788,7 @@ def calc_desp_ncen (Length, Width, Height,
             if cz == False:
                 z = Height / 2.0
         else:
-            print "error 2 in calc_desp_ncen"
+            print("error 2 in calc_desp_ncen")
     elif abs(vec1[2]) == 1: # Z axis
         if abs(vec2[0]) == 1:   # X
             if cx == False:
@@ -6114,7 +6805,7 @@ def calc_desp_ncen (Length, Width, Height,
             if cz == False:
                 z = Length / 2.0
         else:
-            print "error 3 in calc_desp_ncen"
+            print("error 3 in calc_desp_ncen")
     elif (vec1[0]==0 and vec1[1]==0 and vec1[2]==0): 
         #It doesnt matter vec1. Probably it is symetrical on plane XY.
         # So Length and Width are the same
@@ -6142,9 +6833,9 @@ def calc_desp_ncen (Length, Width, Height,
             if cz == False:
                 z = Height / 2.0
         else:
-            print "error 4 in calc_desp_ncen"
+            print("error 4 in calc_desp_ncen")
     else:
-        print "error 5 in calc_desp_ncen"
+        print("error 5 in calc_desp_ncen")
 
 
     vdesp = FreeCAD.Vector(x,y,z)
@@ -6276,7 +6967,7 @@ def get_nameofbasevec (fcvec):
     elif fcvec.x==0 and fcvec.y==0 and fcvec.z==-1:
         return '-z'
     else:
-        print "Not a base vector"
+        print("Not a base vector")
 
 
 def get_fclist_4perp_vecname (vecname):
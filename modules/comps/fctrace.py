@@ -0,0 +1,291 @@
+# ----------------------------------------------------------------------------
+# -- Trace events
+# -- comps library
+# -- Low overhead trace of the construction of the components
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# To know where the time of a build goes, logging at debug level is too
+# expensive: the messages are formatted (and many times the objects are
+# converted to strings) even if nobody reads them. Instead, the functions
+# of the library record trace events, that are only taken when the trace
+# is enabled. When it is disabled, the cost is reading a module variable:
+#
+#     if fctrace.enabled:
+#         fctrace.count('fcfun', 'bolt_stamp_hit')
+#
+#     with fctrace.span('EndShaftSlider', 'shape', side = side):
+#         ... make the shapes ...
+#
+#     @fctrace.traced('fcfun')
+#     def shp_filletchamfer_dir (...):
+#
+# Each event is a structured record: the component (or module), the phase,
+# the start time, the duration and a dictionary of counts. The events are
+# kept in a ring buffer, so only the last TRACE_SIZE events are kept, and
+# a long build does not use more memory. The counters (count) are
+# accumulated apart, they are not events.
+#
+# The trace is enabled with the environment variable FCAD_TRACE (i.e.
+# FCAD_TRACE=1), or calling enable(). It can be exported to the Chrome
+# trace format, and opened in chrome://tracing or https://ui.perfetto.dev
+#
+#     fctrace.enable()
+#     ... build ...
+#     fctrace.export_chrome('build_trace.json')
+#
+# If FCAD_TRACE is the name of a JSON file (i.e. FCAD_TRACE=build.json),
+# the trace is exported there when the program ends, so the scripts can
+# be profiled without changing them
+
+import os
+import time
+import atexit
+import json
+import logging
+import functools
+import threading
+import collections
+
+logger = logging.getLogger(__name__)
+
+# number of events kept in the ring buffer
+TRACE_SIZE = 100000
+
+# enabled with the environment variable FCAD_TRACE, or with enable()
+TRACE_ENV = os.environ.get('FCAD_TRACE', '')
+enabled = TRACE_ENV not in ('', '0')
+
+# ring buffer of the events:
+# (comp, phase, start, duration, counts, thread id)
+_events = collections.deque(maxlen = TRACE_SIZE)
+
+# counters: {(comp, name): count}
+_counters = collections.defaultdict(int)
+
+# perf_counter is not in python 2
+_clock = getattr(time, 'perf_counter', time.time)
+
+# origin of the times of the events
+_t0 = _clock()
+
+
+def enable (size = None):
+    """ Enables the trace
+
+    Args:
+        size: number of events of the ring buffer. If None, it keeps the
+              current size. Changing the size clears the events
+    """
+
+    global enabled, _events
+    if size is not None and size != _events.maxlen:
+        _events = collections.deque(maxlen = size)
+    enabled = True
+
+
+def disable ():
+    """ Disables the trace, the events are kept """
+
+    global enabled
+    enabled = False
+
+
+def clear ():
+    """ Removes the events and the counters """
+
+    global _t0
+    _events.clear()
+    _counters.clear()
+    _t0 = _clock()
+
+
+def event (comp, phase, start = None, dur = 0., **counts):
+    """ Records an event, if the trace is enabled
+
+    Args:
+        comp: name of the component or module, i.e. 'EndShaftSlider'
+        phase: name of the phase, i.e. 'shape', 'fco'
+        start: start time (given by the clock of the module). If None, now
+        dur: duration in seconds
+        counts: counts of the event, i.e. edges = 12
+    """
+
+    if not enabled:
+        return
+    if start is None:
+        start = _clock()
+    _events.append((comp, phase, start, dur, counts,
+                    threading.current_thread().ident))
+
+
+def count (comp, name, n = 1):
+    """ Adds n to a counter, if the trace is enabled """
+
+    if enabled:
+        _counters[(comp, name)] += n
+
+
+class _Span (object):
+    """ Context manager that records an event with its duration """
+
+    __slots__ = ('comp', 'phase', 'counts', 'start')
+
+    def __init__ (self, comp, phase, counts):
+        self.comp = comp
+        self.phase = phase
+        self.counts = counts
+
+    def set (self, **counts):
+        """ Adds or changes counts of the event """
+        self.counts.update(counts)
+
+    def __enter__ (self):
+        self.start = _clock()
+        return self
+
+    def __exit__ (self, exc_type, exc_value, tb):
+        end = _clock()
+        if exc_type is not None:
+            self.counts['error'] = exc_type.__name__
+        _events.append((self.comp, self.phase, self.start, end - self.start,
+                        self.counts, threading.current_thread().ident))
+        return False
+
+
+class _NullSpan (object):
+    """ Span of the disabled trace, it does nothing """
+
+    __slots__ = ()
+
+    def set (self, **counts):
+        pass
+
+    def __enter__ (self):
+        return self
+
+    def __exit__ (self, exc_type, exc_value, tb):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+
+def span (comp, phase, **counts):
+    """ Context manager that records an event with the duration of its
+    block. If the trace is disabled, it does nothing
+
+    Args:
+        comp: name of the component or module
+        phase: name of the phase
+        counts: counts of the event, more can be added with set
+
+    Returns:
+        context manager
+    """
+
+    if not enabled:
+        return _NULL_SPAN
+    return _Span(comp, phase, counts)
+
+
+def traced (comp, phase = None):
+    """ Decorator that records an event for each call of the function
+
+    Args:
+        comp: name of the component or module
+        phase: name of the phase, if None, the name of the function
+    """
+
+    def decorator (func):
+        ev_phase = phase or func.__name__
+
+        @functools.wraps(func)
+        def wrapper (*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            with _Span(comp, ev_phase, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def events ():
+    """ Events of the ring buffer
+
+    Returns:
+        list of dictionaries with comp, phase, start, dur (seconds from
+        the start of the trace), counts and tid
+    """
+
+    return [dict(comp = comp, phase = phase, start = start - _t0, dur = dur,
+                 counts = dict(counts), tid = tid)
+            for (comp, phase, start, dur, counts, tid) in list(_events)]
+
+
+def counters ():
+    """ Copy of the counters: {(comp, name): count} """
+
+    return dict(_counters)
+
+
+def summary ():
+    """ Totals of the events for each component and phase
+
+    Returns:
+        dictionary {(comp, phase): (number of events, total duration)}
+    """
+
+    totals = {}
+    for (comp, phase, start, dur, counts, tid) in list(_events):
+        n_ev, tot_dur = totals.get((comp, phase), (0, 0.))
+        totals[(comp, phase)] = (n_ev + 1, tot_dur + dur)
+    return totals
+
+
+def chrome_trace ():
+    """ The events and the counters in the Chrome trace format
+    (Trace Event Format), times in microseconds
+
+    Returns:
+        dictionary, to be saved in JSON
+    """
+
+    pid = os.getpid()
+    trace_ev = []
+    last = 0.
+    for (comp, phase, start, dur, counts, tid) in list(_events):
+        ts = (start - _t0) * 1e6
+        last = max(last, ts + dur * 1e6)
+        trace_ev.append({'name': phase, 'cat': comp, 'ph': 'X',
+                         'ts': ts, 'dur': dur * 1e6,
+                         'pid': pid, 'tid': tid, 'args': dict(counts)})
+    # the counters are shown at the end of the trace
+    for (comp, name), n_count in sorted(_counters.items()):
+        trace_ev.append({'name': comp, 'ph': 'C', 'ts': last,
+                         'pid': pid, 'args': {name: n_count}})
+    return {'traceEvents': trace_ev, 'displayTimeUnit': 'ms'}
+
+
+def export_chrome (path):
+    """ Saves the trace in a JSON file in the Chrome trace format
+
+    Args:
+        path: path of the file
+
+    Returns:
+        path of the file
+    """
+
+    with open(path, 'w') as f_trace:
+        json.dump(chrome_trace(), f_trace)
+    logger.info('trace saved: %s (%d events)', path, len(_events))
+    return path
+
+
+if TRACE_ENV.endswith('.json'):
+    atexit.register(export_chrome, TRACE_ENV)
@@ -0,0 +1,370 @@
+# ----------------------------------------------------------------------------
+# -- glTF export
+# -- comps library
+# -- Exports assemblies to binary glTF (GLB), with the repeated parts instanced
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# To see an assembly (the stage, the epi3, ...) without FreeCAD, it is
+# exported to GLB, that can be opened in any glTF viewer.
+# Many parts are repeated: aluminum profiles, shaft holders, bolts...
+# Each repeated part is the same shape with a different placement, so its
+# mesh is made and written only once, and each part is a node with its
+# placement that uses that mesh:
+#
+#      nodes                       meshes
+#    bolt_1 (placement 1) -----+
+#    bolt_2 (placement 2) -----+--> bolt mesh (tessellated once)
+#    bolt_3 (placement 3) -----+
+#    aluprof_x (placement) -------> aluprof mesh
+#
+# The shapes are compared without their placements, by their fingerprint
+# (fcfun.shp_fingerprint). Shapes that are equal but were made in other
+# positions (not moved with a placement) are not detected, they have their
+# own mesh.
+#
+# The colors are taken from the ShapeColor of the FreeCAD objects (set_color
+# and the method color of the components also set it). Many components have
+# a method color, so their attribute color is not used.
+# FreeCAD uses mm and Z up, glTF uses meters and Y up, the root node has
+# this conversion.
+#
+# The GLB is written with struct and json, without other libraries:
+#
+#    gltfexp.export_doc(FreeCAD.ActiveDocument, 'stage.glb')
+
+import json
+import struct
+import logging
+import collections
+
+import FreeCAD
+import numpy as np
+
+import fcfun
+import kparts
+import massprops
+
+logger = logging.getLogger(__name__)
+
+# tolerance of the tessellation in mm
+TESS_TOL = kparts.LIN_DEFL
+
+# color of the objects without color
+DEFAULT_COLOR = (0.8, 0.8, 0.8)
+
+# from mm and Z up to meters and Y up, column-major as in glTF
+ROOT_MATRIX = [0.001, 0., 0., 0.,
+               0., 0., -0.001, 0.,
+               0., 0.001, 0., 0.,
+               0., 0., 0., 1.]
+
+# glTF constants
+_FLOAT = 5126
+_UINT = 5125
+_USHORT = 5123
+_ARRAY_BUFFER = 34962
+_ELEMENT_ARRAY_BUFFER = 34963
+
+# a part of the scene
+# name: name of the node
+# key: key of its geometry, equal for the parts with the same geometry
+# shp: shape without placement (local coordinates)
+# placement: FreeCAD.Placement of the part
+# color: tuple (r, g, b) from 0. to 1.
+SceneItem = collections.namedtuple('SceneItem',
+                                   ['name', 'key', 'shp', 'placement',
+                                    'color'])
+
+
+def local_item (name, shp, placement = None, color = None):
+    """ Makes the scene item of a shape, separating its placement
+
+    Args:
+        name: name of the node
+        shp: TopoShape, with its placement
+        placement: FreeCAD.Placement of the part. If None, the placement
+                   of the shape
+        color: tuple (r, g, b), if None: DEFAULT_COLOR
+
+    Returns:
+        SceneItem
+    """
+
+    if placement is None:
+        placement = shp.Placement
+    shp_local = shp.copy()
+    shp_local.Placement = FreeCAD.Placement()
+    key = fcfun.shp_fingerprint(shp_local)
+    if color is None:
+        color = DEFAULT_COLOR
+    color = tuple(float(val) for val in color[:3])
+    return SceneItem(name, key, shp_local, placement, color)
+
+
+def get_fco_color (fco):
+    """ Color of a FreeCAD object, DEFAULT_COLOR if there is no GUI """
+
+    vobj = getattr(fco, 'ViewObject', None)
+    if vobj is None or not hasattr(vobj, 'ShapeColor'):
+        return DEFAULT_COLOR
+    return tuple(vobj.ShapeColor[:3])
+
+
+def doc_items (doc = None):
+    """ Scene items of the visible final objects of a document (not the
+    intermediate ones of the booleans), with their global placement.
+    The objects inside App::Part and the subassemblies linked by App::Link
+    are included, see massprops.doc_solids
+
+    Args:
+        doc: FreeCAD document, if None: the active document
+
+    Returns:
+        list of SceneItem
+    """
+
+    return [local_item(name, shp, None, get_fco_color(fco))
+            for fco, name, shp in massprops.doc_solids(doc, visible = 1)]
+
+
+def comp_items (comps, names = None):
+    """ Scene items of a list of components, with the placement and the
+    color (ShapeColor) of their FreeCAD object
+
+    Args:
+        comps: list of component objects (with shp or fco)
+        names: list of the names, if None, the attribute name of the
+               components, or their class
+
+    Returns:
+        list of SceneItem
+    """
+
+    import builddaemon
+
+    if names is None:
+        names = [getattr(comp, 'name', type(comp).__name__)
+                 for comp in comps]
+    items = []
+    for name, comp in zip(names, comps):
+        fco = getattr(comp, 'fco', None)
+        if fco is not None:
+            color = get_fco_color(fco)
+            shp = fco.Shape
+        else:
+            color = None
+            shp = builddaemon.get_build_shp(comp)
+        items.append(local_item(name, shp, None, color))
+    return items
+
+
+def shp_mesh (shp, tol = TESS_TOL):
+    """ Mesh of a shape
+
+    Args:
+        shp: TopoShape
+        tol: tolerance of the tessellation
+
+    Returns:
+        tuple (positions, indices):
+            positions: NumPy array (n,3) of float32, in mm
+            indices: NumPy array (m*3) of uint32, the triangles
+    """
+
+    pts, tris = shp.tessellate(tol)
+    positions = np.array([tuple(pt) for pt in pts],
+                         dtype = np.float32).reshape(-1, 3)
+    indices = np.array(tris, dtype = np.uint32).reshape(-1)
+    return positions, indices
+
+
+def placement_matrix (placement):
+    """ Matrix of a placement as a list of 16 floats, column-major """
+
+    mtx = placement.toMatrix()
+    rows = [[mtx.A11, mtx.A12, mtx.A13, mtx.A14],
+            [mtx.A21, mtx.A22, mtx.A23, mtx.A24],
+            [mtx.A31, mtx.A32, mtx.A33, mtx.A34],
+            [mtx.A41, mtx.A42, mtx.A43, mtx.A44]]
+    return [float(rows[row][col]) for col in range(4) for row in range(4)]
+
+
+class _BinBuffer (object):
+    """ Binary buffer of the GLB, with its buffer views and accessors """
+
+    def __init__ (self):
+        self.chunks = []
+        self.length = 0
+        self.views = []
+        self.accessors = []
+
+    def add_view (self, data, target):
+        data = data.tobytes()
+        self.views.append({'buffer': 0, 'byteOffset': self.length,
+                           'byteLength': len(data), 'target': target})
+        pad = (-len(data)) % 4
+        self.chunks.append(data + b'\x00' * pad)
+        self.length += len(data) + pad
+        return len(self.views) - 1
+
+    def add_positions (self, positions):
+        view = self.add_view(positions, _ARRAY_BUFFER)
+        self.accessors.append({'bufferView': view, 'componentType': _FLOAT,
+                               'count': len(positions), 'type': 'VEC3',
+                               'min': [float(val)
+                                       for val in positions.min(axis = 0)],
+                               'max': [float(val)
+                                       for val in positions.max(axis = 0)]})
+        return len(self.accessors) - 1
+
+    def add_indices (self, indices, n_vert):
+        if n_vert < 65536:
+            indices = indices.astype(np.uint16)
+            comp_type = _USHORT
+        else:
+            comp_type = _UINT
+        view = self.add_view(indices, _ELEMENT_ARRAY_BUFFER)
+        self.accessors.append({'bufferView': view,
+                               'componentType': comp_type,
+                               'count': len(indices), 'type': 'SCALAR'})
+        return len(self.accessors) - 1
+
+    def data (self):
+        return b''.join(self.chunks)
+
+
+def make_gltf (items, tol = TESS_TOL):
+    """ Makes the glTF of the scene, each geometry is tessellated once
+
+    Args:
+        items: list of SceneItem
+        tol: tolerance of the tessellation
+
+    Returns:
+        tuple (gltf, bin_data):
+            gltf: dictionary with the JSON of the glTF
+            bin_data: bytes of the binary buffer
+    """
+
+    buf = _BinBuffer()
+    materials = []
+    mat_ind = {}         # color: index of the material
+    geo_acc = {}         # geometry key: (position accessor, index accessor)
+    mesh_ind = {}        # (geometry key, color): index of the mesh
+    meshes = []
+    nodes = [{'name': 'root', 'matrix': ROOT_MATRIX, 'children': []}]
+    for item in items:
+        if item.key not in geo_acc:
+            positions, indices = shp_mesh(item.shp, tol)
+            if len(indices) == 0:
+                logger.warning(item.name + ': empty mesh, not exported')
+                geo_acc[item.key] = None
+            else:
+                geo_acc[item.key] = (buf.add_positions(positions),
+                                     buf.add_indices(indices,
+                                                     len(positions)))
+        if geo_acc[item.key] is None:
+            continue
+        if item.color not in mat_ind:
+            mat_ind[item.color] = len(materials)
+            materials.append({'pbrMetallicRoughness': {
+                                  'baseColorFactor': list(item.color) + [1.],
+                                  'metallicFactor': 0.,
+                                  'roughnessFactor': 0.8},
+                              'doubleSided': True})
+        # the mesh has the material, so the same geometry with another
+        # color is another mesh, but with the same accessors
+        mkey = (item.key, item.color)
+        if mkey not in mesh_ind:
+            pos_acc, ind_acc = geo_acc[item.key]
+            mesh_ind[mkey] = len(meshes)
+            meshes.append({'name': item.name,
+                           'primitives': [{'attributes': {'POSITION': pos_acc},
+                                           'indices': ind_acc,
+                                           'material': mat_ind[item.color]}]})
+        nodes[0]['children'].append(len(nodes))
+        nodes.append({'name': item.name, 'mesh': mesh_ind[mkey],
+                      'matrix': placement_matrix(item.placement)})
+    bin_data = buf.data()
+    gltf = {'asset': {'version': '2.0', 'generator': 'fcad-comps gltfexp'},
+            'scene': 0,
+            'scenes': [{'nodes': [0]}],
+            'nodes': nodes,
+            'meshes': meshes,
+            'materials': materials,
+            'accessors': buf.accessors,
+            'bufferViews': buf.views,
+            'buffers': [{'byteLength': len(bin_data)}]}
+    logger.info('glTF: %d nodes, %d meshes, %d geometries'
+                % (len(nodes) - 1, len(meshes), len(geo_acc)))
+    return gltf, bin_data
+
+
+def write_glb (gltf, bin_data, path):
+    """ Writes a GLB file
+
+    Args:
+        gltf: dictionary with the JSON of the glTF
+        bin_data: bytes of the binary buffer
+        path: path of the file
+    """
+
+    json_data = json.dumps(gltf, separators = (',', ':')).encode('utf-8')
+    # the chunks are aligned to 4 bytes, JSON with spaces, BIN with 0
+    json_data += b' ' * ((-len(json_data)) % 4)
+    bin_data += b'\x00' * ((-len(bin_data)) % 4)
+    total = 12 + 8 + len(json_data)
+    if bin_data:
+        total += 8 + len(bin_data)
+    with open(path, 'wb') as fglb:
+        fglb.write(struct.pack('<4sII', b'glTF', 2, total))
+        fglb.write(struct.pack('<I4s', len(json_data), b'JSON'))
+        fglb.write(json_data)
+        if bin_data:
+            fglb.write(struct.pack('<I4s', len(bin_data), b'BIN\x00'))
+            fglb.write(bin_data)
+
+
+def export_items (items, path, tol = TESS_TOL):
+    """ Exports scene items to a GLB file
+
+    Args:
+        items: list of SceneItem
+        path: path of the file
+        tol: tolerance of the tessellation
+    """
+
+    gltf, bin_data = make_gltf(items, tol)
+    write_glb(gltf, bin_data, path)
+
+
+def export_doc (doc, path, tol = TESS_TOL):
+    """ Exports the visible final objects of a document to a GLB file,
+    see doc_items
+
+    Args:
+        doc: FreeCAD document, if None: the active document
+        path: path of the file
+        tol: tolerance of the tessellation
+    """
+
+    export_items(doc_items(doc), path, tol)
+
+
+def export_comps (comps, path, names = None, tol = TESS_TOL):
+    """ Exports a list of components to a GLB file, see comp_items
+
+    Args:
+        comps: list of component objects
+        path: path of the file
+        names: list of the names, see comp_items
+        tol: tolerance of the tessellation
+    """
+
+    export_items(comp_items(comps, names), path, tol)
@@ -0,0 +1,358 @@
+# ----------------------------------------------------------------------------
+# -- Hole records
+# -- comps library
+# -- Compact records of the holes that the components cut
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# The holes of the components are cut geometry, so to know which bolts are
+# needed, or where to drill, the faces would have to be analyzed.
+# Instead, each hole is also kept as a record of a NumPy structured array
+# (HOLE_DTYPE), so these questions are queries on arrays:
+#
+#   pos:    position of the entry of the hole (where the head of the bolt
+#           is, or the opening of the tapped hole)
+#   axis:   unitary direction of the hole, from the entry to the inside
+#   d:      diameter of the hole (as it is cut, tolerances included)
+#   depth:  depth of the hole (length of the bolt)
+#   kind:   'thru':  plain cylindrical hole
+#           'bolt':  plain cylindrical hole for a bolt, that has its head
+#                    and its nut (or its thread) out of the component,
+#                    i.e. the bolts of a motor through its holder
+#           'cbore': hole with a counterbore for a rounded head
+#           'hexhead': hole with a hexagonal hole for the head
+#           'nut':   hole for a bolt with the head and a nut at the other end
+#           'tap':   tapped hole
+#   metric: metric size of the bolt, i.e. 3. for M3
+#
+#      pos    axis
+#       :_____:_____
+#       |     V     |.....
+#       |__       __|    :
+#          |     |       + depth
+#          |_____|.......:
+#          :  d  :
+#
+# The records are taken by the hole logs (HoleLog). A component opens a log
+# at the beginning of its construction, and closes it at the end, keeping
+# the records in its attribute holes. The constructors do it with the
+# decorator log_holes, that closes the log even if the construction fails,
+# so the log is not left open taking the holes of the next components:
+#
+#     @holerec.log_holes
+#     def __init__ (self, ...):
+#         ... build the component ...
+#
+# The functions that make bolt holes in any direction (fcfun.shp_bolt_dir,
+# fcfun.shp_boltnut_dir_hole) record their holes in all the open logs, and
+# other holes can be recorded with record. Since all the open logs take
+# the records, a log opened while building an assembly gets the holes of
+# all its components
+#
+# The records have the coordinates of the shape of the component. If
+# the FreeCAD object is moved afterwards, holes_placed gives the records
+# with its placement, and if it is mirrored, holes_mirrored
+
+import FreeCAD
+import logging
+import functools
+import contextlib
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+HOLE_DTYPE = np.dtype([('pos', 'f8', (3,)),
+                       ('axis', 'f8', (3,)),
+                       ('d', 'f8'),
+                       ('depth', 'f8'),
+                       ('kind', 'U8'),
+                       ('metric', 'f8')])
+
+HOLE_KINDS = ('thru', 'bolt', 'cbore', 'hexhead', 'nut', 'tap')
+
+# metric sizes of the bolts, to get the metric of a hole from its diameter
+METRIC_SIZES = (1.6, 2., 2.5, 3., 4., 5., 6., 8., 10., 12., 16., 20.)
+
+# open logs, all of them take the records
+_open_logs = []
+
+# when paused, the records are not taken, see no_log
+_paused = [0]
+
+
+def no_holes ():
+    """ Returns an empty array of hole records """
+
+    return np.zeros(0, dtype = HOLE_DTYPE)
+
+
+def hole_metric (d):
+    """ Metric size of a bolt that goes in a hole of diameter d.
+    It is the largest metric that is not larger than d, since the diameter
+    of the hole includes the tolerances
+
+    Args:
+        d: diameter of the hole
+
+    Returns:
+        metric size, 0 if the hole is smaller than the smallest metric
+    """
+
+    fit = [size for size in METRIC_SIZES if size <= d + 1e-6]
+    if not fit:
+        return 0.
+    return fit[-1]
+
+
+def hole_recs (pos, axis, d, depth, kind = 'thru', metric = 0):
+    """ Makes the records of holes with the same dimensions
+
+    Args:
+        pos: FreeCAD.Vector of the position of the hole entry, or
+             NumPy array (n,3) with the positions of n holes
+             (see patterns.pts_to_global)
+        axis: FreeCAD.Vector of the direction of the holes, from the entry
+              to the inside. Will be normalized
+        d: diameter of the holes
+        depth: depth of the holes
+        kind: 'thru', 'bolt', 'cbore', 'hexhead', 'nut', 'tap'
+        metric: metric size of the bolts. If 0, it is taken from d
+
+    Returns:
+        NumPy structured array (n) of HOLE_DTYPE
+    """
+
+    if kind not in HOLE_KINDS:
+        logger.error('unknown hole kind: ' + str(kind))
+    pts = np.atleast_2d(np.asarray(tuple(pos) if isinstance(pos,
+                                                           FreeCAD.Vector)
+                                   else pos, dtype = float))
+    axis = np.asarray(tuple(axis), dtype = float)
+    axis = axis / np.linalg.norm(axis)
+    if metric == 0:
+        metric = hole_metric(d)
+    recs = np.zeros(len(pts), dtype = HOLE_DTYPE)
+    recs['pos'] = pts
+    recs['axis'] = axis
+    recs['d'] = d
+    recs['depth'] = depth
+    recs['kind'] = kind
+    recs['metric'] = metric
+    return recs
+
+
+def record (recs):
+    """ Adds hole records to all the open logs
+
+    Args:
+        recs: NumPy array of HOLE_DTYPE, see hole_recs
+    """
+
+    if _paused[0] > 0:
+        return
+    for hlog in _open_logs:
+        hlog.recs.append(recs)
+
+
+@contextlib.contextmanager
+def no_log ():
+    """ Context where the holes are not recorded. To be used when a function
+    that records holes is used to make part of a larger hole, that will be
+    recorded as a whole """
+
+    _paused[0] += 1
+    try:
+        yield
+    finally:
+        _paused[0] -= 1
+
+
+class HoleLog (object):
+    """ Takes the records of the holes made while it is open.
+    It is open when created, and it can be used in a with statement:
+
+        with holerec.HoleLog() as hlog:
+            ...
+        holes = hlog.holes
+
+    Attributes:
+        recs: list of the arrays of records taken
+        holes: (property) all the records in one array
+    """
+
+    def __init__ (self):
+        self.recs = []
+        _open_logs.append(self)
+
+    @property
+    def holes (self):
+        if not self.recs:
+            return no_holes()
+        return np.concatenate(self.recs)
+
+    def close (self):
+        """ Stops taking records
+
+        Returns:
+            NumPy array with all the records
+        """
+
+        if self in _open_logs:
+            _open_logs.remove(self)
+        return self.holes
+
+    def __enter__ (self):
+        return self
+
+    def __exit__ (self, exc_type, exc_value, tb):
+        self.close()
+
+
+def log_holes (init):
+    """ Decorator of the constructors of the components: takes the records
+    of the holes made during the construction, and keeps them in the
+    attribute holes of the component. The log is closed even if the
+    constructor raises an exception """
+
+    @functools.wraps(init)
+    def wrapper (self, *args, **kwargs):
+        hlog = HoleLog()
+        try:
+            init(self, *args, **kwargs)
+        finally:
+            self.holes = hlog.close()
+    return wrapper
+
+
+def get_holes (comp):
+    """ Hole records of a component, the ones it has in its attribute holes
+
+    Args:
+        comp: component object
+
+    Returns:
+        NumPy array of HOLE_DTYPE, empty if it has no records
+    """
+
+    holes = getattr(comp, 'holes', None)
+    if holes is None:
+        return no_holes()
+    return holes
+
+
+def collect_holes (comps, placements = None):
+    """ Aggregates the hole records of the components of an assembly
+
+    Args:
+        comps: list of component objects
+        placements: list of FreeCAD.Placement (or None) of each component.
+                    If None, the records are taken as they are
+
+    Returns:
+        NumPy array of HOLE_DTYPE with the records of all the components
+    """
+
+    if placements is None:
+        placements = [None] * len(comps)
+    holes_list = []
+    for comp, placement in zip(comps, placements):
+        holes = get_holes(comp)
+        if placement is not None:
+            holes = holes_placed(holes, placement)
+        holes_list.append(holes)
+    if not holes_list:
+        return no_holes()
+    return np.concatenate(holes_list)
+
+
+def holes_placed (holes, placement):
+    """ Records of the holes after a placement is applied to the component
+
+    Args:
+        holes: NumPy array of HOLE_DTYPE
+        placement: FreeCAD.Placement
+
+    Returns:
+        NumPy array of HOLE_DTYPE with the positions and axis moved
+    """
+
+    mtx = placement.toMatrix()
+    rot = np.array([[mtx.A11, mtx.A12, mtx.A13],
+                    [mtx.A21, mtx.A22, mtx.A23],
+                    [mtx.A31, mtx.A32, mtx.A33]])
+    moved = holes.copy()
+    moved['pos'] = np.dot(holes['pos'], rot.T) + np.array(
+                                                   tuple(placement.Base))
+    moved['axis'] = np.dot(holes['axis'], rot.T)
+    return moved
+
+
+def holes_mirrored (holes, fc_normal, base = FreeCAD.Vector(0,0,0)):
+    """ Records of the holes after the component is mirrored
+
+    Args:
+        holes: NumPy array of HOLE_DTYPE
+        fc_normal: FreeCAD.Vector normal to the mirror plane
+        base: FreeCAD.Vector of a point of the mirror plane
+
+    Returns:
+        NumPy array of HOLE_DTYPE with the positions and axis mirrored
+    """
+
+    nrm = np.asarray(tuple(fc_normal), dtype = float)
+    nrm = nrm / np.linalg.norm(nrm)
+    base = np.asarray(tuple(base), dtype = float)
+    mirr = holes.copy()
+    dist = np.dot(holes['pos'] - base, nrm).reshape(-1, 1)
+    mirr['pos'] = holes['pos'] - 2. * dist * nrm
+    mirr['axis'] = (holes['axis']
+                    - 2. * np.dot(holes['axis'], nrm).reshape(-1, 1) * nrm)
+    return mirr
+
+
+def fastener_count (holes):
+    """ Counts the bolts needed for the holes, grouped by kind, metric
+    and depth (rounded to mm). The thru holes are not counted, they may
+    not have a bolt (i.e. the holes of the shafts). The plain holes that
+    have a bolt are of kind 'bolt'
+
+    Args:
+        holes: NumPy array of HOLE_DTYPE
+
+    Returns:
+        dictionary {(kind, metric, depth): number of holes}
+    """
+
+    holes = holes[holes['kind'] != 'thru']
+    keys = np.zeros(len(holes), dtype = [('kind', 'U8'), ('metric', 'f8'),
+                                         ('depth', 'f8')])
+    keys['kind'] = holes['kind']
+    keys['metric'] = holes['metric']
+    keys['depth'] = np.round(holes['depth'])
+    uniq, counts = np.unique(keys, return_counts = True)
+    return dict(((str(key['kind']), float(key['metric']),
+                  float(key['depth'])), int(cnt))
+                for key, cnt in zip(uniq, counts))
+
+
+def drill_pattern (holes, axis = FreeCAD.Vector(0,0,-1), ang_tol = 1.):
+    """ Holes that are drilled along a direction, i.e. from the top
+
+    Args:
+        holes: NumPy array of HOLE_DTYPE
+        axis: FreeCAD.Vector of the drilling direction
+        ang_tol: angle tolerance in degrees
+
+    Returns:
+        NumPy array of HOLE_DTYPE with the holes in that direction
+    """
+
+    axis = np.asarray(tuple(axis), dtype = float)
+    axis = axis / np.linalg.norm(axis)
+    cos_dir = np.dot(holes['axis'], axis)
+    return holes[cos_dir >= np.cos(np.radians(ang_tol))]
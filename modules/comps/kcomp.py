@@ -18,6 +18,16 @@ STOL = TOL / 2.0       # smaller tolerance
 # height of the layer to print. To make some supports, ie: bolt's head
 LAYER3D_H = 0.3  
 
+# ---------------------- Densities of the materials, in g/cm3
+DENSITY = {
+            'pla'   : 1.24,
+            'abs'   : 1.04,
+            'petg'  : 1.27,
+            'alu'   : 2.70,
+            'steel' : 7.85,
+            'brass' : 8.50
+          }
+
 # ---------------------- linear Bearings
 LMEUU_L = { 8: 25., 10: 29.0, 12: 32.0 }; #the length of the bearing
 LMEUU_D = { 8: 16., 10: 19.0, 12: 22.0 }; #diamenter of the bearing 
@@ -258,9 +268,9 @@ WASH_D125_T  = {
                  10:   2.0 }
 
 D125 = {} # empty dictionary
-for (k_di, di), (k_do, do), (k_t, t) in zip(WASH_D125_DI.iteritems(),
-                                            WASH_D125_DO.iteritems(),
-                                            WASH_D125_T.iteritems()):
+for (k_di, di), (k_do, do), (k_t, t) in zip(WASH_D125_DI.items(),
+                                            WASH_D125_DO.items(),
+                                            WASH_D125_T.items()):
     # creation of a 2 dimension dictionary
     # for example: 
     #              D125[4]['do']
@@ -308,9 +318,9 @@ WASH_D9021_T  = {
                  10:   2.5 }
 
 D9021 = {} # empty dictionary
-for (k_di, di), (k_do, do), (k_t, t) in zip(WASH_D9021_DI.iteritems(),
-                                            WASH_D9021_DO.iteritems(),
-                                            WASH_D9021_T.iteritems()):
+for (k_di, di), (k_do, do), (k_t, t) in zip(WASH_D9021_DI.items(),
+                                            WASH_D9021_DO.items(),
+                                            WASH_D9021_T.items()):
     # creation of a 2 dimension dictionary
     # for example: 
     #              D9021[4]['do']
@@ -373,9 +383,9 @@ BEAR_T  = {
           }
 
 BEARING = {} # empty dictionary
-for (k_ndi, di), (k_ndo, do), (k_nt, t) in zip(BEAR_DI.iteritems(),
-                                               BEAR_DO.iteritems(),
-                                               BEAR_T.iteritems()):
+for (k_ndi, di), (k_ndo, do), (k_nt, t) in zip(BEAR_DI.items(),
+                                               BEAR_DO.items(),
+                                               BEAR_T.items()):
     # creation of a 2 dimension dictionary
     # for example: 
     #              BEARING[603]['do']
@@ -526,6 +536,33 @@ def get_idlepull_maxbear_d (idlepull_list):
     return d_maxbear
     
 
+# ------------------------- GT2 belts ---------------------
+#
+#         pitch
+#        :....:
+#   _____      ______      ______ ....................
+#  |     |____|      |____|      |....: GT2_TOOTH_H   + GT2_T
+#  |_____________________________|....................:
+#   ..............................  pitch line: GT2_PLD from the root
+#                                   of the teeth (where the pulley is)
+
+# pitch of the teeth
+GT2_PITCH = 2.
+# total thickness of the belt
+GT2_T = 1.38
+# height of the teeth
+GT2_TOOTH_H = 0.75
+# pitch line differential: distance from the root of the teeth to the
+# pitch line. The length of the belt is measured on the pitch line
+GT2_PLD = 0.254
+# width of the usual belt
+GT2_W = 6.
+
+# stock lengths of closed loop GT2 belts (mm)
+GT2_LOOP_L = (100., 110., 112., 122., 158., 200., 202., 232., 280.,
+              300., 400., 610., 852., 1220.)
+
+
 # ------------------------- Linear bearing housing
 # Similar to SC10UU, but without many the details, just the main dimensions
 #
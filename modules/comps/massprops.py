@@ -0,0 +1,481 @@
+# ----------------------------------------------------------------------------
+# -- Mass properties
+# -- comps library
+# -- Volume, mass, center of mass and bounding box of the components
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# Report of the mass properties of all the components of an assembly,
+# to check the weight and the balance of the moving parts in each build:
+#
+#    rows = massprops.report_doc(FreeCAD.ActiveDocument)
+#    print(massprops.format_table(rows))
+#
+#  name           material  volume(cm3)  mass(g)   com x    com y   com z ...
+#  aluprof_x      alu            25.12     67.8    106.2     0.0    10.0
+#  ...
+#  TOTAL                        140.30    382.1     98.4    12.3    15.1
+#
+# The material of each component is taken from:
+#   1- its attribute material, if it has it
+#   2- its class: MAT_CLASS (aluminum profiles, rods, motors, ...)
+# and the material of each object of a document from:
+#   1- the dictionary materials given to report_doc
+#   2- its property Material, if it has it
+#   3- its label (or name): the first pattern of MAT_LABEL that matches it,
+#      from its beginning (the printed parts are also listed)
+# If none of these: UNKNOWN_MAT, that has the density of DEFAULT_MAT, so
+# the total is not too far, but they are shown apart to be checked.
+# The density is taken from kcomp.DENSITY
+#
+# The geometry is computed in parallel worker processes, the shapes are
+# sent as BREP strings. The results are cached by the hash of the BREP,
+# so the components that dont change are not computed again
+
+import re
+import hashlib
+import logging
+import collections
+import multiprocessing
+
+import FreeCAD
+import Part
+import numpy as np
+
+import kcomp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAT = 'pla'
+
+# material of the components and objects that are not known. Its mass is
+# calculated with the density of DEFAULT_MAT
+UNKNOWN_MAT = 'unknown'
+
+# material of the components by its class name
+MAT_CLASS = {
+              'AluProf'         : 'alu',
+              'AluProf_dir'     : 'alu',
+              'MisumiAlu30s6w8' : 'alu',
+              'RectRndBar'      : 'alu',
+              'Sk'              : 'alu',
+              'Sk_dir'          : 'alu',
+              'FlexCoupling'    : 'alu',
+              'NemaMotor'       : 'steel',
+              'LinBearing'      : 'steel',
+              'LinBearingClone' : 'steel',
+              'LinGuideRail'    : 'steel',
+              'LinGuideBlock'   : 'steel',
+              'T8Nut'           : 'brass',
+              'MisMinLScrNut'   : 'brass',
+            }
+
+# material of the objects of a document by their label or name:
+# (regular expression, material), the first that matches from the beginning
+# of the label (or name) in lowercase
+MAT_LABEL = (
+              # bearings of the sliders, before their printed parts
+              (r'.*_bear$', 'steel'),
+              (r'lm\d*uu', 'steel'),
+              (r'cen_lm', 'steel'),
+              # printed parts
+              (r't8nuthousing', 'pla'),
+              (r'nema_holder', 'pla'),
+              (r'idlpulhold', 'pla'),
+              (r'idlepulleyhold', 'pla'),
+              (r'bracket', 'pla'),
+              (r'belt_clamp', 'pla'),
+              (r'(thin)?linbearhouse', 'pla'),
+              (r'shaft_holder', 'pla'),
+              (r'simple_enstop_holder', 'pla'),
+              (r'slider_(left|right)', 'pla'),
+              (r'central_slider', 'pla'),
+              (r'porta(base|tray)', 'pla'),
+              (r'.*_(top|bot)$', 'pla'),
+              # bought parts
+              (r'(gen)?alu', 'alu'),
+              (r'sk(\d+|[xyz])_', 'alu'),
+              (r'[a-z]?flexcoupling', 'alu'),
+              (r'rod(_|[xyz]|$)', 'steel'),
+              (r'shaft(_|$)', 'steel'),
+              (r't8leadscrew', 'steel'),
+              (r'lg_', 'steel'),
+              (r'linguide', 'steel'),
+              (r'nema(\d+|motor)', 'steel'),
+              (r'bolt', 'steel'),
+              (r'bearing', 'steel'),
+              (r'washer', 'steel'),
+              (r'idle?pull?_', 'steel'),
+              (r'lscrew_nut', 'brass'),
+              (r't8nut$', 'brass'),
+            )
+
+_mat_label_re = [(re.compile(pattern), material)
+                 for pattern, material in MAT_LABEL]
+
+# mass properties of a component
+# name: name of the component
+# material: name of the material (key of kcomp.DENSITY)
+# volume: in mm3
+# mass: in g
+# com: tuple (x, y, z) of the center of mass, in mm
+# bbox: tuple (xmin, ymin, zmin, xmax, ymax, zmax) in mm
+MassProps = collections.namedtuple('MassProps',
+                                   ['name', 'material', 'volume', 'mass',
+                                    'com', 'bbox'])
+
+# cache of the geometric properties: {hash: (volume, com, bbox)}
+_geo_cache = {}
+
+
+def get_comp_material (comp):
+    """ Material of a component, see the header of the module
+
+    Args:
+        comp: component object
+
+    Returns:
+        name of the material
+    """
+
+    material = getattr(comp, 'material', None)
+    if material:
+        return material
+    return MAT_CLASS.get(type(comp).__name__, UNKNOWN_MAT)
+
+
+def get_fco_material (fco):
+    """ Material of an object of a document, by its property Material, or
+    by its label or name, see MAT_LABEL
+
+    Args:
+        fco: FreeCAD object
+
+    Returns:
+        name of the material, UNKNOWN_MAT if it is not known
+    """
+
+    material = getattr(fco, 'Material', None)
+    if material and isinstance(material, str):
+        return material
+    for text in (fco.Label.lower(), fco.Name.lower()):
+        for pattern, material in _mat_label_re:
+            if pattern.match(text):
+                return material
+    return UNKNOWN_MAT
+
+
+def shp_hash (brep_str):
+    """ Hash of a shape, from its BREP string """
+
+    return hashlib.sha1(brep_str.encode('utf-8')).hexdigest()
+
+
+def shp_geo_props (shp):
+    """ Geometric properties of a shape
+
+    Args:
+        shp: TopoShape, it can be a compound of solids
+
+    Returns:
+        tuple (volume, com, bbox)
+    """
+
+    solids = shp.Solids
+    if not solids:
+        volume = 0.
+        com = (0., 0., 0.)
+    else:
+        vols = np.array([sol.Volume for sol in solids])
+        coms = np.array([tuple(sol.CenterOfMass) for sol in solids])
+        volume = float(vols.sum())
+        if volume > 0:
+            com = tuple(float(val) for val in np.dot(vols, coms) / volume)
+        else:
+            com = (0., 0., 0.)
+    bb = shp.BoundBox
+    bbox = (bb.XMin, bb.YMin, bb.ZMin, bb.XMax, bb.YMax, bb.ZMax)
+    return volume, com, bbox
+
+
+def _geo_job (brep_str):
+    shp = Part.Shape()
+    shp.importBrepFromString(brep_str)
+    return shp_geo_props(shp)
+
+
+def geo_props_batch (shp_list, n_proc = 0):
+    """ Geometric properties of many shapes, computed in parallel.
+    The shapes already computed are taken from the cache
+
+    Args:
+        shp_list: list of TopoShape
+        n_proc: number of processes. If 0: number of cpus.
+                If 1: no other processes are created
+
+    Returns:
+        list of tuples (volume, com, bbox), in the same order
+    """
+
+    breps = [shp.exportBrepToString() for shp in shp_list]
+    keys = [shp_hash(brep) for brep in breps]
+    # the shapes not in the cache, without repeating
+    todo = {}
+    for key, brep, shp in zip(keys, breps, shp_list):
+        if key not in _geo_cache and key not in todo:
+            todo[key] = (brep, shp)
+    logger.debug('mass properties: %d shapes, %d to compute'
+                 % (len(shp_list), len(todo)))
+    if todo:
+        todo_keys = list(todo.keys())
+        if n_proc == 0:
+            n_proc = multiprocessing.cpu_count()
+        n_proc = min(n_proc, len(todo_keys))
+        if n_proc <= 1:
+            res = [shp_geo_props(todo[key][1]) for key in todo_keys]
+        else:
+            pool = multiprocessing.Pool(n_proc)
+            try:
+                res = pool.map(_geo_job, [todo[key][0] for key in todo_keys])
+            finally:
+                pool.close()
+                pool.join()
+        _geo_cache.update(zip(todo_keys, res))
+    return [_geo_cache[key] for key in keys]
+
+
+def clear_cache ():
+    """ Empties the cache of the geometric properties """
+
+    _geo_cache.clear()
+
+
+def mass_props (names, shp_list, materials, n_proc = 0):
+    """ Mass properties of a list of shapes
+
+    Args:
+        names: list of the names
+        shp_list: list of TopoShape
+        materials: list of the materials (keys of kcomp.DENSITY)
+        n_proc: number of processes, see geo_props_batch
+
+    Returns:
+        list of MassProps
+    """
+
+    rows = []
+    geo_list = geo_props_batch(shp_list, n_proc)
+    for name, material, (volume, com, bbox) in zip(names, materials,
+                                                   geo_list):
+        if material in kcomp.DENSITY:
+            density = kcomp.DENSITY[material]
+        else:
+            logger.warning('unknown material: %s (%s) taking the density'
+                           ' of %s', material, name, DEFAULT_MAT)
+            material = UNKNOWN_MAT
+            density = kcomp.DENSITY[DEFAULT_MAT]
+        # mm3 to cm3
+        mass = volume / 1000. * density
+        rows.append(MassProps(name, material, volume, mass, com, bbox))
+    return rows
+
+
+def report_comps (comps, names = None, n_proc = 0):
+    """ Mass properties of a list of components
+
+    Args:
+        comps: list of component objects (with shp or fco)
+        names: list of the names, if None, the attribute name of the
+               components, or their class
+        n_proc: number of processes, see geo_props_batch
+
+    Returns:
+        list of MassProps
+    """
+
+    import builddaemon
+
+    if names is None:
+        names = [getattr(comp, 'name', type(comp).__name__)
+                 for comp in comps]
+    shp_list = []
+    for comp in comps:
+        fco = getattr(comp, 'fco', None)
+        if fco is not None:
+            # the FreeCAD object has the placement of the component
+            shp_list.append(fco.Shape)
+        else:
+            shp_list.append(builddaemon.get_build_shp(comp))
+    materials = [get_comp_material(comp) for comp in comps]
+    return mass_props(names, shp_list, materials, n_proc)
+
+
+# objects that group other objects, without a shape of their own
+GROUP_TYPES = ('App::Part', 'App::DocumentObjectGroup')
+
+
+def _final_objs (objs):
+    """ The objects that are not used by other objects, only grouped: the
+    final objects, not the intermediate ones of the booleans """
+
+    return [obj for obj in objs
+            if not [user for user in obj.InList
+                    if user.TypeId not in GROUP_TYPES]]
+
+
+def _placed_solids (fco, plm, name, visible):
+    """ Solids of an object, a group or a link, see doc_solids
+
+    Args:
+        fco: FreeCAD object
+        plm: global placement of the object (of its part, if it is a
+             group, that has no placement)
+        name: name of the object
+        visible: 1: only the visible objects
+
+    Returns:
+        list of tuples (fco, name, shape)
+    """
+
+    if visible == 1 and not getattr(fco, 'Visibility', True):
+        return []
+    if fco.TypeId == 'App::Link':
+        linked = fco.getLinkedObject(True)
+        if linked is None or linked is fco:
+            logger.warning('link without object, skipped: %s', name)
+            return []
+        # the placement of the link replaces the one of the linked object
+        solids = _placed_solids(linked, plm, name, visible)
+        if not solids:
+            logger.warning('link without solids, skipped: %s', name)
+        return solids
+    if fco.TypeId in GROUP_TYPES:
+        solids = []
+        for child in _final_objs(fco.Group):
+            # plm is the placement of the part, or of the part where the
+            # group is, since the groups have no placement
+            if hasattr(child, 'Placement'):
+                child_plm = plm.multiply(child.Placement)
+            else:
+                child_plm = plm
+            solids.extend(_placed_solids(child, child_plm,
+                                         name + '/' + child.Label, visible))
+        return solids
+    if not hasattr(fco, 'Shape') or not fco.Shape.Solids:
+        return []
+    shp = fco.Shape.copy()
+    shp.Placement = plm
+    return [(fco, name, shp)]
+
+
+def doc_solids (doc = None, visible = 0):
+    """ Final solids of a document: the objects that are not used by other
+    objects (not the intermediate ones of the booleans), with their global
+    placement. The objects inside App::Part are placed with the placement
+    of the parts, and the App::Link (i.e. the subassemblies of
+    assembly.link_subasm) are resolved to the objects they link, placed
+    with the placement of the link
+
+    Args:
+        doc: FreeCAD document, if None: the active document
+        visible: 1: only the visible objects
+
+    Returns:
+        list of tuples (fco, name, shape): the FreeCAD object, its name
+        (the labels of the links and parts where it is, and its label,
+        separated by /) and its shape with the global placement
+    """
+
+    if doc is None:
+        doc = FreeCAD.ActiveDocument
+    solids = []
+    for fco in doc.Objects:
+        if fco.InList:
+            # used by other objects, or inside a group: taken from it
+            continue
+        plm = getattr(fco, 'Placement', FreeCAD.Placement())
+        solids.extend(_placed_solids(fco, plm, fco.Label, visible))
+    return solids
+
+
+def report_doc (doc = None, materials = None, n_proc = 0):
+    """ Mass properties of the final solids of a document, including the
+    objects of the App::Part and of the App::Link, see doc_solids
+
+    Args:
+        doc: FreeCAD document, if None: the active document
+        materials: dictionary {name of the object: material} to set the
+                   material of some objects, the rest are taken from
+                   their property Material or their labels (MAT_LABEL)
+        n_proc: number of processes, see geo_props_batch
+
+    Returns:
+        list of MassProps
+    """
+
+    if materials is None:
+        materials = {}
+    solids = doc_solids(doc)
+    names = [name for fco, name, shp in solids]
+    mats = [materials.get(fco.Name, get_fco_material(fco))
+            for fco, name, shp in solids]
+    return mass_props(names, [shp for fco, name, shp in solids], mats,
+                      n_proc)
+
+
+def total_props (rows, name = 'TOTAL'):
+    """ Mass properties of all the components together
+
+    Args:
+        rows: list of MassProps
+
+    Returns:
+        MassProps, its material is ''
+    """
+
+    if not rows:
+        return MassProps(name, '', 0., 0., (0., 0., 0.), (0.,) * 6)
+    masses = np.array([row.mass for row in rows])
+    coms = np.array([row.com for row in rows])
+    bboxes = np.array([row.bbox for row in rows])
+    mass = float(masses.sum())
+    if mass > 0:
+        com = tuple(float(val) for val in np.dot(masses, coms) / mass)
+    else:
+        com = (0., 0., 0.)
+    bbox = tuple(float(val) for val in np.concatenate(
+                                             (bboxes[:, :3].min(axis = 0),
+                                              bboxes[:, 3:].max(axis = 0))))
+    volume = float(sum(row.volume for row in rows))
+    return MassProps(name, '', volume, mass, com, bbox)
+
+
+def format_table (rows, total = 1):
+    """ Text table of the mass properties
+
+    Args:
+        rows: list of MassProps
+        total: 1: a last row with the total is added
+
+    Returns:
+        string with the table
+    """
+
+    if total == 1:
+        rows = list(rows) + [total_props(rows)]
+    name_w = max([len('name')] + [len(row.name) for row in rows])
+    head = ('%-*s %-8s %11s %9s %8s %8s %8s %8s %8s %8s'
+            % (name_w, 'name', 'material', 'volume(cm3)', 'mass(g)',
+               'com x', 'com y', 'com z', 'size x', 'size y', 'size z'))
+    lines = [head, '-' * len(head)]
+    for row in rows:
+        size = [row.bbox[ind + 3] - row.bbox[ind] for ind in range(3)]
+        lines.append('%-*s %-8s %11.2f %9.1f %8.1f %8.1f %8.1f %8.1f %8.1f %8.1f'
+                     % ((name_w, row.name, row.material, row.volume / 1000.,
+                         row.mass) + tuple(row.com) + tuple(size)))
+    return '\n'.join(lines)
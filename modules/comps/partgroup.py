@@ -35,8 +35,6 @@ from fcfun import addBolt, addBoltNut_hole, NutHole
 
 
 
-logging.basicConfig(level=logging.DEBUG,
-                    format='%(%(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
@@ -10,6 +10,8 @@
 # --- LGPL Licence
 # ----------------------------------------------------------------------------
 
+from __future__ import print_function
+
 import FreeCAD
 import Part
 import Draft
@@ -33,6 +35,8 @@ import kcomp_optic
 import fcfun
 import comps
 import kparts
+import patterns
+import holerec
 
 from fcfun import V0, VX, VY, VZ, V0ROT, addBox, addCyl, addCyl_pos, fillet_len
 from fcfun import VXN, VYN, VZN
@@ -42,13 +46,11 @@ from kcomp import TOL
 
 stl_dir = "/stl/"
 
-logging.basicConfig(level=logging.DEBUG,
-                    format='%(%(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 # ----------- class AluProfBracketPerp -----------------------------------
 
-class AluProfBracketPerp (object):
+class AluProfBracketPerp (fcfun.MirrorComp):
 
     """ Bracket to join 2 aluminum profiles that are perpendicular,
         that is, they are not on the same plane
@@ -120,6 +122,7 @@ class AluProfBracketPerp (object):
 
     """
 
+    @holerec.log_holes
     def __init__(self, alusize_lin, alusize_perp,
                  br_perp_thick = 3.,
                  br_lin_thick = 3.,
@@ -241,7 +244,7 @@ class AluProfBracketPerp (object):
 
         # chamfer of the inside box
         chmf_in_r = alusize_perp/2. - br_lin_thick -boltpehead_r_tol
-        logger.debug ("chamfer radius" + str(chmf_in_r))
+        logger.debug("chamfer radius %s", chmf_in_r)
 
         # inside box:
         insbox_pos = ( pos + DraftVecUtils.scale(axis_lin,br_perp_thick)
@@ -349,7 +352,7 @@ class AluProfBracketPerp (object):
             self.fco.ViewObject.ShapeColor = color
         else:
             logger.debug("Bracket object with no fco")
-        
+
     # exports the shape into stl format
     # exportStl has problems in FreeCAD 0.17 when there are cylinders
     # or fillets
@@ -473,7 +476,7 @@ class AluProfBracketPerp (object):
 
 # ----------- class AluProfBracketPerpWide -----------------------------------
 
-class AluProfBracketPerpFlap (object):
+class AluProfBracketPerpFlap (fcfun.MirrorComp):
 
     """ Bracket to join 2 aluminum profiles that are perpendicular,
         that is, they are not on the same plane
@@ -550,6 +553,7 @@ class AluProfBracketPerpFlap (object):
 
     """
 
+    @holerec.log_holes
     def __init__(self, alusize_lin, alusize_perp,
                  br_perp_thick = 3.,
                  br_lin_thick = 3.,
@@ -708,7 +712,7 @@ class AluProfBracketPerpFlap (object):
 
             # chamfer of the inside box
             chmf_in_r = alusize_perp/2. - br_lin_thick -boltlihead_r_tol
-            logger.debug ("chamfer radius" + str(chmf_in_r))
+            logger.debug("chamfer radius %s", chmf_in_r)
 
             insbox_pos = ( pos + DraftVecUtils.scale(axis_lin,br_perp_thick)
                            + DraftVecUtils.scale(axis_perp,br_lin_thick))
@@ -825,7 +829,7 @@ class AluProfBracketPerpFlap (object):
             self.fco.ViewObject.ShapeColor = color
         else:
             logger.debug("Bracket object with no fco")
-        
+
     # exports the shape into stl format
     def export_stl (self, name = ""):
         #filepath = os.getcwd()
@@ -912,7 +916,7 @@ class AluProfBracketPerpFlap (object):
 
 # ----------- class AluProfBracketPerpTwin -----------------------------------
 
-class AluProfBracketPerpTwin (object):
+class AluProfBracketPerpTwin (fcfun.MirrorComp):
 
     """ Bracket to join 3 aluminum profiles that are perpendicular,
         that is, they are not on the same plane
@@ -1009,6 +1013,7 @@ class AluProfBracketPerpTwin (object):
         
     """
 
+    @holerec.log_holes
     def __init__(self, alusize_lin, alusize_perp,
                  alu_sep,
                  br_perp_thick = 3.,
@@ -1051,8 +1056,6 @@ class AluProfBracketPerpTwin (object):
         axis_lin_neg = axis_lin.negative()
         axis_wid  = DraftVecUtils.scaleTo(fc_wide_ax,1) 
 
-        # position of the other profile
-        brlin2_pos = pos + DraftVecUtils.scale(axis_wid, alu_sep)
         if bolt_perp_line == 1: # there is bolt
             if sunk == 2:
                 reinforce = 0
@@ -1073,21 +1076,6 @@ class AluProfBracketPerpTwin (object):
                                         fc_lin_ax = axis_lin,
                                         pos = pos,
                                         wfco = 0)
-            h_brlin2 = AluProfBracketPerp(alusize_lin = alusize_lin,
-                                        alusize_perp = alusize_perp,
-                                        br_perp_thick = br_perp_thick,
-                                        br_lin_thick = br_lin_thick,
-                                        bolt_lin_d = bolt_lin_d,
-                                        bolt_perp_d = bolt_perp_d,
-                                        nbolts_lin = nbolts_lin,
-                                        bolts_lin_dist = bolts_lin_dist,
-                                        bolts_lin_rail = bolts_lin_rail,
-                                        xtr_bolt_head = xtr_bolt_head,
-                                        reinforce = reinforce,
-                                        fc_perp_ax = axis_perp,
-                                        fc_lin_ax = axis_lin,
-                                        pos = brlin2_pos,
-                                        wfco = 0)
         else: # no hole:
             h_brlin1 = AluProfBracketPerpFlap (
                                         alusize_lin = alusize_lin,
@@ -1106,29 +1094,15 @@ class AluProfBracketPerpTwin (object):
                                         fc_lin_ax = axis_lin,
                                         pos = pos,
                                         wfco = 0)
-            h_brlin2 = AluProfBracketPerpFlap (
-                                        alusize_lin = alusize_lin,
-                                        alusize_perp = alusize_perp,
-                                        br_perp_thick = br_perp_thick,
-                                        br_lin_thick = br_lin_thick,
-                                        bolt_lin_d = bolt_lin_d,
-                                        bolt_perp_d = bolt_perp_d,
-                                        nbolts_lin = nbolts_lin,
-                                        bolts_lin_dist = bolts_lin_dist,
-                                        bolts_lin_rail = bolts_lin_rail,
-                                        xtr_bolt_head = xtr_bolt_head,
-                                        sunk = sunk,
-                                        flap = 0, #no flap
-                                        fc_perp_ax = axis_perp,
-                                        fc_lin_ax = axis_lin,
-                                        pos = brlin2_pos,
-                                        wfco = 0)
-
-        shp_brlin1 = h_brlin1.shp
-        shp_brlin2 = h_brlin2.shp
 
         # center of the 2, to make the union between both
         pos_mid = pos + DraftVecUtils.scale(axis_wid, alu_sep/2.)
+        # the other bracket is the mirror of the first one by the plane
+        # in the middle, since the brackets are symmetrical on axis_wid
+        h_brlin2 = h_brlin1.mirrored(axis_wid, pos_mid)
+
+        shp_brlin1 = h_brlin1.shp
+        shp_brlin2 = h_brlin2.shp
 
         # box_w has +2 to make the union
         union_w = alu_sep-alusize_lin
@@ -1866,6 +1840,7 @@ class SimpleEndstopHolder (object):
 
     """
 
+    @holerec.log_holes
     def __init__(self,
                  d_endstop,
                  rail_l = 15,
@@ -1945,7 +1920,7 @@ class SimpleEndstopHolder (object):
         mbolt_head_r = d_mbolt['head_r']
         mbolt_head_r_tol = d_mbolt['head_r_tol']
         mbolt_head_l = d_mbolt['head_l']
-        print (str(mbolt_head_l))
+        logger.debug('mbolt_head_l: %s', mbolt_head_l)
         # endstop data. change h->d, d->h, l->w
         estp_tot_d = d_endstop['HT']
         estp_d = d_endstop['H']
@@ -1978,7 +1953,7 @@ class SimpleEndstopHolder (object):
             tot_h = base_h + mbolt_head_l
             if tot_h > h:
                 logger.debug('h is smaller that it should, taking: ')
-                logger.debug(str(tot_h))
+                logger.debug('tot_h: %s', tot_h)
             else:
                 tot_h = h
 
@@ -1990,10 +1965,10 @@ class SimpleEndstopHolder (object):
             endstop_nut_l =  kcomp.NUT_D934_L[estp_bolt_d]+TOL
         else:
             if endstop_nut_dist > tot_h -  kcomp.NUT_D934_L[estp_bolt_d]+TOL:
-                logger.debug('endstop_nut_dist: ' + str(endstop_nut_dist)
-                             + ' larger than total height - (nut length+tol): '
-                             + str(tot_h) + ' - '
-                             + str( kcomp.NUT_D934_L[estp_bolt_d] + TOL))
+                logger.debug('endstop_nut_dist: %s larger than total height'
+                             ' - (nut length+tol): %s - %s',
+                             endstop_nut_dist, tot_h,
+                             kcomp.NUT_D934_L[estp_bolt_d] + TOL)
                 endstop_nut_l =  kcomp.NUT_D934_L[estp_bolt_d]+TOL
             else:
                 endstop_nut_l = tot_h - endstop_nut_dist
@@ -2325,6 +2300,7 @@ class ThinLinBearHouse1rail (object):
     # Radius to fillet the sides
     FILLT_R = kparts.FILLT_R
 
+    @holerec.log_holes
     def __init__(self, d_lbear,
                  fc_slide_axis = VX,
                  fc_bot_axis =VZN,
@@ -2382,26 +2358,26 @@ class ThinLinBearHouse1rail (object):
         bolt2wall = fcfun.get_bolt_end_sep(BOLT_D, hasnut=1) 
         #housing_l = bearing_l_tol + 2 * (2*BOLT_HEAD_R_TOL + 2* MIN_SEP_WALL)
         housing_l = bearing_l_tol + 2 * (2* bolt2wall)
-        print "housing_l: %", housing_l
+        logger.debug("housing_l: %s", housing_l)
         # width of the housing (very tight)
         housing_w = max ((bearing_d_tol + 2* MIN_SEP_WALL), 
                          (d_lbear['Di'] + 4* MIN2_SEP_WALL + 2*BOLT_D))
-        print "housing_w: %", housing_w
+        logger.debug("housing_w: %s", housing_w)
 
         # dimensions of the base:
         # length on the direction of the sliding rod
         base_l = housing_l +  4* MIN_SEP_WALL + 4 * BOLT_HEAD_R_TOL
-        print "base_l: %", base_l
+        logger.debug("base_l: %s", base_l)
         # width of the base (very tight), the same as the housing
         base_w = housing_w
-        print "base_w: %", base_w
+        logger.debug("base_w: %s", base_w)
         # height of the base (not tight). twice the mininum height
         base_h = 2 * OUT_SEP_H 
-        print "base_h: %", base_h
+        logger.debug("base_h: %s", base_h)
 
         # height of the housing (not tight, can be large)
         housing_h = base_h +  2* BOLT_HEAD_L + bearing_d_tol
-        print "housing_h: %", housing_h
+        logger.debug("housing_h: %s", housing_h)
 
 
         # distance on the slide_axis from midcenter=0 to midcenter 1.
@@ -2735,6 +2711,7 @@ class ThinLinBearHouse (object):
     # Radius to fillet the sides
     FILLT_R = kparts.FILLT_R
 
+    @holerec.log_holes
     def __init__(self, d_lbear,
                  fc_slide_axis = VX,
                  fc_bot_axis =VZN,
@@ -2815,8 +2792,8 @@ class ThinLinBearHouse (object):
             housing_w = max ((bearing_d + 2* MIN_SEP_WALL), 
                               2 * (bolt2wall + bolt2axis))
 
-        print "housing_l: %", housing_l
-        print "housing_w: %", housing_w
+        logger.debug("housing_l: %s", housing_l)
+        logger.debug("housing_w: %s", housing_w)
 
         # bolt distance
         # distance of the bolts to the center, on n1_slide_axis dir
@@ -2827,7 +2804,7 @@ class ThinLinBearHouse (object):
         # minimum height of the housing 
         housing_min_h = bearing_d + 2 * OUT_SEP_H
         axis_min_h = housing_min_h / 2.
-        print "min housing_h: %", housing_min_h
+        logger.debug("min housing_h: %s", housing_min_h)
         if axis_h == 0:
             # minimum values
             housing_h = housing_min_h
@@ -3089,6 +3066,7 @@ class LinBearHouse (object):
     FILLT_R = kparts.FILLT_R
 
 
+    @holerec.log_holes
     def __init__(self, d_lbearhousing,
                  fc_slide_axis = VX,
                  fc_bot_axis =VZN,
@@ -3482,6 +3460,7 @@ class ThinLinBearHouseAsim (object):
     # Radius to fillet the sides
     FILLT_R = kparts.FILLT_R
 
+    @holerec.log_holes
     def __init__(self, d_lbear,
                  fc_fro_ax = VX,
                  fc_bot_ax =VZN,
@@ -3587,8 +3566,8 @@ class ThinLinBearHouseAsim (object):
                               2 * bolt2wall + bolt2cen_wid_n + bolt2cen_wid_p)
 
 
-        print "housing_d: %", housing_d
-        print "housing_w: %", housing_w
+        logger.debug("housing_d: %s", housing_d)
+        logger.debug("housing_w: %s", housing_w)
 
         # bolt distance
         # distance of the bolts to the center, on nfro_ax dir
@@ -3597,7 +3576,7 @@ class ThinLinBearHouseAsim (object):
         # minimum height of the housing 
         housing_min_h = bearing_d + 2 * OUT_SEP_H
         axis_min_h = housing_min_h / 2.
-        print "min housing_h: %", housing_min_h
+        logger.debug("min housing_h: %s", housing_min_h)
         if axis_h == 0:
             # minimum values
             housing_h = housing_min_h
@@ -3857,6 +3836,7 @@ class NemaMotorHolder (object):
 
     """
 
+    @holerec.log_holes
     def __init__ (self,
                   nema_size = 17,
                   wall_thick = 4.,
@@ -3911,13 +3891,13 @@ class NemaMotorHolder (object):
         if bolt_wall_sep == 0:
             bolt_wall_sep = max_bolt_wall_sep
         elif bolt_wall_sep > max_bolt_wall_sep:
-            logger.debug('bolt wall separtion too large: ' + str(bolt_wall_sep))
+            logger.debug('bolt wall separtion too large: %s', bolt_wall_sep)
             bolt_wall_sep = max_bolt_wall_sep
-            logger.debug('taking larges value: ' + str(bolt_wall_sep))
+            logger.debug('taking larges value: %s', bolt_wall_sep)
         elif bolt_wall_sep <  4 * boltwallhead_r:
-            logger.debug('bolt wall separtion too short: ' + str(bolt_wall_sep))
+            logger.debug('bolt wall separtion too short: %s', bolt_wall_sep)
             bolt_wall_sep = max_bolt_wall_sep
-            logger.debug('taking larges value: ' + str(bolt_wall_sep))
+            logger.debug('taking larges value: %s', bolt_wall_sep)
         # else: the given separation is good
 
         # making the big box that will contain everything and will be cut
@@ -3970,7 +3950,6 @@ class NemaMotorHolder (object):
         shp_box = fcfun.shp_filletchamfer_dir(shp_box, axis_h,
                                               fillet=0,
                                               radius = chmf_r)
-        doc.recompute()
         shp_box = shp_box.removeSplitter()
 
         # chamfer of the box to make a 'triangular' reinforcement
@@ -3983,7 +3962,6 @@ class NemaMotorHolder (object):
                                               fc_pt =chmf_pos,
                                               fillet=0,
                                               radius = chmf_reinf_r)
-        doc.recompute()
 
         # holes:
         holes = []
@@ -4000,7 +3978,6 @@ class NemaMotorHolder (object):
 
         shp_motor = fcfun.shp_filletchamfer_dir(shp_motor, fc_axis=axis_h,
                                                 fillet=0, radius=chmf_r)
-        doc.recompute()
         holes.append(shp_motor)
 
         # central circle of the motor
@@ -4013,20 +3990,22 @@ class NemaMotorHolder (object):
                                        pos = motax_pos)
         holes.append(shp_hole)
 
-        # motor bolt holes
-        for add_n in (DraftVecUtils.scale(axis_n, motor_bolt_sep/2.),
-                      DraftVecUtils.scale(axis_n,-motor_bolt_sep/2.)):
-            for add_p in (DraftVecUtils.scale(axis_p, motor_bolt_sep/2.),
-                      DraftVecUtils.scale(axis_p,-motor_bolt_sep/2.)):
-                hole_pos = motax_pos + add_n + add_p
-                shp_hole = fcfun.shp_cylcenxtr( r = motor_bolt_d/2.+TOL,
-                                                h = motor_thick,
-                                                normal = axis_h,
-                                                ch = 0,
-                                                xtr_top = 1,
-                                                xtr_bot = 1,
-                                                pos = hole_pos)
-                holes.append(shp_hole)
+        # motor bolt holes: the hole is made once and translated to the
+        # 4 positions around the motor axis
+        shp_hole = fcfun.shp_cylcenxtr( r = motor_bolt_d/2.+TOL,
+                                        h = motor_thick,
+                                        normal = axis_h,
+                                        ch = 0,
+                                        xtr_top = 1,
+                                        xtr_bot = 1,
+                                        pos = V0)
+        bolt_pts = patterns.pts_to_global(patterns.pts_sym4(motor_bolt_sep),
+                                          motax_pos, axis_n, axis_p)
+        holes.append(patterns.shp_pattern(shp_hole, bolt_pts))
+        holerec.record(holerec.hole_recs(bolt_pts, axis_h,
+                                         d = motor_bolt_d + 2 * TOL,
+                                         depth = motor_thick,
+                                         kind = 'bolt', metric = motor_bolt_d))
 
         # rail holes. To mount the motor holder to a profile or whatever
         for add_p in (DraftVecUtils.scale(axis_p, motor_bolt_sep/2.),
@@ -4066,6 +4045,7 @@ class NemaMotorHolder (object):
         shp_motorholder = shp_box.cut(shp_holes)
         
         self.shp = shp_motorholder
+        self.wfco = wfco
         if wfco == 1:
             # a freeCAD object is created
             fco_motorholder = doc.addObject("Part::Feature", name )
@@ -4626,7 +4606,7 @@ class Plate3CageCubes (object):
 #                pos = V0,
 #                name = 'Plate3CageCubes')
 
-class hallestop_holder (object):
+class hallestop_holder (fcfun.MirrorComp):
 
 
     def __init__(self,
@@ -4753,7 +4733,7 @@ class hallestop_holder (object):
 
         # chamfer of the inside box
         chmf_in_r = boltpehead_r
-        logger.debug ("chamfer radius" + str(chmf_in_r))
+        logger.debug("chamfer radius %s", chmf_in_r)
 
         # inside box:
         insbox_pos = ( pos + DraftVecUtils.scale(axis_lin,sup_thick)
@@ -4848,7 +4828,7 @@ class hallestop_holder (object):
             self.fco.ViewObject.ShapeColor = color
         else:
             logger.debug("Bracket object with no fco")
-        
+
     # exports the shape into stl format
     def export_stl (self, name = ""):
         #filepath = os.getcwd()
@@ -22,14 +22,13 @@ import kcomp    # import material constants and other constants
 import comps    # import my CAD components
 import beltcl   # import my CAD components
 import partgroup  # import my CAD components
+import fctrace
 
 from fcfun import V0, VX, VY, VZ, V0ROT, addBox, addCyl, fillet_len
 from fcfun import addBolt, addBoltNut_hole, NutHole
 from kcomp import TOL
 
 
-logging.basicConfig(level=logging.DEBUG)
-                    #format='%(%(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 # ---------- class EndShaftSlider ----------------------------------------
@@ -38,6 +37,12 @@ logger = logging.getLogger(__name__)
 # The slider is referenced on the slider axis
 # Creates both sides, the upper part and the lower part, it also creates the
 # linear bearings
+# The same class is used by the stages (stageparts, citoparts, ...), that
+# only change its constants (the class attributes in capital letters).
+# The shapes of the top and bottom parts and of the bearings are kept in a
+# cache, so the sliders with the same dimensions and constants (i.e. the
+# 2 slider ends of a stage) are made once, and the other sides are the
+# cached shapes rotated
 
 #     slidrod_r : radius of the rod where the slider runs on
 #     holdrod_r : radius of the rod that this slider holds
@@ -45,6 +50,8 @@ logger = logging.getLogger(__name__)
 #     holdrod_cen : 1: if the piece is centered on the perpendicular 
 #     side        : 'left' or 'right' (slidding on axis Y)
 #                 : 'bottom' or 'top' (slidding on axis X)
+#     shp_only    : 1 to make only the shapes (shp_top, shp_bot, shp_bear)
+#                   without FreeCAD objects
 #
 #          Y      axis= 'y'    side='left'
 #          |
@@ -96,15 +103,38 @@ logger = logging.getLogger(__name__)
 # dent_w  : width of the dent, if no dent is needed, just dent_w = 0
 # dent_l  : length of the dent, 
 # dent_sl : small dimension of the dent length
+# ovdent_w  : width of the dent, including the overlap to make the union
+# ovdent_l  : length of the dent, including the overlap to make the union 
+#   Note: dent_w and dent_l were the dimensions with the overlap, now they
+#   are without it, as in the stages (dent_w = ovdent_w - 1). The callers
+#   that took them to make a CentralSlider have the same dent as before,
+#   the ones that used them for something else have to take ovdent_w and
+#   ovdent_l
+# idlepull_axsep : separation between the axis iddle pulleys
+# pulley_posx: relative position X of the idle pulleys
+# belt_sep : separation between the inner part of the iddle pulleys
+#                   that is where the belts are. So it is
+#                   idlepull_axsep - 2* radius of the bearing
+# shp_top, shp_bot, shp_bear: shapes of the top and bottom parts of the
+#             slider and of the bearings
 # iddlepulls : FreeCad object of the idle pulleys
 # bearings : FreeCad object of the bearings
 # top_slide : FreeCad object of the top part of the slider
 # bot_slide : FreeCad object of the bottm part of the slider
-# base_place: position of the 3 elements: All of them have the same base
-#             position.
+#             (None the FreeCAD objects if shp_only)
+# base_place: position of the 4 elements: All of them are moved by it from
+#             their placement on their side (see side_place).
 #             It is (0,0,0) when initialized, it has to be changed using the
 #             function Base_Place
 
+# cache of the shapes of the sliders, made on side 'left':
+# {(slidrod_r, holdrod_r, holdrod_sep, holdrod_cen, LAYER3D_H, constants):
+#  (shp_top, shp_bot, shp_bear)}
+# kcomp.LAYER3D_H is in the key because the supports of the bolt holes
+# depend on it, and it can be changed for other printers
+_endslider_cache = {}
+
+
 class EndShaftSlider (object):
 
     # Separation from the end of the linear bearing to the end of the piece
@@ -122,7 +152,7 @@ class EndShaftSlider (object):
     FILLT_R = 2.0
 
     # Space for the sliding rod, to be added to its radius, and to be cut
-    SLIDEROD_SPACE = 1.5
+    ROD_SPACE = 1.5
 
     # tolerance on their length for the bearings. Larger because the holes
     # usually are too tight and it doesn't matter how large is the hole
@@ -132,63 +162,128 @@ class EndShaftSlider (object):
     MTOL = TOL - 0.1 # reducing the tolrances, it was too tolerant :)
     MLTOL = TOL - 0.05 # reducing the tolrances, it was too tolerant :)
 
-    # Bolts to hold the top and bottom parts:
-    BOLT_R = 4
-    BOLT_HEAD_R = kcomp.D912_HEAD_D[BOLT_R] / 2.0
-    BOLT_HEAD_L = kcomp.D912_HEAD_L[BOLT_R] + MTOL
-    BOLT_HEAD_R_TOL = BOLT_HEAD_R + MTOL/2.0 
-    BOLT_SHANK_R_TOL = BOLT_R / 2.0 + MTOL/2.0
-    BOLT_NUT_R = kcomp.NUT_D934_D[BOLT_R] / 2.0
-    BOLT_NUT_L = kcomp.NUT_D934_L[BOLT_R] + MTOL
-    #  1.5 TOL because diameter values are minimum, so they may be larger
-    BOLT_NUT_R_TOL = BOLT_NUT_R + 1.5*MTOL
+    # Metric of the bolts to hold the top and bottom parts, and of the bolts
+    # for the pulleys. If 0: 4 if the sliding rod is 12mm diameter or larger,
+    # 3 if it is smaller
+    BOLT_D = 4
+    BOLTPUL_D = 4
 
-    # Bolts for the pulleys
-    BOLTPUL_R = 4
-    BOLTPUL_SHANK_R_TOL = BOLTPUL_R / 2.0 + MTOL/2.0
-    BOLTPUL_NUT_R = kcomp.NUT_D934_D[BOLTPUL_R] / 2.0
-    BOLTPUL_NUT_L = kcomp.NUT_D934_L[BOLTPUL_R] + MTOL
-    #  1.5 TOL because diameter values are minimum, so they may be larger
-    BOLTPUL_NUT_R_TOL = BOLTPUL_NUT_R + 1.5*MTOL
+    # Position of the right middle bolts and of the idle pulleys:
+    # 'outsep': referenced to the ends of the slider
+    # 'holdrod': referenced to the holes of the hold rods
+    BOLT_LAYOUT = 'outsep'
+
+    # If not 0, the idle pulleys are centered on the slider, with this
+    # separation between their axes, on the line of the right bolt
+    IDLEPULL_SEP = 0
+
+    # list of kcomp.HollowCyl to make the idle pulleys.
+    # If None: kcomp.idpull_dict[BOLTPUL_D]
+    IDLEPULL_LIST = None
+
+    # constants that define the shapes, they are part of the key of the cache
+    SHP_CONSTS = ('OUT_SEP_H', 'MIN_BEAR_SEP', 'HOLDROD_INS_RATIO', 'FILLT_R',
+                  'ROD_SPACE', 'TOL_BEARING_L', 'MTOL', 'MLTOL',
+                  'bolt_d', 'boltpul_d', 'BOLT_LAYOUT', 'IDLEPULL_SEP')
 
     def __init__ (self, slidrod_r, holdrod_r, holdrod_sep, 
-                  name, holdrod_cen = 1, side = 'left'):
+                  name, holdrod_cen = 1, side = 'left', shp_only = 0):
 
-        doc = FreeCAD.ActiveDocument
         self.base_place = (0,0,0)
         self.slidrod_r = slidrod_r
         self.holdrod_r = holdrod_r
         self.holdrod_sep = holdrod_sep
         self.holdrod_cen = holdrod_cen
+        self.side = side
     
         self.name        = name
-        #self.axis        = axis
+
+        # Bolts to hold the top and bottom parts, and for the pulleys
+        if slidrod_r >= 6:
+            bolt_d = 4
+        else:
+            bolt_d = 3 # smaller bolts when the shaft are less 12mm diameter
+        self.bolt_d = self.BOLT_D or bolt_d
+        self.boltpul_d = self.BOLTPUL_D or bolt_d
+        if self.IDLEPULL_LIST is None:
+            self.idlepull_list = kcomp.idpull_dict[self.boltpul_d]
+        else:
+            self.idlepull_list = self.IDLEPULL_LIST
+
+        self.calc_dims()
+
+        key = ((slidrod_r, holdrod_r, holdrod_sep, holdrod_cen,
+                kcomp.LAYER3D_H)
+               + tuple(getattr(self, cname) for cname in self.SHP_CONSTS))
+        if key not in _endslider_cache:
+            with fctrace.span(type(self).__name__, 'shape'):
+                _endslider_cache[key] = self.make_shp()
+        elif fctrace.enabled:
+            fctrace.count(type(self).__name__, 'shape_hit')
+        # the cached shapes are on side 'left'
+        side_mtx = self.side_place().toMatrix()
+        self.shp_top, self.shp_bot, self.shp_bear = [
+                                   fcfun.shp_transform_copy(shp, side_mtx)
+                                   for shp in _endslider_cache[key]]
+
+        self.idlepulls = None
+        self.bearings = None
+        self.top_slide = None
+        self.bot_slide = None
+        if shp_only == 0:
+            with fctrace.span(type(self).__name__, 'fco', side = side):
+                self.make_fcos()
+
+    def calc_dims (self):
+        """ Calculates the dimensions of the slider and the positions of its
+        holes, on side 'left' """
+
+        slidrod_r = self.slidrod_r
+        holdrod_r = self.holdrod_r
+        holdrod_sep = self.holdrod_sep
+        MTOL = self.MTOL
+
+        # Bolts to hold the top and bottom parts:
+        BOLT_HEAD_R = kcomp.D912_HEAD_D[self.bolt_d] / 2.0
+        self.BOLT_HEAD_L = kcomp.D912_HEAD_L[self.bolt_d] + MTOL
+        self.BOLT_HEAD_R_TOL = BOLT_HEAD_R + MTOL/2.0 
+        self.BOLT_SHANK_R_TOL = self.bolt_d / 2.0 + MTOL/2.0
+        BOLT_NUT_R = kcomp.NUT_D934_D[self.bolt_d] / 2.0
+        self.BOLT_NUT_L = kcomp.NUT_D934_L[self.bolt_d] + MTOL
+        #  1.5 TOL because diameter values are minimum, so they may be larger
+        self.BOLT_NUT_R_TOL = BOLT_NUT_R + 1.5*MTOL
+
+        # Bolts for the pulleys
+        self.BOLTPUL_SHANK_R_TOL = self.boltpul_d / 2.0 + MTOL/2.0
+        BOLTPUL_NUT_R = kcomp.NUT_D934_D[self.boltpul_d] / 2.0
+        self.BOLTPUL_NUT_L = kcomp.NUT_D934_L[self.boltpul_d] + MTOL
+        #  1.5 TOL because diameter values are minimum, so they may be larger
+        self.BOLTPUL_NUT_R_TOL = BOLTPUL_NUT_R + 1.5*MTOL
 
         # Separation from the end of the linear bearing to the end of the piece
         # on the width dimension (perpendicular to the movement)
-        if self.BOLT_R == 3:
+        if self.bolt_d == 3:
             self.OUT_SEP_W = 8.0
             # on the length dimension (parallel to the movement)
             self.OUT_SEP_L = 10.0
-        elif self.BOLT_R == 4:
+        elif self.bolt_d == 4:
             self.OUT_SEP_W = 10.0
             self.OUT_SEP_L = 14.0
         else:
-            print "not defined"
+            logger.error('bolt metric not defined: %s', str(self.bolt_d))
 
-        bearing_l     = kcomp.LMEUU_L[int(2*slidrod_r)] 
-        bearing_l_tol = bearing_l + self.TOL_BEARING_L
-        bearing_d     = kcomp.LMEUU_D[int(2*slidrod_r)]
-        bearing_d_tol = bearing_d + 2.0 * self.MLTOL
-        bearing_r     = bearing_d / 2.0
+        self.bearing_l = kcomp.LMEUU_L[int(2*slidrod_r)] 
+        self.bearing_d = kcomp.LMEUU_D[int(2*slidrod_r)]
+        bearing_r     = self.bearing_d / 2.0
+        self.bearing_r = bearing_r
         bearing_r_tol = bearing_r + self.MLTOL
 
-        holdrod_r_tol =  holdrod_r + self.MLTOL/2.0
+        self.holdrod_r_tol =  holdrod_r + self.MLTOL/2.0
 
-        holdrod_insert = self.HOLDROD_INS_RATIO * (2*slidrod_r) 
+        self.holdrod_insert = self.HOLDROD_INS_RATIO * (2*slidrod_r) 
 
         self.slide2holdrod = bearing_r + self.MIN_BEAR_SEP 
-        if side == 'right' or side == 'top':
+        if self.side == 'right' or self.side == 'top':
             # the distance will be negative, either on the X axis (right)
             # or on the Y axis (top)
             self.slide2holdrod_sign = - self.slide2holdrod
@@ -197,187 +292,269 @@ class EndShaftSlider (object):
     
         # calculation of the width
         # dimensions should not depend on tolerances
-        self.width = (  bearing_d     #bearing_d_tol
+        self.width = (  self.bearing_d     #bearing_d_tol
                       + self.OUT_SEP_W
-                      + holdrod_insert
+                      + self.holdrod_insert
                       + self.MIN_BEAR_SEP )
 
-
         # calculation of the length
         # it can be determined by the holdrod_sep (separation of the hold rods)
         # or by the dimensions of the linear bearings. It will be the largest
         # of these two: 
         # tlen: total length ..
         tlen_holdrod = holdrod_sep + 2 * self.OUT_SEP_L + 2 * holdrod_r
-        #tlen_holdrod = holdrod_sep + 2 * self.OUT_SEP_L + 2 * holdrod_r_tol
-        #tlen_bearing = (  2 * bearing_l_tol
-        tlen_bearing = (  2 * bearing_l
+        tlen_bearing = (  2 * self.bearing_l
                         + 2* self.OUT_SEP_L
                         + self.MIN_BEAR_SEP)
         if tlen_holdrod > tlen_bearing:
             self.length = tlen_holdrod
-            print "length comes from holdrod"
+            logger.debug('length comes from holdrod')
         else:
             self.length = tlen_bearing
-            print "length comes from bearing: Check for errors"
-       
+            logger.debug('length comes from bearing: Check for errors')
 
         self.partheight = (  bearing_r
                            + self.OUT_SEP_H)
 
-        
         # distance from the center of the hold rod to the end on the sliding
         # direction
         self.holdrod2end = (self.length - holdrod_sep)/2
 
-#        if axis == 'x':
-#            slid_x = self.length
-#            slid_y = self.width
-#            slid_z = self.partheight
-#        else: # 'y': default
-        slid_x = self.width
-        slid_y = self.length
-        slid_z = self.partheight
-
-        if holdrod_cen == 1:
+        if self.holdrod_cen == 1:
             # offset if it is centered on the y
-            y_offs = - slid_y/2.0
+            y_offs = - self.length/2.0
         else:
             y_offs = 0
+        self.y_offs = y_offs
 
+        self.slid_posx = - (bearing_r + self.OUT_SEP_W)
 
-        slid_posx = - (bearing_r + self.OUT_SEP_W)
-
-
-        bearing0_pos_y = self.OUT_SEP_L
         # Not bearing_l_tol, because the tol will be added on top and bottom
         # automatically
-        bearing1_pos_y = self.length - (self.OUT_SEP_L + bearing_l)
-         
-        # adding the offset
-        bearing0_pos_y = bearing0_pos_y + y_offs
-        bearing1_pos_y = bearing1_pos_y + y_offs
+        self.bearing0_pos_y = self.OUT_SEP_L + y_offs
+        self.bearing1_pos_y = (  self.length - (self.OUT_SEP_L + self.bearing_l)
+                               + y_offs)
 
+        # -------------------- bolts and nuts
+        self.bolt_left_pos_x =  -(  bearing_r
+                                  + self.OUT_SEP_W
+                                  + slidrod_r + self.ROD_SPACE) / 2.0
+
+        self.bolt_right_pos_x =   (  bearing_r
+                                   + self.MIN_BEAR_SEP
+                                   + 0.6 * self.holdrod_insert )
+
+        self.bolt_low_pos_y =  self.OUT_SEP_L / 2.0 + y_offs
+        self.bolt_high_pos_y =  self.length - self.OUT_SEP_L / 2.0 + y_offs
+
+        self.bolt_pull_pos_x =   (  bearing_r_tol
+                                  + self.MIN_BEAR_SEP
+                                  + 0.25 * self.holdrod_insert )
+        self.pulley_posx = self.bolt_pull_pos_x
+
+        if self.BOLT_LAYOUT == 'holdrod':
+            self.bolt_lowmid_pos_y = ( self.holdrod2end
+                                     + holdrod_r
+                                     + .5 * self.OUT_SEP_L
+                                     + y_offs )
+            self.bolt_highmid_pos_y = (  self.length
+                                       - self.holdrod2end
+                                       - holdrod_r 
+                                       - .5 * self.OUT_SEP_L
+                                       + y_offs)
+            self.bolt_pullow_pos_y = self.bolt_lowmid_pos_y + self.OUT_SEP_L
+            self.bolt_pulhigh_pos_y = self.bolt_highmid_pos_y - self.OUT_SEP_L
+        else: # 'outsep'
+            self.bolt_lowmid_pos_y = (  1.5 * self.OUT_SEP_L + 2 * holdrod_r
+                                      + y_offs)
+            self.bolt_highmid_pos_y = (  self.length
+                                       - 1.5 * self.OUT_SEP_L
+                                       - 2 * holdrod_r  # no _tol
+                                       + y_offs)
+            self.bolt_pullow_pos_y = (  2.5 * self.OUT_SEP_L + 2 * holdrod_r
+                                      + y_offs)
+            self.bolt_pulhigh_pos_y = (  self.length
+                                       - 2.5 * self.OUT_SEP_L
+                                       - 2 * holdrod_r  # no _tol
+                                       + y_offs)
+
+        # position of the holes of the bolts of the idle pulleys
+        if self.IDLEPULL_SEP:
+            # centered, on the line of the right bolt
+            self.idlepull_posx = - self.bolt_left_pos_x
+            self.bolt_pullow_pos_y = (  self.length/2. + y_offs
+                                      - self.IDLEPULL_SEP/2.)
+            self.bolt_pulhigh_pos_y = (  self.length/2. + y_offs
+                                       + self.IDLEPULL_SEP/2.)
+        else:
+            self.idlepull_posx = self.bolt_pull_pos_x
+
+        # CHECK: there is no space, length too small
+        pulleyextdiam = partgroup.getmaxwashdiam(self.idlepull_list)
+        rodsep_extra = (  self.bolt_pulhigh_pos_y
+                        - self.bolt_pullow_pos_y
+                        - pulleyextdiam)
+        if rodsep_extra <0:
+            logger.error("Rod separation %d, too small", holdrod_sep)
+            logger.error("It is %d shorter", rodsep_extra)
+        else:
+            logger.debug("Rod separation %d", holdrod_sep)
+            logger.debug("extra space %d", rodsep_extra)
+
+        # separation between the axis iddle pulleys
+        self.idlepull_axsep = self.bolt_pulhigh_pos_y - self.bolt_pullow_pos_y
+        # separation between the inner part of the iddle pulleys
+        # ie: idlepull_axsep - the diameter of the pulley (bearing)
+        # -1 is because the belt is 1.38mm thick. So in each side we can
+        # substract 0.5 mm
+        self.belt_sep = (  self.idlepull_axsep
+                         - partgroup.getmaxbeardiam(self.idlepull_list) - 1)
+
+        # --- dent in the interior to save plastic
+        # points: p dent
+        slid_z = self.partheight
+        self.pdent_list = [
+               # ur
+               FreeCAD.Vector ( self.width + self.slid_posx + 1,
+                                self.bolt_highmid_pos_y - 1,
+                               -slid_z - 1),
+               # ul
+               FreeCAD.Vector ( self.bolt_pull_pos_x + 1,
+                                self.bolt_pulhigh_pos_y - self.OUT_SEP_L ,
+                               -slid_z - 1),
+               # dl
+               FreeCAD.Vector ( self.bolt_pull_pos_x + 1,
+                                self.bolt_pullow_pos_y + self.OUT_SEP_L ,
+                               -slid_z - 1),
+               # dr
+               FreeCAD.Vector ( self.width + self.slid_posx + 1,
+                                self.bolt_lowmid_pos_y +1,
+                               -slid_z - 1)]
+        pdent_ur, pdent_ul, pdent_dl, pdent_dr = self.pdent_list
+
+        # the length is actually shorter, because it is 1 mm inside.
+        #         
+        #        ur  ____ ovdent_l
+        #         /|                 h_over= (1/ovdent_w)*(ovdent_l-dent_sl)/2.
+        #        /_| ___ dent_l      h_over= triang_h_ov / ovdent_w
+        #       /| |    
+        #      / | |          dent_l = ovdent_l -2*lm
+        #     /  | |          
+        # ul /___|_| __ dent_sl
+        #    |     |
+        #    |     |
+        #    |     |
+        # dl |_____| __
+        #    \   | |
+        #     \  | |
+        #      \ | |
+        #       \|_| ___
+        #        \ |
+        #         \| ____
+        #          dr
+        #         1
+        #    |---|  dent_w
+        #    |-----| ovdent_w 
+        #
+        # the dimensions of the dent overlaped (ov), to make the shape
+        self.ovdent_w = abs(pdent_ur.x - pdent_ul.x) # longer width
+        self.dent_w   = self.ovdent_w - 1
+        self.ovdent_l = abs(pdent_ur.y - pdent_dr.y) # longer  Length 
+        self.dent_sl  = abs(pdent_ul.y - pdent_dl.y) # shorter Length 
+        # the height of the overlap triangle
+        triang_h_ov = abs(pdent_ur.y - pdent_ul.y)
+        self.dent_l = ( self.ovdent_l 
+                       - 2*(triang_h_ov / self.ovdent_w)) # h_over
+
+    def side_place (self):
+        """ Placement of the slider on its side, from side 'left' """
+
+        if self.holdrod_cen == 1:
+            pos = V0
+        elif self.side == 'right':
+            pos = FreeCAD.Vector (0, self.length,0)
+        elif self.side == 'bottom':
+            pos = FreeCAD.Vector (self.length,0,0)
+        else:
+            pos = V0
+        if self.side == 'right':
+            rot = FreeCAD.Rotation (VZ, 180)
+        elif self.side == 'bottom':
+            rot = FreeCAD.Rotation (VZ, 90)
+        elif self.side == 'top':
+            rot = FreeCAD.Rotation (VZ, -90)
+        else: # 'left': default condition
+            rot = V0ROT
+        return FreeCAD.Placement(pos, rot)
+
+    def make_shp (self):
+        """ Makes the shapes of the top and bottom parts of the slider,
+        and of the bearings, on side 'left'
+
+        Returns:
+            tuple (shp_top, shp_bot, shp_bear)
+        """
 
-        topslid_box = addBox(slid_x, slid_y, slid_z, "topsideslid_box")
-        topslid_box.Placement.Base = FreeCAD.Vector(slid_posx, y_offs, 0)
-
-        botslid_box = addBox(slid_x, slid_y, slid_z, "bosidetslid_box")
-        botslid_box.Placement.Base = FreeCAD.Vector(slid_posx, y_offs,
-                                                    -self.partheight)
-
-        topslid_fllt = fillet_len (topslid_box, slid_z, 
-                                  self.FILLT_R, "topsideslid_fllt")
-        botslid_fllt = fillet_len (botslid_box, slid_z,
-                                  self.FILLT_R, "botsideslid_fllt")
+        slid_x = self.width
+        slid_y = self.length
+        slid_z = self.partheight
+        y_offs = self.y_offs
+
+        shp_topslid = fcfun.shp_boxcenfill(slid_x, slid_y, slid_z,
+                                           self.FILLT_R,
+                                           pos = FreeCAD.Vector(
+                                                  self.slid_posx, y_offs, 0))
+        shp_botslid = fcfun.shp_boxcenfill(slid_x, slid_y, slid_z,
+                                           self.FILLT_R,
+                                           pos = FreeCAD.Vector(
+                                                  self.slid_posx, y_offs,
+                                                  -slid_z))
 
         # list of elements that cut:
         cutlist = []
-
-        sliderod = fcfun.addCyl_pos (r = slidrod_r + self.SLIDEROD_SPACE,
-                               h = slid_y +2,
-                               name = "sliderod",
-                               axis = 'y',
-                               h_disp = y_offs - 1)
-
-        cutlist.append (sliderod)
-
-        h_lmuu_0 = comps.LinBearing (
-                         r_ext = bearing_r,
-                         r_int = slidrod_r,
-                         h     = bearing_l,
-                         name  = "lm" + str(int(2*slidrod_r)) + "uu_0",
-                         axis  = 'y',
-                         h_disp = bearing0_pos_y,
-                         r_tol  = self.MLTOL,
-                         h_tol  = self.TOL_BEARING_L)
-
-        cutlist.append (h_lmuu_0.bearing_cont)
-
-        h_lmuu_1 = comps.LinBearingClone (
-                                      h_lmuu_0,
-                                      "lm" + str(int(2*slidrod_r)) + "uu_1",
-                                      namadd = 0)
-        h_lmuu_1.BasePlace ((0, bearing1_pos_y - bearing0_pos_y, 0))
-        cutlist.append (h_lmuu_1.bearing_cont)
-
+        # sliding rod
+        cutlist.append(fcfun.shp_cyl(r = self.slidrod_r + self.ROD_SPACE,
+                                     h = slid_y + 2,
+                                     normal = VY,
+                                     pos = FreeCAD.Vector(0, y_offs - 1, 0)))
+        # linear bearings, with their tolerances
+        bear_list = []
+        for bear_pos_y in (self.bearing0_pos_y, self.bearing1_pos_y):
+            cutlist.append(fcfun.shp_cyl(
+                               r = self.bearing_r + self.MLTOL,
+                               h = self.bearing_l + self.TOL_BEARING_L,
+                               normal = VY,
+                               pos = FreeCAD.Vector(
+                                   0, bear_pos_y - self.TOL_BEARING_L/2., 0)))
+            bear_list.append(fcfun.shp_cylholedir(
+                               r_out = self.bearing_r,
+                               r_in = self.slidrod_r,
+                               h = self.bearing_l,
+                               normal = VY,
+                               pos = FreeCAD.Vector(0, bear_pos_y, 0)))
 
         # ------------ hold rods ----------------
-
-        holdrod_0 = fcfun.addCyl_pos (
-                                r = holdrod_r_tol,
-                                h = holdrod_insert + 1,
-                                name = "holdrod_0",
-                                axis = 'x',
-                                h_disp = bearing_r + self.MIN_BEAR_SEP )
-                                #h_disp = bearing_r_tol + self.MIN_BEAR_SEP )
-
-        holdrod_0.Placement.Base = FreeCAD.Vector(
-                                     0,
-                                     self.holdrod2end + y_offs,
-                                     0)
-        cutlist.append (holdrod_0)
-
-        holdrod_1 = fcfun.addCyl_pos (
-                                r = holdrod_r_tol,
-                                h = holdrod_insert + 1,
-                                name = "holdrod_1",
-                                axis = 'x',
-                                h_disp = bearing_r + self.MIN_BEAR_SEP )
-                                #h_disp = bearing_r_tol + self.MIN_BEAR_SEP )
-
-        holdrod_1.Placement.Base = FreeCAD.Vector(
-                                       0,
-                                       self.length - self.holdrod2end + y_offs,
-                                       0)
-        cutlist.append (holdrod_1)
+        for holdrod_pos_y in (self.holdrod2end + y_offs,
+                              self.length - self.holdrod2end + y_offs):
+            cutlist.append(fcfun.shp_cyl(
+                               r = self.holdrod_r_tol,
+                               h = self.holdrod_insert + 1,
+                               normal = VX,
+                               pos = FreeCAD.Vector(
+                                      self.bearing_r + self.MIN_BEAR_SEP,
+                                      holdrod_pos_y, 0)))
 
         # -------------------- bolts and nuts
-        bolt0 = addBoltNut_hole (
+        shp_boltnut = fcfun.shp_addboltnut_hole (
                             r_shank   = self.BOLT_SHANK_R_TOL,
-                            l_bolt    = 2 * self.partheight,
+                            l_bolt    = 2 * slid_z,
                             r_head    = self.BOLT_HEAD_R_TOL,
                             l_head    = self.BOLT_HEAD_L,
                             r_nut     = self.BOLT_NUT_R_TOL,
                             l_nut     = self.BOLT_NUT_L,
                             hex_head  = 0, extra=1,
                             supp_head = 1, supp_nut=1,
-                            headdown  = 0, name="bolt_hole")
-
-        #bolt_left_pos_x =  -(  bearing_r_tol
-        bolt_left_pos_x =  -(  bearing_r
-                             + self.OUT_SEP_W
-                             + sliderod.Base.Radius.Value) / 2.0
-
-        #bolt_right_pos_x =   (  bearing_r_tol
-        bolt_right_pos_x =   (  bearing_r
-                              + self.MIN_BEAR_SEP
-                              + 0.6 * holdrod_insert )
-
-        bolt_low_pos_y =  self.OUT_SEP_L / 2.0 + y_offs
-        bolt_high_pos_y =  self.length - self.OUT_SEP_L / 2.0 + y_offs
-
-        bolt_lowmid_pos_y =  1.5 * self.OUT_SEP_L + 2 * holdrod_r + y_offs
-        bolt_highmid_pos_y = (  self.length
-                             - 1.5 * self.OUT_SEP_L
-                             - 2 * holdrod_r  # no _tol
-                             + y_offs)
-
-        bolt_pull_pos_x =   (  bearing_r_tol
-                              + self.MIN_BEAR_SEP
-                              + 0.25 * holdrod_insert )
-        #bolt_pullow_pos_y =  2.5 * self.OUT_SEP_L + 2 * holdrod_r_tol + y_offs
-        bolt_pullow_pos_y =  2.5 * self.OUT_SEP_L + 2 * holdrod_r + y_offs
-        bolt_pulhigh_pos_y = (  self.length
-                             - 2.5 * self.OUT_SEP_L
-                             - 2 * holdrod_r  # no _tol
-                             + y_offs)
-
-        bolt0.Placement.Base = FreeCAD.Vector (bolt_left_pos_x,
-                                               self.length/2 + y_offs,
-                                               -self.partheight)
-        bolt0.Placement.Rotation = FreeCAD.Rotation (VZ, 90)
-        cutlist.append (bolt0)
+                            headdown  = 0)
 
 # Naming convention for the bolts
 #      ______________ 
@@ -391,244 +568,118 @@ class EndShaftSlider (object):
 #     |  |   |  |____|
 #     |ld|___|____rd_|       right down
 #       
-        # Right
-        boltr = Draft.clone(bolt0)
-        boltr.Label = "bolt_hole_r"
-        boltr.Placement.Base =  FreeCAD.Vector (-bolt_left_pos_x,
-                                                self.length/2 + y_offs,
-                                               -self.partheight)
-        boltr.Placement.Rotation = FreeCAD.Rotation (VZ, 30)
-        cutlist.append (boltr)
-
-
-        # Left Up
-        boltlu = Draft.clone(bolt0)
-        boltlu.Label = "bolt_hole_lu"
-        boltlu.Placement.Base =  FreeCAD.Vector (bolt_left_pos_x,
-                                                bolt_low_pos_y,
-                                               -self.partheight)
-        boltlu.Placement.Rotation = FreeCAD.Rotation (VZ, 0)
-        cutlist.append (boltlu)
-        
-        # Left Down
-        boltld = Draft.clone(bolt0)
-        boltld.Label = "bolt_hole_ld"
-        boltld.Placement.Base =  FreeCAD.Vector (bolt_left_pos_x,
-                                                bolt_high_pos_y,
-                                               -self.partheight)
-        boltld.Placement.Rotation = FreeCAD.Rotation (VZ, 0)
-        cutlist.append (boltld)
-
-        # Right Up 
-        boltru = Draft.clone(bolt0)
-        boltru.Label = "bolt_hole_ru"
-        boltru.Placement.Base =  FreeCAD.Vector (bolt_right_pos_x,
-                                                bolt_high_pos_y,
-                                               -self.partheight)
-        boltru.Placement.Rotation = FreeCAD.Rotation (VZ, 0)
-        cutlist.append (boltru)
-
-        # Right Down
-        boltrd = Draft.clone(bolt0)
-        boltrd.Label = "bolt_hole_rd"
-        boltrd.Placement.Base =  FreeCAD.Vector (bolt_right_pos_x,
-                                                bolt_low_pos_y,
-                                               -self.partheight)
-        boltrd.Placement.Rotation = FreeCAD.Rotation (VZ, 0)
-        cutlist.append (boltrd)
-
-        # Right Middle Up 
-        boltrmu = Draft.clone(bolt0)
-        boltrmu.Label = "bolt_hole_rmu"
-        boltrmu.Placement.Base =  FreeCAD.Vector (bolt_right_pos_x,
-                                                  bolt_highmid_pos_y,
-                                                 -self.partheight)
-        boltrmu.Placement.Rotation = FreeCAD.Rotation (VZ, 0)
-        cutlist.append (boltrmu)
-
-        # Right Middle Down
-        boltrmd = Draft.clone(bolt0)
-        boltrmd.Label = "bolt_hole_rmd"
-        boltrmd.Placement.Base =  FreeCAD.Vector (bolt_right_pos_x,
-                                                bolt_lowmid_pos_y,
-                                               -self.partheight)
-        boltrmd.Placement.Rotation = FreeCAD.Rotation (VZ, 0)
-        cutlist.append (boltrmd)
-
-        # Hole for the upper Pulley bolt       
-        boltpull0 = addBolt (
+        # (x, y, rotation around VZ)
+        boltnut_list = [
+            # 0
+            (self.bolt_left_pos_x, self.length/2 + y_offs, 90),
+            # Right
+            (-self.bolt_left_pos_x, self.length/2 + y_offs, 30),
+            # Left Up
+            (self.bolt_left_pos_x, self.bolt_low_pos_y, 0),
+            # Left Down
+            (self.bolt_left_pos_x, self.bolt_high_pos_y, 0),
+            # Right Up 
+            (self.bolt_right_pos_x, self.bolt_high_pos_y, 0),
+            # Right Down
+            (self.bolt_right_pos_x, self.bolt_low_pos_y, 0),
+            # Right Middle Up 
+            (self.bolt_right_pos_x, self.bolt_highmid_pos_y, 0),
+            # Right Middle Down
+            (self.bolt_right_pos_x, self.bolt_lowmid_pos_y, 0)]
+
+        # Holes for the pulley bolts
+        shp_boltpul = fcfun.shp_addbolt (
                             r_shank   = self.BOLTPUL_SHANK_R_TOL,
-                            l_bolt    = 2 * self.partheight,
+                            l_bolt    = 2 * slid_z,
                             r_head    = self.BOLTPUL_NUT_R_TOL,
                             l_head    = self.BOLTPUL_NUT_L,
                             hex_head  = 1, extra=1,
                             support = 1, 
-                            headdown  = 1, name="boltpul_hole")
+                            headdown  = 1)
+        boltpul_list = [
+            (self.idlepull_posx, self.bolt_pulhigh_pos_y, 30),
+            (self.idlepull_posx, self.bolt_pullow_pos_y, 30)]
+
+        for shp_bolt, bolt_list in ((shp_boltnut, boltnut_list),
+                                    (shp_boltpul, boltpul_list)):
+            for bolt_x, bolt_y, bolt_rot in bolt_list:
+                bolt_place = FreeCAD.Placement(
+                                       FreeCAD.Vector(bolt_x, bolt_y, -slid_z),
+                                       FreeCAD.Rotation(VZ, bolt_rot))
+                cutlist.append(fcfun.shp_transform_copy(
+                                               shp_bolt,
+                                               bolt_place.toMatrix()))
+
+        # --- dent in the interior to save plastic
+        shp_dent_face = Part.Face(Part.makePolygon(self.pdent_list
+                                                   + [self.pdent_list[0]]))
+        cutlist.append(shp_dent_face.extrude(
+                                       FreeCAD.Vector(0,0, 2*slid_z +2)))
+
+        shp_holes = fcfun.fuseshplist(cutlist)
+        shp_top = shp_topslid.cut(shp_holes)
+        shp_bot = shp_botslid.cut(shp_holes)
+        shp_bear = bear_list[0].fuse(bear_list[1])
+        return shp_top, shp_bot, shp_bear
+
+    def make_fcos (self):
+        """ Makes the FreeCAD objects of the slider, the bearings and the
+        idle pulleys """
 
-        boltpull0.Placement.Base =  FreeCAD.Vector (bolt_pull_pos_x,
-                                                    bolt_pulhigh_pos_y,
-                                                   -self.partheight)
-        boltpull0.Placement.Rotation = FreeCAD.Rotation (VZ, 30)
-        cutlist.append (boltpull0)
+        doc = FreeCAD.ActiveDocument
+        side_place = self.side_place()
 
         # washers and bearings (iddle pulley), from bottom to top
-        # lower washer. DIN9021 (large), size M6
-        idlepull_name_list = [
-                kcomp.HollowCyl (part = 'washer', size = 6, kind= 'large'),
-                kcomp.HollowCyl (part = 'washer', size = 4, kind= 'regular'),
-                kcomp.HollowCyl (part = 'bearing', size = 624), # 624ZZ
-                kcomp.HollowCyl (part = 'washer', size = 4, kind= 'regular'),
-                kcomp.HollowCyl (part = 'washer', size = 6, kind= 'large'),
-                kcomp.HollowCyl (part = 'washer', size = 4, kind= 'large')
-                          ]
-
-        h_idlepull0 = partgroup.BearWashGroup (holcyl_list = idlepull_name_list,
+        h_idlepull0 = partgroup.BearWashGroup (
+                                   holcyl_list = self.idlepull_list,
                                    name = 'idlepull_0',
                                    normal = VZ,
-                                   pos = boltpull0.Placement.Base + 
-                                         FreeCAD.Vector(0,0,2*self.partheight))
+                                   pos = FreeCAD.Vector(
+                                              self.idlepull_posx,
+                                              self.bolt_pulhigh_pos_y,
+                                              self.partheight))
         idlepull0 = h_idlepull0.fco
 
-        # Hole for Pulley Down
-        boltpull1 = Draft.clone(boltpull0)
-        boltpull1.Label = "boltpul_hole_1"
-        boltpull1.Placement.Base =  FreeCAD.Vector (bolt_pull_pos_x,
-                                                    bolt_pullow_pos_y,
-                                                   -self.partheight)
-        boltpull1.Placement.Rotation = FreeCAD.Rotation (VZ, 30)
-        cutlist.append (boltpull1)
-
         # the other pulley:
         idlepull1 = Draft.clone(idlepull0)
         idlepull1.Label = "idlepull_1"
-        idlepull1.Placement.Base.y = bolt_pullow_pos_y - bolt_pulhigh_pos_y
+        idlepull1.Placement.Base.y = (  self.bolt_pullow_pos_y
+                                      - self.bolt_pulhigh_pos_y)
 
         idlepull_list = [ idlepull0, idlepull1]
         idlepulls = doc.addObject("Part::Compound", "idlepulls")
         idlepulls.Links = idlepull_list
-
-        # --- make a dent in the interior to save plastic
-        # points: p dent
-
-        pdent_ur = FreeCAD.Vector ( self.width + slid_posx + 1,
-                                    bolt_highmid_pos_y - 1,
-                                   -self.partheight - 1)
-        pdent_ul = FreeCAD.Vector ( bolt_pull_pos_x + 1,
-                                    bolt_pulhigh_pos_y - self.OUT_SEP_L ,
-                                   -self.partheight - 1)
-        pdent_dr = FreeCAD.Vector ( self.width + slid_posx + 1,
-                                    bolt_lowmid_pos_y +1,
-                                   -self.partheight - 1)
-        pdent_dl = FreeCAD.Vector ( bolt_pull_pos_x + 1,
-                                    bolt_pullow_pos_y + self.OUT_SEP_L ,
-                                   -self.partheight - 1)
-
-        # dent dimensions
-        self.dent_w = abs(pdent_ur.x - pdent_ul.x) # Width
-        self.dent_l = pdent_ur.y - pdent_dr.y # Length 
-        self.dent_sl = pdent_ul.y - pdent_dl.y # shorter Length 
-
-        pdent_list = [ pdent_ur, pdent_ul, pdent_dl, pdent_dr]
-
-        dent_plane = doc.addObject("Part::Polygon", "dent_plane")
-        dent_plane.Nodes = pdent_list
-        dent_plane.Close = True
-        dent_plane.ViewObject.Visibility = False
-        dent = doc.addObject("Part::Extrusion", "dent")
-        dent.Base = dent_plane
-        dent.Dir = (0,0, 2*self.partheight +2)
-        dent.Solid = True
-        cutlist.append (dent)
-
-        holes = doc.addObject("Part::MultiFuse", "holes")
-        holes.Shapes = cutlist
-
-
-        if side == 'right':
-            holes.Placement.Rotation = FreeCAD.Rotation (VZ, 180)
-            idlepulls.Placement.Rotation = FreeCAD.Rotation (VZ, 180)
-            topslid_fllt.Placement.Rotation = FreeCAD.Rotation (VZ, 180)
-            botslid_fllt.Placement.Rotation = FreeCAD.Rotation (VZ, 180)
-            # h_lmuu_0.bearing. bearings stay the same
-            if holdrod_cen == False:
-                holes.Placement.Base = FreeCAD.Vector (0, self.length,0)
-                idlepulls.Placement.Base = FreeCAD.Vector (0, self.length,0)
-                topslid_fllt.Placement.Base = FreeCAD.Vector (0, self.length,0)
-                botslid_fllt.Placement.Base = FreeCAD.Vector (0, self.length,0)
-        elif side == 'bottom':
-            holes.Placement.Rotation = FreeCAD.Rotation (VZ, 90)
-            idlepulls.Placement.Rotation = FreeCAD.Rotation (VZ, 90)
-            topslid_fllt.Placement.Rotation = FreeCAD.Rotation (VZ, 90)
-            botslid_fllt.Placement.Rotation = FreeCAD.Rotation (VZ, 90)
-            h_lmuu_0.bearing.Placement.Rotation =  FreeCAD.Rotation (VZ, 90)
-            # lmuu_1 has relative position to lmuu_0, so if rotating it
-            # to the other side and reseting its position will put it in its
-            # place
-            if holdrod_cen == True:
-                h_lmuu_1.bearing.Placement.Rotation = FreeCAD.Rotation (VZ, -90)
-                h_lmuu_1.bearing.Placement.Base = FreeCAD.Vector (0,0,0)
-            if holdrod_cen == False:
-                holes.Placement.Base = FreeCAD.Vector (self.length,0,0)
-                idlepulls.Placement.Base = FreeCAD.Vector (self.length,0,0)
-                topslid_fllt.Placement.Base = FreeCAD.Vector (self.length,0,0)
-                botslid_fllt.Placement.Base = FreeCAD.Vector (self.length,0,0)
-                h_lmuu_0.bearing.Placement.Base = FreeCAD.Vector (
-                                                          self.length,0,0)
-                h_lmuu_1.bearing.Placement.Base = FreeCAD.Vector (
-                           self.length - h_lmuu_1.bearing.Placement.Base.y ,0,0)
-                h_lmuu_1.bearing.Placement.Rotation =  FreeCAD.Rotation (VZ, 90)
-        elif side == 'top':
-            holes.Placement.Rotation = FreeCAD.Rotation (VZ, -90)
-            idlepulls.Placement.Rotation = FreeCAD.Rotation (VZ, -90)
-            topslid_fllt.Placement.Rotation = FreeCAD.Rotation (VZ, -90)
-            botslid_fllt.Placement.Rotation = FreeCAD.Rotation (VZ, -90)
-            h_lmuu_0.bearing.Placement.Rotation =  FreeCAD.Rotation (VZ, -90)
-            # lmuu_1 has relative position to lmuu_0, so if rotating it
-            # to the other side and reseting its position will put it in its
-            # place
-            if holdrod_cen == True:
-                h_lmuu_1.bearing.Placement.Rotation =  FreeCAD.Rotation (VZ, 90)
-                h_lmuu_1.bearing.Placement.Base = FreeCAD.Vector (0,0,0)
-            if holdrod_cen == False:
-                #holes.Placement.Base = FreeCAD.Vector (self.length,0,0)
-                #topslid_fllt.Placement.Base = FreeCAD.Vector (self.length,0,0)
-                #botslid_fllt.Placement.Base = FreeCAD.Vector (self.length,0,0)
-                #h_lmuu_0.bearing.Placement.Base = FreeCAD.Vector (
-                                                          #self.length,0,0)
-                h_lmuu_1.bearing.Placement.Base = FreeCAD.Vector (
-                                         h_lmuu_1.bearing.Placement.Base.y ,0,0)
-                h_lmuu_1.bearing.Placement.Rotation = FreeCAD.Rotation (VZ, -90)
-
-
-        # elif side == 'left':
-            # don't do anything, default condition
-
+        idlepulls.Placement = side_place
         self.idlepulls = idlepulls
 
-        bearings = doc.addObject("Part::Fuse", name + "_bear")
-        bearings.Base = h_lmuu_0.bearing
-        bearings.Tool = h_lmuu_1.bearing
+        bearings = doc.addObject("Part::Feature", self.name + "_bear")
+        bearings.Shape = self.shp_bear
         self.bearings = bearings
 
-        top_slide = doc.addObject("Part::Cut", name + "_top")
-        top_slide.Base = topslid_fllt 
-        top_slide.Tool = holes 
+        top_slide = doc.addObject("Part::Feature", self.name + "_top")
+        top_slide.Shape = self.shp_top
         self.top_slide = top_slide
 
-        bot_slide = doc.addObject("Part::Cut", name + "_bot")
-        bot_slide.Base = botslid_fllt 
-        bot_slide.Tool = holes 
+        bot_slide = doc.addObject("Part::Feature", self.name + "_bot")
+        bot_slide.Shape = self.shp_bot
         self.bot_slide = bot_slide
 
     # ---- end of __init__  EndShaftSlider
 
-    # move both sliders (top & bottom) and the bearings
+    # move both sliders (top & bottom), the bearings and the idle pulleys.
+    # The shapes have the side placement built in, but the idle pulleys
+    # have it in their Placement, so all of them are moved from their
+    # placement on their side
     def BasePlace (self, position = (0,0,0)):
         self.base_place = position
-        self.idlepulls.Placement.Base = FreeCAD.Vector(position)
-        self.bearings.Placement.Base = FreeCAD.Vector(position)
-        self.top_slide.Placement.Base = FreeCAD.Vector(position)
-        self.bot_slide.Placement.Base = FreeCAD.Vector(position)
+        base_plm = FreeCAD.Placement(FreeCAD.Vector(position), V0ROT)
+        side_plm = self.side_place()
+        for fco, fco_plm in ((self.idlepulls, side_plm),
+                             (self.bearings, FreeCAD.Placement()),
+                             (self.top_slide, FreeCAD.Placement()),
+                             (self.bot_slide, FreeCAD.Placement())):
+            if fco is not None:
+                fco.Placement = base_plm.multiply(fco_plm)
         
 
 
@@ -654,6 +705,10 @@ class EndShaftSlider (object):
 #     dent_w  : width of the dent, if no dent is needed, just dent_w = 0
 #     dent_l  : length of the dent, 
 #     dent_sl : small dimension of the dent length
+#     Note: dent_w and dent_l are without the 1mm of overlap, as the ones of
+#     EndShaftSlider and of the stages. Before they were with the overlap
+#     (now ovdent_w, ovdent_l), so the callers that gave their own values
+#     have to give 1mm less of width (i.e. 17, 119 instead of 18, 122)
 #
 #           Y   
 #           |
@@ -706,6 +761,8 @@ class EndShaftSlider (object):
 # dent_w  : width of the dent, if no dent is needed, just dent_w = 0
 # dent_l  : length of the dent, 
 # dent_sl : small dimension of the dent length
+# ovdent_w  : width of the dent, including the overlap to make the union
+# ovdent_l  : length of the dent, including the overlap to make the union 
 # bearings : FreeCad object of the bearings
 # top_slide : FreeCad object of the top part of the slider
 # bot_slide : FreeCad object of the bottm part of the slider
@@ -759,9 +816,16 @@ class CentralSlider (object):
         if dent_w == 0:
             self.dent_l     = 0
             self.dent_sl    = 0
+            self.ovdent_w   = 0
+            self.ovdent_l   = 0
         else:
             self.dent_l     = dent_l
             self.dent_sl    = dent_sl
+            # the dimensions of the dent with 1mm of overlap, to make the
+            # union (see EndShaftSlider)
+            self.ovdent_w   = dent_w + 1
+            h_over = ((dent_l - dent_sl) / 2.) / dent_w
+            self.ovdent_l   = dent_l + 2 * h_over
 
         bearing_l     = kcomp.LMEUU_L[int(2*rod_r)] 
         bearing_l_tol = bearing_l + self.TOL_BEARING_L
@@ -787,7 +851,7 @@ class CentralSlider (object):
         elif self.BOLT_R == 4:
             self.OUT_SEP_MOVPP = 10.0
         else:
-            print "Bolt Size not defined in CentralSlider"
+            logger.error('Bolt Size not defined in CentralSlider')
 
 
         self.length = rod_sep + 2 * bearing_r + 2 * self.OUT_SEP_MOVPP
@@ -822,12 +886,12 @@ class CentralSlider (object):
         #             \   /
         #        bl    --- br  (bottom right)
 
-        # slid_x-1 because the dent was calculated with 1 mm of superposition
+        # slid_x-1 because the dent has 1 mm of superposition (ovdent)
         # points:
-        #p_dent_t  = FreeCAD.Vector(  0            , dent_l/2.0, 0)
-        p_dent_tr = FreeCAD.Vector(  slid_x/2. -1 , dent_l/2.0, 0)
-        p_dent_rt = FreeCAD.Vector(  slid_x/2. -1 + dent_w , dent_sl/2.0, 0)
-        #p_dent_r  = FreeCAD.Vector(  slid_x/2. -1 + dent_w , 0          , 0)
+        #p_dent_t  = FreeCAD.Vector(  0            , ovdent_l/2.0, 0)
+        p_dent_tr = FreeCAD.Vector(  slid_x/2. -1 , self.ovdent_l/2.0, 0)
+        p_dent_rt = FreeCAD.Vector(  slid_x/2. + dent_w , dent_sl/2.0, 0)
+        #p_dent_r  = FreeCAD.Vector(  slid_x/2. + dent_w , 0          , 0)
 
         dentwire = fcfun.wire_sim_xy([p_dent_tr, p_dent_rt])
         dentface = Part.Face(dentwire)
@@ -926,9 +990,12 @@ class CentralSlider (object):
         self.bot_slide.Placement.Base = FreeCAD.Vector(position)
         
 
-doc = FreeCAD.newDocument()
-#CentralSlider (rod_r = kcit.ROD_R, rod_sep = 150.0, name="central_slider")
-cs = CentralSlider (rod_r = 6, rod_sep = 150.0, name="central_slider",
-                    dent_w = 18,
-                    dent_l = 122,
-                    dent_sl = 68)
+# example, only when executed, not when imported (by the stage modules
+# and the build daemon)
+if __name__ == '__main__':
+    doc = FreeCAD.newDocument()
+    #CentralSlider (rod_r = kcit.ROD_R, rod_sep = 150.0, name="central_slider")
+    cs = CentralSlider (rod_r = 6, rod_sep = 150.0, name="central_slider",
+                        dent_w = 17,
+                        dent_l = 119,
+                        dent_sl = 68)
@@ -0,0 +1,207 @@
+# ----------------------------------------------------------------------------
+# -- Placement patterns
+# -- comps library
+# -- Positions of repeated features (holes, bolts, ...) computed in batch
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# The positions of a pattern are computed at once as a NumPy array, instead
+# of adding FreeCAD.Vector one by one. There are two steps:
+# 1- Get the local coordinates of the pattern: pts_grid, pts_sym4, pts_circ,
+#    pts_linear. These are 2D coordinates (n,2) on a plane defined by 2 axis
+#    (axis_1, axis_2), centered or not, as each function indicates.
+# 2- Get the global coordinates: pts_to_global, giving the 2 axis and the
+#    position of the local origin. It returns an array (n,3)
+#
+# Then, the array can be handed to the geometry layer in one batch:
+# shp_pattern makes a compound with copies of a tool (a hole) translated
+# to each of the positions
+#
+#            axis_2
+#              :
+#         o    o    o    o
+#              :
+#         o    o....o....o...... axis_1
+#
+#         o    o    o    o
+
+
+import FreeCAD
+import Part
+import DraftVecUtils
+import logging
+import numpy as np
+
+import fcfun
+
+from fcfun import V0
+
+logger = logging.getLogger(__name__)
+
+
+def pts_grid (n_1, n_2, sep_1, sep_2 = None, cen = 0):
+    """ Rectangular grid of n_1 x n_2 points
+
+    Args:
+        n_1: number of points along axis_1
+        n_2: number of points along axis_2
+        sep_1: separation between points along axis_1
+        sep_2: separation between points along axis_2. If None, same as sep_1
+        cen: 1: the grid is centered on the origin
+             0: the first point is on the origin and the rest on the
+                positive side of the axis
+
+    Returns:
+        NumPy array (n_1 * n_2, 2) with the local coordinates.
+        Points are ordered along axis_2 first:
+        (0,0), (0,1), ... (1,0), (1,1), ...
+    """
+
+    if sep_2 is None:
+        sep_2 = sep_1
+    c_1 = np.arange(n_1) * float(sep_1)
+    c_2 = np.arange(n_2) * float(sep_2)
+    if cen == 1:
+        c_1 -= (n_1 - 1) * sep_1 / 2.
+        c_2 -= (n_2 - 1) * sep_2 / 2.
+    g_1, g_2 = np.meshgrid(c_1, c_2, indexing = 'ij')
+    return np.column_stack((g_1.ravel(), g_2.ravel()))
+
+
+def pts_sym4 (sep_1, sep_2 = None):
+    """ 4 points in symmetrical positions, centered on the origin
+
+              sep_1
+            :.......:
+            :       :
+            o       o .....
+                  :       : sep_2
+            o       o ....:
+
+    Args:
+        sep_1: separation between the points along axis_1
+        sep_2: separation between the points along axis_2.
+               If None, same as sep_1 (square)
+
+    Returns:
+        NumPy array (4, 2) with the local coordinates
+    """
+
+    if sep_2 is None:
+        sep_2 = sep_1
+    return pts_grid(2, 2, sep_1, sep_2, cen = 1)
+
+
+def pts_circ (n_pts, radius, ang0 = 0):
+    """ Points evenly distributed on a circle, centered on the origin
+
+    Args:
+        n_pts: number of points
+        radius: radius of the circle
+        ang0: angle (degrees) of the first point, from axis_1 to axis_2
+
+    Returns:
+        NumPy array (n_pts, 2) with the local coordinates
+    """
+
+    ang = np.radians(ang0) + np.arange(n_pts) * (2 * np.pi / n_pts)
+    return radius * np.column_stack((np.cos(ang), np.sin(ang)))
+
+
+def pts_linear (length, sep, end_sep = 0, n_pts = 0):
+    """ Points along axis_1 in a length, with the end offsets.
+    The first point is at end_sep from the origin
+
+         end_sep      sep
+          :...:.....:
+          :   :     :
+          |___o_____o_____o_____o___|
+          :                         :
+          :......... length ........:
+
+    Args:
+        length: total length
+        sep: separation between the points
+        end_sep: separation from the ends to the first and last points
+        n_pts: number of points. If 0, as many as fit in the length,
+               leaving at least end_sep at the end
+
+    Returns:
+        NumPy array (n, 2) with the local coordinates, the second coordinate
+        is always 0
+    """
+
+    if n_pts == 0:
+        n_pts = int(round(length - 2 * end_sep, 6) // sep) + 1
+        if n_pts < 0:
+            n_pts = 0
+    c_1 = end_sep + np.arange(n_pts) * float(sep)
+    return np.column_stack((c_1, np.zeros(n_pts)))
+
+
+def pts_to_global (pts, pos = V0, axis_1 = fcfun.VX, axis_2 = fcfun.VY):
+    """ Converts the local coordinates of a pattern to global coordinates
+    All the points are converted at once: pos + p1 * axis_1 + p2 * axis_2
+
+    Args:
+        pts: NumPy array (n,2) (or (n,3)) with the local coordinates
+        pos: FreeCAD.Vector of the local origin
+        axis_1: FreeCAD.Vector of the first local axis. Will be normalized
+        axis_2: FreeCAD.Vector of the second local axis. Will be normalized
+                if pts is (n,3), the third axis is axis_1 x axis_2
+
+    Returns:
+        NumPy array (n,3) with the global coordinates
+    """
+
+    pts = np.asarray(pts, dtype = float)
+    nax_1 = DraftVecUtils.scaleTo(axis_1, 1)
+    nax_2 = DraftVecUtils.scaleTo(axis_2, 1)
+    axes = [tuple(nax_1), tuple(nax_2)]
+    if pts.shape[1] == 3:
+        axes.append(tuple(nax_1.cross(nax_2)))
+    return np.dot(pts, np.array(axes)) + np.array(tuple(pos))
+
+
+def fcvecs (pts):
+    """ Converts an array (n,3) of coordinates into a list of FreeCAD.Vector
+
+    Args:
+        pts: NumPy array (n,3)
+
+    Returns:
+        list of FreeCAD.Vector
+    """
+
+    return [FreeCAD.Vector(x, y, z) for (x, y, z) in np.asarray(pts).tolist()]
+
+
+def shp_pattern (shp_tool, pts):
+    """ Makes a compound of copies of a shape, translated to the positions
+    The shape is built once (usually at V0) and just translated, so the
+    positions are given to the geometry layer in one batch
+
+    Args:
+        shp_tool: TopoShape to be replicated, usually a hole to be cut
+        pts: NumPy array (n,3) with the global translations (not the
+             positions, if shp_tool is not at V0)
+
+    Returns:
+        TopoShape compound with the copies. If there are no points, an
+        empty compound, so it can still be cut or fused
+    """
+
+    shp_list = []
+    for vec in fcvecs(pts):
+        shp_i = shp_tool.copy()
+        shp_i.translate(vec)
+        shp_list.append(shp_i)
+    if not shp_list:
+        logger.debug('empty pattern')
+    return Part.makeCompound(shp_list)
+
@@ -0,0 +1,257 @@
+# ----------------------------------------------------------------------------
+# -- Placement nodes
+# -- comps library
+# -- Placement of the parts and sets of parts, with dirty flags
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# The parts (fc_clss.SinglePart) and the sets of parts (fc_clss.PartsSet)
+# form a tree. When a set is moved, all the FreeCAD objects below it have
+# to be placed again, but when only a part is moved, only that part has
+# to be placed. Each node keeps a dirty flag:
+#
+#            set_a  (dirty_parts: {set_b})
+#           /     \
+#       part_1    set_b  (dirty_parts: {part_3})
+#                /     \
+#            part_2   part_3  (place_dirty: rel_place changed)
+#
+# When rel_place, extra_mov or pos_o_adjust of a node change, the node is
+# marked as dirty, and each set above it keeps it in its dirty_parts. Then
+# place_fcos of set_a only goes down to set_b and part_3, unless set_a has
+# moved, then all of them are placed.
+#
+# The placements are written with set_fco_base. Inside batch_place they are
+# kept and written all together at the end, with only one recompute
+#
+# This module only needs FreeCAD, so it can be used (and tested) without
+# the rest of the classes of fc_clss
+
+import contextlib
+import collections
+
+import FreeCAD
+
+V0 = FreeCAD.Vector(0, 0, 0)
+
+# Placements waiting to be written to the FreeCAD objects, see batch_place
+_place_batches = []
+
+
+@contextlib.contextmanager
+def batch_place (doc = None, recompute = 0):
+    """ Context where the placements of the FreeCAD objects set with
+    set_fco_base are not written, they are written all together at the end.
+    If a placement is set more than once, only the last one is written.
+    Batches can be nested, the outer batch writes the placements
+
+    Parameters:
+    -----------
+    doc : FreeCAD document
+        document to recompute, if None, the active document
+    recompute : int
+        1: the document is recomputed once after writing the placements
+        0: no recompute
+    """
+    pending = collections.OrderedDict()
+    _place_batches.append(pending)
+    try:
+        yield pending
+    finally:
+        _place_batches.pop()
+        if _place_batches:
+            _place_batches[-1].update(pending)
+        else:
+            for fco, base in pending.values():
+                placement = fco.Placement
+                placement.Base = base
+                fco.Placement = placement
+            if recompute == 1 and pending:
+                if doc is None:
+                    doc = FreeCAD.ActiveDocument
+                doc.recompute()
+
+
+def set_fco_base (fco, base):
+    """ Sets the Placement.Base of a FreeCAD object, or keeps it to be
+    written at the end of the batch, if there is a batch open
+
+    Parameters:
+    -----------
+    fco : FreeCAD object
+    base : FreeCAD.Vector
+    """
+    if _place_batches:
+        _place_batches[-1][id(fco)] = (fco, base)
+    else:
+        fco.Placement.Base = base
+
+
+class PlaceNode (object):
+    """
+    Node of the hierarchy of parts and sets of parts, that keeps its
+    displacements with a dirty flag. When rel_place, extra_mov or
+    pos_o_adjust change, the node is marked as dirty, and its sets
+    (parent_set) know that they have a dirty part. So place_fcos only goes
+    to the parts that have changed, and the ones that haven't are not
+    placed again
+
+    Attributes:
+    ------------
+    rel_place : FreeCAD.Vector
+        displacement of the part in its set
+    extra_mov : FreeCAD.Vector
+        extra movement of the part
+    pos_o_adjust : FreeCAD.Vector
+        displacement of the origin of the part (only used by the parts)
+    parent_set : PlaceSet
+        the set that has this part, None if it is not in a set
+    place_dirty : int
+        1: the displacements have changed since the last place_fcos
+    local_displ : FreeCAD.Vector
+        cached displacement of the node in its set
+    tot_displ : FreeCAD.Vector
+        cached total displacement of the node, from the last place_fcos
+    """
+
+    parent_set = None
+    place_dirty = 1
+
+    @property
+    def rel_place (self):
+        return getattr(self, '_rel_place', V0)
+
+    @rel_place.setter
+    def rel_place (self, place):
+        self._rel_place = place
+        self.mark_dirty()
+
+    @property
+    def extra_mov (self):
+        return getattr(self, '_extra_mov', V0)
+
+    @extra_mov.setter
+    def extra_mov (self, mov):
+        self._extra_mov = mov
+        self.mark_dirty()
+
+    @property
+    def pos_o_adjust (self):
+        return getattr(self, '_pos_o_adjust', V0)
+
+    @pos_o_adjust.setter
+    def pos_o_adjust (self, adjust):
+        self._pos_o_adjust = adjust
+        self.mark_dirty()
+
+    def mark_dirty (self):
+        """ Marks the node as dirty, and tells its sets up to the root
+        """
+        self.place_dirty = 1
+        node = self
+        parent = node.parent_set
+        while parent is not None:
+            if node in parent.dirty_parts:
+                # the sets above already know it
+                break
+            parent.dirty_parts.add(node)
+            node = parent
+            parent = node.parent_set
+
+
+class PlacePart (PlaceNode):
+    """
+    Node of a part, with its FreeCAD object in the attribute fco
+    """
+
+    def place_fcos (self, displacement = V0):
+        """ Place the freecad object
+        The displacement of the part in its set is only calculated again
+        if it has changed, and the object is only placed if its total
+        displacement has changed
+
+        Parameters:
+        -----------
+        displacement : FreeCAD.Vector
+            total displacement of the set of the part
+        """
+        if self.place_dirty == 1:
+            self.local_displ = (  self.pos_o_adjust
+                                + self.rel_place + self.extra_mov)
+            self.place_dirty = 0
+        elif getattr(self, 'tot_displ', None) == (displacement
+                                                  + self.local_displ):
+            return
+        tot_displ = displacement + self.local_displ
+        self.tot_displ = tot_displ
+        set_fco_base(self.fco, tot_displ)
+
+
+class PlaceSet (PlaceNode):
+    """
+    Node of a set of parts (PlacePart or PlaceSet), in the list parts_lst.
+    If the set has been grouped, it has the FreeCAD object of the group in
+    the attribute fco, and its parts are not placed
+
+    Attributes:
+    ------------
+    parts_lst : list
+        parts of the set
+    dirty_parts : set
+        parts that have changed since the last place_fcos
+    """
+
+    def init_parts (self):
+        """ Initializes the list of parts, to be called by the constructor
+        """
+        self.parts_lst = []
+        self.dirty_parts = set()
+
+    def append_part (self, part):
+        """ Appends a new part to the list of parts
+        """
+        self.parts_lst.append(part)
+        part.parent_set = self
+        # it has not been placed in this set
+        part.mark_dirty()
+
+    def place_fcos (self, displacement = V0):
+        """ Place the freecad objects
+        If the total displacement of the set has not changed, only the
+        parts that have changed (dirty_parts) are placed again.
+        The placements are written together at the end (see batch_place)
+
+        Parameters:
+        -----------
+        displacement : FreeCAD.Vector
+            total displacement of the set of this set
+        """
+        # having pos_o_adjust and rel_place made the sum twice
+        if self.place_dirty == 1:
+            self.local_displ = self.rel_place + self.extra_mov
+            self.place_dirty = 0
+        tot_displ = displacement + self.local_displ
+        moved = getattr(self, 'tot_displ', None) != tot_displ
+        self.tot_displ = tot_displ
+        with batch_place():
+            #if this set has been grouped, we dont have to go to its children
+            try:
+                fco = self.fco
+            except AttributeError:
+                # Not grouped: set the new position for the freecad objects
+                if moved:
+                    part_list = self.parts_lst
+                else:
+                    part_list = [part for part in self.parts_lst
+                                 if part in self.dirty_parts]
+                for part in part_list:
+                    part.place_fcos(tot_displ)
+            else:
+                if moved:
+                    set_fco_base(fco, tot_displ)
+        self.dirty_parts.clear()
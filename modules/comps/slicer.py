@@ -0,0 +1,300 @@
+# ----------------------------------------------------------------------------
+# -- Slicer
+# -- comps library
+# -- Layer areas of the printable parts, filament and print time estimation
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# This is not a slicer for printing, it is to compare the design variants
+# by their printing cost, without running an external slicer.
+# The part is cut in layers of kcomp.LAYER3D_H along its printing direction
+# (axis_print of the component, or VZ), and for each layer the area and the
+# perimeter of the section are computed. The layers are computed in
+# parallel processes: the shape is sent to them as a BREP string.
+#
+# With the areas and perimeters, and the printing settings (PRINT_CFG),
+# the volume of filament is estimated:
+#
+#       perimeters            infill
+#     ____________      _________________
+#    |  ________  |    |  _____________  |
+#    | |  ____  | |    | |/ / / / / / /| |
+#    | | |    | | |    | |/ / / / / / /| |
+#
+#   - perimeters: perimeter length * n_perim * line_w * layer_h
+#   - top and bottom layers: all the area is filled
+#   - the rest: the inner area (area - perimeter band) * infill
+#
+#    est = slicer.estimate(bracket.shp, fc_axis_print = VZ)
+#    print(est.mass, est.time / 3600.)
+
+import math
+import logging
+import collections
+import multiprocessing
+
+import FreeCAD
+import Part
+import DraftVecUtils
+import numpy as np
+
+import kcomp
+
+from fcfun import VZ
+
+logger = logging.getLogger(__name__)
+
+# printing settings: speeds in mm/s, lengths in mm, density in g/cm3
+PRINT_CFG = {
+    'layer_h': kcomp.LAYER3D_H,
+    'line_w': 0.45,        # width of the extruded line
+    'n_perim': 2,          # number of perimeters
+    'n_top': 4,            # number of solid top layers
+    'n_bot': 4,            # number of solid bottom layers
+    'infill': 0.2,         # infill density (0 to 1)
+    'perim_speed': 40.,
+    'infill_speed': 60.,
+    'solid_speed': 40.,
+    'travel_factor': 1.15, # extra time for travel moves and accelerations
+    'filament_d': 1.75,
+    'density': 1.24,       # PLA
+}
+
+# result of the estimation
+# n_layers: number of layers
+# volume: volume of the extruded plastic in mm3
+# filament_l: length of filament in mm
+# mass: mass of the plastic in grams
+# time: printing time in seconds
+PrintEstimate = collections.namedtuple('PrintEstimate',
+                                       ['n_layers', 'volume', 'filament_l',
+                                        'mass', 'time'])
+
+
+def layer_heights (shp, fc_axis_print = VZ, layer_h = kcomp.LAYER3D_H):
+    """ Heights of the layers along the printing direction, in the middle of
+    each layer
+
+    Args:
+        shp: shape of the part
+        fc_axis_print: FreeCAD.Vector of the printing direction (up)
+        layer_h: height of the layers
+
+    Returns:
+        NumPy array with the heights, as distances along fc_axis_print
+    """
+
+    axis_print = DraftVecUtils.scaleTo(fc_axis_print, 1)
+    h_vals = [vtx.Point.dot(axis_print) for vtx in shp.Vertexes]
+    h_min = min(h_vals)
+    n_layers = int(math.ceil(round((max(h_vals) - h_min) / layer_h, 6)))
+    return h_min + (np.arange(n_layers) + 0.5) * layer_h
+
+
+def section_area_perim (shp, fc_axis, h_pos):
+    """ Area and perimeter of the section of a shape by a plane
+
+    Args:
+        shp: shape of the part
+        fc_axis: FreeCAD.Vector normal to the plane, normalized
+        h_pos: distance along fc_axis of the plane
+
+    Returns:
+        tuple (area, perimeter)
+    """
+
+    wires = [wire for wire in shp.slice(fc_axis, h_pos) if wire.isClosed()]
+    if not wires:
+        return 0., 0.
+    faces = sorted((Part.Face(wire) for wire in wires),
+                   key = lambda face: face.Area, reverse = True)
+    area = 0.
+    for ind, face in enumerate(faces):
+        # the wire is a hole if it is inside an odd number of larger faces
+        pt = face.OuterWire.Vertexes[0].Point
+        depth = sum(1 for outer in faces[:ind]
+                    if outer.isInside(pt, 1e-6, True))
+        if depth % 2 == 0:
+            area += face.Area
+        else:
+            area -= face.Area
+    perim = sum(wire.Length for wire in wires)
+    return area, perim
+
+
+# shape of the worker processes, loaded once in each worker
+_wrk_shp = [None]
+
+
+def _init_worker (brep_str):
+    shp = Part.Shape()
+    shp.importBrepFromString(brep_str)
+    _wrk_shp[0] = shp
+
+
+def _layers_job (args):
+    axis_tup, heights = args
+    axis = FreeCAD.Vector(*axis_tup)
+    return [section_area_perim(_wrk_shp[0], axis, h_pos)
+            for h_pos in heights]
+
+
+def layer_sections (shp, fc_axis_print = VZ, layer_h = kcomp.LAYER3D_H,
+                    n_proc = 0):
+    """ Area and perimeter of each layer of a part
+
+    Args:
+        shp: shape of the part
+        fc_axis_print: FreeCAD.Vector of the printing direction (up)
+        layer_h: height of the layers
+        n_proc: number of processes. If 0: number of cpus.
+                If 1: no other processes are created
+
+    Returns:
+        NumPy array (n_layers, 2) with the area and the perimeter of
+        each layer
+    """
+
+    axis_print = DraftVecUtils.scaleTo(fc_axis_print, 1)
+    heights = layer_heights(shp, axis_print, layer_h)
+    if n_proc == 0:
+        n_proc = multiprocessing.cpu_count()
+    n_proc = max(1, min(n_proc, len(heights)))
+    if n_proc == 1:
+        res = [section_area_perim(shp, axis_print, h_pos)
+               for h_pos in heights]
+    else:
+        axis_tup = tuple(axis_print)
+        chunks = [(axis_tup, chunk.tolist())
+                  for chunk in np.array_split(heights, n_proc)]
+        pool = multiprocessing.Pool(n_proc, _init_worker,
+                                    (shp.exportBrepToString(),))
+        try:
+            res = [sec for chunk_res in pool.map(_layers_job, chunks)
+                   for sec in chunk_res]
+        finally:
+            pool.close()
+            pool.join()
+    return np.array(res, dtype = float).reshape(-1, 2)
+
+
+def estimate_sections (sections, cfg = None):
+    """ Estimates the filament and the printing time from the layer sections
+
+    Args:
+        sections: NumPy array (n_layers, 2) with area and perimeter,
+                  see layer_sections
+        cfg: dictionary with the printing settings, the ones that are not
+             given are taken from PRINT_CFG
+
+    Returns:
+        PrintEstimate
+    """
+
+    conf = dict(PRINT_CFG)
+    if cfg:
+        conf.update(cfg)
+    layer_h = conf['layer_h']
+    line_w = conf['line_w']
+    area = sections[:, 0]
+    perim = sections[:, 1]
+    n_layers = len(area)
+
+    # band of the perimeters, it cannot be larger than the area
+    perim_area = np.minimum(perim * conf['n_perim'] * line_w, area)
+    inner_area = area - perim_area
+    # solid layers at the bottom and at the top
+    solid = np.zeros(n_layers, dtype = bool)
+    solid[:conf['n_bot']] = True
+    if conf['n_top'] > 0:
+        solid[-conf['n_top']:] = True
+    fill_area = np.where(solid, inner_area, inner_area * conf['infill'])
+
+    perim_vol = perim_area.sum() * layer_h
+    solid_vol = fill_area[solid].sum() * layer_h
+    infill_vol = fill_area[~solid].sum() * layer_h
+    volume = perim_vol + solid_vol + infill_vol
+
+    # length of the extruded path of each kind, and its time
+    path_sect = line_w * layer_h
+    time = conf['travel_factor'] * (
+                  perim_vol / path_sect / conf['perim_speed']
+                + solid_vol / path_sect / conf['solid_speed']
+                + infill_vol / path_sect / conf['infill_speed'])
+    filament_l = volume / (math.pi * (conf['filament_d'] / 2.) ** 2)
+    # mm3 to cm3
+    mass = volume / 1000. * conf['density']
+    return PrintEstimate(n_layers, float(volume), float(filament_l),
+                         float(mass), float(time))
+
+
+def estimate (shp, fc_axis_print = VZ, cfg = None, n_proc = 0):
+    """ Estimates the filament and the printing time of a part
+
+    Args:
+        shp: shape of the part
+        fc_axis_print: FreeCAD.Vector of the printing direction (up)
+        cfg: dictionary with the printing settings, see PRINT_CFG
+        n_proc: number of processes for the layers, see layer_sections
+
+    Returns:
+        PrintEstimate
+    """
+
+    layer_h = (cfg or {}).get('layer_h', PRINT_CFG['layer_h'])
+    sections = layer_sections(shp, fc_axis_print, layer_h, n_proc)
+    return estimate_sections(sections, cfg)
+
+
+def estimate_comp (comp, cfg = None, n_proc = 0):
+    """ Estimates the filament and the printing time of a component,
+    printed along its axis_print (VZ if it doesnt have it)
+
+    Args:
+        comp: component with the shape (shp or fco)
+        cfg: dictionary with the printing settings, see PRINT_CFG
+        n_proc: number of processes for the layers, see layer_sections
+
+    Returns:
+        PrintEstimate
+    """
+
+    import builddaemon
+
+    shp = builddaemon.get_build_shp(comp)
+    return estimate(shp, getattr(comp, 'axis_print', VZ), cfg, n_proc)
+
+
+def compare_variants (specs, cfg = None, n_proc = 0):
+    """ Builds the design variants one by one and estimates their
+    printing cost
+
+    Args:
+        specs: iterable of tuples (name, builder, kwargs), as in
+               assembly.iter_build
+        cfg: dictionary with the printing settings, see PRINT_CFG
+        n_proc: number of processes for the layers, see layer_sections
+
+    Returns:
+        list of tuples (name, PrintEstimate), in the same order
+    """
+
+    import assembly
+
+    results = []
+    for name, builder, kwargs in specs:
+        doc, comp = assembly.build_subasm(builder, name, **kwargs)
+        try:
+            results.append((name, estimate_comp(comp, cfg, n_proc)))
+        finally:
+            FreeCAD.closeDocument(doc.Name)
+    for name, est in results:
+        logger.info('%s: %d layers, %.1f g, %.1f m, %.0f min'
+                    % (name, est.n_layers, est.mass, est.filament_l / 1000.,
+                       est.time / 60.))
+    return results
@@ -0,0 +1,390 @@
+# ----------------------------------------------------------------------------
+# -- Spatial index
+# -- comps library
+# -- AABB tree of the components of an assembly, for clearance queries
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# To know which parts are close to a part (the belt clamp and the slider,
+# the LED holder and the cage cubes, ...), distToShape would have to be
+# called with all the parts, and it is slow.
+# The bounding boxes (AABB) of the parts are kept in a tree: each node has
+# the box that contains the boxes of its parts, and the parts are split in
+# two children along the largest side of the box:
+#
+#                     [ all the parts ]
+#                    /                 \
+#          [ parts on the left ]  [ parts on the right ]
+#            /         \             /         \
+#         leaf        leaf        leaf        leaf   (LEAF_SIZE parts)
+#
+# The distance between boxes is a lower bound of the distance between
+# the parts, so the nodes that are farther than the query are discarded,
+# and distToShape is only called on the parts whose boxes are close.
+#
+#    sidx = spatialidx.SpatialIndex(spatialidx.doc_objects(doc))
+#    sidx.within('beltclamp', 2.)     -> [(name, distance), ...]
+#    sidx.nearest('beltclamp', k = 3) -> [(name, distance), ...]
+#    sidx.clearance_report(2.)        -> [(name_a, name_b, distance), ...]
+#
+# If the parts are moved, refresh updates the boxes of the parts whose
+# placement has changed, and the boxes of the nodes above them
+
+import heapq
+import logging
+
+import FreeCAD
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# maximum number of parts in a leaf of the tree
+LEAF_SIZE = 4
+
+
+def doc_objects (doc = None):
+    """ Visible objects of a document with solids that are not used by
+    other objects (the final objects, not the intermediate ones of the
+    booleans)
+
+    Args:
+        doc: FreeCAD document, if None: the active document
+
+    Returns:
+        list of FreeCAD objects
+    """
+
+    if doc is None:
+        doc = FreeCAD.ActiveDocument
+    fcos = []
+    for fco in doc.Objects:
+        if (not hasattr(fco, 'Shape') or not fco.Visibility
+                or fco.TypeId == 'App::Part' or not fco.Shape.Solids):
+            continue
+        if [obj for obj in fco.InList
+                if obj.TypeId not in ('App::Part',
+                                      'App::DocumentObjectGroup')]:
+            continue
+        fcos.append(fco)
+    return fcos
+
+
+def shp_box (shp):
+    """ Bounding box of a shape as a NumPy array
+    (xmin, ymin, zmin, xmax, ymax, zmax) """
+
+    bb = shp.BoundBox
+    return np.array([bb.XMin, bb.YMin, bb.ZMin, bb.XMax, bb.YMax, bb.ZMax])
+
+
+def box_dist (box, boxes):
+    """ Distances between a box and an array of boxes, 0 if they overlap
+
+    Args:
+        box: NumPy array (6)
+        boxes: NumPy array (n,6)
+
+    Returns:
+        NumPy array (n)
+    """
+
+    gap = np.maximum(np.maximum(boxes[:, :3] - box[3:],
+                                box[:3] - boxes[:, 3:]), 0.)
+    return np.sqrt(np.sum(gap * gap, axis = 1))
+
+
+class SpatialIndex (object):
+    """ AABB tree of the shapes of a list of components or FreeCAD objects
+
+    Args:
+        objs: list of FreeCAD objects or components (with fco or shp)
+        names: list of the names. If None, the Label of the FreeCAD objects
+               or the attribute name of the components
+        leaf_size: maximum number of parts in a leaf
+
+    Attributes:
+        objs: list of the objects
+        names: list of the names
+        boxes: NumPy array (n,6) with the bounding boxes of the parts
+        order: NumPy array with the indexes of the parts, ordered by the
+               leaves of the tree
+        node_box: NumPy array (m,6) with the boxes of the nodes
+        node_child: NumPy array (m,2) with the children of the nodes,
+                    -1 if it is a leaf
+        node_range: NumPy array (m,2) with the start and end in order of
+                    the parts of the node
+        node_parent: NumPy array (m) with the parent of the node, -1 for
+                     the root
+        leaf_of: NumPy array (n) with the leaf of each part
+    """
+
+    def __init__ (self, objs, names = None, leaf_size = LEAF_SIZE):
+        self.objs = list(objs)
+        if names is None:
+            names = [self._obj_name(obj) for obj in self.objs]
+        self.names = list(names)
+        self.name_ind = dict((name, ind) for ind, name in enumerate(names))
+        self.leaf_size = leaf_size
+        self.shps = [self._obj_shp(obj) for obj in self.objs]
+        self.keys = [self._obj_key(obj) for obj in self.objs]
+        if self.shps:
+            self.boxes = np.array([shp_box(shp) for shp in self.shps])
+        else:
+            self.boxes = np.zeros((0, 6))
+        self.build()
+
+    @staticmethod
+    def _obj_name (obj):
+        if hasattr(obj, 'Label'):
+            return obj.Label
+        return getattr(obj, 'name', type(obj).__name__)
+
+    @staticmethod
+    def _fco (obj):
+        if hasattr(obj, 'Shape'):
+            return obj
+        return getattr(obj, 'fco', None)
+
+    def _obj_shp (self, obj):
+        import builddaemon
+
+        fco = self._fco(obj)
+        if fco is not None:
+            return fco.Shape
+        return builddaemon.get_build_shp(obj)
+
+    def _obj_key (self, obj):
+        """ Key of the placement of an object, to know if it has moved """
+
+        fco = self._fco(obj)
+        if fco is not None:
+            placement = fco.Placement
+        else:
+            placement = self._obj_shp(obj).Placement
+        return tuple(placement.toMatrix().A)
+
+    def build (self):
+        """ Builds the tree from the boxes of the parts """
+
+        n_parts = len(self.boxes)
+        self.order = np.arange(n_parts)
+        boxes = []
+        childs = []
+        ranges = []
+        parents = []
+        self.leaf_of = np.zeros(n_parts, dtype = int)
+        if n_parts == 0:
+            stack = []
+        else:
+            stack = [(0, n_parts, -1)]
+        centers = (self.boxes[:, :3] + self.boxes[:, 3:]) / 2.
+        while stack:
+            start, end, parent = stack.pop()
+            node = len(boxes)
+            if parent >= 0:
+                # the first child is set first
+                if childs[parent][0] < 0:
+                    childs[parent][0] = node
+                else:
+                    childs[parent][1] = node
+            sel = self.order[start:end]
+            boxes.append(np.concatenate((self.boxes[sel, :3].min(axis = 0),
+                                         self.boxes[sel, 3:].max(axis = 0))))
+            childs.append([-1, -1])
+            ranges.append((start, end))
+            parents.append(parent)
+            if end - start <= self.leaf_size:
+                self.leaf_of[sel] = node
+                continue
+            # split by the median of the centers on the largest side
+            axis = int(np.argmax(boxes[node][3:] - boxes[node][:3]))
+            self.order[start:end] = sel[np.argsort(centers[sel, axis],
+                                                   kind = 'mergesort')]
+            mid = (start + end) // 2
+            stack.append((mid, end, node))
+            stack.append((start, mid, node))
+        self.node_box = np.array(boxes).reshape(-1, 6)
+        self.node_child = np.array(childs, dtype = int).reshape(-1, 2)
+        self.node_range = np.array(ranges, dtype = int).reshape(-1, 2)
+        self.node_parent = np.array(parents, dtype = int)
+
+    def refresh (self):
+        """ Updates the boxes of the parts that have been moved, and the
+        boxes of their nodes, without building the tree again
+
+        Returns:
+            number of parts that have been moved
+        """
+
+        moved = []
+        for ind, obj in enumerate(self.objs):
+            key = self._obj_key(obj)
+            if key != self.keys[ind]:
+                self.keys[ind] = key
+                self.shps[ind] = self._obj_shp(obj)
+                self.boxes[ind] = shp_box(self.shps[ind])
+                moved.append(ind)
+        # the nodes from the leaves to the root
+        dirty = set(int(self.leaf_of[ind]) for ind in moved)
+        while dirty:
+            node = max(dirty)
+            dirty.discard(node)
+            left, right = self.node_child[node]
+            if left < 0:
+                start, end = self.node_range[node]
+                sel = self.order[start:end]
+                self.node_box[node] = np.concatenate(
+                                          (self.boxes[sel, :3].min(axis = 0),
+                                           self.boxes[sel, 3:].max(axis = 0)))
+            else:
+                self.node_box[node] = np.concatenate(
+                            (np.minimum(self.node_box[left, :3],
+                                        self.node_box[right, :3]),
+                             np.maximum(self.node_box[left, 3:],
+                                        self.node_box[right, 3:])))
+            if self.node_parent[node] >= 0:
+                dirty.add(int(self.node_parent[node]))
+        if moved:
+            logger.debug('spatial index: %d parts moved' % len(moved))
+        return len(moved)
+
+    def _query_box (self, query):
+        """ Index (or None) and box of a query: name, index or shape """
+
+        if isinstance(query, (int, np.integer)):
+            ind = int(query)
+        elif hasattr(query, 'BoundBox'):
+            return None, shp_box(query)
+        else:
+            ind = self.name_ind[query]
+        return ind, self.boxes[ind]
+
+    def box_candidates (self, box, dist):
+        """ Parts whose boxes are at a distance not larger than dist
+        from a box
+
+        Args:
+            box: NumPy array (6)
+            dist: distance
+
+        Returns:
+            list of the indexes of the parts
+        """
+
+        if len(self.node_box) == 0:
+            return []
+        cands = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if box_dist(box, self.node_box[node:node + 1])[0] > dist:
+                continue
+            left, right = self.node_child[node]
+            if left < 0:
+                start, end = self.node_range[node]
+                sel = self.order[start:end]
+                cands.extend(sel[box_dist(box, self.boxes[sel]) <= dist])
+            else:
+                stack.extend((left, right))
+        return [int(ind) for ind in cands]
+
+    def _exact_dist (self, ind, shp):
+        return self.shps[ind].distToShape(shp)[0]
+
+    def within (self, query, dist):
+        """ Parts at a distance not larger than dist from the query
+
+        Args:
+            query: name or index of a part of the index, or a TopoShape
+            dist: distance
+
+        Returns:
+            list of tuples (name, distance), ordered by distance
+        """
+
+        q_ind, box = self._query_box(query)
+        shp = self.shps[q_ind] if q_ind is not None else query
+        res = []
+        for ind in self.box_candidates(box, dist):
+            if ind == q_ind:
+                continue
+            d_ind = self._exact_dist(ind, shp)
+            if d_ind <= dist:
+                res.append((self.names[ind], d_ind))
+        res.sort(key = lambda item: item[1])
+        return res
+
+    def nearest (self, query, k = 1):
+        """ The k nearest parts to the query. The nodes are visited by the
+        distance of their boxes, and distToShape is only called on the
+        parts whose boxes are closer than the k-th exact distance
+
+        Args:
+            query: name or index of a part of the index, or a TopoShape
+            k: number of parts
+
+        Returns:
+            list of tuples (name, distance), ordered by distance
+        """
+
+        q_ind, box = self._query_box(query)
+        shp = self.shps[q_ind] if q_ind is not None else query
+        res = []
+        if len(self.node_box) == 0:
+            return res
+        # (distance, kind, index): kind 0: node, 1: part box, 2: part exact
+        heap = [(0., 0, 0)]
+        while heap and len(res) < k:
+            dist, kind, ind = heapq.heappop(heap)
+            if kind == 2:
+                res.append((self.names[ind], dist))
+            elif kind == 1:
+                heapq.heappush(heap, (self._exact_dist(ind, shp), 2, ind))
+            else:
+                left, right = self.node_child[ind]
+                if left < 0:
+                    start, end = self.node_range[ind]
+                    sel = self.order[start:end]
+                    for p_ind, p_dist in zip(sel, box_dist(box,
+                                                           self.boxes[sel])):
+                        if p_ind != q_ind:
+                            heapq.heappush(heap, (float(p_dist), 1,
+                                                  int(p_ind)))
+                else:
+                    for child in (left, right):
+                        heapq.heappush(heap, (float(box_dist(
+                                           box,
+                                           self.node_box[child:child + 1])[0]),
+                                              0, int(child)))
+        return res
+
+    def clearance_report (self, dist):
+        """ All the pairs of parts at a distance not larger than dist
+
+        Args:
+            dist: distance
+
+        Returns:
+            list of tuples (name_a, name_b, distance), ordered by distance.
+            Distance 0 if they touch or interfere
+        """
+
+        res = []
+        n_cands = 0
+        for ind_a in range(len(self.objs)):
+            for ind_b in self.box_candidates(self.boxes[ind_a], dist):
+                if ind_b <= ind_a:
+                    continue
+                n_cands += 1
+                d_ab = self._exact_dist(ind_b, self.shps[ind_a])
+                if d_ab <= dist:
+                    res.append((self.names[ind_a], self.names[ind_b], d_ab))
+        logger.debug('clearance report: %d parts, %d candidate pairs'
+                     % (len(self.objs), n_cands))
+        res.sort(key = lambda item: item[2])
+        return res
@@ -0,0 +1,275 @@
+# ----------------------------------------------------------------------------
+# -- Swept volumes
+# -- comps library
+# -- Envelopes of the volume that moving parts sweep along their stroke
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# To check the clearance of a moving group (i.e. stageparts.CentralSlider
+# on its rods, or the movegroup of epi3) against the frame, instead of
+# checking the group at many positions, the volume that it sweeps along
+# the whole stroke is made, and the clearance is one boolean.
+#
+#      stroke_min       stroke_max
+#          :                :
+#        ______ ............______
+#       |      |           |      |
+#       |group |  ----->   |group |   axis
+#       |______|...........|______|
+#
+#       :__________________________:
+#               swept envelope
+#
+# The envelope can be made in different ways (mode):
+#   'bbox': box aligned with the axis that contains the group, extruded
+#           along the stroke. The fastest and the most conservative
+#   'hull': 2D convex hull of the group projected on the plane
+#           perpendicular to the axis, extruded along the stroke. Conservative
+#   'sampled': union of copies of the group at n_samples positions of the
+#              stroke. It is the closest to the real volume, but it is only
+#              conservative if the step is smaller than the group along axis
+#
+# The envelopes are cached by (group, axis, stroke, mode)
+#
+#    env = swept.swept_volume([slider.fco_top, slider.fco_bot], VY, -50, 50)
+#    swept.clearance(env, frame_shp)
+
+import logging
+import hashlib
+
+import FreeCAD
+import Part
+import DraftVecUtils
+import numpy as np
+
+import fcfun
+
+logger = logging.getLogger(__name__)
+
+# tolerance of the tessellation used to take the points of the shapes.
+# It is added to the envelopes, so they are conservative
+TESS_TOL = 0.1
+
+# cache of the envelopes: {(group key, axis, stroke, mode, ...): shape}
+_swept_cache = {}
+
+
+def group_shapes (group):
+    """ Shapes of a group of moving parts
+
+    Args:
+        group: list of TopoShapes, FreeCAD objects or components (with
+               shp or fco)
+
+    Returns:
+        list of TopoShapes
+    """
+
+    import builddaemon
+
+    shp_list = []
+    for elem in group:
+        if isinstance(elem, Part.Shape):
+            shp_list.append(elem)
+        elif hasattr(elem, 'Shape'):
+            shp_list.append(elem.Shape)
+        elif getattr(elem, 'fco', None) is not None:
+            # the FreeCAD object has the placement of the component
+            shp_list.append(elem.fco.Shape)
+        else:
+            shp_list.append(builddaemon.get_build_shp(elem))
+    return shp_list
+
+
+def group_key (shp_list):
+    """ Key of a group of shapes for the cache: hash of their fingerprints,
+    see fcfun.shp_fingerprint """
+
+    sha = hashlib.sha1()
+    for shp in shp_list:
+        sha.update(fcfun.shp_fingerprint(shp).encode('utf-8'))
+    return sha.hexdigest()
+
+
+def group_points (shp_list):
+    """ Points of the tessellation of the shapes, that include the
+    extremes of the curved faces
+
+    Returns:
+        NumPy array (n,3)
+    """
+
+    pts = []
+    for shp in shp_list:
+        pts.extend(tuple(vec) for vec in shp.tessellate(TESS_TOL)[0])
+        pts.extend(tuple(vtx.Point) for vtx in shp.Vertexes)
+    return np.array(pts, dtype = float).reshape(-1, 3)
+
+
+def hull_2d (pts):
+    """ Convex hull of 2D points (monotone chain)
+
+    Args:
+        pts: NumPy array (n,2)
+
+    Returns:
+        NumPy array (m,2) with the vertexes of the hull, counterclockwise
+    """
+
+    pts = np.unique(np.round(pts, 6), axis = 0)
+    if len(pts) < 3:
+        return pts
+
+    def half (points):
+        chain = []
+        for pt in points:
+            while len(chain) >= 2:
+                (x1, y1), (x2, y2) = chain[-2], chain[-1]
+                if (x2 - x1) * (pt[1] - y1) - (y2 - y1) * (pt[0] - x1) > 0:
+                    break
+                chain.pop()
+            chain.append(tuple(pt))
+        return chain
+
+    lower = half(pts)
+    upper = half(pts[::-1])
+    return np.array(lower[:-1] + upper[:-1])
+
+
+def offset_convex (poly, dist):
+    """ Offset of a convex polygon, each edge is moved dist outwards
+
+    Args:
+        poly: NumPy array (m,2) with the vertexes, counterclockwise
+        dist: distance of the offset
+
+    Returns:
+        NumPy array (m,2) with the vertexes of the offset polygon
+    """
+
+    edges = np.roll(poly, -1, axis = 0) - poly
+    # outward normals of the edges (counterclockwise polygon)
+    nrm = np.column_stack((edges[:, 1], -edges[:, 0]))
+    nrm /= np.linalg.norm(nrm, axis = 1).reshape(-1, 1)
+    # each vertex is between the previous edge and its edge
+    nrm_prev = np.roll(nrm, 1, axis = 0)
+    cos_ang = np.sum(nrm * nrm_prev, axis = 1).reshape(-1, 1)
+    return poly + dist * (nrm + nrm_prev) / (1. + cos_ang)
+
+
+def _axes (fc_axis):
+    """ Normalized axis and 2 perpendicular axes """
+
+    axis = DraftVecUtils.scaleTo(fc_axis, 1)
+    axis_1 = DraftVecUtils.scaleTo(fcfun.get_fc_perpend1(axis), 1)
+    axis_2 = axis.cross(axis_1)
+    return axis, axis_1, axis_2
+
+
+def _prism (poly_2d, axes, a_min, a_max):
+    """ Extrusion along axis of a 2D polygon on the plane of axis_1, axis_2
+
+    Args:
+        poly_2d: NumPy array (m,2) with the vertexes
+        axes: tuple (axis, axis_1, axis_2)
+        a_min, a_max: extremes of the extrusion along axis
+
+    Returns:
+        solid shape
+    """
+
+    axis, axis_1, axis_2 = axes
+    vecs = [(DraftVecUtils.scale(axis_1, float(pt[0]))
+             + DraftVecUtils.scale(axis_2, float(pt[1]))
+             + DraftVecUtils.scale(axis, a_min)) for pt in poly_2d]
+    wire = Part.makePolygon(vecs + [vecs[0]])
+    return Part.Face(wire).extrude(DraftVecUtils.scale(axis, a_max - a_min))
+
+
+def swept_volume (group, fc_axis, stroke_min, stroke_max, mode = 'hull',
+                  n_samples = 10, key = None):
+    """ Envelope of the volume swept by a group of moving parts
+
+    Args:
+        group: list of TopoShapes, FreeCAD objects or components, at the
+               position where the stroke is 0
+        fc_axis: FreeCAD.Vector of the direction of the movement
+        stroke_min, stroke_max: the range of the movement along fc_axis,
+               from the current position of the group
+        mode: 'bbox', 'hull' or 'sampled', see the header of the module
+        n_samples: number of positions for mode 'sampled', with the ends
+        key: key of the group for the cache. If None, the hash of the shapes
+
+    Returns:
+        shape of the envelope
+    """
+
+    shp_list = group_shapes(group)
+    if key is None:
+        key = group_key(shp_list)
+    axes = _axes(fc_axis)
+    cache_key = (key, tuple(round(val, 9) for val in axes[0]),
+                 float(stroke_min), float(stroke_max), mode)
+    if mode == 'sampled':
+        cache_key += (n_samples,)
+    if cache_key in _swept_cache:
+        return _swept_cache[cache_key]
+
+    if mode == 'sampled':
+        shp_group = Part.makeCompound(shp_list)
+        copies = []
+        for stroke in np.linspace(stroke_min, stroke_max, n_samples):
+            shp_i = shp_group.copy()
+            shp_i.translate(DraftVecUtils.scale(axes[0], float(stroke)))
+            copies.append(shp_i)
+        shp_env = fcfun.fuseshplist(copies).removeSplitter()
+    else:
+        pts = group_points(shp_list)
+        axes_arr = np.array([tuple(vec) for vec in axes])
+        loc = np.dot(pts, axes_arr.T)
+        a_min = loc[:, 0].min() + stroke_min - TESS_TOL
+        a_max = loc[:, 0].max() + stroke_max + TESS_TOL
+        if mode == 'bbox':
+            c_min = loc[:, 1:].min(axis = 0) - TESS_TOL
+            c_max = loc[:, 1:].max(axis = 0) + TESS_TOL
+            poly = np.array([[c_min[0], c_min[1]], [c_max[0], c_min[1]],
+                             [c_max[0], c_max[1]], [c_min[0], c_max[1]]])
+        elif mode == 'hull':
+            # offset to include the tessellation tolerance
+            poly = offset_convex(hull_2d(loc[:, 1:]), TESS_TOL)
+        else:
+            logger.error('unknown swept volume mode: ' + str(mode))
+            return None
+        shp_env = _prism(poly, axes, float(a_min), float(a_max))
+    _swept_cache[cache_key] = shp_env
+    return shp_env
+
+
+def clear_cache ():
+    """ Empties the cache of the envelopes """
+
+    _swept_cache.clear()
+
+
+def clearance (shp_env, shp_frame):
+    """ Checks the clearance between a swept envelope and the frame
+
+    Args:
+        shp_env: shape of the envelope, see swept_volume
+        shp_frame: shape of the frame (or a compound of the fixed parts)
+
+    Returns:
+        tuple (interf_vol, dist):
+            interf_vol: volume of the interference, 0 if there is clearance
+            dist: minimum distance, 0 if there is interference
+    """
+
+    interf_vol = shp_env.common(shp_frame).Volume
+    if interf_vol > 0:
+        return interf_vol, 0.
+    return 0., shp_env.distToShape(shp_frame)[0]
@@ -0,0 +1,441 @@
+# ----------------------------------------------------------------------------
+# -- Test Golden Geometry
+# -- Regression test of the geometry of the components of the library
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# test_comps.py and test_parts3d.py build the components to see them.
+# This test builds the public components of the library with representative
+# arguments, and compares their geometry with the golden values kept in
+# golden_geometry.json:
+#   - volume and area, with a relative tolerance (GOLD_REL_TOL)
+#   - bounding box, with an absolute tolerance (GOLD_LEN_TOL)
+#   - number of solids and faces, exactly
+# If the fingerprint (fcfun.shp_fingerprint) is the same, the geometry
+# has not changed and the other values are not compared.
+#
+# The cases are built in parallel worker processes (as the build daemon
+# does, see builddaemon.py), each case in its own document.
+#
+# To execute it, from this directory:
+#   python test_golden.py            compares with the golden values
+#   python test_golden.py -j 4       with 4 worker processes
+#   python test_golden.py -k bracket only the cases with bracket in the name
+#   python test_golden.py --update   builds the cases and saves their values
+#                                    as the new golden values
+#   python test_golden.py --update --tree /tmp/baseline
+#                                    the same, but building the components
+#                                    of another checkout of the repository
+# or with freecadcmd:
+#   freecadcmd test_golden.py
+# or with pytest (test_golden), with FCAD_GOLDEN_UPDATE=1 in the environment
+# it saves the new golden values, as --update
+#
+# The cases without golden values are reported as new, and the test fails,
+# run --update after checking them, and commit golden_geometry.json.
+# If there is no golden_geometry.json, the pytest test is skipped.
+# Any change in the geometry of a component that is wanted needs an
+# --update, and the diff of golden_geometry.json shows what changed
+#
+# To take the golden values from an older version, i.e. to check that a
+# refactor does not change the geometry, build them from a checkout of it:
+#   git worktree add /tmp/baseline <commit>
+#   python test_golden.py --update --tree /tmp/baseline
+# The fingerprints are not saved if that version has no
+# fcfun.shp_fingerprint, then the other values are compared
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import traceback
+import multiprocessing
+
+# to get the components. Older freecadcmd dont define __file__, then it has
+# to be executed from this directory
+try:
+    filepath = os.path.dirname(os.path.abspath(__file__))
+except NameError:
+    filepath = os.getcwd()
+sys.path.append(filepath)
+# root of the repository, with the stage modules (stageparts, citoparts)
+rootpath = os.path.dirname(os.path.dirname(filepath))
+
+import builddaemon
+
+logger = logging.getLogger(__name__)
+
+GOLDEN_PATH = os.path.join(filepath, 'golden_geometry.json')
+
+# environment variable to save the golden values when run from pytest
+UPDATE_ENV = 'FCAD_GOLDEN_UPDATE'
+
+# relative tolerance of the volume and the area
+GOLD_REL_TOL = 1e-4
+# absolute tolerance of the bounding box (mm)
+GOLD_LEN_TOL = 1e-3
+
+# the cases: (name, module, builder, kwargs [, shape attributes])
+# shape attributes: the components that have their shape in several
+# attributes (shapes or FreeCAD objects), they are compared as a compound
+# the kwargs are encoded as in the requests of the build daemon:
+#   {"__vec__": [x, y, z]} for FreeCAD.Vector
+#   {"__const__": "module.CONSTANT"} for the dictionaries of kcomp
+VX = {'__vec__': [1, 0, 0]}
+VY = {'__vec__': [0, 1, 0]}
+VZ = {'__vec__': [0, 0, 1]}
+
+# the sliders keep the FreeCAD objects of their parts
+SLIDER_SHPS = ('top_slide', 'bot_slide')
+
+CASES = [
+    # comps
+    ('sk8', 'comps', 'Sk', {'size': 8, 'name': 'sk8'}),
+    ('sk_dir8', 'comps', 'Sk_dir', {'size': 8, 'fc_axis_h': VZ,
+                                    'fc_axis_d': VX}),
+    ('sk_dir12', 'comps', 'Sk_dir', {'size': 12, 'fc_axis_h': VX,
+                                     'fc_axis_d': VY}),
+    ('misumialu30', 'comps', 'MisumiAlu30s6w8', {'length': 100.,
+                                                 'name': 'alu30'}),
+    ('aluprof_dir20', 'comps', 'getaluprof_dir',
+         {'aludict': {'__const__': 'kcomp.ALU_MOTEDIS_20I5'},
+          'length': 100.}),
+    ('nema17', 'comps', 'NemaMotor', {'size': 17, 'length': 40.,
+                                      'shaft_l': 24., 'circle_r': 11.,
+                                      'circle_h': 2.}),
+    ('linbearing8', 'comps', 'LinBearing', {'r_ext': 8., 'r_int': 4.,
+                                            'h': 25., 'name': 'lm8uu'}),
+    ('t8nut', 'comps', 'T8Nut', {'name': 't8nut'}),
+    ('t8nuthousing', 'comps', 'T8NutHousing', {'name': 't8nuthousing'}),
+    ('mis_lscrnut', 'comps', 'get_mis_min_lscrnut',
+         {'nutdict': {'__const__': 'kcomp.MIS_LSCRNUT_C_L1_T4'}}),
+    ('flexcoupling', 'comps', 'FlexCoupling', {'ds': 5., 'dl': 8.}),
+    ('linguide15', 'comps', 'f_linguide',
+         {'rail_l': 150., 'dlg': {'__const__': 'kcomp.SEB15A'},
+          'axis_l': 'x', 'axis_b': 'z'}),
+    # parts
+    ('bracket_perp', 'parts', 'AluProfBracketPerp',
+         {'alusize_lin': 20., 'alusize_perp': 20.}),
+    ('bracket_perp_flap', 'parts', 'AluProfBracketPerpFlap',
+         {'alusize_lin': 20., 'alusize_perp': 20.}),
+    ('bracket_twin', 'parts', 'AluProfBracketPerpTwin',
+         {'alusize_lin': 20., 'alusize_perp': 20., 'alu_sep': 50.,
+          'nbolts_lin': 2}),
+    ('idlepulleyholder', 'parts', 'IdlePulleyHolder',
+         {'profile_size': 20., 'pulleybolt_d': 3, 'holdbolt_d': 5,
+          'above_h': 40.}),
+    ('endstopholder', 'parts', 'SimpleEndstopHolder',
+         {'d_endstop': {'__const__': 'kcomp.ENDSTOP_A'}}),
+    ('thinlinbearhouse1rail', 'parts', 'ThinLinBearHouse1rail',
+         {'d_lbear': {'__const__': 'kcomp.LME8UU'}}),
+    ('thinlinbearhouse', 'parts', 'ThinLinBearHouse',
+         {'d_lbear': {'__const__': 'kcomp.LME8UU'}}),
+    ('thinlinbearhouseasim', 'parts', 'ThinLinBearHouseAsim',
+         {'d_lbear': {'__const__': 'kcomp.LME8UU'}}),
+    ('linbearhouse', 'parts', 'LinBearHouse',
+         {'d_lbearhousing': {'__const__': 'kcomp.SC8UU'}}),
+    ('nemamotorholder', 'parts', 'NemaMotorHolder', {}),
+    ('plate3cagecubes', 'parts', 'Plate3CageCubes',
+         {'d_cagecube': {'__const__': 'kcomp_optic.CAGE_CUBE_60'},
+          'thick': 5., 'cube_dist_n': 10., 'cube_dist_p': 10.}),
+    # beltcl
+    ('gt2beltclamp', 'beltcl', 'Gt2BeltClamp', {'base_h': 8.,
+                                                'midblock': 1,
+                                                'name': 'gt2beltclamp'}),
+    ('beltclamp', 'beltcl', 'BeltClamp', {'fc_fro_ax': VX,
+                                          'fc_top_ax': VZ}),
+    # comp_optic
+    ('cagecube60', 'comp_optic', 'f_cagecube',
+         {'d_cagecube': {'__const__': 'kcomp_optic.CAGE_CUBE_60'}}),
+    ('cagecubehalf60', 'comp_optic', 'f_cagecubehalf',
+         {'d_cagecubehalf': {'__const__': 'kcomp_optic.CAGE_CUBE_HALF_60'}}),
+    ('lb1c_plate', 'comp_optic', 'Lb1cPlate',
+         {'d_plate': {'__const__': 'kcomp_optic.LB1CM_PLATE'}}),
+    ('lb2c_plate', 'comp_optic', 'Lb2cPlate', {'fc_axis_h': VZ,
+                                               'fc_axis_l': VX}),
+    ('lcp01m_plate', 'comp_optic', 'lcp01m_plate', {}),
+    ('lcpb1m_base', 'comp_optic', 'lcpb1m_base', {}),
+    ('tubelens_sm1_sm2', 'comp_optic', 'SM1TubelensSm2', {'sm1l_size': 5}),
+    ('thled30', 'comp_optic', 'ThLed30', {}),
+    ('prizled', 'comp_optic', 'PrizLed', {}),
+    ('breadboard', 'comp_optic', 'f_breadboard',
+         {'d_breadboard': {'__const__': 'kcomp_optic.BREAD_BOARD_M'},
+          'length': 200., 'width': 150.}),
+    # sliders of the stages
+    ('endslider_parts3d', 'parts3d', 'EndShaftSlider',
+         {'slidrod_r': 6., 'holdrod_r': 6., 'holdrod_sep': 150.,
+          'name': 'slider_left'}, SLIDER_SHPS),
+    ('endslider_parts3d_right', 'parts3d', 'EndShaftSlider',
+         {'slidrod_r': 6., 'holdrod_r': 6., 'holdrod_sep': 150.,
+          'name': 'slider_right', 'holdrod_cen': 0, 'side': 'right'},
+         SLIDER_SHPS),
+    ('endslider_stage', 'stageparts', 'EndShaftSlider',
+         {'slidrod_r': 6., 'holdrod_r': 6., 'holdrod_sep': 150.,
+          'name': 'slider_left'}, SLIDER_SHPS),
+    ('endslider_stage_aporras', 'stageparts_aporras', 'EndShaftSlider',
+         {'slidrod_r': 6., 'holdrod_r': 6., 'holdrod_sep': 150.,
+          'name': 'slider_right', 'side': 'right'}, SLIDER_SHPS),
+    ('endslider_cito', 'citoparts', 'EndShaftSlider',
+         {'slidrod_r': 6., 'holdrod_r': 6., 'holdrod_sep': 150.,
+          'name': 'slider_bot', 'side': 'bottom'}, SLIDER_SHPS),
+    # with the dent of the end sliders of 6mm rods 150mm apart
+    ('censlider_stage', 'stageparts', 'CentralSlider',
+         {'rod_r': 6., 'rod_sep': 150., 'name': 'central_slider',
+          'belt_sep': 82., 'dent_w': 16.65, 'dent_l': 118.94,
+          'dent_sl': 68.}, SLIDER_SHPS),
+    ('censlider_cito', 'citoparts', 'CentralSlider',
+         {'rod_r': 6., 'rod_sep': 150., 'name': 'central_slider',
+          'belt_sep': 82., 'dent_w': 16.65, 'dent_l': 118.94,
+          'dent_sl': 68., 'dlg_x': {'__const__': 'kcomp.SEBWM16'},
+          'dlg_nx': {'__const__': 'kcomp.SEBWM16'}}, SLIDER_SHPS),
+]
+
+
+def shp_gold_vals (shp):
+    """ Values of a shape that are compared with the golden values
+
+    Args:
+        shp: TopoShape
+
+    Returns:
+        dictionary with the values
+    """
+
+    import fcfun
+
+    # older versions (see --tree) have no fingerprint
+    shp_fingerprint = getattr(fcfun, 'shp_fingerprint', None)
+    bb = shp.BoundBox
+    return {'fingerprint': shp_fingerprint(shp) if shp_fingerprint else None,
+            'volume': shp.Volume,
+            'area': shp.Area,
+            'bbox': [bb.XMin, bb.YMin, bb.ZMin, bb.XMax, bb.YMax, bb.ZMax],
+            'n_solids': len(shp.Solids),
+            'n_faces': len(shp.Faces)}
+
+
+def build_case (case):
+    """ Builds a case in a new document and gets its values.
+    It is executed in the worker processes
+
+    Args:
+        case: tuple (name, module, builder, kwargs [, shape attributes]),
+              see CASES
+
+    Returns:
+        tuple (name, values, error): values is None if there is an error
+    """
+
+    import importlib
+    import FreeCAD
+    import Part
+
+    name, mod_name, builder_name, kwargs = case[:4]
+    shp_attrs = case[4] if len(case) > 4 else ()
+    doc = None
+    try:
+        builder = getattr(importlib.import_module(mod_name), builder_name)
+        doc = FreeCAD.newDocument('golden_' + name)
+        FreeCAD.setActiveDocument(doc.Name)
+        t0 = time.time()
+        comp = builder(**builddaemon.decode_arg(kwargs))
+        doc.recompute()
+        if shp_attrs:
+            shp = Part.makeCompound([builddaemon.get_build_shp(comp, attr)
+                                     for attr in shp_attrs])
+        else:
+            shp = builddaemon.get_build_shp(comp)
+        values = shp_gold_vals(shp)
+        values['time'] = time.time() - t0
+        return name, values, ''
+    except Exception:
+        return name, None, traceback.format_exc()
+    finally:
+        if doc is not None:
+            FreeCAD.closeDocument(doc.Name)
+
+
+def compare_vals (values, golden):
+    """ Compares the values of a case with its golden values
+
+    Args:
+        values: dictionary of the values, see shp_gold_vals
+        golden: dictionary of the golden values
+
+    Returns:
+        list of the differences, empty if they are equal within tolerance
+    """
+
+    if (golden.get('fingerprint')
+            and values['fingerprint'] == golden['fingerprint']):
+        return []
+    diffs = []
+    for key in ('n_solids', 'n_faces'):
+        if values[key] != golden[key]:
+            diffs.append('%s: %d != %d' % (key, values[key], golden[key]))
+    for key in ('volume', 'area'):
+        tol = GOLD_REL_TOL * max(abs(golden[key]), 1.)
+        if abs(values[key] - golden[key]) > tol:
+            diffs.append('%s: %.4f != %.4f' % (key, values[key], golden[key]))
+    bb_diff = max(abs(val - gold) for val, gold in zip(values['bbox'],
+                                                       golden['bbox']))
+    if bb_diff > GOLD_LEN_TOL:
+        diffs.append('bbox: differs %.4f' % bb_diff)
+    return diffs
+
+
+def load_golden (path = GOLDEN_PATH):
+    """ Loads the golden values, empty if there is no file """
+
+    if not os.path.exists(path):
+        return {}
+    with open(path) as fgold:
+        return json.load(fgold)
+
+
+def save_golden (golden, path = GOLDEN_PATH):
+    """ Saves the golden values, sorted, so the diffs are readable """
+
+    with open(path, 'w') as fgold:
+        json.dump(golden, fgold, indent = 1, sort_keys = True)
+        fgold.write('\n')
+
+
+def init_worker (tree = ''):
+    """ Initializer of the processes that build the cases: the root of the
+    repository (for the stage modules) and the library are put first in
+    sys.path, and the library is imported (see builddaemon.warm_worker)
+
+    Args:
+        tree: root of the checkout of the repository whose components are
+              built. If empty, this one
+    """
+
+    if tree:
+        root_path = os.path.abspath(tree)
+        lib_path = os.path.join(root_path, 'modules', 'comps')
+    else:
+        root_path = rootpath
+        lib_path = filepath
+    # first, so they are taken instead of the modules of this checkout
+    for path in (root_path, lib_path):
+        if path in sys.path:
+            sys.path.remove(path)
+        sys.path.insert(0, path)
+    builddaemon.warm_worker(lib_path)
+
+
+def run_cases (cases, n_proc = 0, tree = ''):
+    """ Builds the cases in parallel worker processes
+
+    Args:
+        cases: list of cases, see CASES
+        n_proc: number of processes. If 0: number of cpus.
+                If 1: no other processes are created
+        tree: root of the checkout of the repository whose components are
+              built. If empty, this one
+
+    Returns:
+        list of tuples (name, values, error), sorted by name
+    """
+
+    if n_proc == 0:
+        n_proc = multiprocessing.cpu_count()
+    n_proc = max(1, min(n_proc, len(cases)))
+    if n_proc == 1:
+        init_worker(tree)
+        results = [build_case(case) for case in cases]
+    else:
+        pool = multiprocessing.Pool(n_proc, init_worker, (tree,))
+        try:
+            # one case at a time, the build times are very different
+            results = list(pool.imap_unordered(build_case, cases, 1))
+        finally:
+            pool.close()
+            pool.join()
+    return sorted(results)
+
+
+def check_golden (cases = CASES, n_proc = 0, update = 0,
+                  path = GOLDEN_PATH, tree = ''):
+    """ Builds the cases and compares them with the golden values
+
+    Args:
+        cases: list of cases, see CASES
+        n_proc: number of processes, see run_cases
+        update: 1: the golden values of the cases are replaced
+        path: path of the golden values
+        tree: root of the checkout whose components are built, see
+              run_cases
+
+    Returns:
+        tuple (failed, new): lists of the names of the cases that failed
+        (build errors or differences) and of the cases without golden values
+    """
+
+    golden = load_golden(path)
+    failed = []
+    new = []
+    t0 = time.time()
+    for name, values, error in run_cases(cases, n_proc, tree):
+        if values is None:
+            logger.error(name + ': build error\n' + error)
+            failed.append(name)
+            continue
+        values.pop('time')
+        if update == 1:
+            golden[name] = values
+        elif name not in golden:
+            logger.warning(name + ': no golden values')
+            new.append(name)
+        else:
+            diffs = compare_vals(values, golden[name])
+            if diffs:
+                logger.error(name + ': ' + ', '.join(diffs))
+                failed.append(name)
+    if update == 1:
+        save_golden(golden, path)
+    logger.info('%d cases, %d failed, %d new, %.1f s'
+                % (len(cases), len(failed), len(new), time.time() - t0))
+    return failed, new
+
+
+def test_golden ():
+    update = int(os.environ.get(UPDATE_ENV, '0') not in ('', '0'))
+    if update == 0 and not os.path.exists(GOLDEN_PATH):
+        import pytest
+        pytest.skip('no ' + os.path.basename(GOLDEN_PATH) + ', make it with'
+                    ' python test_golden.py --update [--tree <baseline>]')
+    failed, new = check_golden(update = update)
+    assert not failed, 'geometry changed: ' + ', '.join(failed)
+    assert not new, ('no golden values: ' + ', '.join(new)
+                     + ' (check them and run with --update or '
+                     + UPDATE_ENV + '=1)')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level = logging.INFO,
+                        format = '%(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description = 'Golden geometry test')
+    parser.add_argument('--update', action = 'store_true',
+                        help = 'save the values as the new golden values')
+    parser.add_argument('-j', type = int, default = 0,
+                        help = 'number of processes, 0: number of cpus')
+    parser.add_argument('-k', default = '',
+                        help = 'only the cases with this text in the name')
+    parser.add_argument('--tree', default = '',
+                        help = 'root of another checkout of the repository'
+                               ' to build its components')
+    # freecadcmd passes its own arguments
+    args = parser.parse_known_args()[0]
+    sel_cases = [case for case in CASES if args.k in case[0]]
+    failed, new = check_golden(sel_cases, args.j, int(args.update),
+                               tree = args.tree)
+    sys.exit(1 if failed or new else 0)
@@ -0,0 +1,123 @@
+# ----------------------------------------------------------------------------
+# -- Test Placement nodes
+# -- Propagation of the placements of the sets of parts (placenode.py)
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# The parts and sets are made with placenode.PlacePart and PlaceSet, with
+# objects that only have a Placement instead of the FreeCAD objects, so no
+# document is needed:
+#
+#            set_a
+#           /     \
+#       part_1    set_b
+#                /     \
+#            part_2   part_3
+#
+# To execute it, from this directory:
+#   python -m pytest test_placenode.py
+
+import os
+import sys
+
+import pytest
+
+try:
+    filepath = os.path.dirname(os.path.abspath(__file__))
+except NameError:
+    filepath = os.getcwd()
+sys.path.append(filepath)
+
+FreeCAD = pytest.importorskip('FreeCAD')
+
+import placenode
+
+
+class FakeFco (object):
+    """ Object with a Placement, as the FreeCAD objects, that counts how
+    many times its placement is written """
+
+    def __init__ (self):
+        self._placement = FreeCAD.Placement()
+        self.n_writes = 0
+
+    @property
+    def Placement (self):
+        return self._placement
+
+    @Placement.setter
+    def Placement (self, placement):
+        self.n_writes += 1
+        self._placement = placement
+
+
+def new_part ():
+    part = placenode.PlacePart()
+    part.fco = FakeFco()
+    return part
+
+
+def new_set (parts):
+    set_parts = placenode.PlaceSet()
+    set_parts.init_parts()
+    for part in parts:
+        set_parts.append_part(part)
+    return set_parts
+
+
+def make_tree ():
+    part_1, part_2, part_3 = new_part(), new_part(), new_part()
+    set_b = new_set([part_2, part_3])
+    set_a = new_set([part_1, set_b])
+    set_a.place_fcos()
+    return set_a, set_b, part_1, part_2, part_3
+
+
+def base (part):
+    return part.fco.Placement.Base
+
+
+def test_parent_moves_children ():
+    set_a, set_b, part_1, part_2, part_3 = make_tree()
+    part_2.rel_place = FreeCAD.Vector(1, 0, 0)
+    set_a.place_fcos()
+    assert base(part_2) == FreeCAD.Vector(1, 0, 0)
+
+    set_b.rel_place = FreeCAD.Vector(0, 10, 0)
+    set_a.place_fcos()
+    assert base(part_1) == FreeCAD.Vector(0, 0, 0)
+    assert base(part_2) == FreeCAD.Vector(1, 10, 0)
+    assert base(part_3) == FreeCAD.Vector(0, 10, 0)
+
+    set_a.extra_mov = FreeCAD.Vector(0, 0, 5)
+    set_a.place_fcos()
+    assert base(part_1) == FreeCAD.Vector(0, 0, 5)
+    assert base(part_2) == FreeCAD.Vector(1, 10, 5)
+    assert base(part_3) == FreeCAD.Vector(0, 10, 5)
+
+
+def test_only_dirty_parts_placed ():
+    set_a, set_b, part_1, part_2, part_3 = make_tree()
+    writes = [part.fco.n_writes for part in (part_1, part_2, part_3)]
+    part_3.pos_o_adjust = FreeCAD.Vector(0, 0, 2)
+    assert part_3 in set_b.dirty_parts and set_b in set_a.dirty_parts
+    set_a.place_fcos()
+    assert base(part_3) == FreeCAD.Vector(0, 0, 2)
+    assert part_1.fco.n_writes == writes[0]
+    assert part_2.fco.n_writes == writes[1]
+    assert not set_a.dirty_parts and not set_b.dirty_parts
+
+
+def test_batch_place ():
+    part = new_part()
+    with placenode.batch_place():
+        placenode.set_fco_base(part.fco, FreeCAD.Vector(1, 2, 3))
+        placenode.set_fco_base(part.fco, FreeCAD.Vector(4, 5, 6))
+        assert base(part) == FreeCAD.Vector(0, 0, 0)
+    assert base(part) == FreeCAD.Vector(4, 5, 6)
+    assert part.fco.n_writes == 1
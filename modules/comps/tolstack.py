@@ -0,0 +1,395 @@
+# ----------------------------------------------------------------------------
+# -- Tolerance stack-up
+# -- comps library
+# -- Monte Carlo analysis of the fits of the printed parts
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# The tolerances of the printed parts (kcomp.TOL, kparts.MTOL, MLTOL,
+# TOL_BEARING_L, ROD_SPACE, ...) are added to the dimensions of the
+# holes. To know if a tolerance is too tight or too loose, the dimension
+# chain of the fit is declared, each dimension with its deviations and
+# its distribution, and many draws are sampled to get the probability of
+# interference and the probability of being too loose.
+#
+# A dimension has a nominal value and its lower and upper deviations:
+#
+#          dev_low   dev_up
+#           :-----:-----:
+#           :     :     :
+#       ....|.....+.....|.........
+#              nominal
+#
+#  'uniform':    any value between the limits
+#  'normal':     centered, the limits are at 3 sigma
+#  'triangular': centered, the limits are the extremes
+#
+# A chain is a sum of dimensions with their signs, and the result is the
+# clearance of the fit, i.e. for a bearing in a printed housing:
+#
+#   clearance = bore (LMEUU_D + 2*MLTOL) + printer error - bearing diameter
+#
+#   chain = tolstack.lbear_bore_chain(8)
+#   res = tolstack.analyze(chain, n = 1000000)
+#   print(tolstack.format_table([res]))
+#
+# The chains of the fits of the library are made with the functions
+# *_chain from the values of kcomp and kparts, so different values of
+# a tolerance can be compared with sweep
+
+import logging
+import collections
+
+import numpy as np
+
+import kcomp
+import kparts
+
+logger = logging.getLogger(__name__)
+
+DISTRIBUTIONS = ('uniform', 'normal', 'triangular')
+
+# Error of the printed dimensions (dev_low, dev_up), relative to the
+# designed dimension. The printed holes are usually smaller
+PRINT_ERR = {
+              'hole_d': (-0.4, 0.),  # diameter of the holes
+              'length': (-0.2, 0.2), # lengths on the XY plane
+            }
+
+# number of draws sampled at a time, to limit the memory
+CHUNK = 1000000
+
+# a dimension of the chain
+# name: name of the dimension
+# nominal: nominal value
+# dev_low: lower deviation (negative or 0)
+# dev_up: upper deviation
+# dist: 'uniform', 'normal' or 'triangular'
+Dim = collections.namedtuple('Dim', ['name', 'nominal', 'dev_low', 'dev_up',
+                                     'dist'])
+
+# result of the analysis of a chain
+# name: name of the chain
+# n: number of draws
+# nominal: clearance with the nominal values
+# mean, std, c_min, c_max: statistics of the clearance
+# p_interf: probability of interference (clearance < min_gap)
+# p_loose: probability of being too loose (clearance > max_gap)
+StackResult = collections.namedtuple('StackResult',
+                                     ['name', 'n', 'nominal', 'mean', 'std',
+                                      'c_min', 'c_max', 'p_interf',
+                                      'p_loose'])
+
+
+def dim (name, nominal, dev_low = 0., dev_up = 0., dist = 'uniform'):
+    """ Makes a dimension, checking its arguments
+
+    Args:
+        name: name of the dimension
+        nominal: nominal value
+        dev_low: lower deviation
+        dev_up: upper deviation
+        dist: 'uniform', 'normal' or 'triangular'
+
+    Returns:
+        Dim
+    """
+
+    if dist not in DISTRIBUTIONS:
+        logger.error('unknown distribution: ' + str(dist))
+    if dev_low > dev_up:
+        logger.warning(name + ': dev_low larger than dev_up, swapped')
+        dev_low, dev_up = dev_up, dev_low
+    return Dim(name, float(nominal), float(dev_low), float(dev_up), dist)
+
+
+class Chain (object):
+    """ Dimension chain of a fit. The clearance is the sum of the
+    dimensions with their signs
+
+    Args:
+        name: name of the chain
+        min_gap: the clearance has to be at least min_gap, if not, there
+                 is interference
+        max_gap: the clearance has to be at most max_gap, if not, it is
+                 too loose. If None, there is no upper limit
+
+    Attributes:
+        terms: list of tuples (sign, Dim)
+    """
+
+    def __init__ (self, name, min_gap = 0., max_gap = None):
+        self.name = name
+        self.min_gap = min_gap
+        self.max_gap = max_gap
+        self.terms = []
+
+    def add (self, dimension, sign = 1):
+        """ Adds a dimension to the chain
+
+        Args:
+            dimension: Dim
+            sign: 1 if it increases the clearance (i.e. the hole),
+                  -1 if it reduces it (i.e. the shaft)
+
+        Returns:
+            the chain, so the calls can be chained
+        """
+
+        self.terms.append((sign, dimension))
+        return self
+
+    def nominal (self):
+        """ Clearance with the nominal values """
+
+        return sum(sign * dimension.nominal for sign, dimension in self.terms)
+
+    def worst_case (self):
+        """ Clearance in the worst cases
+
+        Returns:
+            tuple (minimum clearance, maximum clearance)
+        """
+
+        c_min = 0.
+        c_max = 0.
+        for sign, dimension in self.terms:
+            low = dimension.nominal + dimension.dev_low
+            up = dimension.nominal + dimension.dev_up
+            if sign > 0:
+                c_min += low
+                c_max += up
+            else:
+                c_min -= up
+                c_max -= low
+        return c_min, c_max
+
+
+def sample_dims (dims, n, rng):
+    """ Samples the values of the dimensions
+
+    Args:
+        dims: list of Dim
+        n: number of draws
+        rng: NumPy RandomState
+
+    Returns:
+        NumPy array (n, number of dimensions)
+    """
+
+    vals = np.empty((n, len(dims)))
+    for ind, dimension in enumerate(dims):
+        low = dimension.nominal + dimension.dev_low
+        up = dimension.nominal + dimension.dev_up
+        if up == low:
+            vals[:, ind] = low
+        elif dimension.dist == 'normal':
+            vals[:, ind] = rng.normal((low + up) / 2., (up - low) / 6., n)
+        elif dimension.dist == 'triangular':
+            vals[:, ind] = rng.triangular(low, (low + up) / 2., up, n)
+        else:
+            vals[:, ind] = rng.uniform(low, up, n)
+    return vals
+
+
+def sample (chain, n = CHUNK, seed = None):
+    """ Samples the clearance of a chain
+
+    Args:
+        chain: Chain
+        n: number of draws
+        seed: seed of the random numbers, to repeat the results
+
+    Returns:
+        NumPy array (n) with the clearances
+    """
+
+    rng = np.random.RandomState(seed)
+    signs = np.array([sign for sign, _ in chain.terms], dtype = float)
+    dims = [dimension for _, dimension in chain.terms]
+    return np.dot(sample_dims(dims, n, rng), signs)
+
+
+def analyze (chain, n = CHUNK, seed = None):
+    """ Monte Carlo analysis of a chain. The draws are sampled in chunks
+    of CHUNK, so millions of draws dont take much memory
+
+    Args:
+        chain: Chain
+        n: number of draws
+        seed: seed of the random numbers, to repeat the results
+
+    Returns:
+        StackResult
+    """
+
+    rng = np.random.RandomState(seed)
+    signs = np.array([sign for sign, _ in chain.terms], dtype = float)
+    dims = [dimension for _, dimension in chain.terms]
+    c_sum = 0.
+    c_sum2 = 0.
+    c_min = np.inf
+    c_max = -np.inf
+    n_interf = 0
+    n_loose = 0
+    done = 0
+    while done < n:
+        n_chunk = min(CHUNK, n - done)
+        clear = np.dot(sample_dims(dims, n_chunk, rng), signs)
+        c_sum += clear.sum()
+        c_sum2 += np.dot(clear, clear)
+        c_min = min(c_min, clear.min())
+        c_max = max(c_max, clear.max())
+        n_interf += np.count_nonzero(clear < chain.min_gap)
+        if chain.max_gap is not None:
+            n_loose += np.count_nonzero(clear > chain.max_gap)
+        done += n_chunk
+    mean = c_sum / n
+    std = np.sqrt(max(c_sum2 / n - mean * mean, 0.))
+    return StackResult(chain.name, n, chain.nominal(), float(mean),
+                       float(std), float(c_min), float(c_max),
+                       float(n_interf) / n, float(n_loose) / n)
+
+
+def analyze_chains (chains, n = CHUNK, seed = None):
+    """ Analysis of a list of chains
+
+    Returns:
+        list of StackResult, in the same order
+    """
+
+    return [analyze(chain, n, seed) for chain in chains]
+
+
+def sweep (make_chain, values, n = CHUNK, seed = None):
+    """ Analysis of a chain for different values of a tolerance, to
+    choose it
+
+    Args:
+        make_chain: function that takes the value and returns the Chain,
+                    i.e. lambda tol: lbear_bore_chain(8, mltol = tol)
+        values: iterable with the values of the tolerance
+
+    Returns:
+        list of tuples (value, StackResult)
+    """
+
+    return [(value, analyze(make_chain(value), n, seed)) for value in values]
+
+
+def format_table (results):
+    """ Text table of the results of the analysis
+
+    Args:
+        results: list of StackResult
+
+    Returns:
+        string with the table
+    """
+
+    name_w = max([len('name')] + [len(res.name) for res in results])
+    head = ('%-*s %9s %8s %8s %8s %8s %9s %9s'
+            % (name_w, 'name', 'nominal', 'mean', 'std', 'min', 'max',
+               'interf%', 'loose%'))
+    lines = [head, '-' * len(head)]
+    for res in results:
+        lines.append('%-*s %9.3f %8.3f %8.3f %8.3f %8.3f %9.3f %9.3f'
+                     % (name_w, res.name, res.nominal, res.mean, res.std,
+                        res.c_min, res.c_max, 100. * res.p_interf,
+                        100. * res.p_loose))
+    return '\n'.join(lines)
+
+
+# ---------------- chains of the fits of the library
+
+
+def print_dim (name, nominal, err = 'hole_d'):
+    """ Printed dimension, with the deviations of PRINT_ERR """
+
+    dev_low, dev_up = PRINT_ERR[err]
+    return dim(name, nominal, dev_low, dev_up, 'normal')
+
+
+def lbear_bore_chain (d = 8, mltol = kparts.MLTOL, max_gap = 0.5):
+    """ Diameter of the housing of a linear bearing LMEUU, as in
+    parts.ThinLinBearHouse: bearing_d + 2 * MLTOL
+
+    Args:
+        d: diameter of the rod of the bearing (key of kcomp.LMEUU)
+        mltol: tolerance added to the radius of the housing
+        max_gap: maximum clearance, larger and the bearing is loose
+
+    Returns:
+        Chain
+    """
+
+    bearing_d = kcomp.LMEUU[d]['De']
+    chain = Chain('lbear_bore_%d' % d, 0., max_gap)
+    chain.add(print_dim('housing bore', bearing_d + 2. * mltol))
+    # bearing diameter: h7, about -0.02
+    chain.add(dim('bearing De', bearing_d, -0.02, 0.), -1)
+    return chain
+
+
+def lbear_len_chain (d = 8, tol_bearing_l = kparts.TOL_BEARING_L):
+    """ Length of the housing of a linear bearing LMEUU, as in
+    parts.ThinLinBearHouse: bearing_l + TOL_BEARING_L. The holes can be
+    as large as needed, so there is no upper limit
+
+    Returns:
+        Chain
+    """
+
+    bearing_l = kcomp.LMEUU[d]['L']
+    chain = Chain('lbear_len_%d' % d)
+    chain.add(print_dim('housing length', bearing_l + tol_bearing_l,
+                        'length'))
+    chain.add(dim('bearing L', bearing_l, -0.3, 0.), -1)
+    return chain
+
+
+def rod_space_chain (d = 8, rod_space = kparts.ROD_SPACE_MIN):
+    """ Diameter of the hole for the sliding rod, as in
+    parts.ThinLinBearHouse: rod radius + ROD_SPACE_MIN.
+    The rod cannot touch the hole
+
+    Returns:
+        Chain
+    """
+
+    chain = Chain('rod_space_%d' % d, 0.)
+    chain.add(print_dim('rod hole', d + 2. * rod_space))
+    # rod diameter: h6, about -0.01
+    chain.add(dim('rod d', d, -0.01, 0.), -1)
+    return chain
+
+
+def bolt_hole_chain (metric = 3, mtol = kparts.MTOL):
+    """ Diameter of the hole of the shank of a bolt, as in
+    parts.ThinLinBearHouse: BOLT_D + MTOL
+
+    Returns:
+        Chain
+    """
+
+    chain = Chain('bolt_hole_m%d' % metric, 0.)
+    chain.add(print_dim('bolt hole', metric + mtol))
+    chain.add(dim('bolt d', metric, -0.15, 0.), -1)
+    return chain
+
+
+def library_chains (d = 8, metric = 3):
+    """ Chains of the fits of the library with the values of kcomp and
+    kparts
+
+    Returns:
+        list of Chain
+    """
+
+    return [lbear_bore_chain(d), lbear_len_chain(d), rod_space_chain(d),
+            bolt_hole_chain(metric)]
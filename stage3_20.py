@@ -46,6 +46,11 @@ sys.path.append(filepath + '/' + '../comps')
 
 # where the freecad document is going to be saved
 savepath = filepath + "/../../freecad/citometro/py/"
+# 1: the intermediate features are deleted once the model is built, it can
+# be done without saving the document (see fcfun.flatten_doc)
+flatten = 1
+# 1: the document is saved in savepath
+save = 1
 
 import fcfun   # import my functions for freecad. FreeCad Functions
 import kcit    # import citometer constants
@@ -53,6 +58,7 @@ import kcomp   # import material constants and other constants
 import comps   # import my CAD components
 import parts   # import my CAD components to print
 import citoparts # import my CAD pieces to be printed
+import massprops # mass properties report
 
 from fcfun import V0, VX, VY, VZ, V0ROT, addBox, addCyl, fillet_len
 from fcfun import addBolt, addBoltNut_hole, NutHole
@@ -74,8 +80,9 @@ from kcomp import TOL
 #
 # In this design, the bas will be centered on X
 
-logging.basicConfig(level=logging.DEBUG,
-                    format='%(%(levelname)s - %(message)s')
+# level of the log, i.e. FCAD_LOG_LEVEL=DEBUG
+logging.basicConfig(level=os.environ.get('FCAD_LOG_LEVEL', 'INFO'),
+                    format='%(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 doc = FreeCAD.newDocument()
@@ -252,9 +259,9 @@ h_xendslid_r.BasePlace ((rod_y_sep/2.0, portabase_pos_y, rod_y_pos_z))
 
 # ------------------- Central Slider
 
-print "h_zendslid_r.dent_w " + str(h_xendslid_r.dent_w)
-print "h_zendslid_r.dent_w " + str(h_xendslid_r.dent_l)
-print "h_zendslid_r.dent_w " + str(h_xendslid_r.dent_sl)
+print("h_zendslid_r.dent_w " + str(h_xendslid_r.dent_w))
+print("h_zendslid_r.dent_w " + str(h_xendslid_r.dent_l))
+print("h_zendslid_r.dent_w " + str(h_xendslid_r.dent_sl))
 
 h_censlid = citoparts.CentralSlider (rod_r   = kcit.ROD_R,
                                    rod_sep = kcit.ROD_X_SEP,
@@ -426,7 +433,7 @@ lg_ny.BasePlace(( 0,
                  portabase_pos_y - h_censlid.lg_y_posy,
                  rod_y_pos_z +  h_censlid.lg_ny_posz - boltend_sep15))
 
-print 'h_censlid.lg_y_posy: ' + str(h_censlid.lg_y_posy)
+print('h_censlid.lg_y_posy: ' + str(h_censlid.lg_y_posy))
 
 doc.recompute()
 
@@ -497,13 +504,13 @@ portabase_nut_posz_min = nutT8_posz_min +  h_nutT8.FlangeL
 
 
 portabase2nut_h = t8lead_end_posz - portabase_nut_posz_min
-print 'portabase2nut_h : ' + str(portabase2nut_h)
+print('portabase2nut_h : ' + str(portabase2nut_h))
 
 portabase_nut_posz_max =  nutT8_posz_max +  h_nutT8.FlangeL
 
 # this is the stroke
 t8lead_stroke = portabase_nut_posz_max - portabase_nut_posz_min
-print 'Z stroke : ' + str(t8lead_stroke)
+print('Z stroke : ' + str(t8lead_stroke))
 
 
 nutT8shank_l = h_nutT8.NutL - nutT8_base_h
@@ -543,8 +550,8 @@ lg_posz_top_rel = lg_posz_top  - portabase_nut_posz_min
 # longer than the leadscrew
 lgybl_posz_c_min_rel = lgybl_posz_c_min - portabase_nut_posz_min +15
 #lgybl_posz_c_max_rel = lgybl_posz_c_max - portabase_nut_posz
-print 'lg_posz_top_rel: '  + str(lg_posz_top_rel)
-print 'lgybl_posz_c_min_rel: '  + str(lgybl_posz_c_min_rel)
+print('lg_posz_top_rel: '  + str(lg_posz_top_rel))
+print('lgybl_posz_c_min_rel: '  + str(lgybl_posz_c_min_rel))
 
 h_portabase = citoparts.PortaBase (
                        porta_l = kcit.PORTA_L,
@@ -689,7 +696,15 @@ guidoc.portahold.ShapeColor = fcfun.RED
 
 guidoc.ActiveView.setAxisCross(True)
 
-doc.saveAs (savepath + filename + ".FCStd")
+# only the final shapes are kept, without the intermediate features
+if flatten == 1:
+    fcfun.flatten_doc(doc)
+# weight and balance check of the build, in this process (n_proc = 1):
+# no worker processes are forked from the FreeCAD GUI
+logger.info('\n' + massprops.format_table(massprops.report_doc(doc,
+                                                           n_proc = 1)))
+if save == 1:
+    doc.saveAs (savepath + filename + ".FCStd")
 
 
 
@@ -53,6 +53,7 @@ import kcomp   # import material constants and other constants
 import comps   # import my CAD components
 import parts   # import my CAD components to print
 import stageparts # import my CAD pieces to be printed
+import assembly   # to build the subassemblies in their own documents
 
 from fcfun import V0, VX, VY, VZ, V0ROT, addBox, addCyl, fillet_len
 from fcfun import addBolt, addBoltNut_hole, NutHole
@@ -74,8 +75,9 @@ from kcomp import TOL
 #
 # In this design, the base will be centered on X
 
-logging.basicConfig(level=logging.DEBUG,
-                    format='%(%(levelname)s - %(message)s')
+# level of the log, i.e. FCAD_LOG_LEVEL=DEBUG
+logging.basicConfig(level=os.environ.get('FCAD_LOG_LEVEL', 'INFO'),
+                    format='%(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 doc = FreeCAD.newDocument()
@@ -134,10 +136,15 @@ if aluprof_dict == None:
 # --------------- Y slider, the one on the end of X, on the negative side
 # we need some of its dimensions, so we create it here, and then, it will be
 # positioned
+# The sliders are built in their own documents, and linked at the end,
+# so the recomputes of this document dont go through their features
 
 rodx_sep = kstage.PORTABASE_L  # calculate
 
-h_yslid_nx = stageparts.EndShaftSlider(slidrod_r = RODY_R,
+yslid_nx_doc, h_yslid_nx = assembly.build_subasm(
+                                        stageparts.EndShaftSlider,
+                                        "yslider_nx",
+                                        slidrod_r = RODY_R,
                                         holdrod_r = RODY_R,
                                         holdrod_sep = rodx_sep,
                                         name          = "yslider_nx",
@@ -324,7 +331,10 @@ y_stroke = y_rail_l - h_yslid_nx.length
 h_yslid_nx.BasePlace ((-rody_sep/2., yslid_pos_y, rody_pos_z))
 
 # --------------- Y slider, the one on the end of X, on the negative side
-h_yslid_x = stageparts.EndShaftSlider(slidrod_r = RODY_R,
+yslid_x_doc, h_yslid_x = assembly.build_subasm(
+                                      stageparts.EndShaftSlider,
+                                      "yslider_x",
+                                      slidrod_r = RODY_R,
                                       holdrod_r = RODX_R,
                                       holdrod_sep = rodx_sep,
                                       name          = "yslider_x",
@@ -365,7 +375,9 @@ rodx_y.Placement.Base = FreeCAD.Vector(0, rodx_pos_y, rodx_pos_z)
 
 # --------------- Central Slider, with inner hole
 
-h_censlid = stageparts.CentralSliderHole (
+censlid_doc, h_censlid = assembly.build_subasm(
+                                   stageparts.CentralSliderHole,
+                                   "central_slider",
                                    rod_r   = RODX_R,
                                    rod_sep = rodx_sep,
                                    name    = "central_slider",
@@ -420,6 +432,11 @@ h_yslid_x.bot_slide.ViewObject.ShapeColor = fcfun.BLUE_05
 h_portatrayhole.fco.ViewObject.ShapeColor = fcfun.YELLOW_05
 h_portatrayhole.fco_clamp_group.ViewObject.ShapeColor = fcfun.ORANGE
 
+# the subassemblies are placed in their documents, link them here
+for sub_doc in (yslid_nx_doc, yslid_x_doc, censlid_doc):
+    sub_doc.recompute()
+    assembly.link_subasm(doc, sub_doc)
+
 doc.recompute()
 
 
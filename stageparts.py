@@ -38,6 +38,7 @@ import kcomp    # import material constants and other constants
 import comps    # import my CAD components
 import beltcl   # import my CAD components
 import partgroup  # import my CAD components
+import parts3d  # import my CAD components
 import kstage
 
 from fcfun import V0, VX, VY, VZ, V0ROT, addBox, addCyl, fillet_len
@@ -46,706 +47,42 @@ from fcfun import addBolt, addBoltNut_hole, NutHole
 from kcomp import TOL
 
 
-logging.basicConfig(level=logging.DEBUG)
-                    #format='%(%(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 # ---------- class EndShaftSlider ----------------------------------------
 # Creates the slider that goes on a rod and supports the end of another
 # rod. The slider runs on 2 linear bearings
-# The slider is referenced on the slider axis
-# Creates both sides, the upper part and the lower part, it also creates the
-# linear bearings
-
-#     slidrod_r : radius of the rod where the slider runs on
-#     holdrod_r : radius of the rod that this slider holds
-#     holdrod_sep : separation between the rods that are holded
-#     holdrod_cen : 1: if the piece is centered on the perpendicular 
-#     side        : 'left' or 'right' (slidding on axis Y)
-#                 : 'bottom' or 'top' (slidding on axis X)
-#
-#          Y      axis= 'y'    side='left'
-#          |
-#          |                                  
-#          |
-#          |
-#      ____|_________
-#     |  |   |   ____|
-#     |  |   |  |____|
-#     |  |   |       |
-#     |  |   |       |
-#     |  |   |       |---------------- X: holdrod_cen = 1
-#     |  |   |       |
-#     |  |   |   ____|
-#     |  |   |  |____|
-#     |__|___|_______|________________ X: holdrod_cen = 0
-#
-#
-#
-#      ____|_________ __________________________________________ length
-#     |  |   |   ____|
-#     |  |   |  |____| ----------------------- holdrod_sep
-#     |  |   |       |
-#     |  |   |       |                        |
-#     |  |   |       |
-#     |  |   |       |                        |
-#     |  |   |   ____|
-#     |  |   |  |____|----- holdrod2end --------
-#     |__|___|_______|__________________________________________ 
-#
-#          |    |
-#          |----|----> slide2holdrod (+)
-#
+# It is parts3d.EndShaftSlider with the constants of the stage (kstage)
+# See parts3d.EndShaftSlider for the arguments and the atributes
 
-
-# --- Atributes:
-# length : length of the slider, on the direction of the slidding axis
-# width  : width of the slider, on the direction perpendicular to the slidding
-#          axis. On the direction of the holding axis
-# partheight : heigth of each part of the slider. So the total height will be
-#              twice this height
-# holdrod_sep : separation between the 2 rods that are holded and forms the 
-#               perpendicular axis movement
-# slide2holdrod : distance from the sliding rod (axis) to
-#                 the beginning of the hold rod (axis). Positive
-# slide2holdrod_sign : distance from the sliding rod (axis) to
-#                 the beginning of the hold rod (axis). Positive
-#                 or negative depending on the sign
-# dent_w  : width of the dent, if no dent is needed, just dent_w = 0
-# dent_l  : length of the dent, 
-# dent_sl : small dimension of the dent length
-# ovdent_w  : width of the dent, including the overlap to make the union
-# ovdent_l  : length of the dent, including the overlap to make the union 
-# idlepull_axsep : separation between the axis iddle pulleys
-# pulley_posx: relative position X of the idle pulleys
-# belt_sep : separation between the inner part of the iddle pulleys
-#                   that is where the belts are. So it is
-#                   idlepull_axsep - 2* radius of the bearing
-# idlepulls : FreeCad object of the idle pulleys
-# bearings : FreeCad object of the bearings
-# top_slide : FreeCad object of the top part of the slider
-# bot_slide : FreeCad object of the bottm part of the slider
-# base_place: position of the 3 elements: All of them have the same base
-#             position.
-#             It is (0,0,0) when initialized, it has to be changed using the
-#             function Base_Place
-
-class EndShaftSlider (object):
+class EndShaftSlider (parts3d.EndShaftSlider):
 
     # Separation from the end of the linear bearing to the end of the piece
     # on the Heigth dimension (Z)
     OUT_SEP_H = kstage.OUT_SEP_H
 
     # Minimum separation between the bearings, on the slide direction
-    #MIN_BEAR_SEP = 3.0
     MIN_BEAR_SEP = kstage.MIN_BEAR_SEP
 
-    # Ratio between the length of the rod (shaft) that is inserted in the slider
-    # and the diameter of the holded shaft
-    HOLDROD_INS_RATIO = 2.0
-
     # Radius to fillet the sides
     FILLT_R = kstage.FILLT_R
 
     # Space for the sliding rod, to be added to its radius, and to be cut
-    #ROD_SPACE = 1.5
     ROD_SPACE = kstage.ROD_SPACE
 
-    # tolerance on their length for the bearings. Larger because the holes
-    # usually are too tight and it doesn't matter how large is the hole
-    #TOL_BEARING_L = 1.0 # reduced
+    # tolerance on their length for the bearings
     TOL_BEARING_L = kstage.TOL_BEARING_L
 
-    #MTOL = TOL - 0.1 # reducing the tolrances, it was too tolerant :)
-    #MLTOL = TOL - 0.05 # reducing the tolrances, it was too tolerant :)
     MTOL = kstage.MTOL
     MLTOL = kstage.MLTOL
 
-    def __init__ (self, slidrod_r, holdrod_r, holdrod_sep, 
-                  name, holdrod_cen = 1, side = 'left'):
-
-        # Bolts to hold the top and bottom parts:
-        if slidrod_r >= 6:
-            BOLT_D = 4
-            BOLTPUL_D = 4
-        else:
-            BOLT_D = 3 # smaller bolts when the shaft are less 12mm diameter
-            BOLTPUL_D = 3
-   
-        MTOL = self.MTOL
-        MLTOL = self.MLTOL
-        BOLT_HEAD_R = kcomp.D912_HEAD_D[BOLT_D] / 2.0
-        BOLT_HEAD_L = kcomp.D912_HEAD_L[BOLT_D] + MTOL
-        BOLT_HEAD_R_TOL = BOLT_HEAD_R + MTOL/2.0 
-        BOLT_SHANK_R_TOL = BOLT_D / 2.0 + MTOL/2.0
-        BOLT_NUT_R = kcomp.NUT_D934_D[BOLT_D] / 2.0
-        BOLT_NUT_L = kcomp.NUT_D934_L[BOLT_D] + MTOL
-        #  1.5 TOL because diameter values are minimum, so they may be larger
-        BOLT_NUT_R_TOL = BOLT_NUT_R + 1.5*MTOL
-
-        # Bolts for the pulleys
-        BOLTPUL_SHANK_R_TOL = BOLTPUL_D / 2.0 + MTOL/2.0
-        BOLTPUL_NUT_R = kcomp.NUT_D934_D[BOLTPUL_D] / 2.0
-        BOLTPUL_NUT_L = kcomp.NUT_D934_L[BOLTPUL_D] + MTOL
-        #  1.5 TOL because diameter values are minimum, so they may be larger
-        BOLTPUL_NUT_R_TOL = BOLTPUL_NUT_R + 1.5*MTOL
-
-
-        doc = FreeCAD.ActiveDocument
-        self.base_place = (0,0,0)
-        self.slidrod_r = slidrod_r
-        self.holdrod_r = holdrod_r
-        self.holdrod_sep = holdrod_sep
-        self.holdrod_cen = holdrod_cen
-    
-        self.name        = name
-        #self.axis        = axis
-
-        # Separation from the end of the linear bearing to the end of the piece
-        # on the width dimension (perpendicular to the movement)
-        if BOLT_D == 3:
-            self.OUT_SEP_W = 8.0
-            # on the length dimension (parallel to the movement)
-            self.OUT_SEP_L = 10.0
-        elif BOLT_D == 4:
-            self.OUT_SEP_W = 10.0
-            self.OUT_SEP_L = 14.0
-        else:
-            print "not defined"
-
-        bearing_l     = kcomp.LMEUU_L[int(2*slidrod_r)] 
-        bearing_l_tol = bearing_l + self.TOL_BEARING_L
-        bearing_d     = kcomp.LMEUU_D[int(2*slidrod_r)]
-        bearing_d_tol = bearing_d + 2.0 * self.MLTOL
-        bearing_r     = bearing_d / 2.0
-        bearing_r_tol = bearing_r + self.MLTOL
-
-        holdrod_r_tol =  holdrod_r + self.MLTOL/2.0
-
-        holdrod_insert = self.HOLDROD_INS_RATIO * (2*slidrod_r) 
-
-        self.slide2holdrod = bearing_r + self.MIN_BEAR_SEP 
-        if side == 'right' or side == 'top':
-            # the distance will be negative, either on the X axis (right)
-            # or on the Y axis (top)
-            self.slide2holdrod_sign = - self.slide2holdrod
-        else:
-            self.slide2holdrod_sign = self.slide2holdrod
-    
-        # calculation of the width
-        # dimensions should not depend on tolerances
-        self.width = (  bearing_d     #bearing_d_tol
-                      + self.OUT_SEP_W
-                      + holdrod_insert
-                      + self.MIN_BEAR_SEP )
-
-
-        # calculation of the length
-        # it can be determined by the holdrod_sep (separation of the hold rods)
-        # or by the dimensions of the linear bearings. It will be the largest
-        # of these two: 
-        # tlen: total length ..
-        tlen_holdrod = holdrod_sep + 2 * self.OUT_SEP_L + 2 * holdrod_r
-        #tlen_holdrod = holdrod_sep + 2 * self.OUT_SEP_L + 2 * holdrod_r_tol
-        #tlen_bearing = (  2 * bearing_l_tol
-        tlen_bearing = (  2 * bearing_l
-                        + 2* self.OUT_SEP_L
-                        + self.MIN_BEAR_SEP)
-        if tlen_holdrod > tlen_bearing:
-            self.length = tlen_holdrod
-            print "length comes from holdrod"
-        else:
-            self.length = tlen_bearing
-            print "length comes from bearing: Check for errors"
-       
-
-        self.partheight = (  bearing_r
-                           + self.OUT_SEP_H)
-
-        
-        # distance from the center of the hold rod to the end on the sliding
-        # direction
-        self.holdrod2end = (self.length - holdrod_sep)/2
-
-#        if axis == 'x':
-#            slid_x = self.length
-#            slid_y = self.width
-#            slid_z = self.partheight
-#        else: # 'y': default
-        slid_x = self.width
-        slid_y = self.length
-        slid_z = self.partheight
-
-        if holdrod_cen == 1:
-            # offset if it is centered on the y
-            y_offs = - slid_y/2.0
-        else:
-            y_offs = 0
-
-
-        slid_posx = - (bearing_r + self.OUT_SEP_W)
-
-
-        bearing0_pos_y = self.OUT_SEP_L
-        # Not bearing_l_tol, because the tol will be added on top and bottom
-        # automatically
-        bearing1_pos_y = self.length - (self.OUT_SEP_L + bearing_l)
-         
-        # adding the offset
-        bearing0_pos_y = bearing0_pos_y + y_offs
-        bearing1_pos_y = bearing1_pos_y + y_offs
-
-
-        topslid_box = addBox(slid_x, slid_y, slid_z, "topsideslid_box")
-        topslid_box.Placement.Base = FreeCAD.Vector(slid_posx, y_offs, 0)
-
-        botslid_box = addBox(slid_x, slid_y, slid_z, "bosidetslid_box")
-        botslid_box.Placement.Base = FreeCAD.Vector(slid_posx, y_offs,
-                                                    -slid_z)
-
-        topslid_fllt = fillet_len (topslid_box, slid_z, 
-                                  self.FILLT_R, "topsideslid_fllt")
-        botslid_fllt = fillet_len (botslid_box, slid_z,
-                                  self.FILLT_R, "botsideslid_fllt")
-
-        # list of elements that cut:
-        cutlist = []
-
-        sliderod = fcfun.addCyl_pos (r = slidrod_r + self.ROD_SPACE,
-                               h = slid_y +2,
-                               name = "sliderod",
-                               axis = 'y',
-                               h_disp = y_offs - 1)
-
-        cutlist.append (sliderod)
-
-        h_lmuu_0 = comps.LinBearing (
-                         r_ext = bearing_r,
-                         r_int = slidrod_r,
-                         h     = bearing_l,
-                         name  = "lm" + str(int(2*slidrod_r)) + "uu_0",
-                         axis  = 'y',
-                         h_disp = bearing0_pos_y,
-                         r_tol  = self.MLTOL,
-                         h_tol  = self.TOL_BEARING_L)
-
-        cutlist.append (h_lmuu_0.bearing_cont)
-
-        h_lmuu_1 = comps.LinBearingClone (
-                                      h_lmuu_0,
-                                      "lm" + str(int(2*slidrod_r)) + "uu_1",
-                                      namadd = 0)
-        h_lmuu_1.BasePlace ((0, bearing1_pos_y - bearing0_pos_y, 0))
-        cutlist.append (h_lmuu_1.bearing_cont)
-
-
-        # ------------ hold rods ----------------
-
-        holdrod_0 = fcfun.addCyl_pos (
-                                r = holdrod_r_tol,
-                                h = holdrod_insert + 1,
-                                name = "holdrod_0",
-                                axis = 'x',
-                                h_disp = bearing_r + self.MIN_BEAR_SEP )
-                                #h_disp = bearing_r_tol + self.MIN_BEAR_SEP )
-
-        holdrod_0.Placement.Base = FreeCAD.Vector(
-                                     0,
-                                     self.holdrod2end + y_offs,
-                                     0)
-        cutlist.append (holdrod_0)
-
-        holdrod_1 = fcfun.addCyl_pos (
-                                r = holdrod_r_tol,
-                                h = holdrod_insert + 1,
-                                name = "holdrod_1",
-                                axis = 'x',
-                                h_disp = bearing_r + self.MIN_BEAR_SEP )
-                                #h_disp = bearing_r_tol + self.MIN_BEAR_SEP )
-
-        holdrod_1.Placement.Base = FreeCAD.Vector(
-                                       0,
-                                       self.length - self.holdrod2end + y_offs,
-                                       0)
-        cutlist.append (holdrod_1)
-
-        # -------------------- bolts and nuts
-        bolt0 = addBoltNut_hole (
-                            r_shank   = BOLT_SHANK_R_TOL,
-                            l_bolt    = 2 * slid_z,
-                            r_head    = BOLT_HEAD_R_TOL,
-                            l_head    = BOLT_HEAD_L,
-                            r_nut     = BOLT_NUT_R_TOL,
-                            l_nut     = BOLT_NUT_L,
-                            hex_head  = 0, extra=1,
-                            supp_head = 1, supp_nut=1,
-                            headdown  = 0, name="bolt_hole")
-
-        #bolt_left_pos_x =  -(  bearing_r_tol
-        bolt_left_pos_x =  -(  bearing_r
-                             + self.OUT_SEP_W
-                             + sliderod.Base.Radius.Value) / 2.0
-
-        #bolt_right_pos_x =   (  bearing_r_tol
-        bolt_right_pos_x =   (  bearing_r
-                              + self.MIN_BEAR_SEP
-                              + 0.6 * holdrod_insert )
-
-        bolt_low_pos_y =  self.OUT_SEP_L / 2.0 + y_offs
-        bolt_high_pos_y =  self.length - self.OUT_SEP_L / 2.0 + y_offs
-
-        #bolt_lowmid_pos_y =   1.5 * self.OUT_SEP_L + 2 * holdrod_r + y_offs
-        bolt_lowmid_pos_y = ( self.holdrod2end
-                            + holdrod_r
-                            + .5 * self.OUT_SEP_L
-                            + y_offs )
-
-        #bolt_highmid_pos_y = (  self.length
-        #                     - 1.5 * self.OUT_SEP_L
-        #                     - 2 * holdrod_r  # no _tol
-        #                     + y_offs)
-
-        bolt_highmid_pos_y = (  self.length
-                              - self.holdrod2end
-                              - holdrod_r 
-                              - .5 * self.OUT_SEP_L
-                              + y_offs)
-
-        bolt_pull_pos_x =   (  bearing_r_tol
-                              + self.MIN_BEAR_SEP
-                              + 0.25 * holdrod_insert )
-
-        self.pulley_posx = bolt_pull_pos_x
-
-        #bolt_pullow_pos_y =  2.5 * self.OUT_SEP_L + 2 * holdrod_r_tol + y_offs
-        bolt_pullow_pos_y = (  bolt_lowmid_pos_y
-                             + self.OUT_SEP_L)
-        #bolt_pulhigh_pos_y = (  self.length
-        #                     - 2.5 * self.OUT_SEP_L
-        #                     - 2 * holdrod_r  # no _tol
-        #                     + y_offs)
-        bolt_pulhigh_pos_y = (  bolt_highmid_pos_y
-                               - self.OUT_SEP_L)
-
-        # external diameter of the idle pulley. The function is called further
-        # down
-        idpull_nlist = kcomp.idpull_dict[BOLTPUL_D]
-        pulleyextdiam = partgroup.getmaxwashdiam(idpull_nlist)
-
-
-
-        # CHECK: there is no space, length too small
-        rodsep_extra = (  bolt_pulhigh_pos_y 
-                        - bolt_pullow_pos_y
-                        - pulleyextdiam)
-        if rodsep_extra <0:
-            logger.error("Rod separation %d, too small", holdrod_sep)
-            logger.error("It is %d shorter", rodsep_extra)
-        else:
-            logger.debug("Rod separation %d", holdrod_sep)
-            logger.debug("extra space %d", rodsep_extra)
-           
-
-
-        bolt0.Placement.Base = FreeCAD.Vector (bolt_left_pos_x,
-                                               self.length/2 + y_offs,
-                                               -slid_z)
-        bolt0.Placement.Rotation = FreeCAD.Rotation (VZ, 90)
-        cutlist.append (bolt0)
-
-# Naming convention for the bolts
-#      ______________ 
-#     |lu|   |   _ru_|       right up
-#     |  |   |  |____|
-#     |  |   |    rmu|       right middle up
-#     |  |   | pu    |  pulley up
-#     |0 |   | r     | right
-#     |  |   | pd    |  pulley down
-#     |  |   |   _rmd|       right middle down
-#     |  |   |  |____|
-#     |ld|___|____rd_|       right down
-#       
-        # Right
-        boltr = Draft.clone(bolt0)
-        boltr.Label = "bolt_hole_r"
-        boltr.Placement.Base =  FreeCAD.Vector (-bolt_left_pos_x,
-                                                self.length/2 + y_offs,
-                                               -slid_z)
-        boltr.Placement.Rotation = FreeCAD.Rotation (VZ, 30)
-        cutlist.append (boltr)
-
-
-        # Left Up
-        boltlu = Draft.clone(bolt0)
-        boltlu.Label = "bolt_hole_lu"
-        boltlu.Placement.Base =  FreeCAD.Vector (bolt_left_pos_x,
-                                                bolt_low_pos_y,
-                                               -slid_z)
-        boltlu.Placement.Rotation = FreeCAD.Rotation (VZ, 0)
-        cutlist.append (boltlu)
-        
-        # Left Down
-        boltld = Draft.clone(bolt0)
-        boltld.Label = "bolt_hole_ld"
-        boltld.Placement.Base =  FreeCAD.Vector (bolt_left_pos_x,
-                                                bolt_high_pos_y,
-                                               -slid_z)
-        boltld.Placement.Rotation = FreeCAD.Rotation (VZ, 0)
-        cutlist.append (boltld)
-
-        # Right Up 
-        boltru = Draft.clone(bolt0)
-        boltru.Label = "bolt_hole_ru"
-        boltru.Placement.Base =  FreeCAD.Vector (bolt_right_pos_x,
-                                                bolt_high_pos_y,
-                                               -slid_z)
-        boltru.Placement.Rotation = FreeCAD.Rotation (VZ, 0)
-        cutlist.append (boltru)
-
-        # Right Down
-        boltrd = Draft.clone(bolt0)
-        boltrd.Label = "bolt_hole_rd"
-        boltrd.Placement.Base =  FreeCAD.Vector (bolt_right_pos_x,
-                                                bolt_low_pos_y,
-                                               -slid_z)
-        boltrd.Placement.Rotation = FreeCAD.Rotation (VZ, 0)
-        cutlist.append (boltrd)
-
-        # Right Middle Up 
-        boltrmu = Draft.clone(bolt0)
-        boltrmu.Label = "bolt_hole_rmu"
-        boltrmu.Placement.Base =  FreeCAD.Vector (bolt_right_pos_x,
-                                                  bolt_highmid_pos_y,
-                                                 -slid_z)
-        boltrmu.Placement.Rotation = FreeCAD.Rotation (VZ, 0)
-        cutlist.append (boltrmu)
-
-        # Right Middle Down
-        boltrmd = Draft.clone(bolt0)
-        boltrmd.Label = "bolt_hole_rmd"
-        boltrmd.Placement.Base =  FreeCAD.Vector (bolt_right_pos_x,
-                                                bolt_lowmid_pos_y,
-                                               -slid_z)
-        boltrmd.Placement.Rotation = FreeCAD.Rotation (VZ, 0)
-        cutlist.append (boltrmd)
-
-        # Hole for the upper Pulley bolt       
-        boltpull0 = addBolt (
-                            r_shank   = BOLTPUL_SHANK_R_TOL,
-                            l_bolt    = 2 * slid_z,
-                            r_head    = BOLTPUL_NUT_R_TOL,
-                            l_head    = BOLTPUL_NUT_L,
-                            hex_head  = 1, extra=1,
-                            support = 1, 
-                            headdown  = 1, name="boltpul_hole")
-
-        boltpull0.Placement.Base =  FreeCAD.Vector (bolt_pull_pos_x,
-                                                    bolt_pulhigh_pos_y,
-                                                   -slid_z)
-        boltpull0.Placement.Rotation = FreeCAD.Rotation (VZ, 30)
-        cutlist.append (boltpull0)
-
-        # idlepull_name_list is a list of the components for building
-        # an idle pulley out of washers and bearings
-        h_idlepull0 = partgroup.BearWashGroup (
-                                   holcyl_list = idpull_nlist,
-                                   name = 'idlepull_0',
-                                   normal = VZ,
-                                   pos = boltpull0.Placement.Base + 
-                                         FreeCAD.Vector(0,0,2*slid_z))
-        idlepull0 = h_idlepull0.fco
-
-        # separation between the axis iddle pulleys
-        self.idlepull_axsep = bolt_pulhigh_pos_y - bolt_pullow_pos_y
-        # separation between the inner part of the iddle pulleys
-        # ie: idlepull_axsep - the diameter of the pulley (bearing)
-        # -1 is because the belt is 1.38mm thick. So in each side we can
-        # substract 0.5 mm
-        self.belt_sep = self.idlepull_axsep - h_idlepull0.d_maxbear - 1
-
-        # Hole for Pulley Down
-        boltpull1 = Draft.clone(boltpull0)
-        boltpull1.Label = "boltpul_hole_1"
-        boltpull1.Placement.Base =  FreeCAD.Vector (bolt_pull_pos_x,
-                                                    bolt_pullow_pos_y,
-                                                   -slid_z)
-        boltpull1.Placement.Rotation = FreeCAD.Rotation (VZ, 30)
-        cutlist.append (boltpull1)
-
-        # the other pulley:
-        idlepull1 = Draft.clone(idlepull0)
-        idlepull1.Label = "idlepull_1"
-        idlepull1.Placement.Base.y = bolt_pullow_pos_y - bolt_pulhigh_pos_y
-
-        idlepull_list = [ idlepull0, idlepull1]
-        idlepulls = doc.addObject("Part::Compound", "idlepulls")
-        idlepulls.Links = idlepull_list
-
-        # --- make a dent in the interior to save plastic
-        # points: p dent
-
-        
+    # Bolts depend on the diameter of the sliding rod
+    BOLT_D = 0
+    BOLTPUL_D = 0
 
-        pdent_ur = FreeCAD.Vector ( self.width + slid_posx + 1,
-                                    bolt_highmid_pos_y - 1,
-                                   -slid_z - 1)
-        pdent_ul = FreeCAD.Vector ( bolt_pull_pos_x + 1,
-                                    bolt_pulhigh_pos_y - self.OUT_SEP_L ,
-                                   -slid_z - 1)
-        pdent_dr = FreeCAD.Vector ( self.width + slid_posx + 1,
-                                    bolt_lowmid_pos_y +1,
-                                   -slid_z - 1)
-        pdent_dl = FreeCAD.Vector ( bolt_pull_pos_x + 1,
-                                    bolt_pullow_pos_y + self.OUT_SEP_L ,
-                                   -slid_z - 1)
-
-        # dent dimensions
-        # the length is actually shorter, because it is 1 mm inside.
-        #         
-        #        ur  ____ ovdent_l
-        #         /|                 h_over= (1/ovdent_w)*(ovdent_l-dent_sl)/2.
-        #        /_| ___ dent_l      h_over= triang_h_ov / ovdent_w
-        #       /| |    
-        #      / | |          dent_l = ovdent_l -2*lm
-        #     /  | |          
-        # ul /___|_| __ dent_sl
-        #    |     |
-        #    |     |
-        #    |     |
-        # dl |_____| __
-        #    \   | |
-        #     \  | |
-        #      \ | |
-        #       \|_| ___
-        #        \ |
-        #         \| ____
-        #          dr
-        #         1
-        #    |---|  dent_w
-        #    |-----| ovdent_w 
-        #
-        # the dimensions of the dent overlaped (ov), to make the shape
-        self.ovdent_w = abs(pdent_ur.x - pdent_ul.x) # longer width
-        self.dent_w   = self.ovdent_w - 1
-        self.ovdent_l = abs(pdent_ur.y - pdent_dr.y) # longer  Length 
-        self.dent_sl  = abs(pdent_ul.y - pdent_dl.y) # shorter Length 
-        # the height of the overlap triangle
-        triang_h_ov = abs(pdent_ur.y - pdent_ul.y)
-        self.dent_l = ( self.ovdent_l 
-                       - 2*(triang_h_ov / self.ovdent_w)) # h_over
-
-        pdent_list = [ pdent_ur, pdent_ul, pdent_dl, pdent_dr]
-
-        dent_plane = doc.addObject("Part::Polygon", "dent_plane")
-        dent_plane.Nodes = pdent_list
-        dent_plane.Close = True
-        dent_plane.ViewObject.Visibility = False
-        dent = doc.addObject("Part::Extrusion", "dent")
-        dent.Base = dent_plane
-        dent.Dir = (0,0, 2*slid_z +2)
-        dent.Solid = True
-        cutlist.append (dent)
-
-        holes = doc.addObject("Part::MultiFuse", "holes")
-        holes.Shapes = cutlist
-
-
-        if side == 'right':
-            holes.Placement.Rotation = FreeCAD.Rotation (VZ, 180)
-            idlepulls.Placement.Rotation = FreeCAD.Rotation (VZ, 180)
-            topslid_fllt.Placement.Rotation = FreeCAD.Rotation (VZ, 180)
-            botslid_fllt.Placement.Rotation = FreeCAD.Rotation (VZ, 180)
-            # h_lmuu_0.bearing. bearings stay the same
-            if holdrod_cen == False:
-                holes.Placement.Base = FreeCAD.Vector (0, self.length,0)
-                idlepulls.Placement.Base = FreeCAD.Vector (0, self.length,0)
-                topslid_fllt.Placement.Base = FreeCAD.Vector (0, self.length,0)
-                botslid_fllt.Placement.Base = FreeCAD.Vector (0, self.length,0)
-        elif side == 'bottom':
-            holes.Placement.Rotation = FreeCAD.Rotation (VZ, 90)
-            idlepulls.Placement.Rotation = FreeCAD.Rotation (VZ, 90)
-            topslid_fllt.Placement.Rotation = FreeCAD.Rotation (VZ, 90)
-            botslid_fllt.Placement.Rotation = FreeCAD.Rotation (VZ, 90)
-            h_lmuu_0.bearing.Placement.Rotation =  FreeCAD.Rotation (VZ, 90)
-            # lmuu_1 has relative position to lmuu_0, so if rotating it
-            # to the other side and reseting its position will put it in its
-            # place
-            if holdrod_cen == True:
-                h_lmuu_1.bearing.Placement.Rotation = FreeCAD.Rotation (VZ, -90)
-                h_lmuu_1.bearing.Placement.Base = FreeCAD.Vector (0,0,0)
-            if holdrod_cen == False:
-                holes.Placement.Base = FreeCAD.Vector (self.length,0,0)
-                idlepulls.Placement.Base = FreeCAD.Vector (self.length,0,0)
-                topslid_fllt.Placement.Base = FreeCAD.Vector (self.length,0,0)
-                botslid_fllt.Placement.Base = FreeCAD.Vector (self.length,0,0)
-                h_lmuu_0.bearing.Placement.Base = FreeCAD.Vector (
-                                                          self.length,0,0)
-                h_lmuu_1.bearing.Placement.Base = FreeCAD.Vector (
-                           self.length - h_lmuu_1.bearing.Placement.Base.y ,0,0)
-                h_lmuu_1.bearing.Placement.Rotation =  FreeCAD.Rotation (VZ, 90)
-        elif side == 'top':
-            holes.Placement.Rotation = FreeCAD.Rotation (VZ, -90)
-            idlepulls.Placement.Rotation = FreeCAD.Rotation (VZ, -90)
-            topslid_fllt.Placement.Rotation = FreeCAD.Rotation (VZ, -90)
-            botslid_fllt.Placement.Rotation = FreeCAD.Rotation (VZ, -90)
-            h_lmuu_0.bearing.Placement.Rotation =  FreeCAD.Rotation (VZ, -90)
-            # lmuu_1 has relative position to lmuu_0, so if rotating it
-            # to the other side and reseting its position will put it in its
-            # place
-            if holdrod_cen == True:
-                h_lmuu_1.bearing.Placement.Rotation =  FreeCAD.Rotation (VZ, 90)
-                h_lmuu_1.bearing.Placement.Base = FreeCAD.Vector (0,0,0)
-            if holdrod_cen == False:
-                #holes.Placement.Base = FreeCAD.Vector (self.length,0,0)
-                #topslid_fllt.Placement.Base = FreeCAD.Vector (self.length,0,0)
-                #botslid_fllt.Placement.Base = FreeCAD.Vector (self.length,0,0)
-                #h_lmuu_0.bearing.Placement.Base = FreeCAD.Vector (
-                                                          #self.length,0,0)
-                h_lmuu_1.bearing.Placement.Base = FreeCAD.Vector (
-                                         h_lmuu_1.bearing.Placement.Base.y ,0,0)
-                h_lmuu_1.bearing.Placement.Rotation = FreeCAD.Rotation (VZ, -90)
-
-
-        # elif side == 'left':
-            # don't do anything, default condition
-
-        self.idlepulls = idlepulls
+    # right middle bolts and idle pulleys referenced to the hold rods
+    BOLT_LAYOUT = 'holdrod'
 
-        bearings = doc.addObject("Part::Fuse", name + "_bear")
-        bearings.Base = h_lmuu_0.bearing
-        bearings.Tool = h_lmuu_1.bearing
-        self.bearings = bearings
-
-        top_slide = doc.addObject("Part::Cut", name + "_top")
-        top_slide.Base = topslid_fllt 
-        top_slide.Tool = holes 
-        self.top_slide = top_slide
-
-        bot_slide = doc.addObject("Part::Cut", name + "_bot")
-        bot_slide.Base = botslid_fllt 
-        bot_slide.Tool = holes 
-        self.bot_slide = bot_slide
-
-    # ---- end of __init__  EndShaftSlider
-
-    # move both sliders (top & bottom) and the bearings
-    def BasePlace (self, position = (0,0,0)):
-        self.base_place = position
-        self.idlepulls.Placement.Base = FreeCAD.Vector(position)
-        self.bearings.Placement.Base = FreeCAD.Vector(position)
-        self.top_slide.Placement.Base = FreeCAD.Vector(position)
-        self.bot_slide.Placement.Base = FreeCAD.Vector(position)
-        
-
-
-"""
-
-    # Move the bearing and its container
-    def BasePlace (self, position = (0,0,0)):
-        self.base_place = position
-        self.bearing.Placement.Base = FreeCAD.Vector(position)
-        self.bearing_cont.Placement.Base = FreeCAD.Vector(position)
-"""
 
 
 # ---------- class CentralSlider ----------------------------------------
@@ -2073,7 +1410,7 @@ class PortaBase (object):
 
         # Making drawings of the portas
         portahole_list = []
-        for ind in xrange(n_porta):
+        for ind in range(n_porta):
             h_porta = comps.RectRndBar (Base = porta_l,
                                         Height = porta_w,
                                         Length = 2.,
@@ -2189,7 +1526,7 @@ class PortaBase (object):
         # Tab to attach to the Y-end linear guides
         lgtab_posy = lgy_posy + dlgy['block']['lh'] + TOL/2.
         if lgtab_posy > portabase_l/2.:
-            print 'citoparts: portabase too small'
+            logger.warning('portabase too small')
             portabase_tot = doc.addObject("Part::Fuse", 'portabase_tot')
             portabase_tot.Base = portabase
             portabase_tot.Tool = portabase_sup
@@ -2917,7 +2254,7 @@ class PortaTrayHole (object):
         # position of the first porta
         portacenter_pos_x = - 0.5 * (n_porta -1) * portacenter_dist 
 
-        for ind in xrange(n_porta):
+        for ind in range(n_porta):
             portathruhole_pos = FreeCAD.Vector(portacenter_pos_x,
                                                0, pos_z-1) # -1 to cut
             
@@ -3253,7 +2590,7 @@ class PortaTrayHole (object):
 #
 #
 #portahole_list = []
-#for i in xrange(kstage.N_PORTA):
+#for i in range(kstage.N_PORTA):
 #    portahole_i = addBox (x = kstage.PORTA_L + TOL,
 #                        y = kstage.PORTA_W + TOL,
 #                        z = kstage.PORTA_H + 2,  # +2 to cut